@@ -0,0 +1,195 @@
+"""
+Append-only activity feed for the Online Music System.
+
+Activity_Log holds one row per user registration, song upload, playlist
+creation and play, with its display text stored at write time, so the
+admin feed is a single index read on (created_at, activity_id) - no joins,
+no merging of per-table queries.
+
+    registrations, uploads,  written by triggers on Users, Songs and
+    playlist creations       Playlists, so every insert path is covered
+    plays                    written per batch by song_stats.record_plays
+
+Older activity is paged with a keyset cursor (created_at, activity_id),
+which stays stable while new rows arrive. prune_activity_log() applies
+ACTIVITY_LOG["retention_days"].
+"""
+
+import time
+from datetime import datetime, timedelta
+from config import ACTIVITY_LOG
+from db_pool import get_connection
+from pagination import fetch_page
+
+# Activity type -> dashboard label
+ACTIVITY_LABELS = {
+    "user_registered": "👤 New user registered",
+    "song_uploaded": "🎵 New song uploaded",
+    "playlist_created": "📁 Playlist created",
+    "song_played": "⬇️ Song played",
+}
+
+ACTIVITY_PAGE_SQL = "SELECT activity_id, activity_type, item, created_at FROM Activity_Log"
+ACTIVITY_KEY = (("created_at", "created_at"), ("activity_id", "activity_id"))
+
+# (name, statement) - single-statement triggers, like the counters in counters.py
+ACTIVITY_TRIGGERS = [
+    ("trg_users_activity",
+     "CREATE TRIGGER trg_users_activity AFTER INSERT ON Users FOR EACH ROW "
+     "INSERT INTO Activity_Log (activity_type, item, user_id, ref_id, created_at) "
+     "VALUES ('user_registered', CONCAT(NEW.first_name, ' ', NEW.last_name), NEW.user_id, NEW.user_id, "
+     "COALESCE(NEW.created_at, CURRENT_TIMESTAMP))"),
+    ("trg_songs_activity",
+     "CREATE TRIGGER trg_songs_activity AFTER INSERT ON Songs FOR EACH ROW "
+     "INSERT INTO Activity_Log (activity_type, item, ref_id, created_at) "
+     "VALUES ('song_uploaded', CONCAT(NEW.title, ' - ', "
+     "COALESCE((SELECT name FROM Artists WHERE artist_id = NEW.artist_id), 'Unknown Artist')), "
+     "NEW.song_id, COALESCE(NEW.upload_date, CURRENT_TIMESTAMP))"),
+    ("trg_playlists_activity",
+     "CREATE TRIGGER trg_playlists_activity AFTER INSERT ON Playlists FOR EACH ROW "
+     "INSERT INTO Activity_Log (activity_type, item, user_id, ref_id, created_at) "
+     "VALUES ('playlist_created', NEW.name, NEW.user_id, NEW.playlist_id, "
+     "COALESCE(NEW.created_at, CURRENT_TIMESTAMP))"),
+]
+
+# ------------------- Writing -------------------
+def create_activity_triggers(cursor):
+    """(Re)create the registration, upload and playlist triggers"""
+    for name, statement in ACTIVITY_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(statement)
+
+def drop_activity_triggers(cursor):
+    """Drop the triggers, e.g. for a bulk load that backfills the feed afterwards"""
+    for name, _ in ACTIVITY_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+def backfill_activity_log(cursor, recent_plays, since=None):
+    """Write feed rows for existing users, songs and playlists plus the newest plays
+
+    Inserted oldest first, so activity ids follow time.
+
+    Args:
+        recent_plays: Number of the newest plays to log
+        since: Only activity from this datetime on (None for everything)
+    """
+    recent_filter = "WHERE h.played_at >= %s" if since else ""
+    window_filter = "WHERE created_at >= %s" if since else ""
+    cursor.execute(f"""
+    INSERT INTO Activity_Log (activity_type, item, user_id, ref_id, created_at)
+    SELECT activity_type, item, user_id, ref_id, created_at FROM (
+        SELECT 'user_registered' AS activity_type, CONCAT(first_name, ' ', last_name) AS item,
+               user_id, user_id AS ref_id, COALESCE(created_at, CURRENT_TIMESTAMP) AS created_at
+        FROM Users
+        UNION ALL
+        SELECT 'song_uploaded', CONCAT(s.title, ' - ', COALESCE(a.name, 'Unknown Artist')),
+               NULL, s.song_id, COALESCE(s.upload_date, CURRENT_TIMESTAMP)
+        FROM Songs s
+        LEFT JOIN Artists a ON s.artist_id = a.artist_id
+        UNION ALL
+        SELECT 'playlist_created', name, user_id, playlist_id, COALESCE(created_at, CURRENT_TIMESTAMP)
+        FROM Playlists
+        UNION ALL
+        SELECT * FROM (
+            SELECT 'song_played', CONCAT(s.title, ' - ', COALESCE(a.name, 'Unknown Artist')),
+                   h.user_id, h.song_id, h.played_at
+            FROM Listening_History h
+            JOIN Songs s ON h.song_id = s.song_id
+            LEFT JOIN Artists a ON s.artist_id = a.artist_id
+            {recent_filter}
+            ORDER BY h.played_at DESC
+            LIMIT %s
+        ) recent_plays
+    ) backfill
+    {window_filter}
+    ORDER BY created_at
+    """, (since, recent_plays, since) if since else (recent_plays,))
+
+def log_song_plays(cursor, history_rows):
+    """Log a batch of plays in the caller's transaction
+
+    Args:
+        history_rows: (user_id, song_id, played_at, ...) tuples
+    """
+    if not history_rows or not ACTIVITY_LOG.get("log_plays", True):
+        return
+
+    song_ids = sorted({row[1] for row in history_rows})
+    placeholders = ", ".join(["%s"] * len(song_ids))
+    cursor.execute(
+        f"""
+        SELECT s.song_id, CONCAT(s.title, ' - ', COALESCE(a.name, 'Unknown Artist')) AS item
+        FROM Songs s
+        LEFT JOIN Artists a ON s.artist_id = a.artist_id
+        WHERE s.song_id IN ({placeholders})
+        """,
+        song_ids
+    )
+    items = {}
+    for row in cursor.fetchall():
+        if isinstance(row, dict):
+            items[row["song_id"]] = row["item"]
+        else:
+            items[row[0]] = row[1]
+
+    cursor.executemany(
+        "INSERT INTO Activity_Log (activity_type, item, user_id, ref_id, created_at) "
+        "VALUES ('song_played', %s, %s, %s, %s)",
+        [(items[row[1]], row[0], row[1], row[2]) for row in history_rows if row[1] in items]
+    )
+
+# ------------------- Reading -------------------
+def get_activities(limit=None, before=None):
+    """Newest activity first, one page at a time
+
+    Args:
+        limit: Page size (defaults to ACTIVITY_LOG["page_size"])
+        before: Keyset cursor returned with the previous page
+
+    Returns:
+        (rows, next_cursor) - rows are dicts with activity_id,
+        activity_type, item and created_at; next_cursor is None on the
+        last page
+    """
+    connection = get_connection()
+    try:
+        cursor = connection.cursor(dictionary=True)
+        page = fetch_page(cursor, ACTIVITY_PAGE_SQL, ACTIVITY_KEY, before,
+                          limit or ACTIVITY_LOG.get("page_size", 20))
+        cursor.close()
+        return page
+    finally:
+        connection.close()
+
+# ------------------- Retention -------------------
+def prune_activity_log(connection, retention_days=None, batch_size=10000):
+    """Delete activity older than retention_days in small batches
+
+    Returns:
+        Number of rows deleted
+    """
+    if retention_days is None:
+        retention_days = ACTIVITY_LOG.get("retention_days")
+    if not retention_days:
+        return 0
+
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    cursor = connection.cursor()
+    start = time.perf_counter()
+    deleted = 0
+    try:
+        while True:
+            cursor.execute(
+                "DELETE FROM Activity_Log WHERE created_at < %s ORDER BY created_at LIMIT %s",
+                (cutoff, batch_size)
+            )
+            connection.commit()
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                break
+    finally:
+        cursor.close()
+
+    print(f"Pruned {deleted} activity rows older than {retention_days} days "
+          f"in {time.perf_counter() - start:.1f}s")
+    return deleted
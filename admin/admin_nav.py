@@ -11,8 +11,9 @@ import subprocess
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import COLORS, ADMIN_SESSION_FILE
+from config import COLORS, ADMIN_SESSION_FILE, session_path
 from utils import get_admin_info
+from app_shell import get_app_shell
 
 class AdminNavigation:
     """Admin navigation sidebar"""
@@ -84,55 +85,45 @@ class AdminNavigation:
             btn.pack(fill="x", pady=5, padx=10)
     
     # ------------------- Navigation Methods -------------------
-    def open_dashboard(self):
-        """Navigate to the dashboard page"""
-        if self.active_item == "dashboard":
-            return  # Already on dashboard
+    def navigate(self, page, script, label):
+        """Switch to a page in the app shell, or start its script when standalone
+        
+        Args:
+            page: Page name (dashboard, users, songs, playlists, reports)
+            script: Page script to start when there is no app shell
+            label: Page name for error messages
+        """
+        if self.active_item == page:
+            return  # Already on this page
         try:
-            subprocess.Popen(["python", "admin/admin_view.py"])
-            self.master.winfo_toplevel().destroy()
+            shell = get_app_shell(self.master)
+            if shell and shell.has_page(page):
+                shell.show(page)
+            else:
+                subprocess.Popen(["python", script])
+                self.master.winfo_toplevel().destroy()
         except Exception as e:
-            messagebox.showerror("Error", f"Unable to open dashboard: {e}")
+            messagebox.showerror("Error", f"Unable to open {label}: {e}")
+    
+    def open_dashboard(self):
+        """Navigate to the dashboard page"""
+        self.navigate("dashboard", "admin/admin_view.py", "dashboard")
     
     def open_manage_users(self):
         """Navigate to the users management page"""
-        if self.active_item == "users":
-            return  # Already on users page
-        try:
-            subprocess.Popen(["python", "admin/admin_users.py"])
-            self.master.winfo_toplevel().destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to open user management: {e}")
+        self.navigate("users", "admin/admin_users.py", "user management")
     
     def open_manage_songs(self):
         """Navigate to the songs management page"""
-        if self.active_item == "songs":
-            return  # Already on songs page
-        try:
-            subprocess.Popen(["python", "admin/admin_songs.py"])
-            self.master.winfo_toplevel().destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to open song management: {e}")
+        self.navigate("songs", "admin/admin_songs.py", "song management")
     
     def open_manage_playlists(self):
         """Navigate to the playlists management page"""
-        if self.active_item == "playlists":
-            return  # Already on playlists page
-        try:
-            subprocess.Popen(["python", "admin/admin_playlists.py"])
-            self.master.winfo_toplevel().destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to open playlist management: {e}")
+        self.navigate("playlists", "admin/admin_playlists.py", "playlist management")
     
     def open_reports(self):
         """Navigate to the reports and analytics page"""
-        if self.active_item == "reports":
-            return  # Already on reports page
-        try:
-            subprocess.Popen(["python", "admin/admin_reports.py"])
-            self.master.winfo_toplevel().destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to open reports: {e}")
+        self.navigate("reports", "admin/admin_reports.py", "reports")
     
     def open_login_page(self):
         """Redirect to the login page"""
@@ -146,8 +137,8 @@ class AdminNavigation:
         """Logout and open the login page"""
         try:
             # Remove admin session file
-            if os.path.exists(ADMIN_SESSION_FILE):
-                os.remove(ADMIN_SESSION_FILE)
+            if os.path.exists(session_path(ADMIN_SESSION_FILE)):
+                os.remove(session_path(ADMIN_SESSION_FILE))
                 
             # Open login page
             subprocess.Popen(["python", "login_signup.py"])
@@ -0,0 +1,257 @@
+"""
+Admin reports and analytics view for the Online Music System.
+
+Every figure on this page is read from the pre-aggregated report tables
+(see reports.py), never from Listening_History itself.
+"""
+
+import os
+import sys
+import datetime
+import customtkinter as ctk
+from tkinter import messagebox
+import traceback
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import UI_THEME, UI_COLOR_THEME, COLORS
+from utils import get_admin_info, connect_db, format_file_size
+from reports import (
+    refresh_reports, get_daily_activity, get_top_genres, get_top_artists,
+    get_uploads_by_day, get_report_freshness, PLAYS_WATERMARK
+)
+
+from admin_nav import AdminNavigation
+
+# Period menu label -> number of days (today included)
+PERIODS = {
+    "Last 7 days": 7,
+    "Last 30 days": 30,
+    "Last 90 days": 90,
+    "Last 365 days": 365
+}
+
+class AdminReports:
+    def __init__(self, root):
+        self.root = root
+        self.admin = get_admin_info()
+
+        if not self.admin:
+            # Admin is not authenticated, redirect to login page
+            self.root.destroy()
+            return
+
+        self.period = "Last 30 days"
+
+        # Initialize UI
+        self.initialize_ui()
+
+        # Load report data
+        self.load_reports()
+
+    def initialize_ui(self):
+        """Initialize the user interface"""
+        self.root.title("Online Music System - Reports & Analytics")
+        self.root.geometry("1000x600")
+        self.root.resizable(False, False)
+
+        # ---------------- Main Frame ----------------
+        self.main_frame = ctk.CTkFrame(self.root, fg_color=COLORS["content_bg"], corner_radius=15)
+        self.main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # ---------------- Navigation Sidebar ----------------
+        self.nav = AdminNavigation(self.main_frame, active_item="reports")
+
+        # ---------------- Main Content ----------------
+        self.content_frame = ctk.CTkFrame(self.main_frame, fg_color=COLORS["content_bg"], corner_radius=10)
+        self.content_frame.pack(side="right", fill="both", expand=True, padx=10, pady=10)
+
+        # Header
+        self.header_frame = ctk.CTkFrame(self.content_frame, fg_color=COLORS["content_bg"], height=40)
+        self.header_frame.pack(fill="x", padx=20, pady=(20, 0))
+
+        self.title_label = ctk.CTkLabel(self.header_frame, text="Reports & Analytics", font=("Arial", 24, "bold"), text_color="white")
+        self.title_label.pack(side="left")
+
+        # Refresh aggregates button
+        self.refresh_btn = ctk.CTkButton(self.header_frame, text="🔄 Refresh Data", font=("Arial", 12),
+                                      fg_color=COLORS["secondary"], hover_color=COLORS["secondary_hover"],
+                                      text_color="white", corner_radius=5,
+                                      width=120, height=30, command=self.refresh_data)
+        self.refresh_btn.pack(side="right", padx=(15, 0))
+
+        # Period selector
+        self.period_menu = ctk.CTkOptionMenu(self.header_frame, values=list(PERIODS),
+                                          command=self.change_period, width=140,
+                                          fg_color=COLORS["card_bg"], button_color=COLORS["primary"],
+                                          button_hover_color=COLORS["primary_hover"])
+        self.period_menu.set(self.period)
+        self.period_menu.pack(side="right")
+
+        # Data freshness
+        self.freshness_label = ctk.CTkLabel(self.content_frame, text="", font=("Arial", 11),
+                                         text_color=COLORS["text_secondary"])
+        self.freshness_label.pack(anchor="w", padx=20)
+
+        # ---------------- Summary Section ----------------
+        self.stats_frame = ctk.CTkFrame(self.content_frame, fg_color=COLORS["content_bg"])
+        self.stats_frame.pack(fill="x", padx=20, pady=(10, 10))
+
+        stat_configs = [
+            ("▶️ Plays", "#DC2626"),  # Red
+            ("👥 Avg Daily Listeners", COLORS["success"]),  # Green
+            ("🎵 Songs Uploaded", COLORS["secondary"]),  # Blue
+            ("💾 Storage Added", "#FACC15")  # Yellow
+        ]
+
+        self.stat_labels = []
+        for name, color in stat_configs:
+            stat_card = ctk.CTkFrame(self.stats_frame, fg_color=COLORS["card_bg"], corner_radius=10, width=160, height=80)
+            stat_card.pack(side="left", padx=10, expand=True)
+            stat_card.pack_propagate(False)  # Keep fixed size
+
+            stat_name = ctk.CTkLabel(stat_card, text=name, font=("Arial", 12, "bold"), text_color="white")
+            stat_name.pack(pady=(15, 5))
+
+            value_label = ctk.CTkLabel(stat_card, text="0", font=("Arial", 20, "bold"), text_color=color)
+            value_label.pack()
+
+            self.stat_labels.append(value_label)
+
+        # ---------------- Report Lists ----------------
+        self.lists_frame = ctk.CTkFrame(self.content_frame, fg_color=COLORS["content_bg"])
+        self.lists_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+
+        self.genres_list = self.create_report_list("Top Genres 🎼")
+        self.artists_list = self.create_report_list("Top Artists 🎤")
+        self.daily_list = self.create_report_list("Daily Activity 📅")
+
+    def create_report_list(self, title):
+        """Create a titled, scrollable column for one report"""
+        column = ctk.CTkFrame(self.lists_frame, fg_color=COLORS["content_bg"])
+        column.pack(side="left", fill="both", expand=True, padx=5)
+
+        title_label = ctk.CTkLabel(column, text=title, font=("Arial", 16, "bold"), text_color=COLORS["primary"])
+        title_label.pack(anchor="w", pady=(0, 10))
+
+        list_frame = ctk.CTkScrollableFrame(column, fg_color=COLORS["card_bg"], corner_radius=10)
+        list_frame.pack(fill="both", expand=True)
+        return list_frame
+
+    def get_period_range(self):
+        """(start, end) dates of the selected period"""
+        end = datetime.date.today()
+        start = end - datetime.timedelta(days=PERIODS[self.period] - 1)
+        return start, end
+
+    def load_reports(self):
+        """Load every report for the selected period"""
+        try:
+            start, end = self.get_period_range()
+
+            daily = get_daily_activity(start, end)
+            uploads = get_uploads_by_day(start, end)
+            genres = get_top_genres(start, end)
+            artists = get_top_artists(start, end)
+
+            # Summary cards
+            total_plays = sum(row["plays"] for row in daily)
+            avg_listeners = sum(row["active_users"] for row in daily) / len(daily) if daily else 0
+            total_uploads = sum(row["uploads"] for row in uploads)
+            bytes_added = sum(row["bytes_uploaded"] for row in uploads)
+
+            self.stat_labels[0].configure(text=f"{total_plays:,}")
+            self.stat_labels[1].configure(text=f"{avg_listeners:,.0f}")
+            self.stat_labels[2].configure(text=f"{total_uploads:,}")
+            self.stat_labels[3].configure(text=format_file_size(bytes_added))
+
+            # Lists
+            self.fill_list(self.genres_list, [(row["genre_name"], f"{row['plays']:,} plays") for row in genres])
+            self.fill_list(self.artists_list, [(row["artist_name"], f"{row['plays']:,} plays") for row in artists])
+
+            uploads_by_day = {row["upload_date"]: row for row in uploads}
+            daily_rows = []
+            for row in reversed(daily):
+                upload = uploads_by_day.get(row["play_date"])
+                detail = f"{row['plays']:,} plays · {row['active_users']:,} listeners"
+                if upload and upload["uploads"]:
+                    detail += f" · {upload['uploads']} uploads ({format_file_size(upload['bytes_uploaded'])})"
+                daily_rows.append((row["play_date"].strftime("%b %d"), detail))
+            self.fill_list(self.daily_list, daily_rows)
+
+            # Freshness
+            refreshed_at = get_report_freshness()[PLAYS_WATERMARK]
+            if refreshed_at:
+                self.freshness_label.configure(text=f"Aggregates refreshed {refreshed_at:%Y-%m-%d %H:%M}")
+            else:
+                self.freshness_label.configure(text="Aggregates have not been built yet - click Refresh Data")
+
+        except Exception as e:
+            print(f"Error loading reports: {e}")
+            traceback.print_exc()
+            messagebox.showerror("Error", f"Failed to load reports: {e}")
+
+    def fill_list(self, list_frame, rows):
+        """Replace a report column's rows with (label, value) pairs"""
+        for widget in list_frame.winfo_children():
+            widget.destroy()
+
+        if not rows:
+            empty_label = ctk.CTkLabel(list_frame, text="No data for this period", font=("Arial", 12),
+                                     text_color=COLORS["text_secondary"])
+            empty_label.pack(pady=20)
+            return
+
+        for label, value in rows:
+            row_frame = ctk.CTkFrame(list_frame, fg_color=COLORS["card_bg"])
+            row_frame.pack(fill="x", padx=5, pady=2)
+
+            name_label = ctk.CTkLabel(row_frame, text=label, font=("Arial", 12, "bold"), text_color="white", anchor="w")
+            name_label.pack(fill="x", padx=10)
+
+            value_label = ctk.CTkLabel(row_frame, text=value, font=("Arial", 11),
+                                     text_color=COLORS["text_secondary"], anchor="w")
+            value_label.pack(fill="x", padx=10)
+
+    def change_period(self, period):
+        """Reload the reports for another period"""
+        self.period = period
+        self.load_reports()
+
+    def refresh_data(self):
+        """Bring the aggregates up to date, then reload"""
+        try:
+            connection = connect_db()
+            if not connection:
+                return
+
+            # Incremental: only days since the last refresh are recomputed
+            refresh_reports(connection)
+            self.load_reports()
+
+        except Exception as e:
+            print(f"Error refreshing reports: {e}")
+            traceback.print_exc()
+            messagebox.showerror("Error", f"Failed to refresh reports: {e}")
+        finally:
+            if 'connection' in locals() and connection and connection.is_connected():
+                connection.close()
+
+def main():
+    try:
+        # Set the appearance mode
+        ctk.set_appearance_mode(UI_THEME)
+        ctk.set_default_color_theme(UI_COLOR_THEME)
+
+        # Create the main window
+        root = ctk.CTk()
+        app = AdminReports(root)
+        root.mainloop()
+    except Exception as e:
+        print(f"Error in admin reports: {e}")
+        traceback.print_exc()
+        messagebox.showerror("Error", f"An unexpected error occurred: {e}")
+
+if __name__ == "__main__":
+    main()
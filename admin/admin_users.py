@@ -13,9 +13,76 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import UI_THEME, UI_COLOR_THEME, COLORS
 from utils import get_admin_info, connect_db, hash_password, validate_email
+from pagination import get_users_page
+from data_client import invalidate
+from song_stats import remove_user_plays
+from virtual_list import VirtualList
+from ui_tasks import get_task_runner
 
 from admin_nav import AdminNavigation
 
+class UserRow(ctk.CTkFrame):
+    """One row of the user list, recycled by VirtualList as the list scrolls"""
+    
+    def __init__(self, master, page):
+        super().__init__(master, fg_color=COLORS["card_bg"], height=40, corner_radius=5)
+        self.pack_propagate(False)  # Prevent frame from resizing
+        self.page = page
+        self.user = None
+        
+        # User ID, name, email and type
+        self.id_label = ctk.CTkLabel(self, text="", width=50, text_color="white")
+        self.id_label.pack(side="left")
+        self.name_label = ctk.CTkLabel(self, text="", width=200, text_color="white")
+        self.name_label.pack(side="left")
+        self.email_label = ctk.CTkLabel(self, text="", width=250, text_color="white")
+        self.email_label.pack(side="left")
+        self.type_label = ctk.CTkLabel(self, text="", width=100, text_color="white")
+        self.type_label.pack(side="left")
+        
+        # Actions
+        actions_frame = ctk.CTkFrame(self, fg_color=COLORS["card_bg"], width=150)
+        actions_frame.pack(side="left")
+        
+        # Edit button
+        edit_btn = ctk.CTkButton(
+            actions_frame, 
+            text="Edit", 
+            fg_color=COLORS["secondary"], 
+            hover_color=COLORS["secondary_hover"],
+            width=60, height=25,
+            command=lambda: self.page.show_edit_user_dialog(self.user["user_id"])
+        )
+        edit_btn.pack(side="left", padx=(0, 5))
+        
+        # Delete button (disabled for self)
+        self.delete_btn = ctk.CTkButton(
+            actions_frame, 
+            text="Delete", 
+            fg_color="#DC2626", 
+            hover_color="#B91C1C",
+            width=60, height=25,
+            command=lambda: self.page.confirm_delete_user(self.user["user_id"])
+        )
+        self.delete_btn.pack(side="left", padx=5)
+    
+    def show(self, user, index):
+        self.user = user
+        self.id_label.configure(text=str(user["user_id"]))
+        self.name_label.configure(text=f"{user['first_name']} {user['last_name']}")
+        self.email_label.configure(text=user["email"])
+        
+        # User Type
+        user_type = "Admin" if user["is_admin"] else "User"
+        type_color = "#FFD700" if user["is_admin"] else "white"  # Gold for admin, white for user
+        self.type_label.configure(text=user_type, text_color=type_color)
+        
+        # Disable delete button for the current admin user
+        if user["user_id"] == self.page.admin["user_id"]:
+            self.delete_btn.configure(state="disabled", fg_color="#555555", hover_color="#555555")
+        else:
+            self.delete_btn.configure(state="normal", fg_color="#DC2626", hover_color="#B91C1C")
+
 class AdminUserManagement:
     def __init__(self, root):
         self.root = root
@@ -26,6 +93,14 @@ class AdminUserManagement:
             self.root.destroy()
             return
         
+        # Database reads run in the background (see ui_tasks.py)
+        self.tasks = get_task_runner(root)
+        
+        # Keyset paging state (see pagination.py)
+        self.user_cursor = None
+        self.search_term = None
+        self.loading_users = False
+        
         # Initialize UI
         self.initialize_ui()
         
@@ -103,209 +178,70 @@ class AdminUserManagement:
         ctk.CTkLabel(self.headers_frame, text="Type", width=100, font=("Arial", 12, "bold"), text_color=COLORS["text_secondary"]).pack(side="left")
         ctk.CTkLabel(self.headers_frame, text="Actions", width=150, font=("Arial", 12, "bold"), text_color=COLORS["text_secondary"]).pack(side="left")
         
-        # Scrollable frame for users
-        self.users_list_frame = ctk.CTkScrollableFrame(self.users_frame, fg_color=COLORS["content_bg"])
-        self.users_list_frame.pack(fill="both", expand=True)
+        # Virtual list for users; the next page is fetched as the end scrolls into view
+        self.users_list = VirtualList(
+            self.users_frame,
+            row_factory=lambda parent: UserRow(parent, self),
+            row_height=40, row_gap=4,
+            empty_text="No users found",
+            on_end_reached=self.load_more_users,
+            fg_color=COLORS["content_bg"]
+        )
+        self.users_list.pack(fill="both", expand=True)
     
-    def load_users(self):
-        """Load users from the database"""
-        # Clear existing users
-        for widget in self.users_list_frame.winfo_children():
-            widget.destroy()
-        
-        try:
-            connection = connect_db()
-            if not connection:
-                return
-            
-            cursor = connection.cursor(dictionary=True)
-            
-            # Get all users
-            query = "SELECT user_id, first_name, last_name, email, is_admin FROM Users ORDER BY user_id"
-            cursor.execute(query)
-            
-            users = cursor.fetchall()
-            
-            if not users:
-                # No users found
-                no_users_label = ctk.CTkLabel(
-                    self.users_list_frame, 
-                    text="No users found", 
-                    font=("Arial", 14), 
-                    text_color=COLORS["text_secondary"]
-                )
-                no_users_label.pack(pady=20)
-                return
-            
-            # Display users
-            for user in users:
-                user_row = ctk.CTkFrame(self.users_list_frame, fg_color=COLORS["card_bg"], height=40, corner_radius=5)
-                user_row.pack(fill="x", pady=2)
-                user_row.pack_propagate(False)  # Prevent frame from resizing
-                
-                # User ID
-                ctk.CTkLabel(user_row, text=str(user["user_id"]), width=50, text_color="white").pack(side="left")
-                
-                # User Name
-                name = f"{user['first_name']} {user['last_name']}"
-                ctk.CTkLabel(user_row, text=name, width=200, text_color="white").pack(side="left")
-                
-                # User Email
-                ctk.CTkLabel(user_row, text=user["email"], width=250, text_color="white").pack(side="left")
-                
-                # User Type
-                user_type = "Admin" if user["is_admin"] else "User"
-                type_color = "#FFD700" if user["is_admin"] else "white"  # Gold for admin, white for user
-                ctk.CTkLabel(user_row, text=user_type, width=100, text_color=type_color).pack(side="left")
-                
-                # Actions
-                actions_frame = ctk.CTkFrame(user_row, fg_color=COLORS["card_bg"], width=150)
-                actions_frame.pack(side="left")
-                
-                # Edit button
-                edit_btn = ctk.CTkButton(
-                    actions_frame, 
-                    text="Edit", 
-                    fg_color=COLORS["secondary"], 
-                    hover_color=COLORS["secondary_hover"],
-                    width=60, height=25,
-                    command=lambda uid=user["user_id"]: self.show_edit_user_dialog(uid)
-                )
-                edit_btn.pack(side="left", padx=(0, 5))
-                
-                # Delete button (disabled for self and for admin if current user is not admin)
-                delete_btn = ctk.CTkButton(
-                    actions_frame, 
-                    text="Delete", 
-                    fg_color="#DC2626", 
-                    hover_color="#B91C1C",
-                    width=60, height=25,
-                    command=lambda uid=user["user_id"]: self.confirm_delete_user(uid)
-                )
-                
-                # Disable delete button for the current admin user
-                if user["user_id"] == self.admin["user_id"]:
-                    delete_btn.configure(state="disabled", fg_color="#555555", hover_color="#555555")
-                
-                delete_btn.pack(side="left", padx=5)
-        
-        except Exception as e:
-            print(f"Error loading users: {e}")
-            traceback.print_exc()
-            
-            # Show error message
-            messagebox.showerror("Error", f"Failed to load users: {e}")
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
+    def load_users(self, search=None):
+        """Load the first page of users, optionally filtered by a search term"""
+        self.search_term = search
+        self.user_cursor = None
+        
+        # Placeholders until the page arrives; a newer load supersedes this one
+        self.users_list.show_skeleton()
+        self.fetch_users_page(first_page=True)
+    
+    def load_more_users(self):
+        """Append the next page of users"""
+        if self.loading_users or not self.user_cursor:
+            return
+        self.fetch_users_page(first_page=False)
+    
+    def fetch_users_page(self, first_page):
+        """Fetch the page after self.user_cursor in the background"""
+        self.loading_users = True
+        self.tasks.submit(
+            get_users_page, self.user_cursor, search=self.search_term, key="users",
+            on_done=lambda page: self.show_users_page(page, first_page),
+            on_error=self.show_users_error
+        )
+    
+    def show_users_page(self, page, first_page):
+        """Show a fetched page and advance the cursor"""
+        users, self.user_cursor = page
+        self.loading_users = False
+        
+        if first_page:
+            search = self.search_term
+            text = f"No users found matching '{search}'" if search else "No users found"
+            self.users_list.set_items(users, empty_text=text)
+        else:
+            self.users_list.append_items(users)
+    
+    def show_users_error(self, e):
+        """Report a failed page load"""
+        self.loading_users = False
+        print(f"Error loading users: {e}")
+        traceback.print_exception(type(e), e, e.__traceback__)
+        
+        # Show error message (in place of the placeholders on a first page)
+        if self.users_list.loading:
+            self.users_list.set_items([], empty_text="Failed to load users")
+        messagebox.showerror("Error", f"Failed to load users: {e}")
     
     def search_users(self):
         """Search for users based on search term"""
         search_term = self.search_entry.get()
         
-        if not search_term:
-            # If search term is empty, load all users
-            self.load_users()
-            return
-        
-        # Clear existing users
-        for widget in self.users_list_frame.winfo_children():
-            widget.destroy()
-        
-        try:
-            connection = connect_db()
-            if not connection:
-                return
-            
-            cursor = connection.cursor(dictionary=True)
-            
-            # Search users by name or email
-            query = """
-            SELECT user_id, first_name, last_name, email, is_admin 
-            FROM Users 
-            WHERE first_name LIKE %s OR last_name LIKE %s OR email LIKE %s
-            ORDER BY user_id
-            """
-            
-            search_param = f"%{search_term}%"
-            cursor.execute(query, (search_param, search_param, search_param))
-            
-            users = cursor.fetchall()
-            
-            if not users:
-                # No users found
-                no_users_label = ctk.CTkLabel(
-                    self.users_list_frame, 
-                    text=f"No users found matching '{search_term}'", 
-                    font=("Arial", 14), 
-                    text_color=COLORS["text_secondary"]
-                )
-                no_users_label.pack(pady=20)
-                return
-            
-            # Display users (same as in load_users)
-            for user in users:
-                user_row = ctk.CTkFrame(self.users_list_frame, fg_color=COLORS["card_bg"], height=40, corner_radius=5)
-                user_row.pack(fill="x", pady=2)
-                user_row.pack_propagate(False)  # Prevent frame from resizing
-                
-                # User ID
-                ctk.CTkLabel(user_row, text=str(user["user_id"]), width=50, text_color="white").pack(side="left")
-                
-                # User Name
-                name = f"{user['first_name']} {user['last_name']}"
-                ctk.CTkLabel(user_row, text=name, width=200, text_color="white").pack(side="left")
-                
-                # User Email
-                ctk.CTkLabel(user_row, text=user["email"], width=250, text_color="white").pack(side="left")
-                
-                # User Type
-                user_type = "Admin" if user["is_admin"] else "User"
-                type_color = "#FFD700" if user["is_admin"] else "white"  # Gold for admin, white for user
-                ctk.CTkLabel(user_row, text=user_type, width=100, text_color=type_color).pack(side="left")
-                
-                # Actions
-                actions_frame = ctk.CTkFrame(user_row, fg_color=COLORS["card_bg"], width=150)
-                actions_frame.pack(side="left")
-                
-                # Edit button
-                edit_btn = ctk.CTkButton(
-                    actions_frame, 
-                    text="Edit", 
-                    fg_color=COLORS["secondary"], 
-                    hover_color=COLORS["secondary_hover"],
-                    width=60, height=25,
-                    command=lambda uid=user["user_id"]: self.show_edit_user_dialog(uid)
-                )
-                edit_btn.pack(side="left", padx=(0, 5))
-                
-                # Delete button (disabled for self)
-                delete_btn = ctk.CTkButton(
-                    actions_frame, 
-                    text="Delete", 
-                    fg_color="#DC2626", 
-                    hover_color="#B91C1C",
-                    width=60, height=25,
-                    command=lambda uid=user["user_id"]: self.confirm_delete_user(uid)
-                )
-                
-                # Disable delete button for the current admin user
-                if user["user_id"] == self.admin["user_id"]:
-                    delete_btn.configure(state="disabled", fg_color="#555555", hover_color="#555555")
-                
-                delete_btn.pack(side="left", padx=5)
-        
-        except Exception as e:
-            print(f"Error searching users: {e}")
-            traceback.print_exc()
-            
-            # Show error message
-            messagebox.showerror("Error", f"Failed to search users: {e}")
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
+        # An empty search term loads all users
+        self.load_users(search=search_term or None)
     
     def show_add_user_dialog(self):
         """Show dialog to add a new user"""
@@ -666,9 +602,11 @@ class AdminUserManagement:
             )
             
             if confirm:
-                # Delete the user
+                # Delete the user, their history and its share of the play counters
+                remove_user_plays(cursor, user_id)
                 cursor.execute("DELETE FROM Users WHERE user_id = %s", (user_id,))
                 connection.commit()
+                invalidate("playlists", "history")
                 
                 # Refresh user list
                 self.load_users()
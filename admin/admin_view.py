@@ -12,8 +12,9 @@ import traceback
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import UI_THEME, UI_COLOR_THEME, COLORS
+from config import UI_THEME, UI_COLOR_THEME, COLORS, ACTIVITY_LOG
 from utils import get_admin_info, connect_db, format_relative_time
+from activity_log import get_activities, ACTIVITY_LABELS
 
 from admin_nav import AdminNavigation
 
@@ -27,6 +28,10 @@ class AdminDashboard:
             self.root.destroy()
             return
         
+        # Keyset cursor for the next page of older activity
+        self.activity_cursor = None
+        self.load_more_btn = None
+        
         # Initialize UI
         self.initialize_ui()
         
@@ -154,8 +159,8 @@ class AdminDashboard:
                                          font=("Arial", 20, "bold"), text_color=COLORS["primary"])
         self.activity_title.pack(anchor="w", pady=(0, 15))
         
-        # Activity list container
-        self.activity_list_frame = ctk.CTkFrame(self.activity_frame, fg_color=COLORS["card_bg"], corner_radius=10)
+        # Activity list container (scrolls once older pages are loaded)
+        self.activity_list_frame = ctk.CTkScrollableFrame(self.activity_frame, fg_color=COLORS["card_bg"], corner_radius=10)
         self.activity_list_frame.pack(fill="both", expand=True)
     
     def load_dashboard_data(self):
@@ -172,6 +177,10 @@ class AdminDashboard:
         # Update recent activities
         self.update_activity_list()
     
+    def on_show(self):
+        """Reload the totals and activity when the app shell shows the page again"""
+        self.load_dashboard_data()
+    
     def refresh_dashboard(self):
         """Refresh dashboard data"""
         # Update all statistics and activities
@@ -192,27 +201,15 @@ class AdminDashboard:
                 
             cursor = connection.cursor()
             
-            # Get user count
-            cursor.execute("SELECT COUNT(*) FROM Users")
-            total_users = cursor.fetchone()[0]
-            
-            # Get song count
-            cursor.execute("SELECT COUNT(*) FROM Songs")
-            total_songs = cursor.fetchone()[0]
-            
-            # Get playlist count
-            cursor.execute("SELECT COUNT(*) FROM Playlists")
-            total_playlists = cursor.fetchone()[0]
-            
-            # Approximate downloads (listening history entries)
-            cursor.execute("SELECT COUNT(*) FROM Listening_History")
-            total_downloads = cursor.fetchone()[0]
+            # All four figures come from System_Counters in one read (see counters.py)
+            cursor.execute("SELECT name, value FROM System_Counters")
+            counters = dict(cursor.fetchall())
             
             return {
-                "total_users": total_users,
-                "total_songs": total_songs,
-                "total_playlists": total_playlists,
-                "total_downloads": total_downloads
+                "total_users": counters.get("users", 0),
+                "total_songs": counters.get("songs", 0),
+                "total_playlists": counters.get("playlists", 0),
+                "total_downloads": counters.get("plays", 0)
             }
             
         except Exception as e:
@@ -229,124 +226,46 @@ class AdminDashboard:
                 cursor.close()
                 connection.close()
     
-    def get_recent_activities(self, limit=4):
-        """Get recent system activities"""
+    def get_recent_activities(self, limit=4, before=None):
+        """Get recent system activities
+
+        A single index read of Activity_Log (see activity_log.py).
+
+        Args:
+            limit: Number of activities to return
+            before: Keyset cursor from the previous page, for older activity
+
+        Returns:
+            ((action, item, time) tuples, cursor for the next page or None)
+        """
         try:
-            connection = connect_db()
-            if not connection:
-                return []
-                
-            cursor = connection.cursor(dictionary=True)
-            
-            # Get recent user registrations
-            user_query = """
-            SELECT 'user_registered' as activity_type, 
-                   CONCAT(first_name, ' ', last_name) as item,
-                   created_at as timestamp
-            FROM Users
-            ORDER BY created_at DESC
-            LIMIT %s
-            """
-            
-            # Get recent song uploads
-            song_query = """
-            SELECT 'song_uploaded' as activity_type,
-                   CONCAT(s.title, ' - ', a.name) as item,
-                   s.upload_date as timestamp
-            FROM Songs s
-            JOIN Artists a ON s.artist_id = a.artist_id
-            ORDER BY s.upload_date DESC
-            LIMIT %s
-            """
-            
-            # Get recent playlist creations
-            playlist_query = """
-            SELECT 'playlist_created' as activity_type,
-                   p.name as item,
-                   p.created_at as timestamp
-            FROM Playlists p
-            ORDER BY p.created_at DESC
-            LIMIT %s
-            """
-            
-            # Get recent listening activity (downloads)
-            download_query = """
-            SELECT 'song_played' as activity_type,
-                   CONCAT(s.title, ' - ', a.name) as item,
-                   lh.played_at as timestamp
-            FROM Listening_History lh
-            JOIN Songs s ON lh.song_id = s.song_id
-            JOIN Artists a ON s.artist_id = a.artist_id
-            ORDER BY lh.played_at DESC
-            LIMIT %s
-            """
-            
-            # Execute all queries
-            cursor.execute(user_query, (limit,))
-            users = cursor.fetchall()
-            
-            cursor.execute(song_query, (limit,))
-            songs = cursor.fetchall()
-            
-            cursor.execute(playlist_query, (limit,))
-            playlists = cursor.fetchall()
-            
-            cursor.execute(download_query, (limit,))
-            downloads = cursor.fetchall()
-            
-            # Combine all activities
-            all_activities = users + songs + playlists + downloads
-            
-            # Sort by timestamp (most recent first)
-            all_activities.sort(key=lambda x: x["timestamp"], reverse=True)
-            
-            # Limit to requested number
-            all_activities = all_activities[:limit]
-            
+            activities, next_cursor = get_activities(limit, before)
+
             # Format activities for display
             formatted_activities = []
-            for activity in all_activities:
-                activity_type = activity["activity_type"]
-                item = activity["item"]
-                timestamp = activity["timestamp"]
-                
+            now = datetime.datetime.now()
+            for activity in activities:
                 # Calculate relative time
-                time_diff = datetime.datetime.now() - timestamp
-                time_str = format_relative_time(time_diff)
-                
-                # Format action based on activity type
-                if activity_type == "user_registered":
-                    action = "👤 New user registered"
-                elif activity_type == "song_uploaded":
-                    action = "🎵 New song uploaded"
-                elif activity_type == "playlist_created":
-                    action = "📁 Playlist created"
-                elif activity_type == "song_played":
-                    action = "⬇️ Song played"
-                else:
-                    action = "🔄 System activity"
-                
-                formatted_activities.append((action, item, time_str))
-            
-            return formatted_activities
-            
+                time_str = format_relative_time(now - activity["created_at"])
+                action = ACTIVITY_LABELS.get(activity["activity_type"], "🔄 System activity")
+                formatted_activities.append((action, activity["item"], time_str))
+
+            return formatted_activities, next_cursor
+
         except Exception as e:
             print(f"Error getting recent activities: {e}")
             traceback.print_exc()
-            return []
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
+            return [], None
     
     def update_activity_list(self):
         """Update the recent activities list in UI"""
         # First, clear existing activities
         for widget in self.activity_list_frame.winfo_children():
             widget.destroy()
+        self.load_more_btn = None
         
         # Get fresh activities
-        activities = self.get_recent_activities()
+        activities, self.activity_cursor = self.get_recent_activities()
         
         # Display activities
         if not activities:
@@ -358,18 +277,43 @@ class AdminDashboard:
             )
             no_activity_label.pack(pady=20)
         else:
-            for action, item, time in activities:
-                activity_item = ctk.CTkFrame(self.activity_list_frame, fg_color=COLORS["card_bg"], height=40)
-                activity_item.pack(fill="x", padx=10, pady=5)
-                
-                action_label = ctk.CTkLabel(activity_item, text=action, font=("Arial", 12, "bold"), text_color="white")
-                action_label.pack(side="left", padx=10)
-                
-                item_label = ctk.CTkLabel(activity_item, text=item, font=("Arial", 12), text_color=COLORS["text_secondary"])
-                item_label.pack(side="left", padx=10)
-                
-                time_label = ctk.CTkLabel(activity_item, text=time, font=("Arial", 12), text_color=COLORS["primary"])
-                time_label.pack(side="right", padx=10)
+            self.add_activity_rows(activities)
+    
+    def load_more_activities(self):
+        """Append the next page of older activities"""
+        if not self.activity_cursor:
+            return
+        activities, self.activity_cursor = self.get_recent_activities(
+            ACTIVITY_LOG.get("page_size", 20), self.activity_cursor
+        )
+        self.add_activity_rows(activities)
+    
+    def add_activity_rows(self, activities):
+        """Add activity rows below the current ones, then the "Load more" button"""
+        if self.load_more_btn:
+            self.load_more_btn.destroy()
+            self.load_more_btn = None
+        
+        for action, item, time in activities:
+            activity_item = ctk.CTkFrame(self.activity_list_frame, fg_color=COLORS["card_bg"], height=40)
+            activity_item.pack(fill="x", padx=10, pady=5)
+            
+            action_label = ctk.CTkLabel(activity_item, text=action, font=("Arial", 12, "bold"), text_color="white")
+            action_label.pack(side="left", padx=10)
+            
+            item_label = ctk.CTkLabel(activity_item, text=item, font=("Arial", 12), text_color=COLORS["text_secondary"])
+            item_label.pack(side="left", padx=10)
+            
+            time_label = ctk.CTkLabel(activity_item, text=time, font=("Arial", 12), text_color=COLORS["primary"])
+            time_label.pack(side="right", padx=10)
+        
+        # Older activity is fetched one keyset page at a time
+        if self.activity_cursor:
+            self.load_more_btn = ctk.CTkButton(self.activity_list_frame, text="Load more", font=("Arial", 12),
+                                            fg_color=COLORS["secondary"], hover_color=COLORS["secondary_hover"],
+                                            text_color="white", corner_radius=5, height=28,
+                                            command=self.load_more_activities)
+            self.load_more_btn.pack(pady=(5, 10))
 
 def main():
     try:
@@ -0,0 +1,225 @@
+"""
+Single-window application shell for the Online Music System.
+
+The user and admin pages used to navigate by starting a new Python
+interpreter for the next page and destroying the current window, so every
+sidebar click paid for interpreter startup, the customtkinter/pygame
+imports and a fresh database connection. The shell keeps one Tk root for
+the whole session instead: each page is built the first time it is
+visited and cached, and switching pages only hides one page's main frame
+and shows another's.
+
+    python app_shell.py user [--page search]
+    python app_shell.py admin [--page users]
+
+Pages are the existing page classes, built with the shared root; they
+pack their main_frame into it as before. A page may define on_show(),
+which is called whenever it is shown again from the cache. The sidebars
+find the shell with get_app_shell() and fall back to starting the page's
+script when a page is run on its own.
+"""
+
+import os
+import sys
+import time
+import argparse
+import importlib.util
+import tkinter as tk
+import customtkinter as ctk
+from tkinter import messagebox
+import traceback
+
+from config import UI_THEME, UI_COLOR_THEME
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Page name (the sidebar's active_item) -> (script, page class)
+USER_PAGES = {
+    "home": ("user/user_view.py", "UserHomePage"),
+    "search": ("user/user_search.py.py", "UserSearchPage"),
+    "playlist": ("user/user_palylist.py", "UserPlaylistPage"),
+    "download": ("user/user_downloads.py", "UserDownloadPage"),
+}
+
+ADMIN_PAGES = {
+    "dashboard": ("admin/admin_view.py", "AdminDashboard"),
+    "users": ("admin/admin_users.py", "AdminUserManagement"),
+    "reports": ("admin/admin_reports.py", "AdminReports"),
+}
+
+SHELL_PAGES = {
+    "user": (USER_PAGES, "home"),
+    "admin": (ADMIN_PAGES, "dashboard"),
+}
+
+_shells = {}  # Tk root -> AppShell
+
+# ------------------- Page Loading -------------------
+def load_page_class(script, class_name):
+    """Import a page script once and return its page class
+
+    Args:
+        script: Path relative to the project root, e.g. "user/user_view.py"
+        class_name: Name of the page class in that script
+
+    Returns:
+        The page class
+    """
+    path = os.path.join(ROOT_DIR, script)
+    # The page scripts import their sidebar as a sibling module (from user_nav import ...)
+    page_dir = os.path.dirname(path)
+    if page_dir not in sys.path:
+        sys.path.append(page_dir)
+
+    module_name = os.path.basename(script)[:-len(".py")].replace(".", "_")
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            del sys.modules[module_name]
+            raise
+    return getattr(module, class_name)
+
+# ------------------- App Shell -------------------
+class AppShell:
+    """One Tk root whose pages are built lazily and swapped in and out
+
+    Args:
+        root: The session's Tk root
+        pages: Page name -> (script, page class name), e.g. USER_PAGES
+    """
+
+    def __init__(self, root, pages):
+        self.root = root
+        self.pages = pages
+        self.instances = {}     # Page name -> page object, built on first visit
+        self.titles = {}        # Page name -> window title the page set
+        self.pack_options = {}  # Page name -> how the page packed its main_frame
+        self.current = None
+        self.last_switch_ms = 0.0
+        _shells[root] = self
+
+        def on_destroy(event):
+            # <Destroy> on the root also fires for every child widget
+            if event.widget is root:
+                _shells.pop(root, None)
+        root.bind("<Destroy>", on_destroy, "+")
+
+    def has_page(self, name):
+        return name in self.pages
+
+    def show(self, name):
+        """Switch to a page, building it on its first visit
+
+        Returns:
+            True if the page is now showing
+        """
+        if name == self.current:
+            return True
+        start = time.perf_counter()
+
+        previous = self.instances.get(self.current)
+        if previous is not None:
+            previous.main_frame.pack_forget()
+
+        page = self.instances.get(name)
+        if page is None:
+            page = self.build_page(name)
+            if page is None:
+                if previous is not None and self.is_alive():
+                    self.pack_page(self.current)
+                return False
+        else:
+            self.pack_page(name)
+            self.root.title(self.titles[name])
+            on_show = getattr(page, "on_show", None)
+            if on_show:
+                on_show()
+
+        self.current = name
+        self.last_switch_ms = (time.perf_counter() - start) * 1000
+        return True
+
+    def page_class(self, name):
+        return load_page_class(*self.pages[name])
+
+    def build_page(self, name):
+        """Construct a page with the shared root and cache it
+
+        Returns:
+            The page, or None if it could not be built
+        """
+        try:
+            page = self.page_class(name)(self.root)
+        except Exception as e:
+            print(f"Error building page {name}: {e}")
+            traceback.print_exc()
+            messagebox.showerror("Error", f"Unable to open {name} page: {e}")
+            return None
+
+        # Pages return early without a main_frame when the session is not valid
+        if getattr(page, "main_frame", None) is None:
+            return None
+
+        # Tk-level pack info holds the already-scaled padding, so it is
+        # restored with Tk's pack rather than CTk's (which would scale it again)
+        options = tk.Pack.pack_info(page.main_frame)
+        options.pop("in", None)
+        self.pack_options[name] = options
+        self.titles[name] = self.root.title()
+        self.instances[name] = page
+        return page
+
+    def is_alive(self):
+        """False once the root is destroyed, e.g. by a page whose session expired"""
+        try:
+            return bool(self.root.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def pack_page(self, name):
+        tk.Pack.pack_configure(self.instances[name].main_frame, **self.pack_options[name])
+
+def get_app_shell(widget):
+    """The AppShell that owns widget's window, or None when running standalone"""
+    try:
+        return _shells.get(widget.winfo_toplevel())
+    except tk.TclError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Online Music System")
+    parser.add_argument("mode", nargs="?", choices=sorted(SHELL_PAGES), default="user")
+    parser.add_argument("--page", help="Page to open first")
+    args = parser.parse_args()
+
+    pages, start_page = SHELL_PAGES[args.mode]
+    if args.page and args.page not in pages:
+        parser.error(f"unknown {args.mode} page {args.page!r} (choose from {', '.join(pages)})")
+    try:
+        # Set the appearance mode
+        ctk.set_appearance_mode(UI_THEME)
+        ctk.set_default_color_theme(UI_COLOR_THEME)
+
+        # One window for the whole session
+        root = ctk.CTk()
+        shell = AppShell(root, pages)
+        if not shell.show(args.page or start_page):
+            if shell.is_alive():
+                root.destroy()
+            return
+        root.mainloop()
+    except Exception as e:
+        print(f"Error in application shell: {e}")
+        traceback.print_exc()
+        messagebox.showerror("Error", f"An unexpected error occurred: {e}")
+
+if __name__ == "__main__":
+    # Run as the importable module, so the sidebars' get_app_shell()
+    # sees the same shell registry rather than a second copy of __main__
+    import app_shell
+    app_shell.main()
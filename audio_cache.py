@@ -0,0 +1,355 @@
+"""
+LRU on-disk cache of playable audio for the Online Music System.
+
+The player used to download a song's whole blob and rewrite
+temp/song_{id}.{ext} on every play, and nothing ever cleaned temp/ up.
+The cache keeps one file per distinct audio payload instead, named by its
+SHA-256 content hash, plus a small entry per song that maps the song id to
+its hash:
+
+    <root>/files/<content_hash>.<ext>   the audio, as played
+    <root>/songs/<song_id>.json         content hash, type, size, title/artist
+    <root>/stats.json                   hit/miss/eviction counters
+
+A replay reads the song's entry, checks the file is still there at its
+recorded size and plays it - no database traffic at all. A miss streams
+the audio from the blob store through SHA-256 and only installs the file
+if the digest matches the content hash in Song_Files. A file's mtime is
+its last play; once the files exceed AUDIO_CACHE["max_bytes"] the least
+recently played ones are evicted.
+
+Files and entries are installed with atomic renames, and lookups,
+eviction and the counters share one lock file, so several processes
+(the player service, tools/manage_audio_cache.py) can use the cache at once.
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from config import AUDIO_CACHE
+from blob_store import file_lock, CHUNK_SIZE
+from song_files import get_song_file, iter_song_chunks
+
+PART_PREFIX = ".part-"
+STALE_PART_AGE = 3600  # Seconds before an unfinished download is removed
+
+STAT_KEYS = ("hits", "misses", "stores", "bytes_stored", "evictions", "bytes_evicted",
+             "integrity_failures")
+
+class AudioCache:
+    """Song audio files on local disk, evicted least recently played first
+
+    Args:
+        root: Cache directory
+        max_bytes: Byte quota for the audio files
+        min_idle_s: Files played more recently than this are never evicted
+        verify_on_hit: Re-hash a cached file before handing it out
+        lock_timeout: Seconds to wait for the cache lock
+    """
+
+    def __init__(self, root, max_bytes, min_idle_s=60, verify_on_hit=False, lock_timeout=10.0):
+        self.root = root
+        self.files_dir = os.path.join(root, "files")
+        self.songs_dir = os.path.join(root, "songs")
+        self.lock_path = os.path.join(root, "cache.lock")
+        self.stats_path = os.path.join(root, "stats.json")
+        self.max_bytes = max_bytes
+        self.min_idle_s = min_idle_s
+        self.verify_on_hit = verify_on_hit
+        self.lock_timeout = lock_timeout
+        self._pending = {key: 0 for key in STAT_KEYS}  # Counts not yet added to stats.json
+        self._pending_lock = threading.Lock()
+        os.makedirs(self.files_dir, exist_ok=True)
+        os.makedirs(self.songs_dir, exist_ok=True)
+
+    # ------------------- Paths -------------------
+    def entry_path(self, song_id):
+        return os.path.join(self.songs_dir, f"{int(song_id)}.json")
+
+    def file_path(self, content_hash, file_type):
+        return os.path.join(self.files_dir, f"{content_hash}.{file_type}")
+
+    def locked(self):
+        return file_lock(self.lock_path, self.lock_timeout)
+
+    # ------------------- Lookups -------------------
+    def read_entry(self, song_id):
+        try:
+            with open(self.entry_path(song_id), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def write_entry(self, song_id, entry):
+        write_atomic(self.entry_path(song_id), json.dumps(entry).encode("utf-8"))
+
+    def lookup(self, song_id):
+        """Cached audio for a song, without touching the database
+
+        Returns:
+            (path, entry) or None if the song is not cached
+        """
+        entry = self.read_entry(song_id)
+        if entry is None:
+            return None
+        path = self.file_path(entry["content_hash"], entry["file_type"])
+
+        with self.locked():
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                size = None  # Evicted; the entry goes on the next store
+            if size is not None and size == entry["file_size"]:
+                os.utime(path)  # Marks it most recently played, and keeps eviction away
+        if size is None:
+            return None
+        if size != entry["file_size"] or (self.verify_on_hit and file_sha256(path) != entry["content_hash"]):
+            print(f"Cached audio for song {song_id} is damaged; fetching it again")
+            self.count("integrity_failures")
+            self.discard(path)
+            return None
+        return path, entry
+
+    def get(self, song_id):
+        """Path of a song's audio, downloading it into the cache on a miss
+
+        Returns:
+            (path, entry)
+
+        Raises:
+            ValueError: The song has no audio, or the download did not match
+                        its content hash
+        """
+        found = self.lookup(song_id)
+        if found:
+            self.count("hits")
+            return found
+
+        self.count("misses")
+        song_file = get_song_file(song_id)
+        if not song_file:
+            raise ValueError(f"Could not find song data for song {song_id}")
+        return self.store(song_id, song_file, iter_song_chunks(song_id, song_file=song_file))
+
+    def update_entry(self, song_id, **fields):
+        """Save extra fields (e.g. title/artist) in a song's entry"""
+        entry = self.read_entry(song_id)
+        if entry is not None:
+            entry.update(fields)
+            self.write_entry(song_id, entry)
+
+    # ------------------- Storing -------------------
+    def store(self, song_id, song_file, chunks):
+        """Write a song's audio into the cache, checking it on the way
+
+        Args:
+            song_file: Result of get_song_file() (content_hash, file_type)
+            chunks: The audio, e.g. iter_song_chunks()
+
+        Returns:
+            (path, entry)
+        """
+        expected = song_file.get("content_hash")
+        fd, tmp_path = tempfile.mkstemp(dir=self.files_dir, prefix=PART_PREFIX)
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            content_hash = digest.hexdigest()
+
+            # Legacy rows may have no hash; their file is named by the one computed here
+            if expected and content_hash != expected:
+                self.count("integrity_failures")
+                raise ValueError(f"Audio for song {song_id} does not match its content hash")
+
+            path = self.file_path(content_hash, song_file["file_type"])
+            entry = {"content_hash": content_hash, "file_type": song_file["file_type"], "file_size": size}
+            # Under the lock so trim() cannot evict the file mid-store; identical
+            # audio already cached (possibly open in the mixer) is kept as is
+            with self.locked():
+                if os.path.exists(path) and os.path.getsize(path) == size:
+                    os.remove(tmp_path)
+                    os.utime(path)
+                else:
+                    os.replace(tmp_path, path)
+                self.write_entry(song_id, entry)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.count("stores")
+        self.count("bytes_stored", size)
+        self.trim()
+        return path, entry
+
+    # ------------------- Eviction -------------------
+    def list_files(self):
+        """Cached audio files, least recently played first
+
+        Returns:
+            List of (mtime, size, path)
+        """
+        files = []
+        now = time.time()
+        for name in os.listdir(self.files_dir):
+            path = os.path.join(self.files_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if name.startswith(PART_PREFIX):
+                # Download from a process that died part-way
+                if now - stat.st_mtime > STALE_PART_AGE:
+                    self.discard(path)
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        return files
+
+    def trim(self, max_bytes=None):
+        """Evict least recently played files until the cache fits its quota
+
+        Returns:
+            (files evicted, bytes evicted)
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        evicted = 0
+        freed = 0
+        with self.locked():
+            files = self.list_files()
+            total = sum(size for _, size, _ in files)
+            idle_before = time.time() - self.min_idle_s
+            for mtime, size, path in files:
+                if total <= max_bytes:
+                    break
+                if mtime > idle_before:
+                    break  # Everything from here on was played too recently
+                if self.discard(path):
+                    total -= size
+                    evicted += 1
+                    freed += size
+        if evicted:
+            self.count("evictions", evicted)
+            self.count("bytes_evicted", freed)
+        return evicted, freed
+
+    def discard(self, path):
+        """Remove a cached file (its song entries go stale and are replaced on the next miss)"""
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            # On Windows a file the mixer still has open cannot be removed yet
+            print(f"Could not evict {path}: {e}")
+            return False
+
+    def verify(self):
+        """Re-hash every cached file and remove the ones that do not match their name
+
+        Returns:
+            (files checked, files removed)
+        """
+        checked = 0
+        removed = 0
+        for _, _, path in self.list_files():
+            content_hash = os.path.basename(path).split(".", 1)[0]
+            checked += 1
+            if file_sha256(path) != content_hash:
+                print(f"Removing damaged cache file {path}")
+                self.count("integrity_failures")
+                removed += self.discard(path)
+        return checked, removed
+
+    def clear(self):
+        """Remove every cached file and song entry"""
+        with self.locked():
+            for directory in (self.files_dir, self.songs_dir):
+                for name in os.listdir(directory):
+                    self.discard(os.path.join(directory, name))
+
+    # ------------------- Stats -------------------
+    def count(self, key, amount=1):
+        with self._pending_lock:
+            self._pending[key] += amount
+
+    def flush_stats(self):
+        """Add this process's counts to stats.json (shared by every process)"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {key: 0 for key in STAT_KEYS}
+        if not any(pending.values()):
+            return
+        with self.locked():
+            stats = self.read_stats()
+            for key, amount in pending.items():
+                stats[key] = stats.get(key, 0) + amount
+            write_atomic(self.stats_path, json.dumps(stats).encode("utf-8"))
+
+    def read_stats(self):
+        try:
+            with open(self.stats_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def get_stats(self):
+        """Counters from every process, hit rate and current usage"""
+        self.flush_stats()
+        stats = {key: 0 for key in STAT_KEYS}
+        stats.update(self.read_stats())
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        files = self.list_files()
+        stats["files"] = len(files)
+        stats["bytes"] = sum(size for _, size, _ in files)
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+def file_sha256(path, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def write_atomic(path, data):
+    """Write a small file via temp file + rename"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=PART_PREFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_audio_cache():
+    """Process-wide AudioCache configured from AUDIO_CACHE"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AudioCache(
+                AUDIO_CACHE["root"],
+                AUDIO_CACHE.get("max_bytes", 2 * 1024 ** 3),
+                min_idle_s=AUDIO_CACHE.get("min_idle_s", 60),
+                verify_on_hit=AUDIO_CACHE.get("verify_on_hit", False),
+                lock_timeout=AUDIO_CACHE.get("lock_timeout_s", 10),
+            )
+        return _cache
+
+def get_audio_cache_stats():
+    """Stats for the shared audio cache"""
+    return get_audio_cache().get_stats()
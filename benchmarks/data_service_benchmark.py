@@ -0,0 +1,89 @@
+"""
+Benchmark cached calls to the shared data service.
+
+Makes one call per method to fill the service's cache (starting the
+service if needed), then times repeated calls from this process - the
+round trip a page pays when another page or window already ran the same
+query. For comparison it also times the same queries run directly against
+MySQL. Fails if the 95th percentile cached call exceeds the budget.
+
+Needs the database.
+
+Usage:
+    python benchmarks/data_service_benchmark.py [--calls 2000] [--budget-ms 1] [--user-id 1]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import catalog
+from data_client import get_data_client
+
+def benchmark_calls(user_id):
+    """(method, args) pairs covering the pages' queries"""
+    return [
+        ("get_recent_songs", (6,)),
+        ("get_featured_songs", (3,)),
+        ("search_songs", ("a", "all")),
+        ("get_popular_songs", (8,)),
+        ("get_user_playlists", (user_id,)),
+        ("get_user_favorite_songs", (user_id, 8)),
+        ("get_artists", ()),
+        ("get_genres", ()),
+    ]
+
+def time_calls(fn, calls, rounds):
+    """Time fn(method, *args) over rounds passes of calls
+
+    Returns:
+        Ms per call
+    """
+    times = []
+    for _ in range(rounds):
+        for method, args in calls:
+            start = time.perf_counter()
+            fn(method, *args)
+            times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description="Data service cache hit benchmark")
+    parser.add_argument("--calls", type=int, default=2000, help="Cached calls to time")
+    parser.add_argument("--budget-ms", type=float, default=1.0, help="95th percentile cached call budget")
+    parser.add_argument("--user-id", type=int, default=1, help="User for the per-user queries")
+    args = parser.parse_args()
+
+    client = get_data_client()
+    calls = benchmark_calls(args.user_id)
+
+    # Fill the cache
+    start = time.perf_counter()
+    for method, call_args in calls:
+        client.request(method, call_args)
+    print(f"First calls (service start + queries): {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rounds = max(1, args.calls // len(calls))
+    cached = time_calls(lambda method, *a: client.request(method, a), calls, rounds)
+    direct = time_calls(lambda method, *a: getattr(catalog, method)(*a), calls, 3)
+
+    p95 = statistics.quantiles(cached, n=20)[-1]
+    print(f"Cached calls over {len(cached)} calls: median {statistics.median(cached):.3f} ms, "
+          f"p95 {p95:.3f} ms, max {max(cached):.2f} ms")
+    print(f"Direct queries over {len(direct)} calls: median {statistics.median(direct):.2f} ms, "
+          f"max {max(direct):.2f} ms")
+    stats = client.stats()
+    print(f"Service: {stats['hits']} hits, {stats['misses']} misses, hit rate {stats['hit_rate']:.1%}")
+
+    if p95 > args.budget_ms:
+        print(f"FAIL: p95 {p95:.3f} ms exceeds the {args.budget_ms:g} ms budget")
+        sys.exit(1)
+    print(f"ok: within the {args.budget_ms:g} ms budget")
+
+if __name__ == "__main__":
+    main()
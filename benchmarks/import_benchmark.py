@@ -0,0 +1,131 @@
+"""
+Benchmark cold imports of the application entry points.
+
+Imports each entry point in fresh interpreters with `python -X importtime`
+and reports the median cumulative import time of the entry module, the
+slowest modules it pulls in, and any heavy module that should only load
+on first use (pygame, mutagen, PIL and mysql.connector). Fails if an
+entry point exceeds its budget in ENTRY_POINTS or imports a deferred
+module.
+
+Nothing is run beyond the import, so no database or display is needed.
+
+Usage:
+    python benchmarks/import_benchmark.py [--runs 5] [--budget-ms N] [--top 5] [--entry user/user_view.py]
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Script -> (module, directory it is imported from, budget ms, deferred modules)
+DEFERRED = ("pygame", "mutagen", "PIL", "mysql")
+ENTRY_POINTS = {
+    # Warm start has to fit in startup_benchmark.py's 200 ms together with the
+    # interpreter and the schema check, so main.py gets the smallest budget
+    "main.py": ("main", ".", 100, DEFERRED),
+    "login_signup.py": ("login_signup", ".", 250, DEFERRED),
+    "user/user_view.py": ("user_view", "user", 300, DEFERRED),
+    "admin/admin_view.py": ("admin_view", "admin", 300, DEFERRED),
+    # Standalone pages of the ui/ front end
+    "ui/home.py": ("home", "ui", 300, DEFERRED),
+    "ui/search.py": ("search", "ui", 300, DEFERRED),
+    "ui/recom.py": ("recom", "ui", 300, DEFERRED),
+    "ui/playlist.py": ("playlist", "ui", 300, DEFERRED),
+    "ui/download.py": ("download", "ui", 300, DEFERRED),
+    "ui/login.py": ("login", "ui", 300, DEFERRED),
+    "ui/signup.py": ("signup", "ui", 300, DEFERRED),
+    "ui/admin.py": ("admin", "ui", 300, DEFERRED),
+    "ui/admin_login.py": ("admin_login", "ui", 300, DEFERRED),
+    "ui/admin_songs.py": ("admin_songs", "ui", 300, DEFERRED),
+    "ui/admin_users.py": ("admin_users", "ui", 300, DEFERRED),
+    "ui/sub_playlist.py": ("sub_playlist", "ui", 300, DEFERRED),
+}
+
+IMPORT_SNIPPET = "import sys; sys.path.insert(0, {path!r}); import {module}"
+
+def parse_importtime(stderr):
+    """Parse -X importtime output
+
+    Returns:
+        List of (module, self us, cumulative us, depth)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+def import_once(module, path):
+    """Import module in a fresh interpreter
+
+    Returns:
+        Parsed importtime rows
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET.format(path=path, module=module)],
+        cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+def entry_total_ms(rows, module):
+    for name, _, cumulative_us, depth in rows:
+        if name == module and depth == 0:
+            return cumulative_us / 1000
+    return sum(r[1] for r in rows) / 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Entry point import benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, help="Override every entry point's budget")
+    parser.add_argument("--top", type=int, default=5, help="Slowest modules to list per entry point")
+    parser.add_argument("--entry", choices=sorted(ENTRY_POINTS), action="append",
+                        help="Only these entry points (repeatable)")
+    args = parser.parse_args()
+
+    failures = []
+    for script in args.entry or ENTRY_POINTS:
+        module, path, budget, deferred = ENTRY_POINTS[script]
+        budget = args.budget_ms or budget
+        try:
+            import_once(module, path)  # Prime the OS file cache and .pyc files
+            runs = [import_once(module, path) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{script}: import failed: {e}")
+            failures.append(f"{script} does not import")
+            continue
+
+        totals = [entry_total_ms(rows, module) for rows in runs]
+        median = statistics.median(totals)
+        print(f"{script}: median {median:.1f} ms, max {max(totals):.1f} ms (budget {budget:.0f} ms)")
+
+        # Slowest modules by their own time, from the median run
+        rows = runs[totals.index(sorted(totals)[len(totals) // 2])]
+        for name, self_us, cumulative_us, _ in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+            print(f"    {name:<40} self {self_us / 1000:6.1f} ms   cumulative {cumulative_us / 1000:6.1f} ms")
+
+        loaded = sorted({name for name, _, _, _ in rows
+                         if any(name == d or name.startswith(d + ".") for d in deferred)})
+        if loaded:
+            print(f"    deferred modules imported: {', '.join(loaded)}")
+            failures.append(f"{script} imports {', '.join(loaded)} at startup")
+        if median > budget:
+            failures.append(f"{script} median {median:.1f} ms exceeds the {budget:.0f} ms budget")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("ok: every entry point within its budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark page switching in the app shell.
+
+Builds an AppShell, visits every page once (the lazy build), then cycles
+through the pages, timing each switch from show() until Tk has finished
+redrawing. By default the pages are synthetic ones shaped like the real
+pages (sidebar, header, a grid of cards and rows), so no database is
+needed; --real user|admin uses the real pages instead, which needs the
+database and a logged-in session. With --spawn it also times the old
+navigation, a fresh interpreter that builds the page in a new window.
+It fails if the 95th percentile cached switch exceeds the budget.
+
+Needs a display.
+
+Usage:
+    python benchmarks/page_switch_benchmark.py [--pages 5] [--switches 200] [--budget-ms 50]
+                                               [--real user|admin] [--spawn]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import customtkinter as ctk
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add parent directory to path for imports
+sys.path.append(ROOT_DIR)
+
+from app_shell import AppShell, SHELL_PAGES
+
+class SyntheticPage:
+    """Page with roughly the widget count of the user pages"""
+
+    def __init__(self, root, name="page", rows=30):
+        root.title(f"Online Music System - {name}")
+        self.main_frame = ctk.CTkFrame(root, corner_radius=15)
+        self.main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        sidebar = ctk.CTkFrame(self.main_frame, width=250, corner_radius=10)
+        sidebar.pack(side="left", fill="y", padx=(10, 0), pady=10)
+        for text in ("Home", "Search", "Playlist", "Download", "Recommend", "Logout"):
+            ctk.CTkButton(sidebar, text=text, anchor="w", corner_radius=0, height=40).pack(fill="x", pady=5, padx=10)
+
+        content = ctk.CTkFrame(self.main_frame, corner_radius=10)
+        content.pack(side="right", fill="both", expand=True, padx=10, pady=10)
+        ctk.CTkLabel(content, text=name, font=("Arial", 24, "bold")).pack(anchor="w", padx=20, pady=(20, 0))
+
+        cards = ctk.CTkFrame(content)
+        cards.pack(fill="x", padx=20, pady=10)
+        for i in range(6):
+            card = ctk.CTkFrame(cards, width=150, height=100, corner_radius=10)
+            card.pack(side="left", padx=5)
+            ctk.CTkLabel(card, text=f"Card {i}").pack(pady=10)
+
+        rows_frame = ctk.CTkScrollableFrame(content)
+        rows_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        for i in range(rows):
+            row = ctk.CTkFrame(rows_frame, height=40, corner_radius=5)
+            row.pack(fill="x", pady=2)
+            ctk.CTkLabel(row, text=f"{i + 1}. Song {i} - Artist {i % 7}", anchor="w").pack(side="left", padx=10)
+            ctk.CTkButton(row, text="▶️", width=30, height=30).pack(side="right", padx=10)
+
+class SyntheticShell(AppShell):
+    """AppShell whose pages are SyntheticPage instances"""
+
+    def page_class(self, name):
+        return lambda root: SyntheticPage(root, name)
+
+# Prints the ms from interpreter start to the first drawn frame of a page
+SPAWN_SNIPPET = """
+import time
+start = time.perf_counter()
+import customtkinter as ctk
+from benchmarks.page_switch_benchmark import SyntheticPage
+root = ctk.CTk()
+root.geometry("1000x600")
+SyntheticPage(root)
+root.update()
+print(f"{(time.perf_counter() - start) * 1000:.1f}")
+root.destroy()
+"""
+
+def time_spawn(runs):
+    """Time the old navigation: a new interpreter building the page
+
+    Returns:
+        Wall ms per run
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", SPAWN_SNIPPET], cwd=ROOT_DIR,
+                       capture_output=True, text=True, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description="App shell page switch benchmark")
+    parser.add_argument("--pages", type=int, default=5, help="Synthetic pages")
+    parser.add_argument("--switches", type=int, default=200)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="95th percentile switch budget")
+    parser.add_argument("--real", choices=sorted(SHELL_PAGES), help="Use the real user or admin pages")
+    parser.add_argument("--spawn", action="store_true", help="Also time subprocess navigation")
+    args = parser.parse_args()
+
+    root = ctk.CTk()
+    root.geometry("1000x600")
+    if args.real:
+        pages = SHELL_PAGES[args.real][0]
+        shell = AppShell(root, pages)
+    else:
+        pages = {f"page{i}": None for i in range(args.pages)}
+        shell = SyntheticShell(root, pages)
+    names = list(pages)
+    if len(names) < 2:
+        parser.error("need at least two pages to switch between")
+
+    # First visits build the pages
+    for name in names:
+        start = time.perf_counter()
+        if not shell.show(name):
+            print(f"Could not build page {name} - is the database up and a session saved?")
+            sys.exit(1)
+        root.update()
+        print(f"Build {name}: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # Later visits come from the cache
+    switches = []
+    for _ in range(args.switches):
+        name = names[(names.index(shell.current) + 1) % len(names)]
+        start = time.perf_counter()
+        shell.show(name)
+        root.update()
+        switches.append((time.perf_counter() - start) * 1000)
+    root.destroy()
+
+    p95 = statistics.quantiles(switches, n=20)[-1]
+    print(f"Cached switches over {args.switches} switches: median {statistics.median(switches):.1f} ms, "
+          f"p95 {p95:.1f} ms, max {max(switches):.1f} ms")
+
+    if args.spawn:
+        spawn = time_spawn(5)
+        print(f"Subprocess navigation over 5 runs: median {statistics.median(spawn):.0f} ms, "
+              f"max {max(spawn):.0f} ms")
+
+    if p95 > args.budget_ms:
+        print(f"FAIL: p95 {p95:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"ok: within the {args.budget_ms:.0f} ms budget")
+
+if __name__ == "__main__":
+    main()
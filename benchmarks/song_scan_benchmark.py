@@ -0,0 +1,179 @@
+"""
+Benchmark catalog scans on a wide Songs table (payload inline) versus the
+narrow Songs + Song_Files layout.
+
+Builds both layouts in a scratch database (online_music_bench by default)
+with the same number of songs, then times the kind of queries the catalog
+pages run: a LIKE search, a newest-first page and a per-artist rollup.
+
+Usage:
+    python benchmarks/song_scan_benchmark.py [--songs 100000] [--payload-bytes 4096]
+
+Payloads small enough to stay in the row (a few KB) are the worst case for
+the wide table. Large LONGBLOBs are mostly stored off-page by InnoDB, so real
+tracks mainly cost buffer-pool pages for the blob pointers and prefixes.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import mysql.connector
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_CONFIG
+
+BENCH_DATABASE = "online_music_bench"
+INSERT_BATCH = 1000
+WORDS = ["love", "night", "dream", "fire", "heart", "summer", "rain", "light", "road", "home"]
+
+QUERIES = [
+    ("LIKE search", "SELECT COUNT(*) FROM {songs} WHERE title LIKE '%heart%'"),
+    ("Newest 50", "SELECT song_id, title FROM {songs} ORDER BY upload_date DESC LIMIT 50"),
+    ("Songs per artist", "SELECT artist_id, COUNT(*), SUM(file_size) FROM {songs} GROUP BY artist_id"),
+]
+
+def connect(database=None):
+    args = {key: DB_CONFIG[key] for key in ("host", "user", "password") if key in DB_CONFIG}
+    if database:
+        args["database"] = database
+    return mysql.connector.connect(**args)
+
+def create_tables(cursor):
+    """(Re)create both layouts"""
+    for table in ("Bench_Song_Files", "Bench_Songs_Narrow", "Bench_Songs_Wide"):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    cursor.execute("""
+    CREATE TABLE Bench_Songs_Wide (
+        song_id INT PRIMARY KEY,
+        title VARCHAR(100) NOT NULL,
+        artist_id INT,
+        genre_id INT,
+        duration INT,
+        file_data LONGBLOB,
+        file_type VARCHAR(10) NOT NULL,
+        file_size INT NOT NULL,
+        upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE Bench_Songs_Narrow (
+        song_id INT PRIMARY KEY,
+        title VARCHAR(100) NOT NULL,
+        artist_id INT,
+        genre_id INT,
+        duration INT,
+        file_type VARCHAR(10) NOT NULL,
+        file_size INT NOT NULL,
+        upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE Bench_Song_Files (
+        song_id INT PRIMARY KEY,
+        file_data LONGBLOB
+    )
+    """)
+
+def populate(connection, cursor, songs, payload_bytes):
+    """Insert the same synthetic catalog into both layouts"""
+    rng = random.Random(42)
+    payload = bytes(rng.getrandbits(8) for _ in range(payload_bytes))
+    start = time.perf_counter()
+
+    for first in range(1, songs + 1, INSERT_BATCH):
+        meta_rows = []
+        for song_id in range(first, min(first + INSERT_BATCH, songs + 1)):
+            title = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {song_id}"
+            upload_date = f"20{rng.randint(15, 24)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            meta_rows.append((song_id, title, rng.randint(1, 5000), rng.randint(1, 20),
+                              rng.randint(90, 400), "mp3", payload_bytes, upload_date))
+
+        cursor.executemany(
+            """
+            INSERT INTO Bench_Songs_Wide
+                (song_id, title, artist_id, genre_id, duration, file_type, file_size, upload_date, file_data)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """,
+            [row + (payload,) for row in meta_rows]
+        )
+        cursor.executemany(
+            """
+            INSERT INTO Bench_Songs_Narrow
+                (song_id, title, artist_id, genre_id, duration, file_type, file_size, upload_date)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """,
+            meta_rows
+        )
+        cursor.executemany(
+            "INSERT INTO Bench_Song_Files (song_id, file_data) VALUES (%s, %s)",
+            [(row[0], payload) for row in meta_rows]
+        )
+        connection.commit()
+
+    cursor.execute("ANALYZE TABLE Bench_Songs_Wide, Bench_Songs_Narrow, Bench_Song_Files")
+    cursor.fetchall()
+    print(f"Loaded {songs} songs per layout in {time.perf_counter() - start:.1f}s")
+
+def time_query(cursor, sql, repeat):
+    """Best-of-N wall time in milliseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(sql)
+        cursor.fetchall()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def table_size_mb(cursor, table):
+    cursor.execute(
+        """
+        SELECT (DATA_LENGTH + INDEX_LENGTH) / 1048576 FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (table,)
+    )
+    return float(cursor.fetchone()[0] or 0)
+
+def main():
+    parser = argparse.ArgumentParser(description="Wide vs narrow Songs scan benchmark")
+    parser.add_argument("--songs", type=int, default=100000)
+    parser.add_argument("--payload-bytes", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database", default=BENCH_DATABASE)
+    parser.add_argument("--skip-load", action="store_true", help="Reuse previously loaded tables")
+    args = parser.parse_args()
+
+    server = connect()
+    server.cursor().execute(f"CREATE DATABASE IF NOT EXISTS {args.database}")
+    server.close()
+
+    connection = connect(args.database)
+    cursor = connection.cursor()
+
+    if not args.skip_load:
+        create_tables(cursor)
+        populate(connection, cursor, args.songs, args.payload_bytes)
+
+    print(f"Bench_Songs_Wide:   {table_size_mb(cursor, 'Bench_Songs_Wide'):.1f} MB")
+    print(f"Bench_Songs_Narrow: {table_size_mb(cursor, 'Bench_Songs_Narrow'):.1f} MB "
+          f"(+ Bench_Song_Files {table_size_mb(cursor, 'Bench_Song_Files'):.1f} MB)")
+    print()
+    print(f"{'Query':<20}{'Wide (ms)':>12}{'Narrow (ms)':>14}{'Speedup':>10}")
+
+    for name, sql in QUERIES:
+        wide = time_query(cursor, sql.format(songs="Bench_Songs_Wide"), args.repeat)
+        narrow = time_query(cursor, sql.format(songs="Bench_Songs_Narrow"), args.repeat)
+        speedup = wide / narrow if narrow else float("inf")
+        print(f"{name:<20}{wide:>12.1f}{narrow:>14.1f}{speedup:>9.1f}x")
+
+    cursor.close()
+    connection.close()
+
+if __name__ == "__main__":
+    main()
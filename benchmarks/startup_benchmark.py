@@ -0,0 +1,77 @@
+"""
+Benchmark warm application startup.
+
+Runs the warm-start path of main.py in fresh interpreters - import main,
+then the single Schema_Version lookup - which is everything that happens
+before the login window is launched. Reports median and worst wall time
+per run and fails if the median exceeds the budget.
+
+The database must already be set up (run main.py once first), otherwise
+the measured path is not the warm one.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 10] [--budget-ms 200]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints: import ms, schema check ms, 1 if the schema was current
+STARTUP_SNIPPET = """
+import time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+current = main.is_schema_current()
+done = time.perf_counter()
+print(f"{(imported - start) * 1000:.1f} {(done - imported) * 1000:.1f} {int(current)}")
+"""
+
+def run_once():
+    """Run one warm start in a fresh interpreter
+
+    Returns:
+        (wall ms, import ms, schema check ms, schema current)
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SNIPPET],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    wall = (time.perf_counter() - start) * 1000
+    import_ms, check_ms, current = result.stdout.strip().splitlines()[-1].split()
+    return wall, float(import_ms), float(check_ms), current == "1"
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm startup benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    run_once()  # Prime the OS file cache and the MySQL connection path
+
+    results = [run_once() for _ in range(args.runs)]
+    if not all(r[3] for r in results):
+        print("Schema is not current - run main.py once so the warm path is measured")
+        sys.exit(1)
+
+    wall = [r[0] for r in results]
+    median = statistics.median(wall)
+    print(f"Warm start over {args.runs} runs: median {median:.1f} ms, max {max(wall):.1f} ms")
+    print(f"  import main:       {statistics.median(r[1] for r in results):.1f} ms")
+    print(f"  schema check:      {statistics.median(r[2] for r in results):.1f} ms")
+    print(f"  interpreter/other: {median - statistics.median(r[1] + r[2] for r in results):.1f} ms")
+
+    if median > args.budget_ms:
+        print(f"FAIL: median {median:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"ok: within the {args.budget_ms:.0f} ms budget")
+
+if __name__ == "__main__":
+    main()
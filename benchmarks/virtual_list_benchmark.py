@@ -0,0 +1,97 @@
+"""
+Benchmark scrolling a VirtualList of search results.
+
+Fills a VirtualList with synthetic songs, then scrolls through it in
+wheel-sized steps, timing each step from the scroll call until Tk has
+finished redrawing. It also times how long it takes to build the first
+screen, and with --naive how long it takes to build one frame per row
+the old way, for comparison. It fails if the 95th percentile frame time
+exceeds the budget.
+
+Needs a display; no database.
+
+Usage:
+    python benchmarks/virtual_list_benchmark.py [--rows 5000] [--steps 300] [--budget-ms 16] [--naive]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import customtkinter as ctk
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from virtual_list import VirtualList, SongRow, SCROLL_UNITS
+
+def make_songs(count):
+    return [{"song_id": i, "title": f"Song {i}", "artist_name": f"Artist {i % 97}",
+             "album_name": f"Album {i % 31}", "duration_formatted": f"{i % 6}:{i % 60:02d}"}
+            for i in range(count)]
+
+def time_naive(root, songs):
+    """Build one frame + labels per song, like the lists did before"""
+    frame = ctk.CTkScrollableFrame(root)
+    frame.pack(fill="both", expand=True)
+    start = time.perf_counter()
+    for song in songs:
+        row = SongRow(frame, lambda song: None)
+        row.show(song, 0)
+        row.pack(fill="x", pady=5)
+    root.update()
+    elapsed = (time.perf_counter() - start) * 1000
+    frame.destroy()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Virtual list scroll benchmark")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--steps", type=int, default=300, help="Wheel steps to scroll")
+    parser.add_argument("--budget-ms", type=float, default=16.0, help="95th percentile frame budget")
+    parser.add_argument("--naive", action="store_true", help="Also time building every row")
+    args = parser.parse_args()
+
+    root = ctk.CTk()
+    root.geometry("800x600")
+    songs = make_songs(args.rows)
+
+    if args.naive:
+        print(f"Naive build of {args.rows} rows: {time_naive(root, songs):.0f} ms")
+
+    song_list = VirtualList(root, row_factory=lambda parent: SongRow(parent, lambda song: None),
+                            row_height=50, row_gap=10)
+    song_list.pack(fill="both", expand=True)
+    root.update()
+
+    start = time.perf_counter()
+    song_list.set_items(songs)
+    root.update()
+    print(f"First screen of {args.rows} rows: {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"({len(song_list.rows)} row widgets)")
+
+    # Scroll down, jumping back to the top when the end is reached
+    step = SCROLL_UNITS * song_list.stride()
+    frames = []
+    for _ in range(args.steps):
+        start = time.perf_counter()
+        if song_list.offset >= song_list.max_offset():
+            song_list.scroll_to_offset(0)
+        else:
+            song_list.scroll_to_offset(song_list.offset + step)
+        root.update()
+        frames.append((time.perf_counter() - start) * 1000)
+    root.destroy()
+
+    p95 = statistics.quantiles(frames, n=20)[-1]
+    print(f"Scroll frames over {args.steps} steps: median {statistics.median(frames):.1f} ms, "
+          f"p95 {p95:.1f} ms, max {max(frames):.1f} ms")
+
+    if p95 > args.budget_ms:
+        print(f"FAIL: p95 {p95:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"ok: within the {args.budget_ms:.0f} ms budget")
+
+if __name__ == "__main__":
+    main()
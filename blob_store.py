@@ -0,0 +1,292 @@
+"""
+Content-addressed audio storage for the Online Music System.
+
+Audio payloads live outside MySQL, keyed by their SHA-256. The database
+only keeps the content hash and a storage locator ("<backend>:<path>")
+in Song_Files. Identical uploads share one blob; a per-blob refcount
+decides when the file can be deleted.
+"""
+
+import os
+import time
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from config import BLOB_STORE
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+STALE_LOCK_AGE = 60       # Seconds before a leftover lock file is broken
+
+@contextmanager
+def file_lock(lock_path, timeout=10.0):
+    """Cross-process lock held while the block runs (O_EXCL lock file)
+
+    Raises:
+        TimeoutError: Not acquired within timeout seconds
+    """
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                # Break locks left behind by a crashed process
+                if time.time() - os.path.getmtime(lock_path) > STALE_LOCK_AGE:
+                    os.remove(lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock {lock_path}")
+            time.sleep(0.01)
+
+    try:
+        yield
+    finally:
+        os.close(fd)
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+class BlobStore:
+    """Interface for audio storage backends"""
+
+    name = None
+
+    def write_stream(self, chunks):
+        """Store an iterable of byte chunks and take one reference to it
+
+        Returns:
+            (content_hash, locator, size)
+        """
+        raise NotImplementedError
+
+    def open(self, locator):
+        """Open a stored blob for binary reading"""
+        raise NotImplementedError
+
+    def exists(self, locator):
+        """Check whether a blob is present"""
+        raise NotImplementedError
+
+    def add_ref(self, locator, count=1):
+        """Take count extra references to an existing blob"""
+        raise NotImplementedError
+
+    def release(self, locator):
+        """Drop one reference; the blob is deleted when none are left
+
+        Returns:
+            Number of references remaining
+        """
+        raise NotImplementedError
+
+    def locator_for(self, content_hash):
+        """Build the locator string for a content hash"""
+        raise NotImplementedError
+
+    def hash_from_locator(self, locator):
+        """Extract the content hash from a locator"""
+        return locator.rsplit("/", 1)[-1]
+
+    def iter_chunks(self, locator, chunk_size=CHUNK_SIZE):
+        """Yield the blob contents in chunks of at most chunk_size bytes"""
+        with self.open(locator) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def verify(self, locator):
+        """Re-hash a blob and check it matches its content hash"""
+        digest = hashlib.sha256()
+        for chunk in self.iter_chunks(locator):
+            digest.update(chunk)
+        return digest.hexdigest() == self.hash_from_locator(locator)
+
+class LocalBlobStore(BlobStore):
+    """Sharded directory on local disk: objects/ab/cd/<sha256>"""
+
+    name = "local"
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.refs_dir = os.path.join(self.root, "refs")
+        self.tmp_dir = os.path.join(self.root, "tmp")
+
+    # ------------------- Paths -------------------
+    def _shard(self, content_hash):
+        return os.path.join(content_hash[:2], content_hash[2:4], content_hash)
+
+    def _object_path(self, content_hash):
+        return os.path.join(self.objects_dir, self._shard(content_hash))
+
+    def _ref_path(self, content_hash):
+        return os.path.join(self.refs_dir, self._shard(content_hash))
+
+    def locator_for(self, content_hash):
+        return f"{self.name}:{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+    def _path_from_locator(self, locator):
+        return self._object_path(self.hash_from_locator(locator))
+
+    # ------------------- Locking & Refcounts -------------------
+    def _locked(self, content_hash, timeout=10.0):
+        """Cross-process lock on one blob's refcount"""
+        return file_lock(self._ref_path(content_hash) + ".lock", timeout)
+
+    def _read_refcount(self, content_hash):
+        try:
+            with open(self._ref_path(content_hash), "r") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _write_refcount(self, content_hash, count):
+        ref_path = self._ref_path(content_hash)
+        if count <= 0:
+            try:
+                os.remove(ref_path)
+            except FileNotFoundError:
+                pass
+            return
+        self._atomic_write(ref_path, str(count).encode())
+
+    def _atomic_write(self, path, data):
+        """Write a small file via temp file + rename"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # ------------------- Blob Operations -------------------
+    def write_stream(self, chunks):
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir, prefix="upload-")
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+            content_hash = digest.hexdigest()
+            final_path = self._object_path(content_hash)
+
+            with self._locked(content_hash):
+                if os.path.exists(final_path):
+                    # Same content already stored - just take another reference
+                    os.remove(tmp_path)
+                else:
+                    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                    os.replace(tmp_path, final_path)
+                self._write_refcount(content_hash, self._read_refcount(content_hash) + 1)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return content_hash, self.locator_for(content_hash), size
+
+    def open(self, locator):
+        return open(self._path_from_locator(locator), "rb")
+
+    def exists(self, locator):
+        return os.path.exists(self._path_from_locator(locator))
+
+    def add_ref(self, locator, count=1):
+        content_hash = self.hash_from_locator(locator)
+        with self._locked(content_hash):
+            if not os.path.exists(self._object_path(content_hash)):
+                raise FileNotFoundError(f"Blob not found: {locator}")
+            self._write_refcount(content_hash, self._read_refcount(content_hash) + count)
+
+    def release(self, locator):
+        content_hash = self.hash_from_locator(locator)
+        with self._locked(content_hash):
+            remaining = max(0, self._read_refcount(content_hash) - 1)
+            self._write_refcount(content_hash, remaining)
+            if remaining == 0:
+                try:
+                    os.remove(self._object_path(content_hash))
+                except FileNotFoundError:
+                    pass
+        return remaining
+
+# ------------------- Backend Registry -------------------
+BACKENDS = {
+    LocalBlobStore.name: LocalBlobStore,
+}
+
+_stores = {}
+
+def register_backend(backend_class):
+    """Register an additional storage backend by its name"""
+    BACKENDS[backend_class.name] = backend_class
+
+def get_blob_store(backend=None):
+    """Get the configured blob store (or a specific backend by name)"""
+    backend = backend or BLOB_STORE["backend"]
+    if backend not in _stores:
+        options = {key: value for key, value in BLOB_STORE.items() if key != "backend"}
+        _stores[backend] = BACKENDS[backend](**options)
+    return _stores[backend]
+
+def store_for_locator(locator):
+    """Get the backend that owns a locator"""
+    return get_blob_store(locator.split(":", 1)[0])
+
+# ------------------- Convenience Functions -------------------
+def store_file(file_path, chunk_size=CHUNK_SIZE):
+    """Copy a file into the blob store
+
+    Returns:
+        (content_hash, locator, size)
+    """
+    def read_chunks():
+        with open(file_path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    return get_blob_store().write_stream(read_chunks())
+
+def store_bytes(data):
+    """Store an in-memory payload
+
+    Returns:
+        (content_hash, locator, size)
+    """
+    return get_blob_store().write_stream([bytes(data)])
+
+def read_blob(locator):
+    """Read a whole blob into memory"""
+    with store_for_locator(locator).open(locator) as f:
+        return f.read()
+
+def add_blob_ref(locator, count=1):
+    """Take count extra references to a stored blob"""
+    store_for_locator(locator).add_ref(locator, count)
+
+def release_blob(locator):
+    """Drop one reference to a stored blob"""
+    return store_for_locator(locator).release(locator)
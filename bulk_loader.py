@@ -0,0 +1,193 @@
+"""
+Batched bulk loading for the Online Music System.
+
+BulkLoader buffers rows and writes them in batches using one of three
+methods:
+
+    executemany - cursor.executemany(), which the connector rewrites into
+                  multi-row INSERTs
+    values      - an explicit multi-row INSERT ... VALUES (...), (...)
+    infile      - LOAD DATA LOCAL INFILE from a generated CSV file (needs
+                  "allow_local_infile": True in DB_CONFIG and local_infile
+                  enabled on the server)
+
+Each batch is committed as it is written, so a large load never builds up
+one huge transaction (commit=False leaves the rows in the caller's
+transaction instead). Row counts and rows/sec are tracked per loader.
+"""
+
+import os
+import time
+import tempfile
+from config import BULK_LOAD
+
+METHODS = ("executemany", "values", "infile")
+
+class BulkLoader:
+    """Buffer rows for one table and write them in batches"""
+
+    def __init__(self, connection, table, columns, batch_size=None, method=None, ignore=False,
+                 commit=True):
+        """Create a loader
+
+        Args:
+            connection: Open database connection (not closed by the loader)
+            table: Target table
+            columns: Column names, in the order rows are given
+            batch_size: Rows per batch (defaults to BULK_LOAD["batch_size"])
+            method: "executemany", "values" or "infile" (defaults to BULK_LOAD["method"])
+            ignore: Skip rows that hit a duplicate key instead of failing
+            commit: Commit each batch (False leaves them to the caller)
+        """
+        self.connection = connection
+        self.table = table
+        self.columns = list(columns)
+        self.batch_size = max(1, int(batch_size or BULK_LOAD["batch_size"]))
+        self.method = method or BULK_LOAD["method"]
+        self.ignore = ignore
+        self.commit = commit
+        if self.method not in METHODS:
+            raise ValueError(f"Unknown bulk load method: {self.method}")
+
+        self._rows = []
+        self._started = None
+        self.rows_loaded = 0
+        self.batches = 0
+        self.elapsed = 0.0
+
+    # ------------------- Public API -------------------
+    def add(self, row):
+        """Queue one row (a tuple in column order)"""
+        if self._started is None:
+            self._started = time.perf_counter()
+        self._rows.append(tuple(row))
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, rows):
+        """Queue an iterable of rows"""
+        for row in rows:
+            self.add(row)
+
+    def flush(self):
+        """Write and commit any buffered rows"""
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+
+        cursor = self.connection.cursor()
+        try:
+            if self.method == "executemany":
+                cursor.executemany(self._insert_sql(1), rows)
+            elif self.method == "values":
+                cursor.execute(self._insert_sql(len(rows)), [value for row in rows for value in row])
+            else:
+                self._load_infile(cursor, rows)
+            if self.commit:
+                self.connection.commit()
+        finally:
+            cursor.close()
+
+        self.rows_loaded += len(rows)
+        self.batches += 1
+        self.elapsed = time.perf_counter() - self._started
+
+    def close(self):
+        """Flush remaining rows and return the load statistics"""
+        self.flush()
+        return self.get_stats()
+
+    def get_stats(self):
+        """Rows written, batches, elapsed seconds and rows/sec"""
+        return {
+            "table": self.table,
+            "method": self.method,
+            "rows": self.rows_loaded,
+            "batches": self.batches,
+            "elapsed": self.elapsed,
+            "rows_per_sec": self.rows_loaded / self.elapsed if self.elapsed else 0.0,
+        }
+
+    def report(self):
+        """Print a one-line throughput summary"""
+        stats = self.get_stats()
+        print(f"Loaded {stats['rows']} rows into {self.table} in {stats['elapsed']:.2f}s "
+              f"({stats['rows_per_sec']:.0f} rows/s, {stats['batches']} batches, {self.method})")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            self.close()
+        return False
+
+    # ------------------- Statement Builders -------------------
+    def _insert_sql(self, row_count):
+        placeholders = "(" + ", ".join(["%s"] * len(self.columns)) + ")"
+        return (
+            f"INSERT {'IGNORE ' if self.ignore else ''}INTO {self.table} "
+            f"({', '.join(self.columns)}) VALUES " + ", ".join([placeholders] * row_count)
+        )
+
+    def _load_infile(self, cursor, rows):
+        """Write the batch to a temporary CSV and LOAD DATA it
+
+        Binary values are written hex-encoded into a user variable and
+        decoded with UNHEX() in the SET clause.
+        """
+        binary = {i for row in rows for i, value in enumerate(row) if isinstance(value, (bytes, bytearray))}
+        targets = [f"@{column}" if i in binary else column for i, column in enumerate(self.columns)]
+        set_clause = ""
+        if binary:
+            set_clause = "SET " + ", ".join(f"{self.columns[i]} = UNHEX(@{self.columns[i]})"
+                                            for i in sorted(binary))
+
+        fd, csv_path = tempfile.mkstemp(prefix="bulk-", suffix=".csv")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                for row in rows:
+                    f.write(",".join(csv_field(value) for value in row) + "\n")
+
+            cursor.execute(
+                f"""
+                LOAD DATA LOCAL INFILE %s {'IGNORE' if self.ignore else ''}
+                INTO TABLE {self.table}
+                CHARACTER SET utf8mb4
+                FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+                LINES TERMINATED BY '\\n'
+                ({', '.join(targets)})
+                {set_clause}
+                """,
+                (csv_path,)
+            )
+        finally:
+            os.remove(csv_path)
+
+# ------------------- Helpers -------------------
+def csv_field(value):
+    """Format one value for LOAD DATA (NULL unquoted, strings quoted, bytes hex)"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (bytes, bytearray)):
+        return '"' + value.hex() + '"'
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+def bulk_insert(connection, table, columns, rows, batch_size=None, method=None, ignore=False, report=True,
+                commit=True):
+    """Load an iterable of rows into a table in batches
+
+    Returns:
+        Load statistics (see BulkLoader.get_stats)
+    """
+    loader = BulkLoader(connection, table, columns, batch_size=batch_size, method=method, ignore=ignore,
+                        commit=commit)
+    loader.add_many(rows)
+    stats = loader.close()
+    if report and stats["rows"]:
+        loader.report()
+    return stats
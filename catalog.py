@@ -0,0 +1,325 @@
+"""
+Catalog read queries for the Online Music System.
+
+The song, playlist and recommendation lookups the pages show, as plain
+functions of their arguments (the user is passed in rather than read from
+current_user.txt). data_service.py serves and caches them for every
+window; pages call them through data_client.call(), which falls back to
+running them in-process when the service is unavailable.
+
+Rows are plain data; formatting for display (durations, file sizes) is
+left to the pages. Errors propagate to the caller.
+"""
+
+import random
+from db_pool import get_connection
+from history_rollup import user_song_plays
+
+# Columns of a search result row
+SEARCH_COLUMNS = """
+    SELECT s.song_id, s.title, a.name as artist_name, al.title as album_name,
+           g.name as genre, s.duration
+    FROM Songs s
+    JOIN Artists a ON s.artist_id = a.artist_id
+    LEFT JOIN Albums al ON s.album_id = al.album_id
+    LEFT JOIN Genres g ON s.genre_id = g.genre_id
+"""
+
+SEARCH_FILTERS = {
+    "song": "s.title LIKE %s",
+    "artist": "a.name LIKE %s",
+    "album": "al.title LIKE %s",
+    "all": "s.title LIKE %s OR a.name LIKE %s OR al.title LIKE %s",
+}
+
+def fetch_all(query, params=()):
+    """Run a SELECT on a pooled connection
+
+    Returns:
+        List of row dicts
+    """
+    connection = get_connection()
+    try:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    finally:
+        connection.close()
+
+# ------------------- Songs -------------------
+def search_songs(query, search_type="all"):
+    """Songs whose title, artist and/or album match query
+
+    Args:
+        query: Text to look for (substring match)
+        search_type: "all", "song", "artist" or "album"
+
+    Returns:
+        Song dicts ordered by title
+    """
+    if not query:
+        return []
+    condition = SEARCH_FILTERS.get(search_type, SEARCH_FILTERS["all"])
+    search_param = f"%{query}%"
+    return fetch_all(
+        f"{SEARCH_COLUMNS} WHERE {condition} ORDER BY s.title",
+        (search_param,) * condition.count("%s")
+    )
+
+def get_recent_songs(limit=6):
+    """Most recently uploaded songs"""
+    return fetch_all(
+        """
+        SELECT s.song_id, s.title, a.name as artist_name
+        FROM Songs s
+        JOIN Artists a ON s.artist_id = a.artist_id
+        ORDER BY s.upload_date DESC
+        LIMIT %s
+        """,
+        (limit,)
+    )
+
+def get_featured_songs(limit=3):
+    """Most played songs, or the newest ones before anything has been played"""
+    # Most played songs, from the Song_Stats counters (index range scan);
+    # every song has a row, so unplayed ones are filtered out for the fallback
+    songs = fetch_all(
+        """
+        SELECT s.song_id, s.title, a.name as artist_name, st.play_count
+        FROM Song_Stats st
+        JOIN Songs s ON st.song_id = s.song_id
+        JOIN Artists a ON s.artist_id = a.artist_id
+        WHERE st.play_count > 0
+        ORDER BY st.play_count DESC, st.song_id DESC
+        LIMIT %s
+        """,
+        (limit,)
+    )
+    return songs or get_recent_songs(limit)
+
+def get_popular_songs(limit=8):
+    """Most played songs with their file sizes (download page)"""
+    songs = fetch_all(
+        """
+        SELECT s.song_id, s.title, a.name as artist_name, st.play_count,
+               g.name as genre_name, s.file_size, s.file_type
+        FROM Song_Stats st
+        JOIN Songs s ON st.song_id = s.song_id
+        JOIN Artists a ON s.artist_id = a.artist_id
+        LEFT JOIN Genres g ON s.genre_id = g.genre_id
+        WHERE st.play_count > 0
+        ORDER BY st.play_count DESC, st.song_id DESC
+        LIMIT %s
+        """,
+        (limit,)
+    )
+
+    # If no songs with play history, get newest songs
+    if not songs:
+        songs = fetch_all(
+            """
+            SELECT s.song_id, s.title, a.name as artist_name, s.file_size, s.file_type,
+                   g.name as genre_name, 0 as play_count
+            FROM Songs s
+            JOIN Artists a ON s.artist_id = a.artist_id
+            LEFT JOIN Genres g ON s.genre_id = g.genre_id
+            ORDER BY s.upload_date DESC
+            LIMIT %s
+            """,
+            (limit,)
+        )
+    return songs
+
+def get_random_songs(limit=8, exclude_ids=None):
+    """Random songs, skipping exclude_ids"""
+    exclusion_filter = ""
+    params = []
+    if exclude_ids:
+        placeholders = ", ".join(["%s"] * len(exclude_ids))
+        exclusion_filter = f"WHERE s.song_id NOT IN ({placeholders})"
+        params = list(exclude_ids)
+
+    songs = fetch_all(
+        f"""
+        SELECT s.song_id, s.title, a.name as artist_name, g.name as genre_name
+        FROM Songs s
+        JOIN Artists a ON s.artist_id = a.artist_id
+        LEFT JOIN Genres g ON s.genre_id = g.genre_id
+        {exclusion_filter}
+        ORDER BY RAND()
+        LIMIT %s
+        """,
+        params + [limit]
+    )
+
+    # If no songs in database yet, return dummy data
+    if not songs and not exclude_ids:
+        songs = [
+            {"song_id": 1, "title": "Blinding Lights", "artist_name": "The Weeknd", "genre_name": "Pop"},
+            {"song_id": 2, "title": "Levitating", "artist_name": "Dua Lipa", "genre_name": "Pop"},
+            {"song_id": 3, "title": "Believer", "artist_name": "Imagine Dragons", "genre_name": "Rock"},
+            {"song_id": 4, "title": "Shape of You", "artist_name": "Ed Sheeran", "genre_name": "Pop"}
+        ]
+        random.shuffle(songs)
+        songs = songs[:limit]
+    return songs
+
+def get_artists():
+    return fetch_all("SELECT artist_id, name FROM Artists ORDER BY name")
+
+def get_genres():
+    return fetch_all("SELECT genre_id, name FROM Genres ORDER BY name")
+
+# ------------------- Playlists -------------------
+def get_user_playlists(user_id):
+    """A user's playlists with their song counts, newest first"""
+    return fetch_all(
+        """
+        SELECT p.playlist_id, p.name, COUNT(ps.song_id) AS song_count
+        FROM Playlists p
+        LEFT JOIN Playlist_Songs ps ON p.playlist_id = ps.playlist_id
+        WHERE p.user_id = %s
+        GROUP BY p.playlist_id
+        ORDER BY p.created_at DESC
+        """,
+        (user_id,)
+    )
+
+def get_playlist_songs(playlist_id):
+    """Songs in a playlist, in playlist order"""
+    return fetch_all(
+        """
+        SELECT s.song_id, s.title, a.name as artist_name, s.duration,
+               ps.position
+        FROM Playlist_Songs ps
+        JOIN Songs s ON ps.song_id = s.song_id
+        JOIN Artists a ON s.artist_id = a.artist_id
+        WHERE ps.playlist_id = %s
+        ORDER BY ps.position
+        """,
+        (playlist_id,)
+    )
+
+# ------------------- Listening History -------------------
+def get_user_listening_history(user_id, limit=5):
+    """Songs the user played most recently, with their play counts"""
+    # Per-song plays from the daily rollups plus recent raw history
+    plays_sql, plays_params = user_song_plays(user_id)
+    return fetch_all(
+        f"""
+        SELECT s.song_id, s.title, a.name as artist_name, g.genre_id, g.name as genre_name,
+               up.plays as play_count
+        FROM ({plays_sql}) up
+        JOIN Songs s ON up.song_id = s.song_id
+        JOIN Artists a ON s.artist_id = a.artist_id
+        LEFT JOIN Genres g ON s.genre_id = g.genre_id
+        ORDER BY up.last_played_at DESC
+        LIMIT %s
+        """,
+        plays_params + (limit,)
+    )
+
+def get_user_favorite_songs(user_id, limit=8):
+    """The user's most played songs with their file sizes"""
+    plays_sql, plays_params = user_song_plays(user_id)
+    return fetch_all(
+        f"""
+        SELECT s.song_id, s.title, a.name as artist_name, up.plays as play_count,
+               g.name as genre_name, s.file_size, s.file_type
+        FROM ({plays_sql}) up
+        JOIN Songs s ON up.song_id = s.song_id
+        JOIN Artists a ON s.artist_id = a.artist_id
+        LEFT JOIN Genres g ON s.genre_id = g.genre_id
+        ORDER BY play_count DESC
+        LIMIT %s
+        """,
+        plays_params + (limit,)
+    )
+
+def get_favorite_genres(user_id, limit=3):
+    """The user's most played genres"""
+    plays_sql, plays_params = user_song_plays(user_id)
+    return fetch_all(
+        f"""
+        SELECT g.genre_id, g.name as genre_name, SUM(up.plays) as count
+        FROM ({plays_sql}) up
+        JOIN Songs s ON up.song_id = s.song_id
+        JOIN Genres g ON s.genre_id = g.genre_id
+        WHERE g.genre_id IS NOT NULL
+        GROUP BY g.genre_id
+        ORDER BY count DESC
+        LIMIT %s
+        """,
+        plays_params + (limit,)
+    )
+
+def get_favorite_artists(user_id, limit=3):
+    """The user's most played artists"""
+    plays_sql, plays_params = user_song_plays(user_id)
+    return fetch_all(
+        f"""
+        SELECT a.artist_id, a.name as artist_name, SUM(up.plays) as count
+        FROM ({plays_sql}) up
+        JOIN Songs s ON up.song_id = s.song_id
+        JOIN Artists a ON s.artist_id = a.artist_id
+        GROUP BY a.artist_id
+        ORDER BY count DESC
+        LIMIT %s
+        """,
+        plays_params + (limit,)
+    )
+
+def get_recommended_songs(user_id, limit=8):
+    """Unheard songs in the user's favorite genres and artists
+
+    Topped up with random songs when there are not enough (or no history).
+    """
+    favorite_genres = get_favorite_genres(user_id)
+    favorite_artists = get_favorite_artists(user_id)
+
+    # No history yet, return random songs
+    if not favorite_genres and not favorite_artists:
+        return get_random_songs(limit)
+
+    # Songs the user has already listened to
+    plays_sql, plays_params = user_song_plays(user_id)
+    listened_songs = [row['song_id'] for row in fetch_all(f"SELECT song_id FROM ({plays_sql}) up", plays_params)]
+
+    filters = []
+    params = []
+    if favorite_genres:
+        genre_ids = [g['genre_id'] for g in favorite_genres]
+        filters.append(f"s.genre_id IN ({', '.join(['%s'] * len(genre_ids))})")
+        params += genre_ids
+    if favorite_artists:
+        artist_ids = [a['artist_id'] for a in favorite_artists]
+        filters.append(f"s.artist_id IN ({', '.join(['%s'] * len(artist_ids))})")
+        params += artist_ids
+
+    # Exclude songs the user has already heard
+    exclusion_filter = ""
+    if listened_songs:
+        exclusion_filter = f"AND s.song_id NOT IN ({', '.join(['%s'] * len(listened_songs))})"
+        params += listened_songs
+
+    recommendations = fetch_all(
+        f"""
+        SELECT s.song_id, s.title, a.name as artist_name, g.name as genre_name
+        FROM Songs s
+        JOIN Artists a ON s.artist_id = a.artist_id
+        LEFT JOIN Genres g ON s.genre_id = g.genre_id
+        WHERE ({' OR '.join(filters)}) {exclusion_filter}
+        ORDER BY RAND()
+        LIMIT %s
+        """,
+        params + [limit]
+    )
+
+    # If we don't have enough recommendations, fill with random songs
+    if len(recommendations) < limit:
+        excluded = [song['song_id'] for song in recommendations] + listened_songs
+        recommendations.extend(get_random_songs(limit - len(recommendations), excluded))
+    return recommendations
@@ -2,12 +2,22 @@
 Configuration settings for the Online Music System application.
 """
 
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Database Configuration
 DB_CONFIG = {
     "host": "localhost",
     "user": "root",
     "password": "new_password",
-    "database": "online_music_system"
+    "database": "online_music_system",
+    # Connection pool settings (see db_pool.py)
+    "pool_size": 5,          # Maximum open connections per process
+    "pool_timeout": 10,      # Seconds to wait for a free connection
+    "pool_recycle": 3600,    # Reopen connections older than this (seconds)
+    "pool_pre_ping": True,   # Check idle connections before reuse
+    "pool_ping_after": 5     # Only ping connections idle longer than this (seconds)
 }
 
 # File Paths
@@ -15,6 +25,107 @@ TEMP_DIR = "temp"
 USER_SESSION_FILE = "current_user.txt"
 ADMIN_SESSION_FILE = "current_admin.txt"
 
+def session_path(session_file):
+    """Absolute path of a session file (pages and services run from different directories)"""
+    return os.path.join(BASE_DIR, session_file)
+
+# Audio Storage (see blob_store.py)
+BLOB_STORE = {
+    "backend": "local",                            # Registered backend name
+    "root": os.path.join(BASE_DIR, "audio_store")  # Root directory for the local backend
+}
+
+# Playback Audio Cache (see audio_cache.py)
+AUDIO_CACHE = {
+    "root": os.path.join(BASE_DIR, TEMP_DIR, "audio_cache"),
+    "max_bytes": 2 * 1024 ** 3,  # Least recently played files are evicted above this
+    "min_idle_s": 60,            # Never evict a file played more recently than this
+    "verify_on_hit": False,      # Re-hash cached files before every play (size is always checked)
+    "lock_timeout_s": 10
+}
+
+# Bulk Loading (see bulk_loader.py)
+BULK_LOAD = {
+    "batch_size": 1000,        # Rows per INSERT batch / CSV file
+    "method": "executemany"    # "executemany", "values" or "infile" (LOAD DATA LOCAL INFILE)
+}
+
+# Play Event Spool (see play_events.py)
+PLAY_HISTORY = {
+    "spool_dir": os.path.join(BASE_DIR, "spool", "plays"),  # Local append-only segments
+    "fsync": True,              # fsync each appended play
+    "flush_every": 50,          # Seal and ingest once this many plays are spooled
+    "flush_interval_ms": 2000,  # ...or at least this often
+    "ingest_batch": 5000,       # Plays per Listening_History transaction
+    "stale_after_s": 300,       # Take over segments left idle this long by other processes
+    "max_attempts": 5           # Quarantine a segment the database rejected this many times
+}
+
+# Listening History Partitions and Rollups (see history_rollup.py)
+HISTORY_RETENTION = {
+    "raw_months": 13,           # Drop raw monthly partitions older than this (once rolled up)
+    "partitions_ahead": 3,      # Monthly partitions created ahead of time
+    "rollup_lookback_days": 2,  # Days re-rolled each run to catch late-ingested plays
+    "boundary_cache_s": 60      # How long queries cache the rollup boundary
+}
+
+# Reports (see reports.py)
+REPORTS = {
+    "lookback_days": 1,  # Already refreshed days recomputed on each refresh
+    "top_n": 10          # Rows in top genre/artist reports
+}
+
+# Activity feed
+ACTIVITY_LOG = {
+    "page_size": 20,       # Rows per dashboard page / "Load more"
+    "retention_days": 365, # Older activity is pruned (None keeps everything)
+    "log_plays": True      # Write a feed row for every ingested play
+}
+
+# Admin song/user lists (keyset paginated, see pagination.py)
+PAGINATION = {
+    "page_size": 100,        # Rows fetched per page
+    "max_page_size": 1000,   # Upper bound for a requested page size
+    "prefetch_fraction": 0.8 # Fetch the next page once scrolled past this point
+}
+
+# Background data loading for the Tk pages (see ui_tasks.py)
+UI_TASKS = {
+    "workers": 4,   # Worker threads per window
+    "poll_ms": 15   # How often finished results are delivered while tasks run
+}
+
+# Audio Player Service (see player_service.py)
+PLAYER_SERVICE = {
+    "socket_path": None,     # Unix socket; None = online_music_player_<uid>.sock in the system temp dir
+    "host": "127.0.0.1",     # Loopback TCP instead where Unix sockets are unavailable
+    "port": 47810,
+    "start_timeout_s": 10,   # Wait this long for a freshly started service to listen
+    "command_timeout_s": 5,  # Per-command socket timeout
+    "poll_ms": 200,          # Track-end checks in the service, event delivery in the UI
+    "history_size": 50,      # Songs remembered for "previous"
+    "idle_exit_s": 900       # Exit after this long with nothing playing and no subscribers
+}
+
+# Shared Data Service (see data_service.py)
+DATA_SERVICE = {
+    "socket_path": None,     # Unix socket; None = online_music_data_<uid>.sock in the system temp dir
+    "host": "127.0.0.1",     # Loopback TCP instead where Unix sockets are unavailable
+    "port": 47811,
+    "workers": None,         # Query threads; None = DB_CONFIG["pool_size"]
+    "cache_entries": 2048,   # Cached results kept (least recently used go first)
+    "ttl_s": {               # How long results stay cached, per cache group
+        "songs": 60,
+        "playlists": 30,
+        "history": 30,
+        "lookups": 300
+    },
+    "start_timeout_s": 10,   # Wait this long for a freshly started service to listen
+    "call_timeout_s": 30,    # Per-call socket timeout
+    "retry_s": 30,           # After the service fails to start, query locally this long
+    "idle_exit_s": 1800      # Exit after this long with no connected windows
+}
+
 # UI Settings
 UI_THEME = "dark"
 UI_COLOR_THEME = "blue"
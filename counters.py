@@ -0,0 +1,112 @@
+"""
+Dashboard counters for the Online Music System.
+
+System_Counters holds one row per dashboard figure, so the admin dashboard
+reads four numbers in a single query instead of running COUNT(*) over
+Users, Songs, Playlists and Listening_History.
+
+    users, songs, playlists  kept by triggers on those tables (a user
+                             delete also subtracts the playlists it
+                             cascades to, which fire no triggers)
+    plays                    plays of existing songs, i.e.
+                             SUM(Song_Stats.play_count); bumped by
+                             song_stats.record_plays per batch, reduced
+                             by a trigger when a song is deleted and by
+                             song_stats.remove_user_plays when a user is
+                             deleted
+
+TRUNCATE and bulk loads that bypass record_plays do not update the
+counters; recount_counters() recomputes them exactly (see
+tools/recount_counters.py).
+"""
+
+import time
+
+# Counter name -> exact recount query
+COUNTER_QUERIES = {
+    "users": "SELECT COUNT(*) FROM Users",
+    "songs": "SELECT COUNT(*) FROM Songs",
+    "playlists": "SELECT COUNT(*) FROM Playlists",
+    "plays": "SELECT COALESCE(SUM(play_count), 0) FROM Song_Stats",
+}
+
+# (name, statement) - single-statement triggers, so no DELIMITER juggling
+COUNTER_TRIGGERS = [
+    ("trg_users_count_insert",
+     "CREATE TRIGGER trg_users_count_insert AFTER INSERT ON Users FOR EACH ROW "
+     "UPDATE System_Counters SET value = value + 1 WHERE name = 'users'"),
+    ("trg_users_count_delete",
+     "CREATE TRIGGER trg_users_count_delete AFTER DELETE ON Users FOR EACH ROW "
+     "UPDATE System_Counters SET value = value - 1 WHERE name = 'users'"),
+    ("trg_users_playlists_delete",
+     "CREATE TRIGGER trg_users_playlists_delete BEFORE DELETE ON Users FOR EACH ROW "
+     "UPDATE System_Counters SET value = value - "
+     "(SELECT COUNT(*) FROM Playlists WHERE user_id = OLD.user_id) WHERE name = 'playlists'"),
+    ("trg_songs_count_insert",
+     "CREATE TRIGGER trg_songs_count_insert AFTER INSERT ON Songs FOR EACH ROW "
+     "UPDATE System_Counters SET value = value + 1 WHERE name = 'songs'"),
+    ("trg_songs_count_delete",
+     "CREATE TRIGGER trg_songs_count_delete AFTER DELETE ON Songs FOR EACH ROW "
+     "UPDATE System_Counters SET value = value - 1 WHERE name = 'songs'"),
+    ("trg_songs_plays_delete",
+     "CREATE TRIGGER trg_songs_plays_delete BEFORE DELETE ON Songs FOR EACH ROW "
+     "UPDATE System_Counters SET value = value - "
+     "COALESCE((SELECT play_count FROM Song_Stats WHERE song_id = OLD.song_id), 0) WHERE name = 'plays'"),
+    ("trg_playlists_count_insert",
+     "CREATE TRIGGER trg_playlists_count_insert AFTER INSERT ON Playlists FOR EACH ROW "
+     "UPDATE System_Counters SET value = value + 1 WHERE name = 'playlists'"),
+    ("trg_playlists_count_delete",
+     "CREATE TRIGGER trg_playlists_count_delete AFTER DELETE ON Playlists FOR EACH ROW "
+     "UPDATE System_Counters SET value = value - 1 WHERE name = 'playlists'"),
+]
+
+# ------------------- Maintenance -------------------
+def create_counter_triggers(cursor):
+    """(Re)create every counter trigger"""
+    for name, statement in COUNTER_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(statement)
+
+def drop_counter_triggers(cursor):
+    """Drop the triggers, e.g. for a bulk load that is recounted afterwards"""
+    for name, _ in COUNTER_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+def add_plays(cursor, count):
+    """Bump the plays counter in the caller's transaction"""
+    if count:
+        cursor.execute("UPDATE System_Counters SET value = value + %s WHERE name = 'plays'", (count,))
+
+def recount_counters(connection):
+    """Recompute every counter exactly, one transaction per counter
+
+    The counter row is locked before counting, so writers that commit during
+    the recount are either already in the count or apply their increment
+    after it - nothing is lost or counted twice.
+
+    Returns:
+        Dict of counter name -> (old value, new value)
+    """
+    cursor = connection.cursor()
+    start = time.perf_counter()
+    changes = {}
+    try:
+        for name, query in COUNTER_QUERIES.items():
+            cursor.execute("INSERT IGNORE INTO System_Counters (name) VALUES (%s)", (name,))
+            cursor.execute("SELECT value FROM System_Counters WHERE name = %s FOR UPDATE", (name,))
+            old_value = cursor.fetchone()[0]
+            cursor.execute(query)
+            new_value = int(cursor.fetchone()[0])
+            cursor.execute(
+                "UPDATE System_Counters SET value = %s, recounted_at = CURRENT_TIMESTAMP WHERE name = %s",
+                (new_value, name)
+            )
+            connection.commit()
+            changes[name] = (old_value, new_value)
+    finally:
+        cursor.close()
+
+    drift = {name: new - old for name, (old, new) in changes.items() if new != old}
+    print(f"Recounted {len(changes)} counters in {time.perf_counter() - start:.1f}s"
+          + (f" (corrected drift: {drift})" if drift else ""))
+    return changes
@@ -0,0 +1,265 @@
+"""
+Client for the shared data service (data_service.py).
+
+Every window used to open its own connection pool and re-run the same
+catalog queries whenever a page was built. The data service is one
+long-lived local process that holds the pool and caches query results for
+all windows; pages call it instead of querying MySQL themselves:
+
+    songs = call("search_songs", query, search_type)
+    invalidate("playlists")       # after writing to the tables behind a group
+
+The protocol is newline-delimited JSON over a Unix socket (loopback TCP
+where Unix sockets are unavailable):
+
+    request   {"id": 1, "method": "search_songs", "args": [...], "kwargs": {...}, "fresh": false}
+    reply     {"id": 1, "result": ...}  or  {"id": 1, "error": "..."}
+
+Methods are the functions in catalog.py plus ping, stats and invalidate.
+The first call starts the service if it is not running. If it cannot be
+started, calls run the catalog function in this process for
+DATA_SERVICE["retry_s"] before trying the service again, so pages keep
+working without it.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import datetime
+import tempfile
+import threading
+import subprocess
+from decimal import Decimal
+from config import BASE_DIR, DATA_SERVICE
+
+SERVICE_SCRIPT = os.path.join(BASE_DIR, "data_service.py")
+
+class DataServiceError(Exception):
+    """The service ran a call and it failed"""
+
+class DataServiceUnavailable(DataServiceError):
+    """The service is not running and could not be started"""
+
+# ------------------- Protocol -------------------
+def to_json(value):
+    """JSON form of the MySQL values that json does not handle"""
+    if isinstance(value, Decimal):
+        # SUM()/AVG() results; whole numbers stay ints
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def encode_message(message):
+    """One JSON line"""
+    return (json.dumps(message, separators=(",", ":"), default=to_json) + "\n").encode("utf-8")
+
+def decode_message(line):
+    return json.loads(line.decode("utf-8"))
+
+def uses_unix_socket():
+    return hasattr(socket, "AF_UNIX")
+
+def socket_path():
+    """Path of the service's Unix socket (one per OS user)"""
+    if DATA_SERVICE.get("socket_path"):
+        return DATA_SERVICE["socket_path"]
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"online_music_data_{user}.sock")
+
+def service_address():
+    return DATA_SERVICE.get("host", "127.0.0.1"), DATA_SERVICE.get("port", 47811)
+
+def open_connection(timeout):
+    """Connect to the service's socket
+
+    Raises:
+        OSError: Nothing is listening
+    """
+    if not uses_unix_socket():
+        return socket.create_connection(service_address(), timeout=timeout)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+def start_data_service():
+    """Start the service in the background, detached from this window"""
+    subprocess.Popen(
+        [sys.executable, SERVICE_SCRIPT],
+        cwd=BASE_DIR,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,  # Outlives the window that started it (POSIX only)
+        creationflags=getattr(subprocess, "DETACHED_PROCESS", 0),
+    )
+
+def connect_to_service(start=True):
+    """Open a connection to the service, starting it if needed
+
+    Raises:
+        DataServiceUnavailable: The service is not running (start=False) or
+                                did not come up within DATA_SERVICE["start_timeout_s"]
+    """
+    timeout = DATA_SERVICE.get("call_timeout_s", 30)
+    try:
+        return open_connection(timeout)
+    except OSError as e:
+        if not start:
+            raise DataServiceUnavailable(f"Data service is not running: {e}")
+
+    start_data_service()
+    deadline = time.monotonic() + DATA_SERVICE.get("start_timeout_s", 10)
+    while True:
+        try:
+            return open_connection(timeout)
+        except OSError as e:
+            if time.monotonic() > deadline:
+                raise DataServiceUnavailable(f"Data service did not start: {e}")
+            time.sleep(0.05)
+
+# ------------------- Calls -------------------
+class DataClient:
+    """Calls the data service over one connection per thread
+
+    Pages query from their background workers, so each worker thread
+    keeps its own connection rather than queueing behind a shared one.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._unavailable_until = 0.0  # Query locally until then
+
+    def request(self, method, args=(), kwargs=None, fresh=False, start=True):
+        """Send one request and wait for its reply
+
+        Returns:
+            The call's result
+
+        Raises:
+            DataServiceUnavailable: The service could not be reached
+            DataServiceError: The call failed or timed out in the service
+        """
+        local = self._local
+        local.next_id = getattr(local, "next_id", 0) + 1
+        message = {"id": local.next_id, "method": method, "args": list(args),
+                   "kwargs": kwargs or {}, "fresh": fresh}
+
+        # A connection kept from an earlier call may belong to a service
+        # that has since exited; retry once on a fresh one. A timeout means
+        # the service is still running the call, so it is not re-sent.
+        for attempt in range(2):
+            try:
+                if getattr(local, "sock", None) is None:
+                    local.sock = connect_to_service(start=start)
+                    local.reader = local.sock.makefile("rb")
+                local.sock.sendall(encode_message(message))
+                line = local.reader.readline()
+                if not line:
+                    raise ConnectionError("connection closed by the data service")
+                break
+            except socket.timeout:
+                self.close()
+                raise DataServiceError(
+                    f"Data service call {method} timed out after {DATA_SERVICE.get('call_timeout_s', 30)}s"
+                )
+            except OSError as e:
+                self.close()
+                if attempt:
+                    raise DataServiceUnavailable(f"Data service unavailable: {e}")
+
+        reply = decode_message(line)
+        if reply.get("id") != message["id"]:
+            self.close()
+            raise DataServiceError("Data service reply out of order")
+        if "error" in reply:
+            raise DataServiceError(reply["error"])
+        return reply.get("result")
+
+    def call(self, method, *args, fresh=False, **kwargs):
+        """Run a catalog query through the service's cache
+
+        Args:
+            method: Name of a function in catalog.py
+            fresh: Skip the cached result (the new one is cached)
+
+        Returns:
+            The query's result
+
+        Raises:
+            DataServiceError: The query failed
+        """
+        if time.monotonic() >= self._unavailable_until:
+            try:
+                return self.request(method, args, kwargs, fresh=fresh)
+            except DataServiceUnavailable as e:
+                print(f"{e}; querying the database directly")
+                with self._lock:
+                    self._unavailable_until = time.monotonic() + DATA_SERVICE.get("retry_s", 30)
+
+        # Same JSON round trip as a service reply, so callers see the same
+        # types (no Decimal or datetime) either way
+        import catalog
+        result = getattr(catalog, method)(*args, **kwargs)
+        return json.loads(json.dumps(result, default=to_json))
+
+    def invalidate(self, *groups):
+        """Drop cached results of groups (all groups if none are given)
+
+        Does nothing if the service is not running - there is nothing cached.
+        """
+        try:
+            return self.request("invalidate", [list(groups)], start=False)
+        except DataServiceUnavailable:
+            return 0
+        except DataServiceError as e:
+            print(f"Could not invalidate {', '.join(groups) or 'the cache'}: {e}")
+            return 0
+
+    def stats(self):
+        return self.request("stats", start=False)
+
+    def close(self):
+        """Close this thread's connection"""
+        local = self._local
+        if getattr(local, "sock", None) is not None:
+            try:
+                local.reader.close()
+                local.sock.close()
+            except OSError:
+                pass
+        local.sock = None
+        local.reader = None
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_data_client():
+    """Process-wide DataClient"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = DataClient()
+        return _client
+
+def call(method, *args, **kwargs):
+    """get_data_client().call(...)"""
+    return get_data_client().call(method, *args, **kwargs)
+
+def invalidate(*groups):
+    """get_data_client().invalidate(...)"""
+    return get_data_client().invalidate(*groups)
@@ -0,0 +1,264 @@
+"""
+Shared data service for the Online Music System.
+
+One background process holds the MySQL connection pool and a cache of
+catalog query results (catalog.py) for every window, so a result one page
+fetched is a socket round trip away for the next page or the next window
+instead of a new connection and a new query. Windows call it through
+data_client.py over a Unix socket (see the protocol there).
+
+    python data_service.py          # normally started by the first client
+
+The event loop only parses requests and answers cache hits; queries run
+on a thread pool the size of the connection pool. Results are cached as
+their encoded JSON, so a hit is a dictionary lookup and one write.
+Concurrent identical calls share one query. Each method belongs to a
+cache group whose entries expire after DATA_SERVICE["ttl_s"][group];
+writers drop a group early with invalidate(). The service exits after
+DATA_SERVICE["idle_exit_s"] with no connected windows.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import catalog
+from config import DATA_SERVICE, DB_CONFIG
+from db_pool import get_pool_stats
+from data_client import to_json, decode_message, uses_unix_socket, socket_path, service_address, open_connection
+
+# Method -> cache group
+METHODS = {
+    "search_songs": "songs",
+    "get_recent_songs": "songs",
+    "get_featured_songs": "songs",
+    "get_popular_songs": "songs",
+    "get_playlist_songs": "playlists",
+    "get_user_playlists": "playlists",
+    "get_user_listening_history": "history",
+    "get_user_favorite_songs": "history",
+    "get_favorite_genres": "history",
+    "get_favorite_artists": "history",
+    "get_recommended_songs": "history",
+    "get_random_songs": None,  # Never cached
+    "get_artists": "lookups",
+    "get_genres": "lookups",
+}
+
+def encode_result(value):
+    return json.dumps(value, separators=(",", ":"), default=to_json).encode("utf-8")
+
+def run_query(method, args, kwargs):
+    """Run a catalog function on a worker thread
+
+    Returns:
+        The result, encoded as JSON
+    """
+    return encode_result(getattr(catalog, method)(*args, **kwargs))
+
+# ------------------- Cache -------------------
+class DataService:
+    """Result cache in front of the catalog queries
+
+    Only touched from the event loop thread, so it needs no locks.
+    """
+
+    def __init__(self, workers, cache_entries=2048, ttl=None):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="data-query")
+        self.cache_entries = cache_entries
+        self.ttl = ttl or {}
+        self.cache = OrderedDict()  # Key -> (expires_at, group, encoded result), oldest first
+        self.inflight = {}          # Key -> future of the running query
+        self.generations = {}       # Group -> invalidation count
+        self.clients = 0
+        self.last_active = time.monotonic()
+        self.stats = {"calls": 0, "hits": 0, "misses": 0, "shared": 0, "errors": 0,
+                      "invalidations": 0, "query_time_total": 0.0}
+
+    async def call(self, method, args, kwargs, fresh=False):
+        """Result of a catalog query, from the cache when possible
+
+        Returns:
+            The result, encoded as JSON
+        """
+        group = METHODS[method]
+        key = method + json.dumps([args, kwargs], separators=(",", ":"), sort_keys=True, default=to_json)
+        self.stats["calls"] += 1
+
+        if not fresh:
+            entry = self.cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[2]
+            pending = self.inflight.get(key)
+            if pending is not None:
+                self.stats["shared"] += 1
+                return await asyncio.shield(pending)
+
+        self.stats["misses"] += 1
+        generation = self.generations.get(group, 0)
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().run_in_executor(self.executor, run_query, method, args, kwargs)
+        self.inflight[key] = future
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+            self.stats["query_time_total"] += time.perf_counter() - start
+
+        # A result started before an invalidation may already be stale
+        ttl = self.ttl.get(group, 0) if group else 0
+        if ttl > 0 and self.generations.get(group, 0) == generation:
+            self.cache[key] = (time.monotonic() + ttl, group, result)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_entries:
+                self.cache.popitem(last=False)
+        return result
+
+    def invalidate(self, groups=None):
+        """Drop the cached results of groups (all if empty)
+
+        Returns:
+            Number of entries dropped
+        """
+        groups = set(groups or self.ttl)
+        for group in groups:
+            self.generations[group] = self.generations.get(group, 0) + 1
+        stale = [key for key, entry in self.cache.items() if entry[1] in groups]
+        for key in stale:
+            del self.cache[key]
+        self.stats["invalidations"] += 1
+        return len(stale)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"] + stats["shared"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["cached"] = len(self.cache)
+        stats["clients"] = self.clients
+        stats["pool"] = get_pool_stats()
+        return stats
+
+    # ------------------- Requests -------------------
+    async def respond(self, line):
+        """Handle one request line
+
+        Returns:
+            The reply line
+        """
+        request_id = None
+        try:
+            request = decode_message(line)
+            request_id = request.get("id")
+            method = request.get("method")
+            args = request.get("args") or []
+
+            if method == "ping":
+                result = b'"pong"'
+            elif method == "stats":
+                result = encode_result(self.get_stats())
+            elif method == "invalidate":
+                result = encode_result(self.invalidate(args[0] if args else None))
+            elif method in METHODS:
+                result = await self.call(method, args, request.get("kwargs") or {}, bool(request.get("fresh")))
+            else:
+                raise ValueError(f"Unknown method: {method}")
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Error handling data request: {e}")
+            traceback.print_exc()
+            return (json.dumps({"id": request_id, "error": str(e) or type(e).__name__},
+                               separators=(",", ":")) + "\n").encode("utf-8")
+
+        # The cached result is spliced in as-is
+        return b'{"id":' + json.dumps(request_id).encode("utf-8") + b',"result":' + result + b'}\n'
+
+    async def handle_client(self, reader, writer):
+        """One window connection: a request per line, answered in order"""
+        self.clients += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(await self.respond(line))
+                await writer.drain()
+                self.last_active = time.monotonic()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass  # Window went away or sent garbage
+        finally:
+            self.clients -= 1
+            self.last_active = time.monotonic()
+            writer.close()
+
+    def idle_for(self):
+        return 0.0 if self.clients else time.monotonic() - self.last_active
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+# ------------------- Server -------------------
+def service_running():
+    try:
+        open_connection(1).close()
+        return True
+    except OSError:
+        return False
+
+async def serve():
+    if service_running():
+        print("Data service not started: another one is already running")
+        return
+
+    service = DataService(
+        workers=DATA_SERVICE.get("workers") or DB_CONFIG.get("pool_size", 5),
+        cache_entries=DATA_SERVICE.get("cache_entries", 2048),
+        ttl=DATA_SERVICE.get("ttl_s"),
+    )
+    if uses_unix_socket():
+        path = socket_path()
+        if os.path.exists(path):
+            os.unlink(path)  # Left behind by a service that did not exit cleanly
+        server = await asyncio.start_unix_server(service.handle_client, path=path)
+        os.chmod(path, 0o600)  # The service has no authentication; owner only
+        print(f"Data service listening on {path}")
+    else:
+        path = None
+        try:
+            server = await asyncio.start_server(service.handle_client, *service_address())
+        except OSError as e:
+            print(f"Data service not started: {e}")
+            return
+        print(f"Data service listening on {server.sockets[0].getsockname()}")
+
+    idle_exit_s = DATA_SERVICE.get("idle_exit_s")
+    try:
+        async with server:
+            while True:
+                await asyncio.sleep(1)
+                if idle_exit_s and service.idle_for() > idle_exit_s:
+                    print(f"Idle for {idle_exit_s}s, exiting")
+                    break
+    finally:
+        service.close()
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+def main():
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,505 @@
+"""
+Versioned schema migrations for the Online Music System.
+
+Each migration is a function registered with a version number. Applied
+versions are recorded in the Schema_Version table, so running the
+migrations again only executes the ones a database has not seen yet.
+
+At startup is_schema_current() does a single version lookup; only when it
+fails does the application run DDL and seeding.
+"""
+
+from datetime import date
+from db_pool import get_connection
+from song_stats import rebuild_song_stats
+from counters import create_counter_triggers, recount_counters
+from activity_log import create_activity_triggers, backfill_activity_log
+from history_rollup import history_partition_clause, list_history_partitions, month_start, add_months
+from config import HISTORY_RETENTION
+
+MIGRATIONS = []  # (version, description, function), kept sorted by version
+
+def migration(version, description):
+    """Decorator that registers a migration function"""
+    def register(function):
+        MIGRATIONS.append((version, description, function))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return function
+    return register
+
+# ------------------- Helpers -------------------
+def index_exists(cursor, table, index_name):
+    """Check whether an index exists on a table in the current database"""
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        LIMIT 1
+        """,
+        (table, index_name)
+    )
+    return cursor.fetchone() is not None
+
+def create_index(cursor, table, index_name, columns):
+    """Create an index unless it already exists (MySQL has no IF NOT EXISTS for indexes)"""
+    if index_exists(cursor, table, index_name):
+        return False
+    print(f"Creating index {index_name} on {table}...")
+    cursor.execute(f"CREATE INDEX {index_name} ON {table} ({columns})")
+    return True
+
+def create_rollup_tables(cursor):
+    """Listening_Daily and Rollup_Watermarks (see history_rollup.py)"""
+    print("Creating Listening_Daily and Rollup_Watermarks tables...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Rollup_Watermarks (
+        name VARCHAR(64) PRIMARY KEY,
+        watermark DATETIME NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+    """)
+    # No foreign keys, like the partitioned table it is rolled up from;
+    # user and song deletes remove these rows explicitly
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Listening_Daily (
+        play_date DATE NOT NULL,
+        user_id INT NOT NULL,
+        song_id INT NOT NULL,
+        plays INT NOT NULL,
+        last_played_at DATETIME NOT NULL,
+        PRIMARY KEY (user_id, play_date, song_id),
+        INDEX idx_daily_date_song (play_date, song_id),
+        INDEX idx_daily_song (song_id, play_date)
+    )
+    """)
+
+# ------------------- Baseline -------------------
+def create_baseline_schema(connection, cursor):
+    """Tables the versioned migrations build on
+
+    Runs before every migration pass and only uses CREATE TABLE IF NOT
+    EXISTS, so fresh, pre-migration and migrated databases all adopt it.
+    Not a numbered migration: version 1 was already shipped as the
+    hot-query indexes, which need these tables on a fresh database.
+    """
+    # Create Users table
+    print("Creating Users table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Users (
+        user_id INT AUTO_INCREMENT PRIMARY KEY,
+        first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL,
+        email VARCHAR(100) NOT NULL UNIQUE,
+        password VARCHAR(64) NOT NULL,
+        is_admin BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    
+    # Create Artists table
+    print("Creating Artists table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Artists (
+        artist_id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        bio TEXT,
+        image_url VARCHAR(255)
+    )
+    """)
+    
+    # Create Albums table
+    print("Creating Albums table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Albums (
+        album_id INT AUTO_INCREMENT PRIMARY KEY,
+        title VARCHAR(100) NOT NULL,
+        artist_id INT,
+        release_year INT,
+        cover_art MEDIUMBLOB,
+        FOREIGN KEY (artist_id) REFERENCES Artists(artist_id) ON DELETE SET NULL
+    )
+    """)
+    
+    # Create Genres table
+    print("Creating Genres table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Genres (
+        genre_id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(50) NOT NULL UNIQUE
+    )
+    """)
+    
+    # Create Songs table
+    print("Creating Songs table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Songs (
+        song_id INT AUTO_INCREMENT PRIMARY KEY,
+        title VARCHAR(100) NOT NULL,
+        artist_id INT,
+        album_id INT,
+        genre_id INT,
+        duration INT,
+        file_type VARCHAR(10) NOT NULL,
+        file_size INT NOT NULL,
+        upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (artist_id) REFERENCES Artists(artist_id) ON DELETE SET NULL,
+        FOREIGN KEY (album_id) REFERENCES Albums(album_id) ON DELETE SET NULL,
+        FOREIGN KEY (genre_id) REFERENCES Genres(genre_id) ON DELETE SET NULL
+    )
+    """)
+    
+    # Create Song_Files table - the 1:1 audio payload for each song, kept
+    # out of Songs so catalog scans never touch blob pages
+    print("Creating Song_Files table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Song_Files (
+        song_id INT PRIMARY KEY,
+        file_data LONGBLOB NULL,
+        content_hash CHAR(64),
+        storage_locator VARCHAR(255),
+        FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
+    )
+    """)
+    
+    # Create Playlists table
+    print("Creating Playlists table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Playlists (
+        playlist_id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        name VARCHAR(100) NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+    )
+    """)
+    
+    # Create Playlist_Songs junction table
+    print("Creating Playlist_Songs table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Playlist_Songs (
+        playlist_id INT NOT NULL,
+        song_id INT NOT NULL,
+        position INT NOT NULL,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (playlist_id, song_id),
+        FOREIGN KEY (playlist_id) REFERENCES Playlists(playlist_id) ON DELETE CASCADE,
+        FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
+    )
+    """)
+    
+    # Create User_Favorites table
+    print("Creating User_Favorites table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS User_Favorites (
+        user_id INT NOT NULL,
+        song_id INT NOT NULL,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (user_id, song_id),
+        FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
+        FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
+    )
+    """)
+    
+    # Create Listening_History table
+    print("Creating Listening_History table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Listening_History (
+        history_id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        song_id INT NOT NULL,
+        played_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
+        FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
+    )
+    """)
+
+    # Song_Stats rebuilds (migration 3 and later) read the daily rollups
+    create_rollup_tables(cursor)
+
+def split_song_files(connection, cursor, batch_size=200):
+    """Move payload columns from an old wide Songs table into Song_Files
+
+    Rows are copied in song_id batches and committed as they go, so an
+    interrupted upgrade resumes where it stopped. The payload columns are
+    dropped from Songs once every row has been copied.
+    """
+    cursor.execute("""
+    SELECT COLUMN_NAME FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Songs'
+    """)
+    columns = {row[0] for row in cursor.fetchall()}
+    payload_columns = [c for c in ("file_data", "content_hash", "storage_locator") if c in columns]
+
+    if not payload_columns:
+        return  # Already split
+
+    print("Moving song payloads into Song_Files...")
+    select_list = ", ".join(c if c in columns else f"NULL AS {c}"
+                            for c in ("file_data", "content_hash", "storage_locator"))
+
+    cursor.execute("SELECT COALESCE(MAX(song_id), 0) FROM Song_Files")
+    last_song_id = cursor.fetchone()[0]
+    copied = 0
+
+    while True:
+        cursor.execute(
+            "SELECT song_id FROM Songs WHERE song_id > %s ORDER BY song_id LIMIT %s",
+            (last_song_id, batch_size)
+        )
+        song_ids = [row[0] for row in cursor.fetchall()]
+        if not song_ids:
+            break
+        
+        cursor.execute(
+            f"""
+            INSERT IGNORE INTO Song_Files (song_id, file_data, content_hash, storage_locator)
+            SELECT song_id, {select_list} FROM Songs
+            WHERE song_id BETWEEN %s AND %s
+            """,
+            (song_ids[0], song_ids[-1])
+        )
+        connection.commit()
+        copied += len(song_ids)
+        last_song_id = song_ids[-1]
+
+    print(f"Copied {copied} song payloads. Dropping payload columns from Songs...")
+    cursor.execute("ALTER TABLE Songs " + ", ".join(f"DROP COLUMN {c}" for c in payload_columns))
+    connection.commit()
+
+# ------------------- Migrations -------------------
+@migration(1, "Covering indexes for the hot history, catalog and artist queries")
+def add_hot_query_indexes(connection, cursor):
+    # Per-user history, newest first (recommendations, recently played).
+    # InnoDB appends the primary key, so song_id + history_id make it covering.
+    create_index(cursor, "Listening_History", "idx_history_user_played",
+                 "user_id, played_at DESC, song_id")
+    # Play counts grouped by song, optionally limited to a time window
+    create_index(cursor, "Listening_History", "idx_history_song_played",
+                 "song_id, played_at")
+    # Newest-first catalog pages; covers song_id/title/artist_id for the join
+    create_index(cursor, "Songs", "idx_songs_upload_date",
+                 "upload_date, artist_id, title")
+    # Artist pickers sorted by name
+    create_index(cursor, "Artists", "idx_artists_name", "name")
+
+@migration(2, "Move song payloads into Song_Files")
+def move_song_payloads(connection, cursor):
+    split_song_files(connection, cursor)
+
+@migration(3, "Song_Stats materialized play counters")
+def add_song_stats(connection, cursor):
+    print("Creating Song_Stats table...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Song_Stats (
+        song_id INT PRIMARY KEY,
+        play_count BIGINT NOT NULL DEFAULT 0,
+        last_played_at TIMESTAMP NULL,
+        plays_7d INT NOT NULL DEFAULT 0,
+        INDEX idx_song_stats_play_count (play_count, song_id),
+        INDEX idx_song_stats_plays_7d (plays_7d, song_id),
+        FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
+    )
+    """)
+    # Lets the 7-day refresh read only the recent window of history
+    create_index(cursor, "Listening_History", "idx_history_played", "played_at, song_id")
+    rebuild_song_stats(connection)
+
+@migration(4, "Listening_History event ids for idempotent ingestion")
+def add_history_event_ids(connection, cursor):
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Listening_History'
+          AND COLUMN_NAME = 'event_id'
+        """
+    )
+    if cursor.fetchone() is None:
+        print("Adding event_id to Listening_History...")
+        # NULL for rows written before the spool; UNIQUE ignores NULLs
+        cursor.execute("ALTER TABLE Listening_History ADD COLUMN event_id BINARY(16) NULL")
+    if not index_exists(cursor, "Listening_History", "uq_history_event"):
+        cursor.execute("CREATE UNIQUE INDEX uq_history_event ON Listening_History (event_id)")
+
+@migration(5, "Monthly Listening_History partitions and daily rollups")
+def partition_listening_history(connection, cursor):
+    create_rollup_tables(cursor)
+
+    if list_history_partitions(cursor):
+        return
+
+    # Partitioned InnoDB tables cannot have foreign keys, and every unique
+    # key must include the partitioning column
+    cursor.execute(
+        """
+        SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'Listening_History'
+        """
+    )
+    for (constraint_name,) in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE Listening_History DROP FOREIGN KEY {constraint_name}")
+
+    print("Partitioning Listening_History by month...")
+    cursor.execute("UPDATE Listening_History SET played_at = CURRENT_TIMESTAMP WHERE played_at IS NULL")
+    cursor.execute("""
+    ALTER TABLE Listening_History
+        MODIFY played_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        DROP PRIMARY KEY,
+        ADD PRIMARY KEY (history_id, played_at),
+        DROP INDEX uq_history_event,
+        ADD UNIQUE INDEX uq_history_event (event_id, played_at)
+    """)
+
+    cursor.execute("SELECT MIN(played_at) FROM Listening_History")
+    first = cursor.fetchone()[0]
+    this_month = month_start(date.today())
+    first_month = min(month_start(first), this_month) if first else this_month
+    last_month = add_months(this_month, HISTORY_RETENTION.get("partitions_ahead", 3))
+    cursor.execute("ALTER TABLE Listening_History " + history_partition_clause(first_month, last_month))
+
+@migration(6, "Report aggregate tables")
+def add_report_tables(connection, cursor):
+    print("Creating report aggregate tables...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Report_Plays_Daily (
+        play_date DATE NOT NULL,
+        genre_id INT NOT NULL,
+        artist_id INT NOT NULL,
+        plays BIGINT NOT NULL,
+        PRIMARY KEY (play_date, genre_id, artist_id)
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Report_Plays_Monthly (
+        month DATE NOT NULL,
+        genre_id INT NOT NULL,
+        artist_id INT NOT NULL,
+        plays BIGINT NOT NULL,
+        PRIMARY KEY (month, genre_id, artist_id)
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Report_Active_Users_Daily (
+        play_date DATE PRIMARY KEY,
+        active_users INT NOT NULL,
+        plays BIGINT NOT NULL
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Report_Uploads_Daily (
+        upload_date DATE PRIMARY KEY,
+        uploads INT NOT NULL,
+        bytes_uploaded BIGINT NOT NULL
+    )
+    """)
+
+@migration(7, "System_Counters dashboard counters")
+def add_system_counters(connection, cursor):
+    print("Creating System_Counters table and triggers...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS System_Counters (
+        name VARCHAR(32) PRIMARY KEY,
+        value BIGINT NOT NULL DEFAULT 0,
+        recounted_at TIMESTAMP NULL
+    )
+    """)
+    create_counter_triggers(cursor)
+    connection.commit()
+    recount_counters(connection)
+
+@migration(8, "Activity_Log feed for the admin dashboard")
+def add_activity_log(connection, cursor, recent_plays=1000):
+    print("Creating Activity_Log table and triggers...")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Activity_Log (
+        activity_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        activity_type VARCHAR(32) NOT NULL,
+        item VARCHAR(255) NOT NULL,
+        user_id INT NULL,
+        ref_id INT NULL,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_activity_created (created_at, activity_id)
+    )
+    """)
+
+    print("Backfilling Activity_Log...")
+    backfill_activity_log(cursor, recent_plays)
+    create_activity_triggers(cursor)
+
+@migration(9, "Keyset indexes for the admin song and user lists")
+def add_admin_list_indexes(connection, cursor):
+    # Newest-first pages on a unique key (see pagination.py)
+    create_index(cursor, "Songs", "idx_songs_upload_keyset", "upload_date, song_id")
+    create_index(cursor, "Users", "idx_users_created_keyset", "created_at, user_id")
+
+# ------------------- Runner -------------------
+def ensure_version_table(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Schema_Version (
+        version INT PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+def get_schema_version(cursor):
+    """Highest applied migration version (0 for a fresh database)"""
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM Schema_Version")
+    return cursor.fetchone()[0]
+
+def latest_version():
+    """Version the code expects the database to be at"""
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+def is_schema_current():
+    """Fast-path startup check: one query against Schema_Version
+
+    Returns:
+        False if the database, the version table or any migration is missing
+    """
+    import mysql.connector
+    try:
+        connection = get_connection()
+    except mysql.connector.Error:
+        return False  # Database not created yet
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT MAX(version) FROM Schema_Version")
+        version = cursor.fetchone()[0] or 0
+        cursor.close()
+        return version >= latest_version()
+    except mysql.connector.Error:
+        return False
+    finally:
+        connection.close()
+
+def apply_migrations(connection):
+    """Apply every pending migration in version order
+
+    Returns:
+        Number of migrations applied
+    """
+    cursor = connection.cursor()
+    try:
+        ensure_version_table(cursor)
+        current = get_schema_version(cursor)
+        applied = 0
+        if current < latest_version():
+            create_baseline_schema(connection, cursor)
+
+        for version, description, function in MIGRATIONS:
+            if version <= current:
+                continue
+            print(f"Applying migration {version}: {description}...")
+            function(connection, cursor)
+            cursor.execute(
+                "INSERT INTO Schema_Version (version, description) VALUES (%s, %s)",
+                (version, description)
+            )
+            connection.commit()
+            applied += 1
+
+        return applied
+    finally:
+        cursor.close()
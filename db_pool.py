@@ -0,0 +1,283 @@
+"""
+Process-wide MySQL connection pool for the Online Music System.
+
+connect_db() hands out connections from this pool. Calling close() on a
+pooled connection returns it to the pool instead of tearing down the TCP
+session, so existing call sites keep working unchanged.
+
+mysql.connector is imported when the first connection is opened, so
+importing this module (and every page that imports it) stays cheap.
+"""
+
+import os
+import time
+import weakref
+import threading
+from config import DB_CONFIG
+
+# Keys in DB_CONFIG that are passed through to mysql.connector.connect
+CONNECT_KEYS = ("host", "port", "user", "password", "database", "allow_local_infile")
+
+class PooledConnection:
+    """Wrapper around a pooled connection; close() returns it to the pool
+
+    A wrapper garbage-collected without close() (a call site that returned
+    early or raised) discards its connection, so the slot is not lost.
+    """
+
+    def __init__(self, pool, raw_connection):
+        self._pool = pool
+        self._raw = raw_connection
+        self._finalizer = weakref.finalize(self, pool.reclaim, raw_connection)
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            from mysql.connector import errors
+            raise errors.OperationalError("Connection has already been returned to the pool")
+        return getattr(raw, name)
+
+    def is_connected(self):
+        """Cheap check - the pool validates connections at checkout, so no ping here"""
+        return self._raw is not None
+
+    def close(self):
+        """Return the connection to the pool"""
+        if self._raw is None:
+            return
+        raw, self._raw = self._raw, None
+        self._finalizer.detach()
+        self._pool.release(raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+class ConnectionPool:
+    """Thread-safe, fixed-size pool of MySQL connections"""
+
+    def __init__(self, db_config, pool_size=5, timeout=10.0, recycle=3600,
+                 pre_ping=True, ping_after=5.0):
+        """Create an empty pool; connections are opened lazily
+
+        Args:
+            db_config: Dict with host/user/password/database
+            pool_size: Maximum number of open connections
+            timeout: Seconds to wait for a free connection before giving up
+            recycle: Reopen connections older than this many seconds (0 = never)
+            pre_ping: Check idle connections are alive before handing them out
+            ping_after: Only ping connections that sat idle longer than this
+        """
+        self.connect_args = {key: db_config[key] for key in CONNECT_KEYS if key in db_config}
+        self.pool_size = max(1, int(pool_size))
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.ping_after = ping_after
+
+        self._cond = threading.Condition()
+        self._idle = []        # (raw_connection, returned_at) - used as a LIFO stack
+        self._created_at = {}  # id(raw_connection) -> time opened
+        self._open_count = 0
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "timeouts": 0,
+            "created": 0,
+            "reconnects": 0,
+            "discarded": 0,
+            "leaked": 0,
+        }
+
+    # ------------------- Checkout / Checkin -------------------
+    def get_connection(self):
+        """Check a connection out of the pool, waiting up to timeout seconds"""
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        waited = False
+        raw = None
+        returned_at = None
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, returned_at = self._idle.pop()
+                    break
+                if self._open_count < self.pool_size:
+                    # Reserve a slot; the connection is opened outside the lock
+                    self._open_count += 1
+                    break
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    from mysql.connector import errors
+                    raise errors.PoolError(
+                        f"No free connection in pool after {self.timeout}s "
+                        f"(pool_size={self.pool_size})"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+        if raw is None:
+            try:
+                raw = self._open()
+            except Exception:
+                with self._cond:
+                    self._open_count -= 1
+                    self._cond.notify()
+                raise
+        else:
+            raw = self._validate(raw, returned_at)  # Frees the slot itself on failure
+
+        wait_time = time.perf_counter() - start
+        with self._cond:
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["waits"] += 1
+            self._stats["wait_time_total"] += wait_time
+            self._stats["wait_time_max"] = max(self._stats["wait_time_max"], wait_time)
+
+        return PooledConnection(self, raw)
+
+    def release(self, raw):
+        """Return a raw connection to the pool"""
+        try:
+            # End any open transaction so the next user doesn't inherit
+            # uncommitted work or a stale REPEATABLE READ snapshot
+            if raw.in_transaction:
+                raw.rollback()
+        except Exception:
+            self._discard(raw)
+            return
+
+        with self._cond:
+            self._idle.append((raw, time.monotonic()))
+            self._cond.notify()
+
+    def reclaim(self, raw):
+        """Discard a connection whose wrapper was garbage-collected without close()
+
+        Its transaction state is unknown, so it is closed rather than reused.
+        """
+        with self._cond:
+            self._stats["leaked"] += 1
+        self._discard(raw)
+
+    # ------------------- Connection Lifecycle -------------------
+    def _open(self):
+        """Open a new physical connection"""
+        import mysql.connector
+        raw = mysql.connector.connect(**self.connect_args)
+        with self._cond:
+            self._created_at[id(raw)] = time.monotonic()
+            self._stats["created"] += 1
+        return raw
+
+    def _validate(self, raw, returned_at):
+        """Recycle old connections and reconnect stale ones
+
+        Raises:
+            The reconnect's error, after discarding raw and freeing its slot
+        """
+        now = time.monotonic()
+        created_at = self._created_at.get(id(raw), now)
+
+        try:
+            if self.recycle and now - created_at > self.recycle:
+                self._close_quietly(raw)
+                with self._cond:
+                    self._created_at.pop(id(raw), None)
+                replacement = self._open()
+                with self._cond:
+                    self._stats["reconnects"] += 1
+                return replacement
+
+            if self.pre_ping and now - returned_at > self.ping_after:
+                if not raw.is_connected():
+                    raw.reconnect(attempts=1, delay=0)
+                    with self._cond:
+                        self._created_at[id(raw)] = time.monotonic()
+                        self._stats["reconnects"] += 1
+        except Exception:
+            self._discard(raw)
+            raise
+
+        return raw
+
+    def _discard(self, raw):
+        """Drop a broken connection and free its slot"""
+        self._close_quietly(raw)
+        with self._cond:
+            self._created_at.pop(id(raw), None)
+            self._open_count -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+
+    def _close_quietly(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        """Close every idle connection (checked-out ones close on return)"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            for raw, _ in idle:
+                self._created_at.pop(id(raw), None)
+            self._open_count -= len(idle)
+            self._cond.notify_all()
+        for raw, _ in idle:
+            self._close_quietly(raw)
+
+    # ------------------- Metrics -------------------
+    def get_stats(self):
+        """Return a snapshot of pool checkout/wait metrics"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["pool_size"] = self.pool_size
+            stats["open"] = self._open_count
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._open_count - len(self._idle)
+        checkouts = stats["checkouts"]
+        stats["wait_time_avg"] = stats["wait_time_total"] / checkouts if checkouts else 0.0
+        return stats
+
+# ------------------- Process-wide Pool -------------------
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Get the process-wide pool, creating it on first use
+
+    A forked child gets its own pool - sockets must not be shared across processes.
+    """
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool(
+                DB_CONFIG,
+                pool_size=DB_CONFIG.get("pool_size", 5),
+                timeout=DB_CONFIG.get("pool_timeout", 10),
+                recycle=DB_CONFIG.get("pool_recycle", 3600),
+                pre_ping=DB_CONFIG.get("pool_pre_ping", True),
+                ping_after=DB_CONFIG.get("pool_ping_after", 5),
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+def get_connection():
+    """Check a connection out of the process-wide pool"""
+    return get_pool().get_connection()
+
+def get_pool_stats():
+    """Metrics for the process-wide pool"""
+    return get_pool().get_stats()
@@ -0,0 +1,291 @@
+"""
+Partitioning, rollup and retention for Listening_History.
+
+Listening_History is RANGE partitioned by month on played_at (p202601
+holds January 2026, p_future catches anything past the last month).
+Listening_Daily keeps one row per (day, user, song) with the day's play
+count, and is what survives once raw partitions age out:
+
+    ensure_history_partitions()  create upcoming (or backfilled) months
+    rollup_listening_history()   roll complete days into Listening_Daily
+    drop_expired_history()       drop raw months past the retention age,
+                                 but only once they have been rolled up
+
+The rollup watermark (Rollup_Watermarks) is the first day not yet rolled
+up. Per-user play queries read Listening_Daily before the watermark and raw
+history from it onwards (see user_song_plays), so results are the same
+before and after a partition is dropped. Each run re-rolls the last
+HISTORY_RETENTION["rollup_lookback_days"] days to pick up plays that were
+ingested late from the spool.
+"""
+
+import time
+import threading
+from datetime import date, datetime, timedelta
+from config import HISTORY_RETENTION
+from db_pool import get_connection
+
+ROLLUP_WATERMARK = "listening_daily"       # First day not yet in Listening_Daily
+RAW_FLOOR_WATERMARK = "listening_raw"      # First day still held in raw partitions
+EPOCH_DATE = date(1970, 1, 1)              # Boundary before anything is rolled up
+
+# One user's plays per song: rolled-up days before the boundary, raw rows after it
+USER_PLAYS_SQL = """
+    SELECT song_id, SUM(plays) AS plays, MAX(last_played_at) AS last_played_at
+    FROM (
+        SELECT song_id, plays, last_played_at
+        FROM Listening_Daily
+        WHERE user_id = %s AND play_date < %s
+        UNION ALL
+        SELECT song_id, 1, played_at
+        FROM Listening_History
+        WHERE user_id = %s AND played_at >= %s
+    ) combined
+    GROUP BY song_id
+"""
+
+# ------------------- Watermarks -------------------
+def get_watermark(cursor, name):
+    """Stored watermark (a datetime) or None if the job never ran"""
+    cursor.execute("SELECT watermark FROM Rollup_Watermarks WHERE name = %s", (name,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return row["watermark"] if isinstance(row, dict) else row[0]
+
+def set_watermark(cursor, name, value):
+    """Store a watermark in the caller's transaction"""
+    cursor.execute(
+        """
+        INSERT INTO Rollup_Watermarks (name, watermark) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE watermark = VALUES(watermark), updated_at = CURRENT_TIMESTAMP
+        """,
+        (name, value)
+    )
+
+_boundary_cache = {"value": None, "loaded_at": 0.0}
+_boundary_lock = threading.Lock()
+
+def get_rollup_boundary(cursor=None):
+    """First day whose plays are still read from raw history
+
+    Without a cursor the value comes from the shared pool and is cached for
+    HISTORY_RETENTION["boundary_cache_s"] seconds; a stale value is safe
+    because the rollup only ever moves the boundary forward over days that
+    are still held raw.
+    """
+    if cursor is not None:
+        value = get_watermark(cursor, ROLLUP_WATERMARK)
+        return value.date() if value else EPOCH_DATE
+
+    with _boundary_lock:
+        now = time.monotonic()
+        if (_boundary_cache["value"] is None or
+                now - _boundary_cache["loaded_at"] > HISTORY_RETENTION.get("boundary_cache_s", 60)):
+            connection = get_connection()
+            try:
+                cursor = connection.cursor()
+                _boundary_cache["value"] = get_rollup_boundary(cursor)
+                cursor.close()
+            finally:
+                connection.close()
+            _boundary_cache["loaded_at"] = now
+        return _boundary_cache["value"]
+
+def user_song_plays(user_id):
+    """Derived table of one user's plays per song
+
+    Returns:
+        (sql, params) for "FROM (<sql>) alias" with columns song_id, plays
+        and last_played_at
+    """
+    boundary = get_rollup_boundary()
+    return USER_PLAYS_SQL, (user_id, boundary, user_id, boundary)
+
+# ------------------- Partitions -------------------
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_definition(month):
+    """PARTITION clause holding one calendar month"""
+    return f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{add_months(month, 1):%Y-%m-%d}')"
+
+def history_partition_clause(first_month, last_month):
+    """PARTITION BY clause for the given months plus the catch-all"""
+    parts = []
+    month = first_month
+    while month <= last_month:
+        parts.append(partition_definition(month))
+        month = add_months(month, 1)
+    parts.append("PARTITION p_future VALUES LESS THAN (MAXVALUE)")
+    return "PARTITION BY RANGE COLUMNS(played_at) (\n    " + ",\n    ".join(parts) + "\n)"
+
+def list_history_partitions(cursor):
+    """Partitions of Listening_History in order
+
+    Returns:
+        List of (name, upper bound date or None for MAXVALUE); empty if the
+        table is not partitioned
+    """
+    cursor.execute(
+        """
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Listening_History'
+          AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+        """
+    )
+    partitions = []
+    for name, description in cursor.fetchall():
+        description = description.strip("'")
+        bound = None if description == "MAXVALUE" else datetime.strptime(description[:10], "%Y-%m-%d").date()
+        partitions.append((name, bound))
+    return partitions
+
+def ensure_history_partitions(connection, since=None, months_ahead=None):
+    """Create monthly partitions up to months_ahead and back to since
+
+    Upcoming months are split off p_future; months before the oldest
+    partition (e.g. backfilled history) are split off the oldest one.
+
+    Returns:
+        Number of partitions created
+    """
+    if months_ahead is None:
+        months_ahead = HISTORY_RETENTION.get("partitions_ahead", 3)
+    cursor = connection.cursor()
+    try:
+        monthly = [(name, bound) for name, bound in list_history_partitions(cursor) if bound]
+        this_month = month_start(date.today())
+        created = 0
+
+        # Upcoming months
+        month = monthly[-1][1] if monthly else this_month
+        upcoming = []
+        while month <= add_months(this_month, months_ahead):
+            upcoming.append(partition_definition(month))
+            month = add_months(month, 1)
+        if upcoming:
+            print(f"Adding {len(upcoming)} Listening_History partitions...")
+            cursor.execute(
+                "ALTER TABLE Listening_History REORGANIZE PARTITION p_future INTO ("
+                + ", ".join(upcoming) + ", PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+            )
+            created += len(upcoming)
+
+        # Backfilled months below the oldest partition
+        if since and monthly:
+            oldest_name, oldest_bound = monthly[0]
+            month = month_start(since)
+            oldest_month = add_months(oldest_bound, -1)
+            earlier = []
+            while month < oldest_month:
+                earlier.append(partition_definition(month))
+                month = add_months(month, 1)
+            if earlier:
+                print(f"Splitting {len(earlier)} older months out of {oldest_name}...")
+                cursor.execute(
+                    f"ALTER TABLE Listening_History REORGANIZE PARTITION {oldest_name} INTO ("
+                    + ", ".join(earlier)
+                    + f", PARTITION {oldest_name} VALUES LESS THAN ('{oldest_bound:%Y-%m-%d}'))"
+                )
+                created += len(earlier)
+        return created
+    finally:
+        cursor.close()
+
+# ------------------- Rollup -------------------
+def rollup_listening_history(connection, lookback_days=None):
+    """Roll complete days of raw history into Listening_Daily
+
+    Each day is recomputed from raw history in its own transaction (delete
+    and re-insert), so re-running a day is idempotent. Days whose raw
+    partitions have already been dropped are never recomputed.
+
+    Returns:
+        Number of days rolled up
+    """
+    if lookback_days is None:
+        lookback_days = HISTORY_RETENTION.get("rollup_lookback_days", 2)
+    cursor = connection.cursor()
+    start_time = time.perf_counter()
+    try:
+        today = date.today()
+        boundary = get_watermark(cursor, ROLLUP_WATERMARK)
+        if boundary is None:
+            # Nothing rolled up yet: the boundary starts at the first day of
+            # history and only moves past a day once that day has committed
+            cursor.execute("SELECT MIN(played_at) FROM Listening_History")
+            first = cursor.fetchone()[0]
+            day = min(first.date(), today) if first else today
+            boundary = day
+        else:
+            boundary = boundary.date()
+            day = boundary - timedelta(days=lookback_days)
+        raw_floor = get_watermark(cursor, RAW_FLOOR_WATERMARK)
+        if raw_floor:
+            day = max(day, raw_floor.date())
+
+        days = 0
+        while day < today:
+            next_day = day + timedelta(days=1)
+            cursor.execute("DELETE FROM Listening_Daily WHERE play_date = %s", (day,))
+            cursor.execute(
+                """
+                INSERT INTO Listening_Daily (play_date, user_id, song_id, plays, last_played_at)
+                SELECT %s, user_id, song_id, COUNT(*), MAX(played_at)
+                FROM Listening_History
+                WHERE played_at >= %s AND played_at < %s
+                GROUP BY user_id, song_id
+                """,
+                (day, day, next_day)
+            )
+            # Same transaction as the day's rows; re-rolled lookback days
+            # never move it back
+            boundary = max(boundary, next_day)
+            set_watermark(cursor, ROLLUP_WATERMARK, boundary)
+            connection.commit()
+            days += 1
+            day = next_day
+
+        if days == 0:
+            set_watermark(cursor, ROLLUP_WATERMARK, boundary)
+            connection.commit()
+    finally:
+        cursor.close()
+
+    print(f"Rolled up {days} days of listening history in {time.perf_counter() - start_time:.1f}s "
+          f"(raw history from {boundary})")
+    return days
+
+# ------------------- Retention -------------------
+def drop_expired_history(connection, raw_months=None):
+    """Drop raw partitions older than raw_months that are fully rolled up
+
+    Returns:
+        Names of the dropped partitions
+    """
+    if raw_months is None:
+        raw_months = HISTORY_RETENTION.get("raw_months", 13)
+    cursor = connection.cursor()
+    try:
+        boundary = get_rollup_boundary(cursor)
+        cutoff = add_months(month_start(date.today()), -raw_months)
+        expired = [(name, bound) for name, bound in list_history_partitions(cursor)
+                   if bound and bound <= cutoff and bound <= boundary]
+        if not expired:
+            return []
+
+        names = [name for name, _ in expired]
+        print(f"Dropping expired Listening_History partitions: {', '.join(names)}")
+        cursor.execute(f"ALTER TABLE Listening_History DROP PARTITION {', '.join(names)}")
+        set_watermark(cursor, RAW_FLOOR_WATERMARK, expired[-1][1])
+        connection.commit()
+        return names
+    finally:
+        cursor.close()
@@ -8,7 +8,7 @@ import customtkinter as ctk
 from tkinter import messagebox
 import traceback
 
-from config import UI_THEME, UI_COLOR_THEME, COLORS, USER_SESSION_FILE, ADMIN_SESSION_FILE
+from config import UI_THEME, UI_COLOR_THEME, COLORS, USER_SESSION_FILE, ADMIN_SESSION_FILE, session_path
 from utils import (
     connect_db, hash_password, validate_email, validate_password, 
     create_centered_window
@@ -345,18 +345,18 @@ class LoginSignupApp:
                 messagebox.showinfo("Success", f"Welcome {first_name} {last_name}!")
                 
                 # Save user ID to a file for session persistence
-                with open(USER_SESSION_FILE, "w") as f:
+                with open(session_path(USER_SESSION_FILE), "w") as f:
                     f.write(str(user_id))
                 
                 # If admin, also create admin session file
                 if is_admin:
-                    with open(ADMIN_SESSION_FILE, "w") as f:
+                    with open(session_path(ADMIN_SESSION_FILE), "w") as f:
                         f.write(str(user_id))
-                    # Open admin page
-                    subprocess.Popen(["python", "admin/admin_view.py"])
+                    # Open the admin pages in the app shell
+                    subprocess.Popen(["python", "app_shell.py", "admin"])
                 else:
-                    # Open user home page
-                    subprocess.Popen(["python", "user/user_view.py"])
+                    # Open the user pages in the app shell
+                    subprocess.Popen(["python", "app_shell.py", "user"])
                 
                 # Close the login window
                 self.root.destroy()
@@ -4,19 +4,23 @@ Handles initial setup, database creation, and launches the application.
 """
 
 import os
-import time
+import sys
 import random
-import mysql.connector
-import customtkinter as ctk
 from tkinter import messagebox
 import subprocess
 
-from config import UI_THEME, UI_COLOR_THEME, COLORS, TEMP_DIR
+from config import UI_THEME, UI_COLOR_THEME, COLORS, USER_SESSION_FILE, ADMIN_SESSION_FILE, session_path
 from utils import connect_db, connect_db_server, hash_password, create_temp_directory
+from blob_store import store_bytes, add_blob_ref
+from db_migrations import apply_migrations, is_schema_current
+from bulk_loader import bulk_insert
+from song_stats import rebuild_song_stats
+from counters import recount_counters
 
 # ------------------- Database Setup Functions -------------------
 def create_database():
     """Create the database and tables"""
+    import mysql.connector
     try:
         # First connect to server
         connection = connect_db_server()
@@ -30,127 +34,10 @@ def create_database():
         cursor.execute("CREATE DATABASE IF NOT EXISTS online_music_system")
         cursor.execute("USE online_music_system")
         
-        # Create Users table
-        print("Creating Users table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Users (
-            user_id INT AUTO_INCREMENT PRIMARY KEY,
-            first_name VARCHAR(50) NOT NULL,
-            last_name VARCHAR(50) NOT NULL,
-            email VARCHAR(100) NOT NULL UNIQUE,
-            password VARCHAR(64) NOT NULL,
-            is_admin BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        
-        # Create Artists table
-        print("Creating Artists table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Artists (
-            artist_id INT AUTO_INCREMENT PRIMARY KEY,
-            name VARCHAR(100) NOT NULL,
-            bio TEXT,
-            image_url VARCHAR(255)
-        )
-        """)
-        
-        # Create Albums table
-        print("Creating Albums table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Albums (
-            album_id INT AUTO_INCREMENT PRIMARY KEY,
-            title VARCHAR(100) NOT NULL,
-            artist_id INT,
-            release_year INT,
-            cover_art MEDIUMBLOB,
-            FOREIGN KEY (artist_id) REFERENCES Artists(artist_id) ON DELETE SET NULL
-        )
-        """)
-        
-        # Create Genres table
-        print("Creating Genres table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Genres (
-            genre_id INT AUTO_INCREMENT PRIMARY KEY,
-            name VARCHAR(50) NOT NULL UNIQUE
-        )
-        """)
-        
-        # Create Songs table
-        print("Creating Songs table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Songs (
-            song_id INT AUTO_INCREMENT PRIMARY KEY,
-            title VARCHAR(100) NOT NULL,
-            artist_id INT,
-            album_id INT,
-            genre_id INT,
-            duration INT,
-            file_data LONGBLOB NOT NULL,
-            file_type VARCHAR(10) NOT NULL,
-            file_size INT NOT NULL,
-            upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (artist_id) REFERENCES Artists(artist_id) ON DELETE SET NULL,
-            FOREIGN KEY (album_id) REFERENCES Albums(album_id) ON DELETE SET NULL,
-            FOREIGN KEY (genre_id) REFERENCES Genres(genre_id) ON DELETE SET NULL
-        )
-        """)
-        
-        # Create Playlists table
-        print("Creating Playlists table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Playlists (
-            playlist_id INT AUTO_INCREMENT PRIMARY KEY,
-            user_id INT NOT NULL,
-            name VARCHAR(100) NOT NULL,
-            description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
-        )
-        """)
-        
-        # Create Playlist_Songs junction table
-        print("Creating Playlist_Songs table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Playlist_Songs (
-            playlist_id INT NOT NULL,
-            song_id INT NOT NULL,
-            position INT NOT NULL,
-            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (playlist_id, song_id),
-            FOREIGN KEY (playlist_id) REFERENCES Playlists(playlist_id) ON DELETE CASCADE,
-            FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
-        )
-        """)
-        
-        # Create User_Favorites table
-        print("Creating User_Favorites table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS User_Favorites (
-            user_id INT NOT NULL,
-            song_id INT NOT NULL,
-            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (user_id, song_id),
-            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
-            FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
-        )
-        """)
-        
-        # Create Listening_History table
-        print("Creating Listening_History table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Listening_History (
-            history_id INT AUTO_INCREMENT PRIMARY KEY,
-            user_id INT NOT NULL,
-            song_id INT NOT NULL,
-            played_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
-            FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
-        )
-        """)
+        # Tables, indexes and later schema changes are versioned migrations
+        print("Applying schema migrations...")
+        apply_migrations(connection)
         
-        connection.commit()
         cursor.close()
         connection.close()
         
@@ -163,6 +50,7 @@ def create_database():
 
 def add_default_users():
     """Add default users including admin"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -193,13 +81,8 @@ def add_default_users():
         
         # Insert users
         print("Adding default users...")
-        for first_name, last_name, email, password, is_admin in default_users:
-            cursor.execute(
-                "INSERT INTO Users (first_name, last_name, email, password, is_admin) VALUES (%s, %s, %s, %s, %s)",
-                (first_name, last_name, email, password, is_admin)
-            )
-        
-        connection.commit()
+        bulk_insert(connection, "Users", ("first_name", "last_name", "email", "password", "is_admin"),
+                    default_users)
         print(f"Added {len(default_users)} default users successfully!")
         
         cursor.close()
@@ -212,6 +95,7 @@ def add_default_users():
 
 def add_default_genres():
     """Add default music genres"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -239,10 +123,7 @@ def add_default_genres():
         
         # Insert genres
         print("Adding default genres...")
-        for genre in default_genres:
-            cursor.execute("INSERT INTO Genres (name) VALUES (%s)", (genre,))
-        
-        connection.commit()
+        bulk_insert(connection, "Genres", ("name",), ((genre,) for genre in default_genres))
         print(f"Added {len(default_genres)} default genres successfully!")
         
         cursor.close()
@@ -255,6 +136,7 @@ def add_default_genres():
 
 def add_default_artists():
     """Add default artists"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -288,13 +170,7 @@ def add_default_artists():
         
         # Insert artists
         print("Adding default artists...")
-        for name, bio in default_artists:
-            cursor.execute(
-                "INSERT INTO Artists (name, bio) VALUES (%s, %s)",
-                (name, bio)
-            )
-        
-        connection.commit()
+        bulk_insert(connection, "Artists", ("name", "bio"), default_artists)
         print(f"Added {len(default_artists)} default artists successfully!")
         
         cursor.close()
@@ -307,6 +183,7 @@ def add_default_artists():
 
 def add_default_albums():
     """Add default albums"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -344,13 +221,7 @@ def add_default_albums():
         
         # Insert albums
         print("Adding default albums...")
-        for title, artist_id, release_year in default_albums:
-            cursor.execute(
-                "INSERT INTO Albums (title, artist_id, release_year) VALUES (%s, %s, %s)",
-                (title, artist_id, release_year)
-            )
-        
-        connection.commit()
+        bulk_insert(connection, "Albums", ("title", "artist_id", "release_year"), default_albums)
         print(f"Added {len(default_albums)} default albums successfully!")
         
         cursor.close()
@@ -407,6 +278,7 @@ def create_dummy_audio():
 
 def add_dummy_songs():
     """Add dummy/placeholder songs"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -456,28 +328,44 @@ def add_dummy_songs():
             ("Stay", "Justin Bieber", "Justice", "Pop", 141)
         ]
         
-        # Dummy audio data - just a placeholder WAV file
+        # Dummy audio data - just a placeholder WAV file, stored once and
+        # shared by every dummy song through the blob store
         print("Creating dummy audio data...")
         dummy_audio_data = create_dummy_audio()
-        dummy_file_size = len(dummy_audio_data)
+        dummy_hash, dummy_locator, dummy_file_size = store_bytes(dummy_audio_data)
         dummy_file_type = "wav"
         
-        # Insert songs
+        # store_bytes() took the first reference; each extra song takes one more
+        if len(dummy_songs) > 1:
+            add_blob_ref(dummy_locator, len(dummy_songs) - 1)
+        
+        # Insert songs and their Song_Files rows in one transaction, so a
+        # failure never leaves songs without a payload row
         print("Adding dummy songs...")
-        for title, artist_name, album_title, genre_name, duration in dummy_songs:
-            # Get IDs from mappings
-            artist_id = artists.get(artist_name, 1)  # Default to ID 1 if not found
-            album_id = albums.get(album_title, 1)    # Default to ID 1 if not found
-            genre_id = genres.get(genre_name, 1)     # Default to ID 1 if not found
-            
-            cursor.execute(
-                """
-                INSERT INTO Songs (title, artist_id, album_id, genre_id, duration, file_data, file_type, file_size)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (title, artist_id, album_id, genre_id, duration, dummy_audio_data, dummy_file_type, dummy_file_size)
-            )
+        bulk_insert(
+            connection, "Songs",
+            ("title", "artist_id", "album_id", "genre_id", "duration", "file_type", "file_size"),
+            (
+                (title,
+                 artists.get(artist_name, 1),  # Default to ID 1 if not found
+                 albums.get(album_title, 1),
+                 genres.get(genre_name, 1),
+                 duration, dummy_file_type, dummy_file_size)
+                for title, artist_name, album_title, genre_name, duration in dummy_songs
+            ),
+            commit=False
+        )
         
+        # Every dummy song shares the same blob, so one set-based insert covers them all
+        cursor.execute(
+            """
+            INSERT INTO Song_Files (song_id, content_hash, storage_locator)
+            SELECT s.song_id, %s, %s FROM Songs s
+            LEFT JOIN Song_Files f ON f.song_id = s.song_id
+            WHERE f.song_id IS NULL
+            """,
+            (dummy_hash, dummy_locator)
+        )
         connection.commit()
         print(f"Added {len(dummy_songs)} dummy songs successfully!")
         
@@ -487,10 +375,16 @@ def add_dummy_songs():
         
     except mysql.connector.Error as err:
         print(f"Error adding dummy songs: {err}")
+        try:
+            connection.rollback()
+            connection.close()
+        except Exception:
+            pass
         return False
 
 def add_default_playlists():
     """Add default playlists"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -519,14 +413,6 @@ def add_default_playlists():
             (1, "Workout Mix", "Energetic tracks to keep you moving")
         ]
         
-        # Insert system playlists
-        print("Adding system playlists...")
-        for user_id, name, description in system_playlists:
-            cursor.execute(
-                "INSERT INTO Playlists (user_id, name, description) VALUES (%s, %s, %s)",
-                (user_id, name, description)
-            )
-        
         # Create user playlists (one for each user)
         user_playlists = []
         for user_id in user_ids:
@@ -534,15 +420,10 @@ def add_default_playlists():
                 user_playlists.append((user_id, f"My Favorites", "My favorite songs"))
                 user_playlists.append((user_id, f"Road Trip", "Perfect for long drives"))
         
-        # Insert user playlists
-        print("Adding user playlists...")
-        for user_id, name, description in user_playlists:
-            cursor.execute(
-                "INSERT INTO Playlists (user_id, name, description) VALUES (%s, %s, %s)",
-                (user_id, name, description)
-            )
-        
-        connection.commit()
+        # Insert system and user playlists
+        print("Adding playlists...")
+        bulk_insert(connection, "Playlists", ("user_id", "name", "description"),
+                    system_playlists + user_playlists)
         print(f"Added {len(system_playlists) + len(user_playlists)} default playlists successfully!")
         
         # Now add songs to playlists
@@ -554,6 +435,7 @@ def add_default_playlists():
         
         if song_ids:
             print("Adding songs to playlists...")
+            playlist_song_rows = []
             # For each playlist, add 3-5 random songs
             for playlist_id in playlist_ids:
                 # Choose a random number of songs (3-5)
@@ -563,12 +445,11 @@ def add_default_playlists():
                 
                 # Add songs to playlist
                 for position, song_id in enumerate(playlist_songs, 1):
-                    cursor.execute(
-                        "INSERT INTO Playlist_Songs (playlist_id, song_id, position) VALUES (%s, %s, %s)",
-                        (playlist_id, song_id, position)
-                    )
+                    playlist_song_rows.append((playlist_id, song_id, position))
+            
+            bulk_insert(connection, "Playlist_Songs", ("playlist_id", "song_id", "position"),
+                        playlist_song_rows)
         
-        connection.commit()
         print("Added songs to playlists successfully!")
         
         cursor.close()
@@ -581,6 +462,7 @@ def add_default_playlists():
 
 def add_sample_listening_history():
     """Add sample listening history for users"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -613,6 +495,7 @@ def add_sample_listening_history():
             return False
         
         print("Adding sample listening history...")
+        history_rows = []
         # For each user, add 5-15 listening records
         for user_id in user_ids:
             # Choose a random number of plays (5-15)
@@ -621,15 +504,9 @@ def add_sample_listening_history():
             # Generate random plays
             for _ in range(num_plays):
                 # Choose a random song
-                song_id = random.choice(song_ids)
-                
-                # Add to listening history
-                cursor.execute(
-                    "INSERT INTO Listening_History (user_id, song_id) VALUES (%s, %s)",
-                    (user_id, song_id)
-                )
+                history_rows.append((user_id, random.choice(song_ids)))
         
-        connection.commit()
+        bulk_insert(connection, "Listening_History", ("user_id", "song_id"), history_rows)
         
         # Check how many were added
         cursor.execute("SELECT COUNT(*) FROM Listening_History")
@@ -637,6 +514,10 @@ def add_sample_listening_history():
         
         print(f"Added {new_count} listening history records successfully!")
         
+        # Bring the Song_Stats play counters and dashboard totals in line with the seeded data
+        rebuild_song_stats(connection)
+        recount_counters(connection)
+        
         cursor.close()
         connection.close()
         return True
@@ -648,6 +529,7 @@ def add_sample_listening_history():
 # ------------------- Splash Screen -------------------
 def show_splash_screen():
     """Display a splash screen while setting up the database"""
+    import customtkinter as ctk  # Deferred: warm starts never open a window here
     # Setup splash window
     splash_root = ctk.CTk()
     splash_root.title("Online Music System - Setup")
@@ -723,7 +605,6 @@ def show_splash_screen():
         progress.set(0.05)
         loading_label.configure(text="Starting setup...")
         splash_root.update_idletasks()
-        time.sleep(0.5)
         
         # Run each setup step
         setup_success = True
@@ -744,9 +625,6 @@ def show_splash_screen():
                 setup_success = False
                 print(f"Error during setup: {e}")
                 status_label.configure(text=f"Error: {str(e)[:30]}...")
-            
-            # Small delay for visual feedback
-            time.sleep(0.3)
         
         # Complete setup
         progress.set(1.0)
@@ -759,14 +637,13 @@ def show_splash_screen():
             status_label.configure(text="See console for details. Launching application...")
         
         splash_root.update_idletasks()
-        time.sleep(1.5)
         
         # Close splash and launch application
         splash_root.destroy()
         launch_application()
     
-    # Start setup after a short delay
-    splash_root.after(500, run_setup)
+    # Start setup as soon as the window has been drawn
+    splash_root.after_idle(run_setup)
     
     # Start the splash screen
     splash_root.mainloop()
@@ -776,11 +653,11 @@ def launch_application():
     """Launch the application starting with the login screen"""
     try:
         # Clear any existing user session
-        if os.path.exists("current_user.txt"):
-            os.remove("current_user.txt")
+        if os.path.exists(session_path(USER_SESSION_FILE)):
+            os.remove(session_path(USER_SESSION_FILE))
         
-        if os.path.exists("current_admin.txt"):
-            os.remove("current_admin.txt")
+        if os.path.exists(session_path(ADMIN_SESSION_FILE)):
+            os.remove(session_path(ADMIN_SESSION_FILE))
         
         # Start the login page
         subprocess.Popen(["python", "login_signup.py"])
@@ -791,12 +668,18 @@ def launch_application():
 # ------------------- Main Entry Point -------------------
 if __name__ == "__main__":
     try:
-        # Set the appearance mode for splash screen
-        ctk.set_appearance_mode(UI_THEME)
-        ctk.set_default_color_theme(UI_COLOR_THEME)
-        
-        # Show splash screen and setup database
-        show_splash_screen()
+        # Warm start: schema is current, so skip DDL, seeding and the splash
+        # screen entirely (pass --setup to force the full setup run)
+        if "--setup" not in sys.argv and is_schema_current():
+            launch_application()
+        else:
+            # Set the appearance mode for splash screen
+            import customtkinter as ctk
+            ctk.set_appearance_mode(UI_THEME)
+            ctk.set_default_color_theme(UI_COLOR_THEME)
+            
+            # Show splash screen and setup database
+            show_splash_screen()
     except Exception as e:
         print(f"Error starting application: {e}")
         import traceback
@@ -0,0 +1,144 @@
+"""
+Keyset pagination for the admin song and user lists.
+
+A page is read as "the next N rows after the last row I have" on a
+unique sort key, instead of as OFFSET n LIMIT N:
+
+    songs  newest first on (upload_date, song_id)
+    users  newest first on (created_at, user_id)
+
+Each page is a short index range scan however deep the admin has scrolled,
+and rows inserted while they scroll land before the first page, so they
+never shift or repeat rows on later pages. A cursor is the sort key of the
+last row returned; None means there is nothing more to fetch.
+"""
+
+from config import PAGINATION
+from db_pool import get_connection
+from history_rollup import get_rollup_boundary
+
+SONG_KEY = (("s.upload_date", "upload_date"), ("s.song_id", "song_id"))
+USER_KEY = (("u.created_at", "created_at"), ("u.user_id", "user_id"))
+
+SONGS_PAGE_SQL = """
+    SELECT s.song_id, s.title, a.name as artist_name, al.title as album_name,
+           g.name as genre_name, s.duration, s.file_size, s.file_type, s.upload_date
+    FROM Songs s
+    JOIN Artists a ON s.artist_id = a.artist_id
+    LEFT JOIN Albums al ON s.album_id = al.album_id
+    LEFT JOIN Genres g ON s.genre_id = g.genre_id
+"""
+
+# Per-user counts are correlated subqueries, so they only run for the page's rows
+USERS_PAGE_SQL = """
+    SELECT u.user_id, u.first_name, u.last_name, u.email, u.is_admin, u.created_at,
+           (SELECT COUNT(*) FROM Playlists p WHERE p.user_id = u.user_id) as playlist_count,
+           (SELECT COALESCE(SUM(d.plays), 0) FROM Listening_Daily d
+            WHERE d.user_id = u.user_id AND d.play_date < %s)
+           + (SELECT COUNT(*) FROM Listening_History lh
+              WHERE lh.user_id = u.user_id AND lh.played_at >= %s) as listening_count
+    FROM Users u
+"""
+
+# ------------------- Keyset Helpers -------------------
+def page_size_or_default(page_size):
+    """Clamp a requested page size to PAGINATION["max_page_size"]"""
+    page_size = page_size or PAGINATION.get("page_size", 100)
+    return max(1, min(page_size, PAGINATION.get("max_page_size", 1000)))
+
+def keyset_condition(columns):
+    """WHERE condition for rows after a cursor in descending key order
+
+    (a, b) gives "a < %s OR (a = %s AND b < %s)"; spelled out rather than
+    as a row comparison so the optimizer always uses a range scan.
+    """
+    terms = []
+    for i, column in enumerate(columns):
+        parts = [f"{prefix} = %s" for prefix in columns[:i]] + [f"{column} < %s"]
+        terms.append(parts[0] if len(parts) == 1 else "(" + " AND ".join(parts) + ")")
+    return " OR ".join(terms)
+
+def keyset_params(after):
+    """Parameters matching keyset_condition for a cursor"""
+    params = []
+    for i in range(len(after)):
+        params.extend(after[:i + 1])
+    return params
+
+def fetch_page(cursor, select_sql, key, after=None, page_size=None, where=None, params=()):
+    """Run one keyset page of select_sql, newest first
+
+    Args:
+        cursor: Dictionary cursor
+        select_sql: SELECT ... FROM ... without WHERE, ORDER BY or LIMIT
+        key: ((column, result name), ...) - unique sort key, most significant first
+        after: Cursor returned with the previous page
+        page_size: Rows per page (defaults to PAGINATION["page_size"])
+        where: Optional extra filter, ANDed with the keyset condition
+        params: Parameters for select_sql and where, in order
+
+    Returns:
+        (rows, next_cursor) - next_cursor is None on the last page
+    """
+    page_size = page_size_or_default(page_size)
+    columns = [column for column, _ in key]
+    conditions = [f"({where})"] if where else []
+    params = list(params)
+    if after:
+        conditions.append(f"({keyset_condition(columns)})")
+        params.extend(keyset_params(after))
+    params.append(page_size + 1)
+
+    query = (select_sql
+             + (" WHERE " + " AND ".join(conditions) if conditions else "")
+             + " ORDER BY " + ", ".join(f"{column} DESC" for column in columns)
+             + " LIMIT %s")
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+
+    # One extra row tells us whether there is another page
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, tuple(rows[-1][name] for _, name in key)
+    return rows, None
+
+# ------------------- Listings -------------------
+def get_songs_page(after=None, page_size=None):
+    """One page of the admin song list, newest uploads first
+
+    Returns:
+        (songs, next_cursor)
+    """
+    connection = get_connection()
+    try:
+        cursor = connection.cursor(dictionary=True)
+        page = fetch_page(cursor, SONGS_PAGE_SQL, SONG_KEY, after, page_size)
+        cursor.close()
+        return page
+    finally:
+        connection.close()
+
+def get_users_page(after=None, page_size=None, search=None):
+    """One page of the admin user list, newest registrations first
+
+    Args:
+        search: Optional substring matched against name and email
+
+    Returns:
+        (users, next_cursor) - users include playlist_count and listening_count
+    """
+    boundary = get_rollup_boundary()
+    params = [boundary, boundary]
+    where = None
+    if search:
+        where = "u.first_name LIKE %s OR u.last_name LIKE %s OR u.email LIKE %s"
+        params.extend([f"%{search}%"] * 3)
+
+    connection = get_connection()
+    try:
+        cursor = connection.cursor(dictionary=True)
+        page = fetch_page(cursor, USERS_PAGE_SQL, USER_KEY, after, page_size, where, params)
+        cursor.close()
+        return page
+    finally:
+        connection.close()
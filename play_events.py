@@ -0,0 +1,467 @@
+"""
+Durable play-event capture for the Online Music System.
+
+record_play_event() appends one JSON line to a local append-only spool file
+and returns; it never touches the database, so playback costs one small
+local write. A background ingester thread bulk-loads the spool into
+Listening_History (plus the Song_Stats counters) in large batches.
+
+Spool layout (PLAY_HISTORY["spool_dir"]):
+
+    <segment>.open       being appended to by one process
+    <segment>.ready      sealed, waiting to be ingested
+    <segment>.ingesting  claimed by an ingester
+    <segment>.failed     quarantined after PLAY_HISTORY["max_attempts"]
+                         failed loads; requeue_failed() retries them
+
+Segments move between states only by atomic rename, so several app
+processes can share one spool. Every event carries a UUID that is stored in
+Listening_History.event_id; events already present are skipped, so a
+segment that is ingested twice (crash between commit and delete) never
+double-counts. Segments abandoned by a crashed process are picked up once
+they have been idle for PLAY_HISTORY["stale_after_s"] seconds. Plays of
+songs or users deleted before ingestion are dropped rather than failing
+their whole batch.
+"""
+
+import os
+import json
+import time
+import uuid
+import atexit
+import threading
+from datetime import datetime
+from config import PLAY_HISTORY
+from db_pool import get_connection
+from song_stats import record_plays
+
+OPEN, READY, INGESTING, FAILED = ".open", ".ready", ".ingesting", ".failed"
+ATTEMPT_MARK = "~"  # <stem>~<failed attempts><state>
+
+# ------------------- Spool -------------------
+class PlaySpool:
+    """Append-only segment files holding plays not yet in MySQL"""
+
+    def __init__(self, spool_dir, fsync=True, stale_after_s=300, max_attempts=5):
+        """Create the spool directory if needed
+
+        Args:
+            spool_dir: Directory holding the segment files
+            fsync: fsync every append (survives OS crashes, not just app crashes)
+            stale_after_s: Idle time after which another process's open or
+                           claimed segment is treated as abandoned
+            max_attempts: Failed loads after which a segment is quarantined
+        """
+        self.spool_dir = spool_dir
+        self.fsync = fsync
+        self.stale_after_s = stale_after_s
+        self.max_attempts = max(1, int(max_attempts))
+        self._lock = threading.Lock()
+        self._file = None
+        self._path = None
+        self.unsealed = 0  # Events in this process's open segment
+        os.makedirs(spool_dir, exist_ok=True)
+
+    def append(self, event):
+        """Write one event as a JSON line to this process's open segment"""
+        line = (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file is not None and not os.path.exists(self._path):
+                # Another process claimed the segment as abandoned; its
+                # events go with it, new ones start a new segment
+                self._close_segment()
+            if self._file is None:
+                name = f"{time.time_ns():020d}-{os.getpid()}"
+                self._path = os.path.join(self.spool_dir, name + OPEN)
+                self._file = open(self._path, "ab")
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.unsealed += 1
+
+    def seal(self):
+        """Close the open segment and hand it to the ingester
+
+        Returns:
+            True if a segment was sealed
+        """
+        with self._lock:
+            if self._file is None:
+                return False
+            path = self._path
+            try:
+                self._close_segment()
+                os.replace(path, path[:-len(OPEN)] + READY)
+            except FileNotFoundError:
+                return False  # Already claimed by another process as abandoned
+            return True
+
+    def _close_segment(self):
+        """Forget the open segment; the next append starts a new one"""
+        try:
+            self._file.close()
+        finally:
+            self._file = None
+            self._path = None
+            self.unsealed = 0
+
+    def claim(self):
+        """Claim every sealed (or abandoned) segment for ingestion
+
+        Returns:
+            Paths of the claimed segments, oldest first
+        """
+        claimed = []
+        now = time.time()
+        for name in sorted(os.listdir(self.spool_dir)):
+            path = os.path.join(self.spool_dir, name)
+            stem, state = os.path.splitext(name)
+            if state not in (OPEN, READY, INGESTING) or path == self._path:
+                continue
+            try:
+                if state != READY and now - os.path.getmtime(path) < self.stale_after_s:
+                    continue  # Still owned by a live writer or ingester
+                target = os.path.join(self.spool_dir, stem + INGESTING)
+                os.replace(path, target)
+                os.utime(target)  # Fresh mtime marks the claim as live
+            except OSError:
+                continue  # Another process got there first
+            claimed.append(target)
+        return claimed
+
+    def unclaim(self, path, rejected=False):
+        """Return a claimed segment to the ready state after a failure
+
+        Args:
+            rejected: The database refused the segment's data (not an
+                      outage); counts towards max_attempts, after which the
+                      segment is quarantined instead of retried forever
+
+        Returns:
+            True if the segment was quarantined
+        """
+        stem = path[:-len(INGESTING)]
+        state = READY
+        if rejected:
+            base, _, attempts = stem.rpartition(ATTEMPT_MARK)
+            if not base or not attempts.isdigit():
+                base, attempts = stem, "0"
+            attempts = int(attempts) + 1
+            if attempts >= self.max_attempts:
+                stem, state = base, FAILED
+                print(f"Quarantined spool segment {os.path.basename(base)} after {attempts} failed loads")
+            else:
+                stem = f"{base}{ATTEMPT_MARK}{attempts}"
+        try:
+            os.replace(path, stem + state)
+        except OSError as e:
+            print(f"Error returning spool segment {path}: {e}")
+            return False
+        return state == FAILED
+
+    def requeue_failed(self):
+        """Move quarantined segments back to ready with a fresh attempt count
+
+        Returns:
+            Number of segments requeued
+        """
+        requeued = 0
+        for name in os.listdir(self.spool_dir):
+            stem, state = os.path.splitext(name)
+            if state != FAILED:
+                continue
+            try:
+                os.replace(os.path.join(self.spool_dir, name), os.path.join(self.spool_dir, stem + READY))
+                requeued += 1
+            except OSError:
+                continue
+        return requeued
+
+    def read_events(self, path):
+        """Parse a segment
+
+        Returns:
+            (events, number of unreadable lines) - a torn last line from a
+            crash mid-append is counted and skipped
+        """
+        events = []
+        corrupt = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                    events.append((
+                        event["user_id"],
+                        event["song_id"],
+                        datetime.fromisoformat(event["played_at"]),
+                        bytes.fromhex(event["event_id"]),
+                    ))
+                except (ValueError, KeyError, TypeError):
+                    corrupt += 1
+        return events, corrupt
+
+    def get_backlog(self, states=(OPEN, READY, INGESTING)):
+        """Segments and bytes waiting in the spool (or in the given states)"""
+        segments = 0
+        size = 0
+        for name in os.listdir(self.spool_dir):
+            if os.path.splitext(name)[1] in states:
+                segments += 1
+                try:
+                    size += os.path.getsize(os.path.join(self.spool_dir, name))
+                except OSError:
+                    pass
+        return segments, size
+
+    def close(self):
+        self.seal()
+
+# ------------------- Ingester -------------------
+class PlayEventIngester:
+    """Records plays into the spool and bulk-loads the spool in the background"""
+
+    def __init__(self, spool, flush_every=50, flush_interval_ms=2000, batch_size=5000):
+        """Create the ingester; its thread starts on the first event
+
+        Args:
+            spool: PlaySpool to write to and ingest from
+            flush_every: Seal and ingest as soon as this many plays are spooled
+            flush_interval_ms: Seal and ingest at least this often
+            batch_size: Events per Listening_History transaction
+        """
+        self.spool = spool
+        self.flush_every = max(1, int(flush_every))
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.batch_size = max(1, int(batch_size))
+
+        self._cond = threading.Condition()
+        self._ingest_lock = threading.Lock()  # One ingest pass at a time
+        self._thread = None
+        self._closed = False
+        self._stats = {
+            "recorded": 0,
+            "dropped": 0,
+            "ingested": 0,
+            "duplicates": 0,
+            "corrupt": 0,
+            "orphaned": 0,
+            "quarantined": 0,
+            "segments": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "batch_size_max": 0,
+            "batch_time_total": 0.0,
+            "batch_time_max": 0.0,
+            "batch_time_last": 0.0,
+        }
+
+    # ------------------- Recording -------------------
+    def record(self, user_id, song_id):
+        """Spool a play event; never blocks on the database
+
+        Returns:
+            The event id (hex), or None if the spool could not be written
+        """
+        event_id = uuid.uuid4().hex
+        try:
+            self.spool.append({
+                "event_id": event_id,
+                "user_id": user_id,
+                "song_id": song_id,
+                "played_at": datetime.now().isoformat(),
+            })
+        except Exception as e:
+            print(f"Error spooling play event: {e}")
+            with self._cond:
+                self._stats["dropped"] += 1
+            return None
+
+        with self._cond:
+            self._stats["recorded"] += 1
+            if self._thread is None:
+                self._start()
+            if self.spool.unsealed >= self.flush_every:
+                self._cond.notify()
+        return event_id
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="play-event-ingester", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Ingester thread: wake on a full segment or when the interval elapses"""
+        failed = False
+        while True:
+            with self._cond:
+                # After a failed pass, wait out the interval instead of retrying hot
+                if failed or (self.spool.unsealed < self.flush_every and not self._closed):
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+                failures = self._stats["failed_batches"]
+            self.ingest()
+            with self._cond:
+                failed = self._stats["failed_batches"] != failures
+            if closed:
+                return
+
+    # ------------------- Ingestion -------------------
+    def ingest(self):
+        """Seal this process's segment and load every claimable segment
+
+        Returns:
+            Number of new events written to Listening_History
+        """
+        with self._ingest_lock:
+            self.spool.seal()
+            written = 0
+            for path in self.spool.claim():
+                try:
+                    written += self._ingest_segment(path)
+                except Exception as e:
+                    print(f"Error ingesting play events from {os.path.basename(path)}: {e}")
+                    quarantined = self.spool.unclaim(path, rejected=is_data_error(e))
+                    with self._cond:
+                        self._stats["failed_batches"] += 1
+                        self._stats["quarantined"] += quarantined
+            if written:
+                # History pages and popular songs (Song_Stats) read these plays
+                from data_client import invalidate
+                invalidate("history", "songs")
+            return written
+
+    def _ingest_segment(self, path):
+        events, corrupt = self.spool.read_events(path)
+        written = 0
+        for i in range(0, len(events), self.batch_size):
+            written += self._write_batch(events[i:i + self.batch_size])
+            os.utime(path)  # Keep the claim fresh on long segments
+        os.remove(path)
+        with self._cond:
+            self._stats["segments"] += 1
+            self._stats["corrupt"] += corrupt
+        return written
+
+    def _write_batch(self, batch):
+        """Insert the events not already in Listening_History, in one transaction"""
+        start = time.perf_counter()
+        connection = get_connection()
+        try:
+            cursor = connection.cursor()
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(
+                f"SELECT event_id FROM Listening_History WHERE event_id IN ({placeholders})",
+                [event[3] for event in batch]
+            )
+            seen = {bytes(row[0]) for row in cursor.fetchall()}
+            new_events = [event for event in batch if event[3] not in seen]
+            valid_events = drop_orphaned_events(cursor, new_events)
+            record_plays(cursor, valid_events)
+            connection.commit()
+            cursor.close()
+        finally:
+            connection.close()
+
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self._stats["ingested"] += len(valid_events)
+            self._stats["duplicates"] += len(batch) - len(new_events)
+            self._stats["orphaned"] += len(new_events) - len(valid_events)
+            self._stats["batches"] += 1
+            self._stats["batch_size_max"] = max(self._stats["batch_size_max"], len(batch))
+            self._stats["batch_time_total"] += elapsed
+            self._stats["batch_time_max"] = max(self._stats["batch_time_max"], elapsed)
+            self._stats["batch_time_last"] = elapsed
+        return len(valid_events)
+
+    def wake(self):
+        """Seal now and let the background thread ingest (does not block)"""
+        self.spool.seal()
+        with self._cond:
+            self._cond.notify()
+
+    def close(self, timeout=5):
+        """Seal the spool and give the thread a last chance to ingest
+
+        Anything not ingested before the timeout stays in the spool for the
+        next run.
+        """
+        self.spool.close()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    # ------------------- Metrics -------------------
+    def get_stats(self):
+        """Events recorded/ingested/skipped, batch sizes, latency and backlog"""
+        with self._cond:
+            stats = dict(self._stats)
+        stats["backlog_segments"], stats["backlog_bytes"] = self.spool.get_backlog()
+        stats["failed_segments"], _ = self.spool.get_backlog(states=(FAILED,))
+        batches = stats["batches"]
+        stats["batch_size_avg"] = (stats["ingested"] + stats["duplicates"]) / batches if batches else 0.0
+        stats["batch_time_avg"] = stats["batch_time_total"] / batches if batches else 0.0
+        return stats
+
+# ------------------- Helpers -------------------
+def drop_orphaned_events(cursor, events):
+    """Events whose song and user still exist
+
+    A song or user deleted between the play and its ingestion would fail
+    the Song_Stats foreign key and with it every other play in the batch.
+    """
+    if not events:
+        return events
+    existing = {}
+    for table, column, index in (("Songs", "song_id", 1), ("Users", "user_id", 0)):
+        ids = sorted({event[index] for event in events})
+        placeholders = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"SELECT {column} FROM {table} WHERE {column} IN ({placeholders})", ids)
+        existing[index] = {row[0] for row in cursor.fetchall()}
+    return [event for event in events if event[1] in existing[1] and event[0] in existing[0]]
+
+def is_data_error(error):
+    """True if MySQL rejected the data itself (retrying cannot help), not
+    for outages and connection errors"""
+    from mysql.connector import errors
+    return isinstance(error, (errors.IntegrityError, errors.DataError))
+
+# ------------------- Process-wide Ingester -------------------
+_ingester = None
+_ingester_lock = threading.Lock()
+
+def get_play_ingester():
+    """Get the process-wide ingester, creating it on first use"""
+    global _ingester
+
+    with _ingester_lock:
+        if _ingester is None:
+            spool = PlaySpool(
+                PLAY_HISTORY["spool_dir"],
+                fsync=PLAY_HISTORY.get("fsync", True),
+                stale_after_s=PLAY_HISTORY.get("stale_after_s", 300),
+                max_attempts=PLAY_HISTORY.get("max_attempts", 5),
+            )
+            _ingester = PlayEventIngester(
+                spool,
+                flush_every=PLAY_HISTORY.get("flush_every", 50),
+                flush_interval_ms=PLAY_HISTORY.get("flush_interval_ms", 2000),
+                batch_size=PLAY_HISTORY.get("ingest_batch", 5000),
+            )
+            atexit.register(_ingester.close)
+        return _ingester
+
+def record_play_event(user_id, song_id):
+    """Spool a play for background ingestion"""
+    return get_play_ingester().record(user_id, song_id)
+
+def flush_play_events():
+    """Seal spooled plays and wake the ingester (logout, page shutdown)"""
+    if _ingester is not None:
+        _ingester.wake()
+
+def get_play_event_stats():
+    """Metrics for the process-wide ingester"""
+    return get_play_ingester().get_stats()
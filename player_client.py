@@ -0,0 +1,329 @@
+"""
+Client for the audio player service (player_service.py).
+
+The service is one long-lived process that owns the pygame mixer, the
+play queue and the downloaded audio files, so music keeps playing across
+windows and two windows never fight over the audio device. Pages talk to
+it over a Unix socket only the OS user can open (loopback TCP where Unix
+sockets are unavailable) with newline-delimited JSON:
+
+    request   {"cmd": "play", "song_id": 7, "title": "...", "user_id": 1}
+    reply     {"ok": true, "status": {...}}  or  {"ok": false, "error": "..."}
+    event     {"event": "status", "status": {...}}   (after "subscribe")
+
+Commands: play, enqueue, pause, resume, toggle, stop, seek, next,
+previous, status, subscribe, shutdown. The first command starts the
+service if it is not running. A play is only recorded when user_id is
+the user logged in on this machine; the service checks it against the
+login session rather than trusting the request.
+
+status is {"state": "stopped" | "loading" | "playing" | "paused",
+"song_id", "title", "artist", "position", "queue", "error"}. play only
+starts loading the song; the "playing" status (or an error) follows as
+an event, which follow_player() delivers on the Tk thread:
+
+    follow_player(widget, self.update_playback_state)
+    get_player().play(song_id, title, artist, user_id=user_id)
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import tempfile
+import threading
+import subprocess
+from config import BASE_DIR, PLAYER_SERVICE
+
+SERVICE_SCRIPT = os.path.join(BASE_DIR, "player_service.py")
+
+class PlayerError(Exception):
+    """The player service rejected a command or could not be reached"""
+
+# ------------------- Protocol -------------------
+def encode_message(message):
+    """One JSON line"""
+    return (json.dumps(message, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+def decode_message(line):
+    return json.loads(line.decode("utf-8"))
+
+def uses_unix_socket():
+    return hasattr(socket, "AF_UNIX")
+
+def socket_path():
+    """Path of the service's Unix socket (one per OS user)"""
+    if PLAYER_SERVICE.get("socket_path"):
+        return PLAYER_SERVICE["socket_path"]
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"online_music_player_{user}.sock")
+
+def service_address():
+    return PLAYER_SERVICE.get("host", "127.0.0.1"), PLAYER_SERVICE.get("port", 47810)
+
+def open_connection(timeout):
+    """Connect to the service's socket
+
+    Raises:
+        OSError: Nothing is listening
+    """
+    if not uses_unix_socket():
+        return socket.create_connection(service_address(), timeout=timeout)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+def start_player_service():
+    """Start the service in the background, detached from this window"""
+    subprocess.Popen(
+        [sys.executable, SERVICE_SCRIPT],
+        cwd=BASE_DIR,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,  # Outlives the window that started it (POSIX only)
+        creationflags=getattr(subprocess, "DETACHED_PROCESS", 0),
+    )
+
+def connect_to_service(start=True):
+    """Open a connection to the service, starting it if needed
+
+    Returns:
+        Connected socket
+
+    Raises:
+        PlayerError: The service is not running (start=False) or did not
+                     come up within PLAYER_SERVICE["start_timeout_s"]
+    """
+    timeout = PLAYER_SERVICE.get("command_timeout_s", 5)
+    try:
+        return open_connection(timeout)
+    except OSError as e:
+        if not start:
+            raise PlayerError(f"Player service is not running: {e}")
+
+    start_player_service()
+    deadline = time.monotonic() + PLAYER_SERVICE.get("start_timeout_s", 10)
+    while True:
+        try:
+            return open_connection(timeout)
+        except OSError as e:
+            if time.monotonic() > deadline:
+                raise PlayerError(f"Player service did not start: {e}")
+            time.sleep(0.1)
+
+# ------------------- Commands -------------------
+class PlayerClient:
+    """Sends commands to the player service over one reused connection"""
+
+    def __init__(self):
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def command(self, cmd, **params):
+        """Send a command and wait for its reply
+
+        Returns:
+            The service's status after the command
+
+        Raises:
+            PlayerError
+        """
+        message = dict(params, cmd=cmd)
+        with self._lock:
+            # A connection kept from an earlier command may belong to a
+            # service that has since exited; retry once on a fresh one
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._sock = connect_to_service(start=cmd != "shutdown")
+                        self._reader = self._sock.makefile("rb")
+                    self._sock.sendall(encode_message(message))
+                    line = self._reader.readline()
+                    if not line:
+                        raise ConnectionError("connection closed by the player service")
+                    break
+                except OSError as e:
+                    self.close()
+                    if attempt:
+                        raise PlayerError(f"Player service unavailable: {e}")
+
+        reply = decode_message(line)
+        if not reply.get("ok"):
+            raise PlayerError(reply.get("error", "Unknown player error"))
+        return reply.get("status")
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def play(self, song_id, title=None, artist=None, user_id=None):
+        """Play a song now; the current song goes to the "previous" history
+
+        Args:
+            title, artist: Shown while loading (looked up if not given)
+            user_id: Record the play in this user's listening history (must
+                     be the logged-in user, or the play is not recorded)
+        """
+        return self.command("play", song_id=song_id, title=title, artist=artist, user_id=user_id)
+
+    def enqueue(self, song_id, title=None, artist=None, user_id=None):
+        """Add a song to the end of the queue (plays now if idle)"""
+        return self.command("enqueue", song_id=song_id, title=title, artist=artist, user_id=user_id)
+
+    def pause(self):
+        return self.command("pause")
+
+    def resume(self):
+        return self.command("resume")
+
+    def toggle(self):
+        """Pause if playing, resume if paused"""
+        return self.command("toggle")
+
+    def stop(self):
+        """Stop playback and clear the queue"""
+        return self.command("stop")
+
+    def seek(self, position):
+        """Jump to position seconds into the current song"""
+        return self.command("seek", position=position)
+
+    def next(self):
+        return self.command("next")
+
+    def previous(self):
+        return self.command("previous")
+
+    def status(self):
+        return self.command("status")
+
+    def shutdown(self):
+        """Stop the service (logout); does nothing if it is not running"""
+        try:
+            return self.command("shutdown")
+        except PlayerError:
+            return None
+        finally:
+            self.close()
+
+_player = None
+_player_lock = threading.Lock()
+
+def get_player():
+    """Process-wide PlayerClient"""
+    global _player
+    with _player_lock:
+        if _player is None:
+            _player = PlayerClient()
+        return _player
+
+# ------------------- Status Events -------------------
+class PlayerSubscription:
+    """Background reader for the service's status events
+
+    The reader thread only queues events; follow_player() hands them to
+    the Tk thread. The first connection starts the service if needed; if
+    it goes away later (logout) the reader just reconnects once it is back.
+    """
+
+    def __init__(self):
+        self.followers = []  # SimpleQueue per follower
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add_follower(self):
+        events = queue.SimpleQueue()
+        with self._lock:
+            self.followers.append(events)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="player-events", daemon=True)
+                self._thread.start()
+        return events
+
+    def remove_follower(self, events):
+        with self._lock:
+            if events in self.followers:
+                self.followers.remove(events)
+
+    def _run(self):
+        start = True  # Start the service the first time; later just wait for it
+        while True:
+            try:
+                sock = connect_to_service(start=start)
+                if not start:
+                    print("Player events reconnected")
+                start = False
+                sock.settimeout(None)  # Events arrive whenever the state changes
+                with sock, sock.makefile("rb") as reader:
+                    sock.sendall(encode_message({"cmd": "subscribe"}))
+                    for line in reader:
+                        message = decode_message(line)
+                        if message.get("event") == "status":
+                            with self._lock:
+                                followers = list(self.followers)
+                            for events in followers:
+                                events.put(message["status"])
+                print("Player service closed the event stream")
+            except PlayerError:
+                if start:
+                    print("Player events unavailable: the service did not start")
+                    start = False
+            except (OSError, ValueError) as e:
+                print(f"Player events unavailable: {e}")
+            time.sleep(1)
+
+_subscription = None
+
+def follow_player(widget, callback):
+    """Call callback(status) on the Tk thread whenever the player changes
+
+    Delivery polls every PLAYER_SERVICE["poll_ms"] while widget exists;
+    events that arrive between polls are coalesced to the newest one.
+    """
+    global _subscription
+    with _player_lock:
+        if _subscription is None:
+            _subscription = PlayerSubscription()
+    subscription = _subscription
+    events = subscription.add_follower()
+    poll_ms = PLAYER_SERVICE.get("poll_ms", 200)
+
+    def poll():
+        try:
+            if not widget.winfo_exists():
+                subscription.remove_follower(events)
+                return
+        except Exception:
+            # The window was destroyed
+            subscription.remove_follower(events)
+            return
+
+        status = None
+        while True:
+            try:
+                status = events.get_nowait()
+            except queue.Empty:
+                break
+        if status is not None:
+            try:
+                callback(status)
+            except Exception as e:
+                print(f"Error in player status callback: {e}")
+        widget.after(poll_ms, poll)
+
+    widget.after(poll_ms, poll)
@@ -0,0 +1,505 @@
+"""
+Audio player service for the Online Music System.
+
+One background process owns the pygame mixer and the play queue. Windows
+control it through player_client.py over a Unix socket only the OS user
+can open (newline-delimited JSON, see the protocol there), so navigating
+or closing a window never stops the music and two windows never open the
+audio device twice.
+
+    python player_service.py          # normally started by the first client
+
+Songs are loaded on a loader thread, so play/enqueue reply at once with a
+"loading" status and subscribers get the "playing" status (or the error)
+when the file is ready. Audio comes from the on-disk LRU cache in
+audio_cache.py, so a replay needs no database query. A monitor thread
+advances the queue when a song ends. The service exits on "shutdown"
+(logout) or after PLAYER_SERVICE["idle_exit_s"] with nothing playing and
+no subscribers. Plays are recorded through the play-event spool when the
+client passes the user_id of the user logged in on this machine.
+"""
+
+import os
+import sys
+import time
+import threading
+import traceback
+import socketserver
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import BASE_DIR, PLAYER_SERVICE, TEMP_DIR, USER_SESSION_FILE, session_path
+from db_pool import get_connection
+from play_events import record_play_event, flush_play_events
+from audio_cache import get_audio_cache
+from player_client import (encode_message, decode_message, uses_unix_socket, socket_path,
+                           service_address, open_connection)
+
+STOPPED, LOADING, PLAYING, PAUSED = "stopped", "loading", "playing", "paused"
+
+def fetch_song(item):
+    """Get a song's audio from the audio cache and fill in missing title/artist
+
+    A replay is served from local disk without touching the database.
+
+    Returns:
+        Path of the audio file
+    """
+    song_id = item["song_id"]
+    cache = get_audio_cache()
+    path, entry = cache.get(song_id)
+
+    if not item.get("title") or not item.get("artist"):
+        if not entry.get("title"):
+            connection = get_connection()
+            try:
+                cursor = connection.cursor()
+                cursor.execute(
+                    """
+                    SELECT s.title, a.name as artist_name
+                    FROM Songs s
+                    LEFT JOIN Artists a ON s.artist_id = a.artist_id
+                    WHERE s.song_id = %s
+                    """,
+                    (song_id,)
+                )
+                info = cursor.fetchone()
+                cursor.close()
+            finally:
+                connection.close()
+            if info:
+                entry["title"], entry["artist"] = info[0], info[1] or "Unknown Artist"
+                cache.update_entry(song_id, title=entry["title"], artist=entry["artist"])
+        item["title"] = item.get("title") or entry.get("title")
+        item["artist"] = item.get("artist") or entry.get("artist")
+
+    cache.flush_stats()
+    return path
+
+def remove_legacy_downloads(temp_dir):
+    """Remove the per-play song_<id>.<ext> files older versions left in temp_dir"""
+    for name in os.listdir(temp_dir):
+        path = os.path.join(temp_dir, name)
+        if name.startswith("song_") and os.path.isfile(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Error removing {name}: {e}")
+
+def session_user_id():
+    """User logged in on this machine (the login page's session file), or None"""
+    try:
+        with open(session_path(USER_SESSION_FILE), "r") as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+# ------------------- Player -------------------
+class Player:
+    """The mixer, the queue and the playback state, guarded by one lock"""
+
+    def __init__(self, mixer, history_size=50):
+        self.mixer = mixer
+        self.lock = threading.RLock()
+        self.queue = deque()                        # Items waiting to play
+        self.history = deque(maxlen=history_size)  # Items played before current
+        self.current = None    # {"song_id", "title", "artist", "user_id"}
+        self.state = STOPPED
+        self.error = None
+        self.position_base = 0.0  # Seconds into the song where the mixer last started
+        self.generation = 0       # Bumped per load; stale loads are dropped
+        self.loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="song-loader")
+        self.subscribers = []     # Subscriber per "subscribe" connection
+        self.last_active = time.monotonic()
+
+    # ---------- State ----------
+    def status(self):
+        with self.lock:
+            current = self.current or {}
+            position = self.position_base
+            if self.state in (PLAYING, PAUSED):
+                position += max(0, self.mixer.music.get_pos()) / 1000
+            return {
+                "state": self.state,
+                "song_id": current.get("song_id"),
+                "title": current.get("title"),
+                "artist": current.get("artist"),
+                "position": round(position, 1),
+                "queue": [{"song_id": item["song_id"], "title": item.get("title")} for item in self.queue],
+                "error": self.error,
+            }
+
+    def publish(self):
+        """Send the current status to every subscriber"""
+        message = encode_message({"event": "status", "status": self.status()})
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            if not subscriber.send(message):
+                self.unsubscribe(subscriber)
+
+    def subscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+
+    # ---------- Loading ----------
+    def start(self, item, remember=True):
+        """Stop the current song and load item on the loader thread"""
+        with self.lock:
+            if remember and self.current is not None:
+                self.history.append(self.current)
+            self.generation += 1
+            self.current = item
+            self.state = LOADING
+            self.error = None
+            self.position_base = 0.0
+            self.mixer.music.stop()
+            self.loader.submit(self._load, item, self.generation)
+
+    def _load(self, item, generation):
+        try:
+            path = fetch_song(item)
+        except Exception as e:
+            print(f"Error loading song {item['song_id']}: {e}")
+            traceback.print_exc()
+            with self.lock:
+                if generation == self.generation:
+                    self.state = STOPPED
+                    self.error = f"Could not play song: {e}"
+            self.publish()
+            return
+
+        started = False
+        with self.lock:
+            if generation != self.generation:
+                return  # Another song was requested meanwhile
+            try:
+                self.mixer.music.load(path)
+                self.mixer.music.play()
+                self.state = PLAYING
+                started = True
+            except Exception as e:
+                print(f"Error playing {path}: {e}")
+                self.state = STOPPED
+                self.error = f"Could not play song: {e}"
+        if started and item.get("user_id"):
+            try:
+                record_play_event(item["user_id"], item["song_id"])
+            except Exception as e:
+                print(f"Error recording listening history: {e}")
+        self.publish()
+
+    def advance(self):
+        """Play the next queued song, or stop at the end of the queue"""
+        with self.lock:
+            if self.queue:
+                self.start(self.queue.popleft())
+            else:
+                if self.current is not None:
+                    self.history.append(self.current)
+                self.current = None
+                self.state = STOPPED
+                self.position_base = 0.0
+
+    # ---------- Commands ----------
+    def play(self, item):
+        self.start(item)
+
+    def enqueue(self, item):
+        with self.lock:
+            if self.state == STOPPED:
+                self.start(item)
+            else:
+                self.queue.append(item)
+
+    def pause(self):
+        with self.lock:
+            if self.state == PLAYING:
+                self.mixer.music.pause()
+                self.state = PAUSED
+
+    def resume(self):
+        with self.lock:
+            if self.state == PAUSED:
+                self.mixer.music.unpause()
+                self.state = PLAYING
+
+    def toggle(self):
+        with self.lock:
+            if self.state == PLAYING:
+                self.pause()
+            elif self.state == PAUSED:
+                self.resume()
+
+    def stop(self):
+        with self.lock:
+            self.generation += 1
+            self.queue.clear()
+            self.mixer.music.stop()
+            if self.current is not None:
+                self.history.append(self.current)
+            self.current = None
+            self.state = STOPPED
+            self.error = None
+            self.position_base = 0.0
+
+    def seek(self, position):
+        with self.lock:
+            if self.state not in (PLAYING, PAUSED):
+                raise ValueError("Nothing is playing")
+            position = max(0.0, float(position))
+            paused = self.state == PAUSED
+            # play(start=...) restarts the stream at position (MP3/OGG)
+            self.mixer.music.play(start=position)
+            self.position_base = position
+            if paused:
+                self.mixer.music.pause()
+
+    def next(self):
+        with self.lock:
+            if not self.queue:
+                raise ValueError("The queue is empty")
+            self.start(self.queue.popleft())
+
+    def previous(self):
+        with self.lock:
+            if not self.history:
+                raise ValueError("No previous song")
+            if self.current is not None:
+                self.queue.appendleft(self.current)
+            self.start(self.history.pop(), remember=False)
+
+    # ---------- Monitor ----------
+    def check(self):
+        """Advance when the current song has finished (monitor thread)"""
+        with self.lock:
+            finished = self.state == PLAYING and not self.mixer.music.get_busy()
+            if finished:
+                self.advance()
+            if self.state in (PLAYING, LOADING) or self.subscribers:
+                self.last_active = time.monotonic()
+        if finished:
+            self.publish()
+
+    def idle_for(self):
+        return time.monotonic() - self.last_active
+
+    def close(self):
+        with self.lock:
+            self.generation += 1
+            self.mixer.music.stop()
+        self.loader.shutdown(wait=False, cancel_futures=True)
+
+# ------------------- Socket Server -------------------
+class Subscriber:
+    """Write side of a "subscribe" connection"""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.lock = threading.Lock()
+
+    def send(self, message):
+        """Returns False once the connection is gone"""
+        try:
+            with self.lock:
+                self.wfile.write(message)
+                self.wfile.flush()
+            return True
+        except OSError:
+            return False
+
+def song_item(request):
+    """Queue item for a play/enqueue request
+
+    The play is attributed to the logged-in user, and only when the
+    request names that user - any other user_id is not recorded.
+    """
+    if request.get("song_id") is None:
+        raise ValueError("song_id is required")
+    user_id = None
+    if request.get("user_id") is not None:
+        user_id = session_user_id()
+        if user_id is None or str(request["user_id"]) != str(user_id):
+            print(f"Not recording play for user {request['user_id']}: not the logged-in user")
+            user_id = None
+    return {
+        "song_id": int(request["song_id"]),
+        "title": request.get("title"),
+        "artist": request.get("artist"),
+        "user_id": user_id,
+    }
+
+class PlayerRequestHandler(socketserver.StreamRequestHandler):
+    """One client connection: a JSON command per line, a JSON reply per line"""
+
+    def handle(self):
+        player = self.server.player
+        subscriber = None
+        try:
+            for line in self.rfile:
+                try:
+                    request = decode_message(line)
+                    cmd = request.get("cmd")
+                    if cmd == "subscribe":
+                        if subscriber is None:
+                            subscriber = Subscriber(self.wfile)
+                            player.subscribe(subscriber)
+                        # The current status is the subscription's first event
+                        subscriber.send(encode_message({"event": "status", "status": player.status()}))
+                        continue
+                    if cmd == "shutdown":
+                        self.reply({"ok": True, "status": player.status()}, subscriber)
+                        threading.Thread(target=self.server.shutdown, daemon=True).start()
+                        return
+                    changed = self.run_command(player, cmd, request)
+                    self.reply({"ok": True, "status": player.status()}, subscriber)
+                    if changed:
+                        player.publish()
+                except (ValueError, KeyError, TypeError) as e:
+                    self.reply({"ok": False, "error": str(e)}, subscriber)
+                except Exception as e:
+                    print(f"Error handling player command: {e}")
+                    traceback.print_exc()
+                    self.reply({"ok": False, "error": str(e)}, subscriber)
+        except OSError:
+            pass  # Client went away
+        finally:
+            if subscriber is not None:
+                player.unsubscribe(subscriber)
+
+    def reply(self, message, subscriber=None):
+        # Subscribed connections share the socket with the event stream
+        if subscriber is not None:
+            subscriber.send(encode_message(message))
+        else:
+            self.wfile.write(encode_message(message))
+            self.wfile.flush()
+
+    def run_command(self, player, cmd, request):
+        """Apply a command to the player
+
+        Returns:
+            True if the playback state changed (subscribers are notified)
+        """
+        if cmd == "status":
+            return False
+        elif cmd == "play":
+            player.play(song_item(request))
+        elif cmd == "enqueue":
+            player.enqueue(song_item(request))
+        elif cmd == "seek":
+            player.seek(request["position"])
+        elif cmd in ("pause", "resume", "toggle", "stop", "next", "previous"):
+            getattr(player, cmd)()
+        else:
+            raise ValueError(f"Unknown command: {cmd}")
+        return True
+
+class PlayerServer(socketserver.ThreadingTCPServer):
+    """Loopback TCP server, where Unix sockets are unavailable"""
+    daemon_threads = True
+    # On Windows SO_REUSEADDR would let a second service bind the same port
+    allow_reuse_address = os.name != "nt"
+
+    def __init__(self, address, player):
+        self.player = player
+        super().__init__(address, PlayerRequestHandler)
+
+if uses_unix_socket():
+    class UnixPlayerServer(socketserver.ThreadingUnixStreamServer):
+        """Unix socket server; the socket file is readable by its owner only"""
+        daemon_threads = True
+
+        def __init__(self, path, player):
+            self.player = player
+            # Created owner-only, so no other OS user can connect even briefly
+            old_umask = os.umask(0o177)
+            try:
+                super().__init__(path, PlayerRequestHandler)
+            finally:
+                os.umask(old_umask)
+            os.chmod(path, 0o600)
+
+def service_running():
+    try:
+        open_connection(1).close()
+        return True
+    except OSError:
+        return False
+
+def create_server():
+    """Bind the service socket
+
+    Returns:
+        (server, Unix socket path or None)
+
+    Raises:
+        OSError: Another service is already listening
+    """
+    if not uses_unix_socket():
+        return PlayerServer(service_address(), None), None
+    if service_running():
+        raise OSError("another player service is already running")
+    path = socket_path()
+    if os.path.exists(path):
+        os.unlink(path)  # Left behind by a service that did not exit cleanly
+    return UnixPlayerServer(path, None), path
+
+def monitor(server, player, poll_s, idle_exit_s):
+    """Advance the queue at song ends and exit when idle"""
+    while not server.stopping.wait(poll_s):
+        try:
+            player.check()
+        except Exception as e:
+            print(f"Error checking playback: {e}")
+        if idle_exit_s and player.idle_for() > idle_exit_s:
+            print(f"Idle for {idle_exit_s}s, exiting")
+            server.shutdown()
+            return
+
+def main():
+    from pygame import mixer
+
+    try:
+        server, path = create_server()
+    except OSError as e:
+        # Another service already owns the socket or port
+        print(f"Player service not started: {e}")
+        return
+
+    mixer.init()
+    temp_dir = os.path.join(BASE_DIR, TEMP_DIR)
+    os.makedirs(temp_dir, exist_ok=True)
+    remove_legacy_downloads(temp_dir)
+    player = Player(mixer, history_size=PLAYER_SERVICE.get("history_size", 50))
+    server.player = player
+    server.stopping = threading.Event()
+    threading.Thread(
+        target=monitor, name="player-monitor", daemon=True,
+        args=(server, player, PLAYER_SERVICE.get("poll_ms", 200) / 1000, PLAYER_SERVICE.get("idle_exit_s")),
+    ).start()
+
+    host, port = server.server_address if path is None else (None, None)
+    print(f"Player service listening on {path or f'{host}:{port}'}")
+    try:
+        server.serve_forever()
+    finally:
+        server.stopping.set()
+        server.server_close()
+        player.close()
+        flush_play_events()
+        mixer.quit()
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Pre-aggregated reports for the Online Music System.
+
+Report queries never touch Listening_History or Songs directly. They read
+small aggregate tables that refresh_reports() keeps up to date:
+
+    Report_Plays_Daily        plays per day x genre x artist
+    Report_Plays_Monthly      the same cube per calendar month
+    Report_Active_Users_Daily distinct listeners and plays per day
+    Report_Uploads_Daily      songs uploaded and bytes added per day
+
+The refresh is incremental. Each aggregate has a watermark (the last day it
+was refreshed, see Rollup_Watermarks), and a run only recomputes the days
+from there, plus REPORTS["lookback_days"] more for plays that were
+ingested late. Each day is rebuilt in its own transaction. Days before the
+history rollup boundary are read from Listening_Daily, not raw history.
+
+Genre and artist ids of 0 stand for songs with no genre or artist.
+"""
+
+import time
+from datetime import date, datetime, timedelta
+from config import REPORTS
+from db_pool import get_connection
+from history_rollup import get_watermark, set_watermark, get_rollup_boundary, month_start, add_months
+
+PLAYS_WATERMARK = "report_plays"
+UPLOADS_WATERMARK = "report_uploads"
+
+REPORT_TABLES = ("Report_Plays_Daily", "Report_Plays_Monthly",
+                 "Report_Active_Users_Daily", "Report_Uploads_Daily")
+
+# ------------------- Refresh -------------------
+def plays_source(day, boundary):
+    """(sql, params) yielding (user_id, song_id, plays) rows for one day"""
+    if day < boundary:
+        return (
+            "SELECT user_id, song_id, plays FROM Listening_Daily WHERE play_date = %s",
+            (day,)
+        )
+    return (
+        """
+        SELECT user_id, song_id, 1 AS plays FROM Listening_History
+        WHERE played_at >= %s AND played_at < %s
+        """,
+        (day, day + timedelta(days=1))
+    )
+
+def refresh_play_day(cursor, day, boundary):
+    """Rebuild one day of the plays cube and the active-user counts"""
+    source_sql, source_params = plays_source(day, boundary)
+
+    cursor.execute("DELETE FROM Report_Plays_Daily WHERE play_date = %s", (day,))
+    cursor.execute(
+        f"""
+        INSERT INTO Report_Plays_Daily (play_date, genre_id, artist_id, plays)
+        SELECT %s, COALESCE(s.genre_id, 0), COALESCE(s.artist_id, 0), SUM(d.plays)
+        FROM ({source_sql}) d
+        JOIN Songs s ON d.song_id = s.song_id
+        GROUP BY COALESCE(s.genre_id, 0), COALESCE(s.artist_id, 0)
+        """,
+        (day,) + source_params
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO Report_Active_Users_Daily (play_date, active_users, plays)
+        SELECT %s, COUNT(DISTINCT d.user_id), COALESCE(SUM(d.plays), 0)
+        FROM ({source_sql}) d
+        ON DUPLICATE KEY UPDATE
+            active_users = VALUES(active_users),
+            plays = VALUES(plays)
+        """,
+        (day,) + source_params
+    )
+
+def refresh_play_month(cursor, month):
+    """Re-sum one month of the plays cube from its days"""
+    next_month = add_months(month, 1)
+    cursor.execute("DELETE FROM Report_Plays_Monthly WHERE month = %s", (month,))
+    cursor.execute(
+        """
+        INSERT INTO Report_Plays_Monthly (month, genre_id, artist_id, plays)
+        SELECT %s, genre_id, artist_id, SUM(plays)
+        FROM Report_Plays_Daily
+        WHERE play_date >= %s AND play_date < %s
+        GROUP BY genre_id, artist_id
+        """,
+        (month, month, next_month)
+    )
+
+def refresh_upload_day(cursor, day):
+    """Rebuild one day of upload counts"""
+    cursor.execute(
+        """
+        INSERT INTO Report_Uploads_Daily (upload_date, uploads, bytes_uploaded)
+        SELECT %s, COUNT(*), COALESCE(SUM(file_size), 0)
+        FROM Songs
+        WHERE upload_date >= %s AND upload_date < %s
+        ON DUPLICATE KEY UPDATE
+            uploads = VALUES(uploads),
+            bytes_uploaded = VALUES(bytes_uploaded)
+        """,
+        (day, day, day + timedelta(days=1))
+    )
+
+def first_refresh_day(cursor, name, oldest_sql, lookback_days, full):
+    """Day a refresh starts from: the watermark minus the lookback, or the
+    oldest source day for a first or full run"""
+    watermark = None if full else get_watermark(cursor, name)
+    if watermark is not None:
+        return watermark.date() - timedelta(days=lookback_days)
+    cursor.execute(oldest_sql)
+    oldest = cursor.fetchone()[0]
+    if oldest is None:
+        return date.today()
+    return oldest.date() if isinstance(oldest, datetime) else oldest
+
+def refresh_reports(connection, lookback_days=None, full=False):
+    """Bring every report aggregate up to date (today included)
+
+    Args:
+        connection: Open database connection
+        lookback_days: Already refreshed days to recompute
+        full: Rebuild every aggregate from scratch (picks up deleted songs
+              and changed genres/artists)
+
+    Returns:
+        Dict with the number of play days and upload days refreshed
+    """
+    if lookback_days is None:
+        lookback_days = REPORTS.get("lookback_days", 1)
+    cursor = connection.cursor()
+    start_time = time.perf_counter()
+    today = date.today()
+    try:
+        if full:
+            for table in REPORT_TABLES:
+                cursor.execute(f"DELETE FROM {table}")
+            connection.commit()
+
+        # Plays cube and active users
+        boundary = get_rollup_boundary(cursor)
+        day = first_refresh_day(
+            cursor, PLAYS_WATERMARK,
+            """
+            SELECT LEAST(COALESCE((SELECT MIN(play_date) FROM Listening_Daily), CURDATE()),
+                         COALESCE(DATE((SELECT MIN(played_at) FROM Listening_History)), CURDATE()))
+            """,
+            lookback_days, full
+        )
+        play_days = 0
+        months = set()
+        while day <= today:
+            refresh_play_day(cursor, day, boundary)
+            set_watermark(cursor, PLAYS_WATERMARK, day)
+            connection.commit()
+            months.add(month_start(day))
+            play_days += 1
+            day += timedelta(days=1)
+        for month in sorted(months):
+            refresh_play_month(cursor, month)
+            connection.commit()
+
+        # Uploads and storage
+        day = first_refresh_day(
+            cursor, UPLOADS_WATERMARK, "SELECT DATE(MIN(upload_date)) FROM Songs",
+            lookback_days, full
+        )
+        upload_days = 0
+        while day <= today:
+            refresh_upload_day(cursor, day)
+            set_watermark(cursor, UPLOADS_WATERMARK, day)
+            connection.commit()
+            upload_days += 1
+            day += timedelta(days=1)
+    finally:
+        cursor.close()
+
+    print(f"Refreshed reports: {play_days} play days, {upload_days} upload days "
+          f"in {time.perf_counter() - start_time:.1f}s")
+    return {"play_days": play_days, "upload_days": upload_days}
+
+# ------------------- Report Queries -------------------
+def cube_source(start, end):
+    """(sql, params) of (genre_id, artist_id, plays) rows covering start..end
+
+    Whole calendar months come from Report_Plays_Monthly and the partial
+    months at either end from Report_Plays_Daily, so a year-long report
+    reads about twelve months of rows, not 365 days of them.
+    """
+    first_month = month_start(start) if start.day == 1 else add_months(month_start(start), 1)
+    end_month = month_start(end + timedelta(days=1))  # First month not fully inside the range
+    if first_month >= end_month:
+        return (
+            "SELECT genre_id, artist_id, plays FROM Report_Plays_Daily "
+            "WHERE play_date >= %s AND play_date <= %s",
+            (start, end)
+        )
+    return (
+        """
+        SELECT genre_id, artist_id, plays FROM Report_Plays_Monthly
+        WHERE month >= %s AND month < %s
+        UNION ALL
+        SELECT genre_id, artist_id, plays FROM Report_Plays_Daily
+        WHERE (play_date >= %s AND play_date < %s) OR (play_date >= %s AND play_date <= %s)
+        """,
+        (first_month, end_month, start, first_month, end_month, end)
+    )
+
+def run_report(query, params):
+    """Run a report query on a pooled connection and return dict rows"""
+    connection = get_connection()
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+    finally:
+        connection.close()
+
+def get_daily_activity(start, end):
+    """Plays and active users per day, oldest first"""
+    return run_report(
+        """
+        SELECT play_date, plays, active_users
+        FROM Report_Active_Users_Daily
+        WHERE play_date >= %s AND play_date <= %s
+        ORDER BY play_date
+        """,
+        (start, end)
+    )
+
+def get_top_genres(start, end, limit=None):
+    """Genres by plays in the period"""
+    source_sql, source_params = cube_source(start, end)
+    return run_report(
+        f"""
+        SELECT c.genre_id, COALESCE(g.name, 'Unknown') as genre_name, SUM(c.plays) as plays
+        FROM ({source_sql}) c
+        LEFT JOIN Genres g ON c.genre_id = g.genre_id
+        GROUP BY c.genre_id, g.name
+        ORDER BY plays DESC
+        LIMIT %s
+        """,
+        source_params + (limit or REPORTS.get("top_n", 10),)
+    )
+
+def get_top_artists(start, end, limit=None, genre_id=None):
+    """Artists by plays in the period, optionally within one genre"""
+    source_sql, source_params = cube_source(start, end)
+    genre_filter = "WHERE c.genre_id = %s" if genre_id is not None else ""
+    genre_params = (genre_id,) if genre_id is not None else ()
+    return run_report(
+        f"""
+        SELECT c.artist_id, COALESCE(a.name, 'Unknown') as artist_name, SUM(c.plays) as plays
+        FROM ({source_sql}) c
+        LEFT JOIN Artists a ON c.artist_id = a.artist_id
+        {genre_filter}
+        GROUP BY c.artist_id, a.name
+        ORDER BY plays DESC
+        LIMIT %s
+        """,
+        source_params + genre_params + (limit or REPORTS.get("top_n", 10),)
+    )
+
+def get_uploads_by_day(start, end):
+    """Uploads, bytes added and total catalogue bytes per day, oldest first"""
+    return run_report(
+        """
+        SELECT upload_date, uploads, bytes_uploaded,
+               (SELECT COALESCE(SUM(bytes_uploaded), 0) FROM Report_Uploads_Daily
+                WHERE upload_date < %s)
+               + SUM(bytes_uploaded) OVER (ORDER BY upload_date) as storage_bytes
+        FROM Report_Uploads_Daily
+        WHERE upload_date >= %s AND upload_date <= %s
+        ORDER BY upload_date
+        """,
+        (start, start, end)
+    )
+
+def get_report_freshness():
+    """When each aggregate was last refreshed (None if never)"""
+    rows = run_report(
+        "SELECT name, updated_at FROM Rollup_Watermarks WHERE name IN (%s, %s)",
+        (PLAYS_WATERMARK, UPLOADS_WATERMARK)
+    )
+    freshness = {PLAYS_WATERMARK: None, UPLOADS_WATERMARK: None}
+    for row in rows:
+        freshness[row["name"]] = row["updated_at"]
+    return freshness
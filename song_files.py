@@ -0,0 +1,111 @@
+"""
+Streaming access to song audio for the Online Music System.
+
+Audio is never loaded whole: iter_song_chunks() yields fixed-size chunks
+read from the blob store, or via SUBSTRING() offset reads for legacy rows
+whose payload still sits in Song_Files.file_data. Peak memory stays at one
+chunk regardless of track size.
+"""
+
+import os
+import tempfile
+from db_pool import get_connection
+from blob_store import store_for_locator, CHUNK_SIZE
+
+def get_song_file(song_id):
+    """Get file metadata for a song without touching the payload
+
+    Returns:
+        Dict with file_type, file_size, content_hash, storage_locator and
+        inline_size (bytes still stored in file_data), or None
+    """
+    connection = get_connection()
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT s.file_type, s.file_size, f.content_hash, f.storage_locator,
+                   LENGTH(f.file_data) AS inline_size
+            FROM Songs s
+            JOIN Song_Files f ON s.song_id = f.song_id
+            WHERE s.song_id = %s
+            """,
+            (song_id,)
+        )
+        song_file = cursor.fetchone()
+        cursor.close()
+        return song_file
+    finally:
+        connection.close()
+
+def iter_song_chunks(song_id, chunk_size=CHUNK_SIZE, song_file=None):
+    """Yield a song's audio in chunks of at most chunk_size bytes
+
+    Args:
+        song_id: Song to read
+        chunk_size: Maximum bytes per chunk
+        song_file: Result of get_song_file(), if the caller already has it
+    """
+    if song_file is None:
+        song_file = get_song_file(song_id)
+        if song_file is None:
+            return
+
+    if song_file["storage_locator"]:
+        locator = song_file["storage_locator"]
+        yield from store_for_locator(locator).iter_chunks(locator, chunk_size)
+        return
+
+    # Legacy row - read file_data in slices so only one chunk is in memory
+    length = song_file["inline_size"] or 0
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        offset = 1  # SUBSTRING is 1-based
+        while offset <= length:
+            cursor.execute(
+                "SELECT SUBSTRING(file_data, %s, %s) FROM Song_Files WHERE song_id = %s",
+                (offset, chunk_size, song_id)
+            )
+            row = cursor.fetchone()
+            if not row or not row[0]:
+                break
+            chunk = bytes(row[0])
+            offset += len(chunk)
+            yield chunk
+        cursor.close()
+    finally:
+        connection.close()
+
+def copy_chunks(chunks, fileobj):
+    """Write a chunk stream to any writable file-like object (file, socket.makefile())
+
+    Returns:
+        Number of bytes written
+    """
+    written = 0
+    for chunk in chunks:
+        fileobj.write(chunk)
+        written += len(chunk)
+    return written
+
+def save_chunks(chunks, path):
+    """Write a chunk stream to path atomically (temp file + rename)
+
+    Other readers never see a half-written file.
+
+    Returns:
+        Number of bytes written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".part-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            written = copy_chunks(chunks, f)
+        os.replace(tmp_path, path)
+        return written
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,229 @@
+"""
+Materialized per-song play counters for the Online Music System.
+
+Song_Stats holds play_count, last_played_at and plays_7d (plays in the last
+seven days) for every song, so popularity lists are an index range scan on
+Song_Stats instead of a GROUP BY over all of Listening_History.
+
+The counters are maintained incrementally: record_plays() writes the
+history rows and bumps the counters in the caller's transaction, and
+remove_user_plays() takes a deleted user's plays back off them.
+plays_7d only ever grows between refreshes, so refresh_recent_plays()
+recomputes it from the last seven days of history (tools/rollup_history.py
+runs it daily, tools/reconcile_song_stats.py --recent-only on demand), and
+rebuild_song_stats() reconciles every counter against the history and its
+daily rollups (see tools/reconcile_song_stats.py).
+"""
+
+import time
+from datetime import datetime, timedelta
+from history_rollup import get_rollup_boundary
+from counters import add_plays
+from activity_log import log_song_plays
+
+RECENT_DAYS = 7
+REBUILD_BATCH = 5000  # Songs reconciled per transaction
+
+# ------------------- Incremental Maintenance -------------------
+def record_plays(cursor, plays):
+    """Insert listening history rows and update Song_Stats to match
+
+    Runs on the caller's cursor; the caller commits, so history and counters
+    change together.
+
+    Args:
+        plays: Iterable of (user_id, song_id, played_at) or
+               (user_id, song_id, played_at, event_id); played_at may be
+               None for "now", event_id is the spooled event's 16-byte id
+    """
+    now = datetime.now()
+    recent_cutoff = now - timedelta(days=RECENT_DAYS)
+    history_rows = []
+    per_song = {}  # song_id -> [plays, last_played_at, recent plays]
+
+    for play in plays:
+        user_id, song_id, played_at = play[:3]
+        event_id = play[3] if len(play) > 3 else None
+        played_at = played_at or now
+        history_rows.append((user_id, song_id, played_at, event_id))
+        stats = per_song.setdefault(song_id, [0, played_at, 0])
+        stats[0] += 1
+        stats[1] = max(stats[1], played_at)
+        if played_at >= recent_cutoff:
+            stats[2] += 1
+
+    if not history_rows:
+        return 0
+
+    cursor.executemany(
+        "INSERT INTO Listening_History (user_id, song_id, played_at, event_id) VALUES (%s, %s, %s, %s)",
+        history_rows
+    )
+    # Sorted by song_id so concurrent writers lock Song_Stats rows in the same order
+    cursor.executemany(
+        """
+        INSERT INTO Song_Stats (song_id, play_count, last_played_at, plays_7d)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            play_count = play_count + VALUES(play_count),
+            last_played_at = GREATEST(COALESCE(last_played_at, VALUES(last_played_at)),
+                                      VALUES(last_played_at)),
+            plays_7d = plays_7d + VALUES(plays_7d)
+        """,
+        [(song_id, count, last_played, recent)
+         for song_id, (count, last_played, recent) in sorted(per_song.items())]
+    )
+    # Dashboard total, bumped once per batch (see counters.py)
+    add_plays(cursor, len(history_rows))
+    # Admin activity feed
+    log_song_plays(cursor, history_rows)
+    return len(history_rows)
+
+def remove_user_plays(cursor, user_id):
+    """Delete a user's listening history and take their plays off the counters
+
+    Runs on the caller's cursor before the user is deleted; the caller
+    commits, so history and counters change together. last_played_at is
+    left as is until the next rebuild_song_stats().
+
+    Returns:
+        Number of plays removed
+    """
+    boundary = get_rollup_boundary(cursor)
+    recent_cutoff = datetime.now() - timedelta(days=RECENT_DAYS)
+    cursor.execute(
+        """
+        SELECT song_id, SUM(plays), SUM(recent)
+        FROM (
+            SELECT song_id, plays, 0 AS recent
+            FROM Listening_Daily
+            WHERE user_id = %s AND play_date < %s
+            UNION ALL
+            SELECT song_id, played_at >= %s, played_at >= %s
+            FROM Listening_History
+            WHERE user_id = %s AND played_at >= LEAST(%s, %s)
+        ) p
+        GROUP BY song_id
+        ORDER BY song_id
+        """,
+        (user_id, boundary, boundary, recent_cutoff, user_id, boundary, recent_cutoff)
+    )
+    per_song = [(int(plays), int(recent), song_id) for song_id, plays, recent in cursor.fetchall()]
+
+    if per_song:
+        # In song_id order, like record_plays, so concurrent writers lock rows alike
+        cursor.executemany(
+            """
+            UPDATE Song_Stats
+            SET play_count = GREATEST(play_count - %s, 0), plays_7d = GREATEST(plays_7d - %s, 0)
+            WHERE song_id = %s
+            """,
+            per_song
+        )
+    removed = sum(plays for plays, _, _ in per_song)
+    add_plays(cursor, -removed)
+
+    # History is partitioned, so it has no cascading foreign keys
+    cursor.execute("DELETE FROM Listening_History WHERE user_id = %s", (user_id,))
+    cursor.execute("DELETE FROM Listening_Daily WHERE user_id = %s", (user_id,))
+    return removed
+
+def record_play(cursor, user_id, song_id):
+    """Record a single play (see record_plays)"""
+    return record_plays(cursor, [(user_id, song_id, None)])
+
+def ensure_song_stats(cursor, song_id):
+    """Create the zero-count row for a new song"""
+    cursor.execute("INSERT IGNORE INTO Song_Stats (song_id) VALUES (%s)", (song_id,))
+
+# ------------------- Reconciliation -------------------
+def rebuild_song_stats(connection, batch_size=REBUILD_BATCH):
+    """Recompute every counter from Listening_History and Listening_Daily
+
+    Works through Songs in song_id ranges, one transaction per range, so it
+    can run alongside normal traffic. Plays recorded while a range is being
+    rebuilt are picked up by the next run.
+
+    Returns:
+        Number of songs reconciled
+    """
+    cursor = connection.cursor()
+    start = time.perf_counter()
+    last_song_id = 0
+    songs = 0
+
+    try:
+        # Days before the boundary come from Listening_Daily (their raw
+        # partitions may be gone); plays_7d always comes from raw history
+        boundary = get_rollup_boundary(cursor)
+        recent_cutoff = datetime.now() - timedelta(days=RECENT_DAYS)
+        while True:
+            cursor.execute(
+                "SELECT song_id FROM Songs WHERE song_id > %s ORDER BY song_id LIMIT %s",
+                (last_song_id, batch_size)
+            )
+            song_ids = [row[0] for row in cursor.fetchall()]
+            if not song_ids:
+                break
+
+            cursor.execute(
+                """
+                INSERT INTO Song_Stats (song_id, play_count, last_played_at, plays_7d)
+                SELECT s.song_id, COALESCE(SUM(p.plays), 0), MAX(p.last_played_at),
+                       COALESCE(SUM(p.recent), 0)
+                FROM Songs s
+                LEFT JOIN (
+                    SELECT song_id, plays, last_played_at, 0 AS recent
+                    FROM Listening_Daily
+                    WHERE song_id BETWEEN %s AND %s AND play_date < %s
+                    UNION ALL
+                    SELECT song_id, played_at >= %s, played_at, played_at >= %s
+                    FROM Listening_History
+                    WHERE song_id BETWEEN %s AND %s AND played_at >= LEAST(%s, %s)
+                ) p ON p.song_id = s.song_id
+                WHERE s.song_id BETWEEN %s AND %s
+                GROUP BY s.song_id
+                ON DUPLICATE KEY UPDATE
+                    play_count = VALUES(play_count),
+                    last_played_at = VALUES(last_played_at),
+                    plays_7d = VALUES(plays_7d)
+                """,
+                (song_ids[0], song_ids[-1], boundary,
+                 boundary, recent_cutoff,
+                 song_ids[0], song_ids[-1], boundary, recent_cutoff,
+                 song_ids[0], song_ids[-1])
+            )
+            connection.commit()
+            songs += len(song_ids)
+            last_song_id = song_ids[-1]
+    finally:
+        cursor.close()
+
+    print(f"Reconciled Song_Stats for {songs} songs in {time.perf_counter() - start:.1f}s")
+    return songs
+
+def refresh_recent_plays(connection):
+    """Recompute plays_7d from the last seven days of history
+
+    Uses the (played_at, song_id) index, so only the recent window is read.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute("UPDATE Song_Stats SET plays_7d = 0 WHERE plays_7d > 0")
+        cursor.execute(
+            """
+            UPDATE Song_Stats st
+            JOIN (
+                SELECT song_id, COUNT(*) AS plays
+                FROM Listening_History
+                WHERE played_at >= NOW() - INTERVAL %s DAY
+                GROUP BY song_id
+            ) recent ON recent.song_id = st.song_id
+            SET st.plays_7d = recent.plays
+            """,
+            (RECENT_DAYS,)
+        )
+        connection.commit()
+        return cursor.rowcount
+    finally:
+        cursor.close()
@@ -0,0 +1,166 @@
+"""
+Single-pass upload pipeline for the Online Music System.
+
+An uploaded file is read exactly once, in fixed-size chunks, straight into
+the blob store, which hashes it on the way through. Duration and tags are
+then parsed with mutagen from the staged blob (headers only, no second full
+read), and the Songs and Song_Files rows are written in one transaction.
+Nothing ever holds the whole track in memory or sends it to MySQL.
+"""
+
+import os
+import importlib
+from db_pool import get_connection
+from blob_store import get_blob_store, release_blob, CHUNK_SIZE
+from song_stats import ensure_song_stats
+from data_client import invalidate
+
+# Parser per file extension as (mutagen module, class); anything else goes
+# through mutagen.File. mutagen is imported on the first upload, not with the page.
+AUDIO_PARSERS = {
+    "mp3": ("mutagen.mp3", "EasyMP3"),
+    "flac": ("mutagen.flac", "FLAC"),
+    "wav": ("mutagen.wave", "WAVE"),
+    "wave": ("mutagen.wave", "WAVE"),
+}
+
+# Tag name -> keys to try (easy/Vorbis names first, then raw ID3 frames)
+TAG_KEYS = {
+    "title": ("title", "TIT2"),
+    "artist": ("artist", "TPE1"),
+    "album": ("album", "TALB"),
+    "genre": ("genre", "TCON"),
+}
+
+# ------------------- Streaming -------------------
+def iter_file_chunks(file_path, chunk_size=CHUNK_SIZE):
+    """Yield a file's contents in chunks of at most chunk_size bytes"""
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+# ------------------- Metadata -------------------
+def read_audio_info(fileobj, file_type):
+    """Parse duration and tags from an open audio file
+
+    Returns:
+        (duration in whole seconds, dict of tags) - (0, {}) if unreadable
+    """
+    try:
+        if file_type in AUDIO_PARSERS:
+            module_name, class_name = AUDIO_PARSERS[file_type]
+            audio = getattr(importlib.import_module(module_name), class_name)(fileobj)
+        else:
+            import mutagen
+            audio = mutagen.File(fileobj, easy=True)
+        if audio is None:
+            return 0, {}
+    except Exception as e:
+        print(f"Error reading audio metadata: {e}")
+        return 0, {}
+
+    duration = int(audio.info.length) if audio.info else 0
+
+    tags = {}
+    if audio.tags:
+        for name, keys in TAG_KEYS.items():
+            for key in keys:
+                try:
+                    value = audio.tags[key]
+                except (KeyError, ValueError):
+                    continue
+                # Easy/Vorbis tags are lists, ID3 frames carry .text
+                value = getattr(value, "text", value)
+                if isinstance(value, list):
+                    value = value[0] if value else None
+                if value:
+                    tags[name] = str(value)
+                    break
+
+    return duration, tags
+
+# ------------------- Pipeline -------------------
+def ingest_file(file_path, chunk_size=CHUNK_SIZE):
+    """Stream an audio file into the blob store and extract its metadata
+
+    The caller owns one reference to the returned storage_locator and must
+    release_blob() it if the song row is never created.
+
+    Returns:
+        Dict with content_hash, storage_locator, file_size, file_type,
+        duration and tags
+    """
+    file_type = os.path.splitext(file_path)[1][1:].lower()  # Extension without dot
+
+    store = get_blob_store()
+    content_hash, storage_locator, file_size = store.write_stream(
+        iter_file_chunks(file_path, chunk_size)
+    )
+
+    try:
+        with store.open(storage_locator) as f:
+            duration, tags = read_audio_info(f, file_type)
+    except Exception:
+        release_blob(storage_locator)
+        raise
+
+    return {
+        "content_hash": content_hash,
+        "storage_locator": storage_locator,
+        "file_size": file_size,
+        "file_type": file_type,
+        "duration": duration,
+        "tags": tags,
+    }
+
+def upload_song_file(file_path, title, artist_id, genre_id=None, album_id=None):
+    """Store an audio file and create its Songs + Song_Files rows
+
+    Args:
+        file_path: Audio file to upload
+        title: Song title; falls back to the file's title tag, then its name
+        artist_id, genre_id, album_id: Catalog references
+
+    Returns:
+        New song_id (raises on failure; nothing is left behind)
+    """
+    info = ingest_file(file_path)
+    storage_locator = info["storage_locator"]
+
+    if not title:
+        title = info["tags"].get("title") or os.path.splitext(os.path.basename(file_path))[0]
+
+    connection = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO Songs (title, artist_id, album_id, genre_id, duration, file_type, file_size)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            (title, artist_id, album_id, genre_id, info["duration"], info["file_type"], info["file_size"])
+        )
+        song_id = cursor.lastrowid
+
+        # Payload pointer goes in the 1:1 Song_Files table, same transaction
+        cursor.execute(
+            "INSERT INTO Song_Files (song_id, content_hash, storage_locator) VALUES (%s, %s, %s)",
+            (song_id, info["content_hash"], storage_locator)
+        )
+        ensure_song_stats(cursor, song_id)
+        connection.commit()
+        cursor.close()
+        storage_locator = None  # Now owned by the Song_Files row
+        # New song (and maybe a new artist) for every window's song lists
+        invalidate("songs", "lookups")
+        return song_id
+    finally:
+        # Drop the blob reference if the song row was never created
+        if storage_locator:
+            release_blob(storage_locator)
+        if connection:
+            connection.close()
@@ -0,0 +1,12 @@
+"""
+Shared setup for the unit tests.
+
+The tests cover pure logic only (no MySQL server or display); modules are
+imported from the repository root like the tools/ scripts do.
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
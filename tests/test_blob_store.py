@@ -0,0 +1,52 @@
+"""
+Tests for content addressing and refcounting in blob_store.py.
+"""
+
+import os
+import hashlib
+import pytest
+from blob_store import LocalBlobStore
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalBlobStore(str(tmp_path / "audio_store"))
+
+def refcount(store, locator):
+    return store._read_refcount(store.hash_from_locator(locator))
+
+def test_write_stream_is_content_addressed(store):
+    content_hash, locator, size = store.write_stream([b"abc", b"def"])
+    assert content_hash == hashlib.sha256(b"abcdef").hexdigest()
+    assert locator == f"local:{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+    assert size == 6
+    assert b"".join(store.iter_chunks(locator, chunk_size=4)) == b"abcdef"
+    assert store.verify(locator)
+    assert os.listdir(store.tmp_dir) == []
+
+def test_identical_content_shares_one_blob(store):
+    _, first, _ = store.write_stream([b"same"])
+    _, second, _ = store.write_stream([b"same"])
+    assert first == second
+    assert refcount(store, first) == 2
+
+def test_blob_is_deleted_with_its_last_reference(store):
+    _, locator, _ = store.write_stream([b"payload"])
+    store.add_ref(locator, 2)
+    assert refcount(store, locator) == 3
+
+    assert store.release(locator) == 2
+    assert store.release(locator) == 1
+    assert store.exists(locator)
+
+    assert store.release(locator) == 0
+    assert not store.exists(locator)
+    assert refcount(store, locator) == 0
+
+def test_release_never_goes_negative(store):
+    _, locator, _ = store.write_stream([b"payload"])
+    assert store.release(locator) == 0
+    assert store.release(locator) == 0
+
+def test_add_ref_to_a_missing_blob_fails(store):
+    with pytest.raises(FileNotFoundError):
+        store.add_ref(store.locator_for("0" * 64))
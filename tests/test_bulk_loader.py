@@ -0,0 +1,96 @@
+"""
+Tests for the CSV encoding and statement building in bulk_loader.py.
+"""
+
+import pytest
+from bulk_loader import BulkLoader, bulk_insert, csv_field
+
+class FakeCursor:
+    """Records statements; keeps the CSV of a LOAD DATA before it is removed"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, params=()):
+        self.connection.statements.append((" ".join(query.split()), params))
+        if "LOAD DATA" in query:
+            with open(params[0], "r", encoding="utf-8") as f:
+                self.connection.csv_files.append(f.read())
+
+    def executemany(self, query, rows):
+        self.connection.statements.append((query, list(rows)))
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+        self.csv_files = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+# ------------------- csv_field -------------------
+@pytest.mark.parametrize("value, expected", [
+    (None, "NULL"),
+    (True, "1"),
+    (False, "0"),
+    (42, "42"),
+    (1.5, "1.5"),
+    ("plain", '"plain"'),
+    ('say "hi"', '"say ""hi"""'),
+    ("a,b\nc", '"a,b\nc"'),
+    (b"\x00\xffA", '"00ff41"'),
+    (bytearray(b"\x10"), '"10"'),
+])
+def test_csv_field(value, expected):
+    assert csv_field(value) == expected
+
+# ------------------- LOAD DATA -------------------
+def test_infile_hex_encodes_binary_columns_and_unhexes_them():
+    connection = FakeConnection()
+    bulk_insert(connection, "Listening_History", ("user_id", "song_id", "event_id"),
+                [(1, 2, b"\xab\xcd"), (3, 4, b"\x01\x02")], method="infile", report=False)
+
+    query, _ = connection.statements[0]
+    assert "(user_id, song_id, @event_id)" in query
+    assert "SET event_id = UNHEX(@event_id)" in query
+    assert connection.csv_files == ['1,2,"abcd"\n3,4,"0102"\n']
+
+def test_infile_without_binary_columns_has_no_set_clause():
+    connection = FakeConnection()
+    bulk_insert(connection, "Genres", ("genre_id", "name"), [(1, "Pop")], method="infile", report=False)
+
+    query, _ = connection.statements[0]
+    assert "(genre_id, name)" in query
+    assert "UNHEX" not in query
+    assert connection.csv_files == ['1,"Pop"\n']
+
+# ------------------- Batching -------------------
+def test_values_method_writes_one_statement_per_batch():
+    connection = FakeConnection()
+    stats = bulk_insert(connection, "Genres", ("genre_id", "name"),
+                        [(i, f"g{i}") for i in range(5)], batch_size=2, method="values",
+                        ignore=True, report=False)
+
+    assert stats["rows"] == 5 and stats["batches"] == 3
+    query, params = connection.statements[0]
+    assert query == "INSERT IGNORE INTO Genres (genre_id, name) VALUES (%s, %s), (%s, %s)"
+    assert params == [0, "g0", 1, "g1"]
+    assert connection.commits == 3
+
+def test_commit_false_leaves_the_transaction_to_the_caller():
+    connection = FakeConnection()
+    bulk_insert(connection, "Genres", ("genre_id", "name"), [(1, "Pop"), (2, "Rock")],
+                batch_size=1, method="executemany", report=False, commit=False)
+    assert len(connection.statements) == 2
+    assert connection.commits == 0
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        BulkLoader(FakeConnection(), "Genres", ("name",), method="copy")
@@ -0,0 +1,116 @@
+"""
+Tests for the rollup watermark in history_rollup.py.
+
+The rollup runs against an in-memory stand-in for the few statements it
+issues; watermark writes and rolled-up days only count once committed.
+"""
+
+import pytest
+from datetime import date, datetime, time, timedelta
+from history_rollup import (rollup_listening_history, ROLLUP_WATERMARK, RAW_FLOOR_WATERMARK,
+                            add_months, month_start, partition_definition)
+
+class FakeHistoryDB:
+    def __init__(self, first_play=None, watermarks=None, fail_on_day=None):
+        self.first_play = first_play
+        self.watermarks = dict(watermarks or {})
+        self.fail_on_day = fail_on_day
+        self.rolled_days = []
+        self._pending_watermarks = {}
+        self._pending_days = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.watermarks.update(self._pending_watermarks)
+        self.rolled_days.extend(self._pending_days)
+        self._pending_watermarks = {}
+        self._pending_days = []
+
+    def watermark(self, name):
+        value = self.watermarks.get(name)
+        return value.date() if value else None
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = None
+
+    def execute(self, query, params=()):
+        query = " ".join(query.split())
+        if query.startswith("SELECT watermark FROM Rollup_Watermarks"):
+            name = params[0]
+            value = self.db._pending_watermarks.get(name, self.db.watermarks.get(name))
+            self.result = (value,) if value else None
+        elif query.startswith("SELECT MIN(played_at)"):
+            self.result = (self.db.first_play,)
+        elif query.startswith("INSERT INTO Listening_Daily"):
+            day = params[0]
+            if day == self.db.fail_on_day:
+                raise RuntimeError("lost connection")
+            self.db._pending_days.append(day)
+        elif query.startswith("INSERT INTO Rollup_Watermarks"):
+            name, value = params
+            self.db._pending_watermarks[name] = datetime.combine(value, time())
+
+    def fetchone(self):
+        return self.result
+
+    def close(self):
+        pass
+
+def at(day):
+    return datetime.combine(day, time())
+
+TODAY = date.today()
+
+# ------------------- Watermark -------------------
+def test_first_run_rolls_every_complete_day_and_moves_the_boundary_to_today():
+    db = FakeHistoryDB(first_play=at(TODAY - timedelta(days=3)) + timedelta(hours=5))
+    assert rollup_listening_history(db, lookback_days=2) == 3
+    assert db.rolled_days == [TODAY - timedelta(days=n) for n in (3, 2, 1)]
+    assert db.watermark(ROLLUP_WATERMARK) == TODAY
+
+def test_failure_leaves_the_boundary_at_the_first_unrolled_day():
+    first = TODAY - timedelta(days=4)
+    db = FakeHistoryDB(first_play=at(first), fail_on_day=first + timedelta(days=2))
+    with pytest.raises(RuntimeError):
+        rollup_listening_history(db, lookback_days=2)
+    assert db.rolled_days == [first, first + timedelta(days=1)]
+    assert db.watermark(ROLLUP_WATERMARK) == first + timedelta(days=2)
+
+def test_failure_on_the_first_day_never_moves_the_boundary_past_it():
+    first = TODAY - timedelta(days=2)
+    db = FakeHistoryDB(first_play=at(first), fail_on_day=first)
+    with pytest.raises(RuntimeError):
+        rollup_listening_history(db, lookback_days=2)
+    assert db.rolled_days == []
+    assert db.watermark(ROLLUP_WATERMARK) is None
+
+def test_rerun_recomputes_the_lookback_days_without_moving_back():
+    db = FakeHistoryDB(watermarks={ROLLUP_WATERMARK: at(TODAY)})
+    assert rollup_listening_history(db, lookback_days=2) == 2
+    assert db.rolled_days == [TODAY - timedelta(days=2), TODAY - timedelta(days=1)]
+    assert db.watermark(ROLLUP_WATERMARK) == TODAY
+
+def test_days_below_the_raw_floor_are_never_recomputed():
+    db = FakeHistoryDB(watermarks={ROLLUP_WATERMARK: at(TODAY),
+                                   RAW_FLOOR_WATERMARK: at(TODAY - timedelta(days=1))})
+    assert rollup_listening_history(db, lookback_days=5) == 1
+    assert db.rolled_days == [TODAY - timedelta(days=1)]
+
+def test_empty_history_starts_the_boundary_today():
+    db = FakeHistoryDB()
+    assert rollup_listening_history(db) == 0
+    assert db.watermark(ROLLUP_WATERMARK) == TODAY
+
+# ------------------- Partitions -------------------
+def test_months_wrap_across_years():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert month_start(date(2026, 3, 31)) == date(2026, 3, 1)
+
+def test_partition_holds_one_calendar_month():
+    assert partition_definition(date(2025, 12, 1)) == \
+        "PARTITION p202512 VALUES LESS THAN ('2026-01-01')"
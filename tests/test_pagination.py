@@ -0,0 +1,66 @@
+"""
+Tests for the keyset pagination helpers in pagination.py.
+"""
+
+from pagination import keyset_condition, keyset_params, fetch_page, SONG_KEY
+
+class RecordingCursor:
+    """Dictionary cursor stand-in that records the query and returns fixed rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.query = None
+        self.params = None
+
+    def execute(self, query, params=()):
+        self.query = query
+        self.params = list(params)
+
+    def fetchall(self):
+        return self.rows
+
+# ------------------- keyset_condition -------------------
+def test_single_column_is_a_plain_comparison():
+    assert keyset_condition(["s.song_id"]) == "s.song_id < %s"
+
+def test_two_columns_expand_to_a_range_condition():
+    assert keyset_condition(["s.upload_date", "s.song_id"]) == (
+        "s.upload_date < %s OR (s.upload_date = %s AND s.song_id < %s)"
+    )
+
+def test_three_columns_repeat_every_prefix():
+    assert keyset_condition(["a", "b", "c"]) == (
+        "a < %s OR (a = %s AND b < %s) OR (a = %s AND b = %s AND c < %s)"
+    )
+
+def test_params_match_the_condition_placeholders():
+    columns = ["a", "b", "c"]
+    params = keyset_params((1, 2, 3))
+    assert params == [1, 1, 2, 1, 2, 3]
+    assert len(params) == keyset_condition(columns).count("%s")
+
+# ------------------- fetch_page -------------------
+def test_extra_row_yields_a_cursor_from_the_last_returned_row():
+    rows = [{"upload_date": f"d{i}", "song_id": i} for i in (5, 4, 3)]
+    cursor = RecordingCursor(rows)
+
+    page, next_cursor = fetch_page(cursor, "SELECT * FROM Songs s", SONG_KEY, page_size=2)
+
+    assert page == rows[:2]
+    assert next_cursor == ("d4", 4)
+    assert cursor.params == [3]  # page_size + 1
+    assert cursor.query.endswith("ORDER BY s.upload_date DESC, s.song_id DESC LIMIT %s")
+
+def test_last_page_has_no_cursor():
+    rows = [{"upload_date": "d1", "song_id": 1}]
+    page, next_cursor = fetch_page(RecordingCursor(rows), "SELECT * FROM Songs s", SONG_KEY, page_size=2)
+    assert page == rows
+    assert next_cursor is None
+
+def test_cursor_and_filter_parameters_follow_the_query_order():
+    cursor = RecordingCursor([])
+    fetch_page(cursor, "SELECT * FROM Songs s", SONG_KEY, after=("d4", 4), page_size=2,
+               where="s.genre_id = %s", params=(7,))
+
+    assert "WHERE (s.genre_id = %s) AND (s.upload_date < %s OR" in cursor.query
+    assert cursor.params == [7, "d4", "d4", 4, 3]
@@ -0,0 +1,111 @@
+"""
+Tests for the PlaySpool segment state machine in play_events.py.
+"""
+
+import os
+import json
+import time
+import uuid
+import pytest
+from datetime import datetime
+from play_events import PlaySpool, OPEN, READY, INGESTING, FAILED
+
+def event(song_id=1):
+    return {"user_id": 7, "song_id": song_id, "played_at": datetime(2026, 1, 2, 3, 4, 5).isoformat(),
+            "event_id": uuid.uuid4().hex}
+
+def names(spool):
+    return sorted(os.listdir(spool.spool_dir))
+
+def states(spool):
+    return sorted(os.path.splitext(name)[1] for name in names(spool))
+
+def write_segment(spool, name, lines, age=0):
+    """Segment left by another process, last touched age seconds ago"""
+    path = os.path.join(spool.spool_dir, name)
+    with open(path, "wb") as f:
+        f.write(b"".join(lines))
+    if age:
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+    return path
+
+@pytest.fixture
+def spool(tmp_path):
+    return PlaySpool(str(tmp_path / "spool"), fsync=False, stale_after_s=300, max_attempts=3)
+
+# ------------------- Append / Seal / Claim -------------------
+def test_append_seal_claim_read(spool):
+    first, second = event(1), event(2)
+    spool.append(first)
+    spool.append(second)
+    assert states(spool) == [OPEN]
+    assert spool.unsealed == 2
+
+    assert spool.seal()
+    assert states(spool) == [READY]
+    assert not spool.seal()  # Nothing open any more
+
+    claimed = spool.claim()
+    assert [os.path.splitext(path)[1] for path in claimed] == [INGESTING]
+    events, corrupt = spool.read_events(claimed[0])
+    assert corrupt == 0
+    assert [e[1] for e in events] == [1, 2]
+    assert events[0][3] == bytes.fromhex(first["event_id"])
+
+def test_claim_skips_own_open_segment_and_live_segments_of_others(spool):
+    spool.append(event())
+    write_segment(spool, "00000000000000000001-99999" + OPEN, [b"{}\n"])
+    write_segment(spool, "00000000000000000002-99999" + INGESTING, [b"{}\n"])
+    assert spool.claim() == []
+    assert states(spool) == [INGESTING, OPEN, OPEN]
+
+def test_claim_takes_over_abandoned_segments(spool):
+    write_segment(spool, "00000000000000000001-99999" + OPEN, [b"{}\n"], age=600)
+    write_segment(spool, "00000000000000000002-99999" + INGESTING, [b"{}\n"], age=600)
+    claimed = spool.claim()
+    assert len(claimed) == 2
+    assert states(spool) == [INGESTING, INGESTING]
+
+def test_owner_keeps_recording_after_its_segment_is_claimed(spool):
+    other = PlaySpool(spool.spool_dir, fsync=False, stale_after_s=0)
+    spool.append(event(1))
+    assert len(other.claim()) == 1
+
+    assert not spool.seal()  # Already claimed - not an error
+    spool.append(event(2))
+    assert spool.seal()
+    assert states(spool) == [INGESTING, READY]
+
+def test_torn_last_line_is_counted_and_skipped(spool):
+    good = (json.dumps(event()) + "\n").encode()
+    path = write_segment(spool, "00000000000000000001-99999" + READY, [good, b'{"user_id": 7, "so'])
+    events, corrupt = spool.read_events(path)
+    assert len(events) == 1
+    assert corrupt == 1
+
+# ------------------- Failures -------------------
+def test_outage_returns_segment_without_counting_an_attempt(spool):
+    spool.append(event())
+    spool.seal()
+    path = spool.claim()[0]
+    assert spool.unclaim(path) is False
+    assert names(spool) == [os.path.basename(path)[:-len(INGESTING)] + READY]
+
+def test_rejected_segment_is_quarantined_after_max_attempts(spool):
+    spool.append(event())
+    spool.seal()
+    stem = os.path.splitext(names(spool)[0])[0]
+
+    for attempt in (1, 2):
+        assert spool.unclaim(spool.claim()[0], rejected=True) is False
+        assert names(spool) == [f"{stem}~{attempt}{READY}"]
+
+    assert spool.unclaim(spool.claim()[0], rejected=True) is True
+    assert names(spool) == [stem + FAILED]
+    assert spool.claim() == []  # Quarantined segments are not retried
+    assert spool.get_backlog() == (0, 0)
+    assert spool.get_backlog(states=(FAILED,))[0] == 1
+
+    assert spool.requeue_failed() == 1
+    assert names(spool) == [stem + READY]
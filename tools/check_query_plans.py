@@ -0,0 +1,157 @@
+"""
+EXPLAIN-based check that the hot queries use indexes.
+
+Every registered query is run through EXPLAIN and the check fails if any
+table in its plan is read with a full table scan (access type ALL). Run it
+against a database with realistic row counts - on a near-empty database the
+optimizer may legitimately prefer scanning a handful of rows.
+
+Usage:
+    python tools/check_query_plans.py [--analyze]
+"""
+
+import os
+import sys
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, timedelta
+from db_pool import get_connection
+from history_rollup import USER_PLAYS_SQL
+
+SAMPLE_USER_ID = 1
+SAMPLE_LIMIT = 10
+SAMPLE_BOUNDARY = date.today() - timedelta(days=1)  # Rollup boundary for the rollup + raw queries
+
+# (name, sql, params) - the access paths indexed by migrations 1, 3 and 5 in db_migrations.py
+HOT_QUERIES = [
+    (
+        "User listening history (recom.get_user_listening_history)",
+        f"""
+        SELECT s.song_id, s.title, a.name as artist_name, g.genre_id, g.name as genre_name,
+               up.plays as play_count
+        FROM ({USER_PLAYS_SQL}) up
+        JOIN Songs s ON up.song_id = s.song_id
+        JOIN Artists a ON s.artist_id = a.artist_id
+        LEFT JOIN Genres g ON s.genre_id = g.genre_id
+        ORDER BY up.last_played_at DESC
+        LIMIT %s
+        """,
+        (SAMPLE_USER_ID, SAMPLE_BOUNDARY, SAMPLE_USER_ID, SAMPLE_BOUNDARY, SAMPLE_LIMIT),
+    ),
+    (
+        "Recently played by user",
+        """
+        SELECT song_id, played_at FROM Listening_History
+        WHERE user_id = %s
+        ORDER BY played_at DESC
+        LIMIT %s
+        """,
+        (SAMPLE_USER_ID, SAMPLE_LIMIT),
+    ),
+    (
+        "Play counts grouped by song",
+        """
+        SELECT song_id, COUNT(*) AS play_count FROM Listening_History
+        GROUP BY song_id
+        ORDER BY play_count DESC
+        LIMIT %s
+        """,
+        (SAMPLE_LIMIT,),
+    ),
+    (
+        "Newest songs",
+        """
+        SELECT s.song_id, s.title, a.name as artist_name
+        FROM Songs s
+        JOIN Artists a ON s.artist_id = a.artist_id
+        ORDER BY s.upload_date DESC
+        LIMIT %s
+        """,
+        (SAMPLE_LIMIT,),
+    ),
+    (
+        "Most played songs (Song_Stats)",
+        """
+        SELECT s.song_id, s.title, a.name as artist_name, st.play_count
+        FROM Song_Stats st
+        JOIN Songs s ON st.song_id = s.song_id
+        JOIN Artists a ON s.artist_id = a.artist_id
+        ORDER BY st.play_count DESC
+        LIMIT %s
+        """,
+        (SAMPLE_LIMIT,),
+    ),
+    (
+        "Trending songs, last 7 days (Song_Stats)",
+        """
+        SELECT song_id, plays_7d FROM Song_Stats
+        ORDER BY plays_7d DESC
+        LIMIT %s
+        """,
+        (SAMPLE_LIMIT,),
+    ),
+    (
+        "Artists by name",
+        "SELECT artist_id, name FROM Artists ORDER BY name",
+        (),
+    ),
+]
+
+def explain(cursor, sql, params):
+    """Return the EXPLAIN rows for a query"""
+    cursor.execute("EXPLAIN " + sql, params)
+    return cursor.fetchall()
+
+def full_scans(plan):
+    """Plan rows that read a real table with a full table scan"""
+    return [
+        row for row in plan
+        if row.get("type") == "ALL" and row.get("table") and not row["table"].startswith("<")
+    ]
+
+def check_query_plans(analyze=False):
+    """EXPLAIN every hot query and report full scans
+
+    Returns:
+        True if no registered query falls back to a full table scan
+    """
+    connection = get_connection()
+    try:
+        cursor = connection.cursor(dictionary=True)
+
+        if analyze:
+            # Refresh index statistics so the plans reflect current row counts
+            cursor.execute("ANALYZE TABLE Listening_History, Listening_Daily, Songs, Song_Stats, Artists, Genres")
+            cursor.fetchall()
+
+        failed = 0
+        for name, sql, params in HOT_QUERIES:
+            plan = explain(cursor, sql, params)
+            scans = full_scans(plan)
+            if scans:
+                failed += 1
+                tables = ", ".join(f"{row['table']} (~{row.get('rows')} rows)" for row in scans)
+                print(f"FAIL  {name}: full scan on {tables}")
+            else:
+                access = ", ".join(f"{row['table']}:{row.get('key') or row.get('type')}" for row in plan)
+                print(f"ok    {name}: {access}")
+
+        cursor.close()
+    finally:
+        connection.close()
+
+    print(f"{len(HOT_QUERIES) - failed}/{len(HOT_QUERIES)} queries use indexes")
+    return failed == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if a hot query plans a full table scan")
+    parser.add_argument("--analyze", action="store_true", help="Run ANALYZE TABLE first")
+    args = parser.parse_args()
+
+    sys.exit(0 if check_query_plans(analyze=args.analyze) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,563 @@
+"""
+Generate a production-scale test dataset for the online_music_system schema.
+
+Fills every table created by the migrations with synthetic but realistically
+shaped data:
+
+    - song popularity follows a Zipf distribution (plays, favorites and
+      playlist entries all draw from it)
+    - per-user activity is Pareto-skewed: a few heavy listeners, a long tail
+    - songs per artist and playlist sizes follow power laws
+    - audio is a small set of tiny synthetic WAV payloads shared through
+      the blob store
+
+The System_Counters and Activity_Log triggers are dropped for the load -
+otherwise every generated row would update the single counter row (which
+serializes the workers) and write a feed row. Derived data is then built
+from the generated rows the way the application maintains it: the history
+is rolled up into Listening_Daily (so retention never drops raw months that
+were not rolled up), Song_Stats and the report aggregates are rebuilt, the
+triggers are recreated and the counters recounted, and Activity_Log is
+backfilled with the registrations, uploads and playlists inside
+ACTIVITY_LOG["retention_days"] plus the most recent plays.
+
+Output is deterministic for a given --seed and size: the work is split into
+units (a table plus a chunk of ids), each with its own seeded random stream
+and explicit primary keys. Units run in parallel worker processes, rows are
+written with INSERT IGNORE through the bulk loader, and finished units are
+recorded in Dataset_Progress - so an interrupted run resumes by skipping
+completed units and re-running partial ones idempotently.
+
+The default target is a separate online_music_scale database; point
+DB_CONFIG["database"] at it to run the application against the dataset.
+
+Usage:
+    python tools/generate_dataset.py [--scale 0.01] [--workers 8] [--seed 42]
+    python tools/generate_dataset.py --songs 500000 --users 2000000 --plays 300000000
+"""
+
+import io
+import os
+import sys
+import math
+import time
+import wave
+import random
+import hashlib
+import argparse
+import functools
+import multiprocessing
+from datetime import datetime, timedelta
+import mysql.connector
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_CONFIG, ACTIVITY_LOG
+from db_pool import CONNECT_KEYS
+from db_migrations import apply_migrations
+from bulk_loader import BulkLoader
+from blob_store import store_bytes, add_blob_ref, release_blob
+from song_stats import rebuild_song_stats
+from counters import create_counter_triggers, drop_counter_triggers, recount_counters
+from activity_log import create_activity_triggers, drop_activity_triggers, backfill_activity_log
+from history_rollup import ensure_history_partitions, rollup_listening_history
+from reports import REPORT_TABLES, refresh_reports
+
+SCALE_DATABASE = "online_music_scale"
+
+# Production-sized defaults, multiplied by --scale
+PRODUCTION_SONGS = 500000
+PRODUCTION_USERS = 2000000
+PRODUCTION_PLAYS = 300000000
+
+DERIVED_UNIT = "derived"       # Progress row written once the derived tables are built
+RECENT_PLAYS_LOGGED = 1000     # Plays backfilled into Activity_Log, as in migration 8
+
+ROWS_PER_UNIT = 50000          # Users/songs/artists/albums per work unit
+USERS_PER_ACTIVITY_UNIT = 2000 # Users whose playlists/favorites/history form one unit
+SONGS_PER_ALBUM = 10
+SONGS_PER_ARTIST = 20
+PAYLOAD_VARIANTS = 64          # Distinct tiny audio payloads
+
+ZIPF_EXPONENT = 1.1            # Song popularity
+ARTIST_ZIPF_EXPONENT = 0.9     # Albums per artist
+ACTIVITY_ALPHA = 1.2           # Pareto shape for plays per user
+PLAYLIST_ALPHA = 1.3           # Pareto shape for playlist sizes
+MAX_PLAYS_PER_USER = 200000
+MAX_PLAYLIST_SIZE = 500
+MAX_FAVORITES = 200
+
+EPOCH = datetime(2020, 1, 1)
+HISTORY_DAYS = 365
+HISTORY_START = EPOCH + timedelta(days=5 * 365 - HISTORY_DAYS)
+
+GENRES = [
+    "Pop", "Rock", "Hip Hop", "R&B", "Country",
+    "Jazz", "Classical", "Electronic", "Blues", "Reggae",
+    "Folk", "Metal", "Punk", "Soul", "Funk",
+    "Disco", "Techno", "House", "Ambient", "Indie"
+]
+WORDS = ["Love", "Night", "Dream", "Fire", "Heart", "Summer", "Rain", "Light",
+         "Road", "Home", "Gold", "Blue", "Wild", "Echo", "Stone", "River"]
+
+# ------------------- Parameters -------------------
+class Params:
+    """Dataset size and seed; everything generated is a function of these"""
+
+    def __init__(self, seed, songs, users, plays):
+        self.seed = seed
+        self.songs = max(1, songs)
+        self.users = max(2, users)
+        self.plays = max(0, plays)
+        self.albums = max(1, math.ceil(self.songs / SONGS_PER_ALBUM))
+        self.artists = max(1, math.ceil(self.songs / SONGS_PER_ARTIST))
+
+    @property
+    def run_key(self):
+        return f"seed={self.seed};songs={self.songs};users={self.users};plays={self.plays}"
+
+    def rng(self, stream, index=0):
+        """Independent, reproducible random stream per (stream, index)"""
+        return random.Random(f"{self.seed}:{stream}:{index}")
+
+def chunk_ranges(total, size):
+    """[(chunk_index, first_id, last_id)] covering 1..total"""
+    return [(index, first, min(first + size - 1, total))
+            for index, first in enumerate(range(1, total + 1, size))]
+
+def zipf_cum_weights(n, exponent):
+    """Cumulative weights for ranks 1..n under a Zipf distribution"""
+    cum = []
+    running = 0.0
+    for rank in range(1, n + 1):
+        running += 1.0 / rank ** exponent
+        cum.append(running)
+    return cum
+
+def coprime_stride(n):
+    """A stride coprime to n, used to scatter popularity ranks over ids"""
+    stride = int(n * 0.618) | 1
+    while math.gcd(stride, n) != 1:
+        stride += 2
+    return stride
+
+def random_time(rng, start, days):
+    return start + timedelta(seconds=rng.randrange(days * 86400))
+
+# ------------------- Per-user Activity -------------------
+def activity_counts(params, unit_index, first, last):
+    """Plays and playlists for each user in an activity unit
+
+    Computed from their own random stream, so the main process can derive
+    id offsets without generating the rows.
+    """
+    rng = params.rng("activity-counts", unit_index)
+    mean_plays = params.plays / params.users
+    pareto_mean = ACTIVITY_ALPHA / (ACTIVITY_ALPHA - 1)
+    plays = []
+    playlists = []
+    for _ in range(first, last + 1):
+        weight = rng.paretovariate(ACTIVITY_ALPHA) / pareto_mean
+        plays.append(min(MAX_PLAYS_PER_USER, int(round(mean_plays * weight))))
+        playlists.append(min(5, int(rng.paretovariate(2.0)) - 1))
+    return plays, playlists
+
+def activity_offsets(params):
+    """Starting history_id / playlist_id for every activity unit"""
+    offsets = []
+    history_base = 0
+    playlist_base = 0
+    for index, first, last in chunk_ranges(params.users, USERS_PER_ACTIVITY_UNIT):
+        offsets.append((history_base, playlist_base))
+        plays, playlists = activity_counts(params, index, first, last)
+        history_base += sum(plays)
+        playlist_base += sum(playlists)
+    return offsets
+
+# ------------------- Audio Payloads -------------------
+def tiny_wav(variant):
+    """A ~0.1 s 8 kHz mono tone, different per variant"""
+    rate = 8000
+    frequency = 220 + 20 * variant
+    samples = bytes(
+        int(128 + 100 * math.sin(2 * math.pi * frequency * i / rate))
+        for i in range(rate // 10)
+    )
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(1)
+        w.setframerate(rate)
+        w.writeframes(samples)
+    return buffer.getvalue()
+
+# ------------------- Worker State -------------------
+_worker = {}
+
+def connect(database):
+    args = {key: DB_CONFIG[key] for key in CONNECT_KEYS if key in DB_CONFIG}
+    args["database"] = database
+    return mysql.connector.connect(**args)
+
+def init_worker(params, database, payloads, batch_size, method):
+    """Per-process setup: own connection and the shared popularity tables"""
+    connection = connect(database)
+    cursor = connection.cursor()
+    # Ids are generated consistently, so skip per-row FK/unique lookups
+    cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+    cursor.close()
+
+    _worker.update(
+        params=params,
+        connection=connection,
+        payloads=payloads,
+        batch_size=batch_size,
+        method=method,
+        song_cum=zipf_cum_weights(params.songs, ZIPF_EXPONENT),
+        song_stride=coprime_stride(params.songs),
+        artist_cum=zipf_cum_weights(params.artists, ARTIST_ZIPF_EXPONENT),
+        password=hashlib.sha256(b"password123").hexdigest(),
+    )
+
+def loader(table, columns):
+    return BulkLoader(_worker["connection"], table, columns, batch_size=_worker["batch_size"],
+                      method=_worker["method"], ignore=True)
+
+def popular_songs(rng, k):
+    """k song ids drawn from the Zipf popularity distribution"""
+    params = _worker["params"]
+    ranks = rng.choices(range(params.songs), cum_weights=_worker["song_cum"], k=k)
+    stride = _worker["song_stride"]
+    return [(rank * stride) % params.songs + 1 for rank in ranks]
+
+@functools.lru_cache(maxsize=4096)
+def album_artist(album_id):
+    """Artist of an album - Zipf-skewed, so a few artists own many albums"""
+    params = _worker["params"]
+    rng = params.rng("album-artist", album_id)
+    return rng.choices(range(1, params.artists + 1), cum_weights=_worker["artist_cum"])[0]
+
+# ------------------- Unit Generators -------------------
+def gen_genres(unit_index, first, last):
+    with loader("Genres", ("genre_id", "name")) as l:
+        l.add_many((genre_id, name) for genre_id, name in enumerate(GENRES, 1))
+    return {"Genres": len(GENRES)}
+
+def gen_artists(unit_index, first, last):
+    with loader("Artists", ("artist_id", "name", "bio")) as l:
+        for artist_id in range(first, last + 1):
+            l.add((artist_id, f"Artist {artist_id}", None))
+    return {"Artists": last - first + 1}
+
+def gen_albums(unit_index, first, last):
+    rng = _worker["params"].rng("albums", unit_index)
+    with loader("Albums", ("album_id", "title", "artist_id", "release_year")) as l:
+        for album_id in range(first, last + 1):
+            title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {album_id}"
+            l.add((album_id, title, album_artist(album_id), rng.randint(1970, 2024)))
+    return {"Albums": last - first + 1}
+
+def gen_users(unit_index, first, last):
+    rng = _worker["params"].rng("users", unit_index)
+    columns = ("user_id", "first_name", "last_name", "email", "password", "is_admin", "created_at")
+    with loader("Users", columns) as l:
+        for user_id in range(first, last + 1):
+            l.add((user_id, f"User{user_id}", "Scale", f"user{user_id}@scale.test",
+                   _worker["password"], user_id == 1, random_time(rng, EPOCH, 4 * 365)))
+    return {"Users": last - first + 1}
+
+def gen_songs(unit_index, first, last):
+    rng = _worker["params"].rng("songs", unit_index)
+    payloads = _worker["payloads"]
+    refs = [0] * len(payloads)
+
+    song_columns = ("song_id", "title", "artist_id", "album_id", "genre_id",
+                    "duration", "file_type", "file_size", "upload_date")
+    with loader("Songs", song_columns) as songs, \
+         loader("Song_Files", ("song_id", "content_hash", "storage_locator")) as files:
+        for song_id in range(first, last + 1):
+            album_id = (song_id - 1) // SONGS_PER_ALBUM + 1
+            variant = song_id % len(payloads)
+            content_hash, locator, size = payloads[variant]
+            refs[variant] += 1
+
+            title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {song_id}"
+            songs.add((song_id, title, album_artist(album_id), album_id,
+                       rng.randint(1, len(GENRES)), rng.randint(90, 420), "wav", size,
+                       random_time(rng, EPOCH, 5 * 365)))
+            files.add((song_id, content_hash, locator))
+
+    # One blob reference per song row (a re-run unit over-counts; blobs just stay longer)
+    for variant, count in enumerate(refs):
+        if count:
+            add_blob_ref(payloads[variant][1], count)
+    return {"Songs": last - first + 1, "Song_Files": last - first + 1}
+
+def gen_activity(unit_index, first, last, history_base, playlist_base):
+    """Playlists, playlist entries, favorites and listening history for a chunk of users"""
+    params = _worker["params"]
+    rng = params.rng("activity", unit_index)
+    plays, playlist_counts = activity_counts(params, unit_index, first, last)
+    counts = {"Playlists": 0, "Playlist_Songs": 0, "User_Favorites": 0, "Listening_History": 0}
+
+    with loader("Playlists", ("playlist_id", "user_id", "name", "description", "created_at")) as playlists, \
+         loader("Playlist_Songs", ("playlist_id", "song_id", "position", "added_at")) as entries, \
+         loader("User_Favorites", ("user_id", "song_id", "added_at")) as favorites, \
+         loader("Listening_History", ("history_id", "user_id", "song_id", "played_at")) as history:
+
+        playlist_id = playlist_base
+        history_id = history_base
+        for offset, user_id in enumerate(range(first, last + 1)):
+            for number in range(playlist_counts[offset]):
+                playlist_id += 1
+                created_at = random_time(rng, EPOCH, 5 * 365)
+                playlists.add((playlist_id, user_id, f"Playlist {number + 1}", None, created_at))
+
+                size = min(MAX_PLAYLIST_SIZE, int(rng.paretovariate(PLAYLIST_ALPHA) * 5))
+                songs = list(dict.fromkeys(popular_songs(rng, size)))  # Unique, in draw order
+                for position, song_id in enumerate(songs, 1):
+                    entries.add((playlist_id, song_id, position, created_at))
+                counts["Playlists"] += 1
+                counts["Playlist_Songs"] += len(songs)
+
+            favorite_count = min(MAX_FAVORITES, int(rng.paretovariate(1.5) * 3) - 2)
+            if favorite_count > 0:
+                for song_id in set(popular_songs(rng, favorite_count)):
+                    favorites.add((user_id, song_id, random_time(rng, EPOCH, 5 * 365)))
+                    counts["User_Favorites"] += 1
+
+            for song_id in popular_songs(rng, plays[offset]):
+                history_id += 1
+                history.add((history_id, user_id, song_id, random_time(rng, HISTORY_START, HISTORY_DAYS)))
+            counts["Listening_History"] += plays[offset]
+
+    return counts
+
+GENERATORS = {
+    "genres": gen_genres,
+    "artists": gen_artists,
+    "albums": gen_albums,
+    "users": gen_users,
+    "songs": gen_songs,
+    "activity": gen_activity,
+}
+
+def run_unit(unit):
+    """Generate one unit and record it as done"""
+    name, kind, args = unit
+    start = time.perf_counter()
+    counts = GENERATORS[kind](*args)
+    elapsed = time.perf_counter() - start
+
+    connection = _worker["connection"]
+    cursor = connection.cursor()
+    cursor.execute(
+        """
+        INSERT INTO Dataset_Progress (run_key, unit, rows_loaded, seconds)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE rows_loaded = VALUES(rows_loaded), seconds = VALUES(seconds)
+        """,
+        (_worker["params"].run_key, name, sum(counts.values()), elapsed)
+    )
+    connection.commit()
+    cursor.close()
+    return name, counts, elapsed
+
+# ------------------- Planning & Progress -------------------
+def plan_units(params):
+    """Every work unit as (name, generator, args); FK checks are off, so order is free"""
+    units = [("genres", "genres", (0, 1, len(GENRES)))]
+    for kind, total in (("artists", params.artists), ("albums", params.albums),
+                        ("users", params.users), ("songs", params.songs)):
+        for index, first, last in chunk_ranges(total, ROWS_PER_UNIT):
+            units.append((f"{kind}:{index}", kind, (index, first, last)))
+
+    offsets = activity_offsets(params)
+    for index, first, last in chunk_ranges(params.users, USERS_PER_ACTIVITY_UNIT):
+        history_base, playlist_base = offsets[index]
+        units.append((f"activity:{index}", "activity", (index, first, last, history_base, playlist_base)))
+    return units
+
+def prepare_database(database, params, reset):
+    """Create the database, schema and progress table; return completed units"""
+    server_args = {key: DB_CONFIG[key] for key in CONNECT_KEYS if key in DB_CONFIG and key != "database"}
+    server = mysql.connector.connect(**server_args)
+    server.cursor().execute(f"CREATE DATABASE IF NOT EXISTS {database}")
+    server.close()
+
+    connection = connect(database)
+    try:
+        apply_migrations(connection)
+        cursor = connection.cursor()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Dataset_Progress (
+            run_key VARCHAR(255) NOT NULL,
+            unit VARCHAR(64) NOT NULL,
+            rows_loaded BIGINT NOT NULL,
+            seconds DOUBLE NOT NULL,
+            done_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (run_key, unit)
+        )
+        """)
+
+        if reset:
+            print(f"Emptying {database}...")
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+            for table in ("Listening_History", "Listening_Daily", "Rollup_Watermarks", *REPORT_TABLES, "Activity_Log",
+                          "User_Favorites", "Playlist_Songs", "Playlists",
+                          "Song_Stats", "Song_Files", "Songs", "Albums", "Artists", "Genres", "Users",
+                          "Dataset_Progress"):
+                cursor.execute(f"TRUNCATE TABLE {table}")
+
+        # Monthly partitions for the whole generated history window
+        ensure_history_partitions(connection, since=HISTORY_START)
+
+        cursor.execute("SELECT DISTINCT run_key FROM Dataset_Progress")
+        other_runs = [row[0] for row in cursor.fetchall() if row[0] != params.run_key]
+        if other_runs:
+            raise SystemExit(f"{database} holds a different dataset ({other_runs[0]}); "
+                             f"re-run with --reset to replace it")
+
+        cursor.execute("SELECT unit FROM Dataset_Progress WHERE run_key = %s", (params.run_key,))
+        done = {row[0] for row in cursor.fetchall()}
+        cursor.close()
+        return done
+    finally:
+        connection.close()
+
+# ------------------- Entry Point -------------------
+def generate(params, database=SCALE_DATABASE, workers=1, batch_size=None, method=None, reset=False):
+    """Generate (or resume) the dataset and report throughput"""
+    done = prepare_database(database, params, reset)
+    units = [unit for unit in plan_units(params) if unit[0] not in done]
+    print(f"Dataset {params.run_key}: {len(units)} units to generate "
+          f"({len(done)} already done), {workers} workers")
+    if units:
+        set_load_triggers(database, enabled=False)
+        generate_units(params, units, database, workers, batch_size, method)
+    if units or DERIVED_UNIT not in done:
+        build_derived_data(params, database)
+    return True
+
+def generate_units(params, units, database, workers, batch_size, method):
+    """Run the pending units in worker processes and report throughput"""
+    # Shared payloads: store once, hold a reference for the duration of the run
+    payloads = [store_bytes(tiny_wav(variant)) for variant in range(PAYLOAD_VARIANTS)]
+
+    totals = {}
+    start = time.perf_counter()
+    try:
+        with multiprocessing.Pool(workers, initializer=init_worker,
+                                  initargs=(params, database, payloads, batch_size, method)) as pool:
+            for finished, (name, counts, elapsed) in enumerate(pool.imap_unordered(run_unit, units), 1):
+                for table, rows in counts.items():
+                    totals[table] = totals.get(table, 0) + rows
+                print(f"[{finished}/{len(units)}] {name}: {sum(counts.values())} rows in {elapsed:.1f}s")
+    finally:
+        for _, locator, _ in payloads:
+            release_blob(locator)
+
+    elapsed = time.perf_counter() - start
+    print(f"Generated {sum(totals.values())} rows in {elapsed:.1f}s")
+    for table, rows in sorted(totals.items()):
+        print(f"  {table:<18}{rows:>14,} rows {rows / elapsed if elapsed else 0:>12,.0f} rows/s")
+
+def set_load_triggers(database, enabled):
+    """Drop (or recreate) the counter and activity triggers
+
+    They fire once per inserted row; the load recounts and backfills
+    instead (see build_derived_data).
+    """
+    connection = connect(database)
+    try:
+        cursor = connection.cursor()
+        if enabled:
+            create_counter_triggers(cursor)
+            create_activity_triggers(cursor)
+        else:
+            drop_counter_triggers(cursor)
+            drop_activity_triggers(cursor)
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+def build_derived_data(params, database):
+    """Rollups, counters, reports and the activity feed, from the generated rows
+
+    Every step recomputes its tables, so an interrupted run simply repeats
+    it; the derived unit is recorded once all of them have finished.
+    """
+    start = time.perf_counter()
+    connection = connect(database)
+    try:
+        # Rolled up first: Song_Stats and the reports read Listening_Daily
+        # for every day before the rollup boundary
+        rollup_listening_history(connection)
+        rebuild_song_stats(connection)
+        refresh_reports(connection, full=True)
+
+        # Triggers back before the recount, so later writes keep it exact
+        set_load_triggers(database, enabled=True)
+        recount_counters(connection)
+        rebuild_activity_log(connection, RECENT_PLAYS_LOGGED)
+
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO Dataset_Progress (run_key, unit, rows_loaded, seconds)
+            VALUES (%s, %s, 0, %s)
+            ON DUPLICATE KEY UPDATE seconds = VALUES(seconds)
+            """,
+            (params.run_key, DERIVED_UNIT, time.perf_counter() - start)
+        )
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+    print(f"Built derived tables in {time.perf_counter() - start:.1f}s")
+
+def rebuild_activity_log(connection, recent_plays):
+    """Refill the feed from the generated rows
+
+    The activity triggers were dropped for the load, so nothing reached
+    Activity_Log; only the retention window is written, as
+    prune_activity_log() would leave it.
+    """
+    retention_days = ACTIVITY_LOG.get("retention_days")
+    since = datetime.now() - timedelta(days=retention_days) if retention_days else None
+    cursor = connection.cursor()
+    try:
+        cursor.execute("TRUNCATE TABLE Activity_Log")
+        backfill_activity_log(cursor, recent_plays, since=since)
+        connection.commit()
+    finally:
+        cursor.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a scale-test dataset")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the production sizes")
+    parser.add_argument("--songs", type=int, help=f"Default {PRODUCTION_SONGS} x scale")
+    parser.add_argument("--users", type=int, help=f"Default {PRODUCTION_USERS} x scale")
+    parser.add_argument("--plays", type=int, help=f"Default {PRODUCTION_PLAYS} x scale")
+    parser.add_argument("--database", default=SCALE_DATABASE)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--batch-size", type=int, help="Rows per bulk insert batch")
+    parser.add_argument("--method", choices=("executemany", "values", "infile"),
+                        help="Bulk load method (see bulk_loader.py)")
+    parser.add_argument("--reset", action="store_true", help="Empty the target database first")
+    args = parser.parse_args()
+
+    params = Params(
+        seed=args.seed,
+        songs=args.songs or int(PRODUCTION_SONGS * args.scale),
+        users=args.users or int(PRODUCTION_USERS * args.scale),
+        plays=args.plays if args.plays is not None else int(PRODUCTION_PLAYS * args.scale),
+    )
+    generate(params, database=args.database, workers=max(1, args.workers),
+             batch_size=args.batch_size, method=args.method, reset=args.reset)
+
+if __name__ == "__main__":
+    main()
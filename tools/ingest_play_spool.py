@@ -0,0 +1,58 @@
+"""
+Drain the local play-event spool into Listening_History.
+
+The application ingests its spool in the background while it runs; this
+tool loads whatever is left (after a crash, or while MySQL was down) without
+starting the UI. Re-running it is safe: events already in
+Listening_History are skipped by event id.
+
+Usage:
+    python tools/ingest_play_spool.py [--spool-dir DIR] [--batch-size 5000] [--force] [--requeue-failed]
+
+--force also takes over segments that still look owned by another process;
+only use it when no instance of the application is running.
+--requeue-failed retries segments quarantined after repeated failed loads.
+"""
+
+import os
+import sys
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import PLAY_HISTORY
+from play_events import PlaySpool, PlayEventIngester
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest spooled play events")
+    parser.add_argument("--spool-dir", default=PLAY_HISTORY["spool_dir"], help="Spool directory")
+    parser.add_argument("--batch-size", type=int, default=PLAY_HISTORY.get("ingest_batch", 5000),
+                        help="Plays per transaction")
+    parser.add_argument("--force", action="store_true",
+                        help="Ingest open/claimed segments regardless of age")
+    parser.add_argument("--requeue-failed", action="store_true",
+                        help="Retry quarantined segments")
+    args = parser.parse_args()
+
+    stale_after = 0 if args.force else PLAY_HISTORY.get("stale_after_s", 300)
+    spool = PlaySpool(args.spool_dir, stale_after_s=stale_after,
+                      max_attempts=PLAY_HISTORY.get("max_attempts", 5))
+    if args.requeue_failed:
+        print(f"Requeued {spool.requeue_failed()} quarantined segments")
+    ingester = PlayEventIngester(spool, batch_size=args.batch_size)
+
+    written = ingester.ingest()
+    stats = ingester.get_stats()
+    print(f"Ingested {written} plays from {stats['segments']} segments "
+          f"({stats['duplicates']} already loaded, {stats['orphaned']} for deleted songs/users, "
+          f"{stats['corrupt']} unreadable lines, "
+          f"{stats['batches']} batches, {stats['batch_time_total']:.2f}s)")
+    if stats["backlog_segments"]:
+        print(f"{stats['backlog_segments']} segments ({stats['backlog_bytes']} bytes) left in the spool")
+    if stats["failed_segments"]:
+        print(f"{stats['failed_segments']} quarantined segments (see --requeue-failed)")
+    return 1 if stats["failed_batches"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
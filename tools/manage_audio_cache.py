@@ -0,0 +1,49 @@
+"""
+Inspect and maintain the playback audio cache (audio_cache.py).
+
+    stats    hit rate, evictions and disk usage, counted across every process
+    verify   re-hash every cached file and remove the damaged ones
+    trim     evict least recently played files down to the quota (or --max-bytes)
+    clear    remove everything; songs are fetched again on their next play
+
+Usage:
+    python tools/manage_audio_cache.py stats|verify|clear
+    python tools/manage_audio_cache.py trim [--max-bytes N]
+"""
+
+import os
+import sys
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_cache import get_audio_cache
+
+def main():
+    parser = argparse.ArgumentParser(description="Playback audio cache maintenance")
+    parser.add_argument("action", choices=["stats", "verify", "trim", "clear"])
+    parser.add_argument("--max-bytes", type=int, help="Quota for trim (default AUDIO_CACHE['max_bytes'])")
+    args = parser.parse_args()
+
+    cache = get_audio_cache()
+    if args.action == "verify":
+        checked, removed = cache.verify()
+        print(f"Checked {checked} files, removed {removed} damaged")
+    elif args.action == "trim":
+        evicted, freed = cache.trim(args.max_bytes)
+        print(f"Evicted {evicted} files ({freed} bytes)")
+    elif args.action == "clear":
+        cache.clear()
+        print(f"Cleared {cache.root}")
+
+    stats = cache.get_stats()
+    print(f"{stats['files']} files, {stats['bytes']} of {stats['max_bytes']} bytes")
+    print(f"Hits {stats['hits']}, misses {stats['misses']}, hit rate {stats['hit_rate']:.1%}")
+    print(f"Stored {stats['stores']} files ({stats['bytes_stored']} bytes), "
+          f"evicted {stats['evictions']} ({stats['bytes_evicted']} bytes), "
+          f"integrity failures {stats['integrity_failures']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
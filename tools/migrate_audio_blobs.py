@@ -0,0 +1,253 @@
+"""
+Move legacy Song_Files.file_data payloads into the blob store.
+
+Each track is streamed out of MySQL in fixed-size SUBSTRING() chunks, so a
+worker never holds more than one chunk in memory. The stored blob is
+re-hashed and size-checked before the row is switched over to the
+storage locator and file_data is set to NULL.
+
+Progress is checkpointed per worker in Blob_Migration_Checkpoint, so an
+interrupted run picks up where it stopped. Songs are split across worker
+processes by song_id modulo the worker count.
+
+Usage:
+    python tools/migrate_audio_blobs.py [--workers 4] [--chunk-size 1048576]
+"""
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_pool import get_connection
+from blob_store import get_blob_store, release_blob, CHUNK_SIZE
+
+BATCH_SIZE = 100  # Song ids fetched per scan query
+
+# ------------------- Checkpoint Table -------------------
+def create_checkpoint_table():
+    """Create the checkpoint table if needed"""
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Blob_Migration_Checkpoint (
+            worker_key VARCHAR(32) PRIMARY KEY,
+            last_song_id INT NOT NULL DEFAULT 0,
+            songs_done INT NOT NULL DEFAULT 0,
+            bytes_done BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+        """)
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+def reset_checkpoints():
+    """Forget all checkpoints (rows already migrated stay migrated)"""
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("DELETE FROM Blob_Migration_Checkpoint")
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+def load_checkpoint(cursor, worker_key):
+    cursor.execute(
+        "SELECT last_song_id FROM Blob_Migration_Checkpoint WHERE worker_key = %s",
+        (worker_key,)
+    )
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def save_checkpoint(cursor, worker_key, song_id, size):
+    cursor.execute(
+        """
+        INSERT INTO Blob_Migration_Checkpoint (worker_key, last_song_id, songs_done, bytes_done)
+        VALUES (%s, %s, 1, %s)
+        ON DUPLICATE KEY UPDATE last_song_id = VALUES(last_song_id),
+                                songs_done = songs_done + 1,
+                                bytes_done = bytes_done + VALUES(bytes_done)
+        """,
+        (worker_key, song_id, size)
+    )
+
+# ------------------- Streaming -------------------
+def iter_file_data(cursor, song_id, length, chunk_size):
+    """Yield Song_Files.file_data for one song in chunk_size pieces"""
+    offset = 1  # SUBSTRING is 1-based
+    while offset <= length:
+        cursor.execute(
+            "SELECT SUBSTRING(file_data, %s, %s) FROM Song_Files WHERE song_id = %s",
+            (offset, chunk_size, song_id)
+        )
+        chunk = cursor.fetchone()[0]
+        if not chunk:
+            break
+        yield bytes(chunk)
+        offset += len(chunk)
+
+def migrate_song(connection, cursor, song_id, chunk_size, worker_key, advance_checkpoint=True):
+    """Copy one song into the blob store and switch the row over
+
+    Returns:
+        Number of bytes migrated
+    """
+    cursor.execute("SELECT LENGTH(file_data) FROM Song_Files WHERE song_id = %s", (song_id,))
+    row = cursor.fetchone()
+    if not row or row[0] is None:
+        connection.rollback()
+        return 0
+    length = row[0]
+
+    store = get_blob_store()
+    content_hash, locator, size = store.write_stream(
+        iter_file_data(cursor, song_id, length, chunk_size)
+    )
+
+    try:
+        if size != length or not store.verify(locator):
+            raise ValueError(
+                f"Checksum/size mismatch for song {song_id}: stored {size} of {length} bytes"
+            )
+
+        cursor.execute(
+            """
+            UPDATE Song_Files
+            SET content_hash = %s, storage_locator = %s, file_data = NULL
+            WHERE song_id = %s AND storage_locator IS NULL
+            """,
+            (content_hash, locator, song_id)
+        )
+        if cursor.rowcount == 0:
+            # Someone else migrated (or replaced) this row meanwhile
+            connection.rollback()
+            release_blob(locator)
+            return 0
+
+        if advance_checkpoint:
+            save_checkpoint(cursor, worker_key, song_id, size)
+        connection.commit()
+        return size
+    except Exception:
+        connection.rollback()
+        release_blob(locator)
+        raise
+
+def run_worker(worker_index, worker_count, chunk_size, results):
+    """Migrate every pending song with song_id % worker_count == worker_index"""
+    worker_key = f"{worker_index}/{worker_count}"
+    songs_done = 0
+    bytes_done = 0
+    failures = 0
+    start = time.perf_counter()
+
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        last_song_id = load_checkpoint(cursor, worker_key)
+        connection.rollback()
+
+        while True:
+            cursor.execute(
+                """
+                SELECT song_id FROM Song_Files
+                WHERE song_id > %s AND MOD(song_id, %s) = %s
+                  AND storage_locator IS NULL AND file_data IS NOT NULL
+                ORDER BY song_id
+                LIMIT %s
+                """,
+                (last_song_id, worker_count, worker_index, BATCH_SIZE)
+            )
+            batch = cursor.fetchall()
+            connection.rollback()  # Don't hold a snapshot between batches
+            if not batch:
+                break
+
+            for (song_id,) in batch:
+                last_song_id = song_id
+                try:
+                    # Stop advancing the checkpoint after a failure so the
+                    # next run starts early enough to retry the failed song
+                    size = migrate_song(connection, cursor, song_id, chunk_size, worker_key,
+                                        advance_checkpoint=(failures == 0))
+                except Exception as e:
+                    failures += 1
+                    print(f"[worker {worker_key}] Error migrating song {song_id}: {e}")
+                    continue
+
+                if size:
+                    songs_done += 1
+                    bytes_done += size
+
+            elapsed = time.perf_counter() - start
+            print(f"[worker {worker_key}] {songs_done} tracks, "
+                  f"{bytes_done / 1048576 / elapsed if elapsed else 0:.2f} MB/s")
+
+        cursor.close()
+    finally:
+        connection.close()
+
+    results.put((songs_done, bytes_done, failures))
+
+# ------------------- Entry Point -------------------
+def migrate(workers=1, chunk_size=CHUNK_SIZE):
+    """Run the migration across worker processes and report throughput"""
+    create_checkpoint_table()
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(index, workers, chunk_size, results))
+        for index in range(workers)
+    ]
+
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    # Only workers that exited cleanly have reported their totals
+    finished = sum(1 for process in processes if process.exitcode == 0)
+    totals = [results.get(timeout=5) for _ in range(finished)]
+
+    songs = sum(t[0] for t in totals)
+    size = sum(t[1] for t in totals)
+    failures = sum(t[2] for t in totals)
+    crashed = len(processes) - finished
+
+    print(f"Migrated {songs} tracks ({size / 1048576:.2f} MB) in {elapsed:.2f}s")
+    if elapsed > 0:
+        print(f"Throughput: {size / 1048576 / elapsed:.2f} MB/s, {songs / elapsed:.2f} tracks/s")
+    if songs:
+        print("Run OPTIMIZE TABLE Song_Files to give the freed blob pages back to the filesystem.")
+    if failures or crashed:
+        print(f"{failures} tracks failed, {crashed} workers crashed - re-run to retry")
+        return False
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Move Song_Files.file_data payloads into the blob store")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Bytes per SUBSTRING read")
+    parser.add_argument("--reset", action="store_true", help="Discard checkpoints before starting")
+    args = parser.parse_args()
+
+    if args.reset:
+        create_checkpoint_table()
+        reset_checkpoints()
+
+    success = migrate(workers=max(1, args.workers), chunk_size=args.chunk_size)
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Reconcile the Song_Stats play counters with Listening_History.
+
+The counters are kept up to date incrementally as plays are recorded; this
+job is the safety net. By default it rebuilds every counter in song_id
+batches. --recent-only just recomputes the rolling 7-day counts from the
+recent window of history, which is cheap enough to run every few minutes.
+
+Usage:
+    python tools/reconcile_song_stats.py [--recent-only] [--batch-size 5000]
+"""
+
+import os
+import sys
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_pool import get_connection
+from song_stats import rebuild_song_stats, refresh_recent_plays, REBUILD_BATCH
+from counters import recount_counters
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile Song_Stats with Listening_History")
+    parser.add_argument("--recent-only", action="store_true", help="Only refresh plays_7d")
+    parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH, help="Songs per transaction")
+    args = parser.parse_args()
+
+    connection = get_connection()
+    try:
+        if args.recent_only:
+            songs = refresh_recent_plays(connection)
+            print(f"Refreshed 7-day play counts for {songs} songs")
+        else:
+            rebuild_song_stats(connection, batch_size=args.batch_size)
+            # The dashboard plays total is the sum of the rebuilt counters
+            recount_counters(connection)
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    main()
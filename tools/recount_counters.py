@@ -0,0 +1,30 @@
+"""
+Recount the dashboard counters in System_Counters exactly.
+
+The counters are kept current by triggers and by song_stats.record_plays;
+this job corrects any drift (TRUNCATEs, bulk loads, manual SQL). Each
+counter is recounted in its own short transaction.
+
+Usage:
+    python tools/recount_counters.py
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_pool import get_connection
+from counters import recount_counters
+
+def main():
+    connection = get_connection()
+    try:
+        for name, (old_value, new_value) in recount_counters(connection).items():
+            print(f"  {name:<10}{new_value:>14,}" + (f"  (was {old_value:,})" if old_value != new_value else ""))
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    main()
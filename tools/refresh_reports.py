@@ -0,0 +1,38 @@
+"""
+Refresh the report aggregate tables behind the admin Reports page.
+
+Incremental by default: only the days since the last refresh (plus a
+short lookback) are recomputed, so it is cheap enough to run every few
+minutes from cron. --full rebuilds everything, which also picks up deleted
+songs and songs whose genre or artist changed.
+
+Usage:
+    python tools/refresh_reports.py [--lookback-days 1] [--full]
+"""
+
+import os
+import sys
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import REPORTS
+from db_pool import get_connection
+from reports import refresh_reports
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh report aggregates")
+    parser.add_argument("--lookback-days", type=int, default=REPORTS.get("lookback_days", 1),
+                        help="Already refreshed days to recompute")
+    parser.add_argument("--full", action="store_true", help="Rebuild every aggregate from scratch")
+    args = parser.parse_args()
+
+    connection = get_connection()
+    try:
+        refresh_reports(connection, lookback_days=args.lookback_days, full=args.full)
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Partition maintenance, rollup and retention for Listening_History.
+
+Run it daily (e.g. from cron). In order it:
+
+    1. creates the upcoming monthly partitions (and splits backfilled months
+       out of the oldest partition)
+    2. rolls complete days into Listening_Daily
+    3. drops raw partitions older than HISTORY_RETENTION["raw_months"]
+       that have been rolled up
+    4. prunes Activity_Log rows older than ACTIVITY_LOG["retention_days"]
+    5. recomputes Song_Stats.plays_7d, so plays older than seven days
+       drop out of the rolling counts
+
+Usage:
+    python tools/rollup_history.py [--lookback-days 2] [--raw-months 13] [--no-retention]
+"""
+
+import os
+import sys
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import HISTORY_RETENTION
+from db_pool import get_connection
+from history_rollup import ensure_history_partitions, rollup_listening_history, drop_expired_history
+from activity_log import prune_activity_log
+from song_stats import refresh_recent_plays
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll up and expire listening history")
+    parser.add_argument("--lookback-days", type=int, default=HISTORY_RETENTION.get("rollup_lookback_days", 2),
+                        help="Already rolled-up days to recompute")
+    parser.add_argument("--raw-months", type=int, default=HISTORY_RETENTION.get("raw_months", 13),
+                        help="Months of raw history to keep")
+    parser.add_argument("--no-retention", action="store_true", help="Do not drop partitions or prune activity")
+    args = parser.parse_args()
+
+    connection = get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT MIN(played_at) FROM Listening_History")
+        oldest = cursor.fetchone()[0]
+        cursor.close()
+
+        created = ensure_history_partitions(connection, since=oldest)
+        print(f"Created {created} partitions")
+        rollup_listening_history(connection, lookback_days=args.lookback_days)
+        if not args.no_retention:
+            dropped = drop_expired_history(connection, raw_months=args.raw_months)
+            print(f"Dropped {len(dropped)} expired partitions")
+            prune_activity_log(connection)
+        songs = refresh_recent_plays(connection)
+        print(f"Refreshed 7-day play counts for {songs} songs")
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,27 @@
 import customtkinter as ctk
 from tkinter import messagebox, filedialog, simpledialog, ttk
-import mysql.connector
 import subprocess
 import os
 import io
-import mutagen
-from mutagen.mp3 import MP3
-from mutagen.id3 import ID3
-from mutagen.flac import FLAC
-from mutagen.wave import WAVE
-import magic  # For file type detection (install with: pip install python-magic)
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_pool import get_connection
+from blob_store import release_blob
+from song_upload import upload_song_file
+from ui_tasks import get_task_runner
+from pagination import get_songs_page
+from data_client import call, invalidate
+from config import PAGINATION, ADMIN_SESSION_FILE, session_path
 
 # ------------------- Database Functions -------------------
 def connect_db():
     """Connect to the MySQL database"""
+    import mysql.connector  # Deferred: only pages that reach the database pay for it
     try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="new_password",
-            database="online_music_system"
-        )
+        connection = get_connection()
         return connection
     except mysql.connector.Error as err:
         messagebox.showerror("Database Connection Error", 
@@ -31,12 +32,12 @@ def get_admin_info():
     """Get the current admin information"""
     try:
         # Read admin ID from file
-        if not os.path.exists("current_admin.txt"):
+        if not os.path.exists(session_path(ADMIN_SESSION_FILE)):
             messagebox.showerror("Error", "Admin session not found!")
             open_admin_login_page()
             return None
             
-        with open("current_admin.txt", "r") as f:
+        with open(session_path(ADMIN_SESSION_FILE), "r") as f:
             admin_id = f.read().strip()
             
         if not admin_id:
@@ -70,27 +71,19 @@ def get_admin_info():
             cursor.close()
             connection.close()
 
-def get_all_songs():
-    """Get all songs from the database"""
+def get_songs(after=None, page_size=None):
+    """Get one page of songs, newest uploads first
+
+    Args:
+        after: Cursor returned with the previous page
+        page_size: Songs per page
+
+    Returns:
+        (songs, next_cursor) - next_cursor is None on the last page
+    """
+    import mysql.connector
     try:
-        connection = connect_db()
-        if not connection:
-            return []
-            
-        cursor = connection.cursor(dictionary=True)
-        
-        query = """
-        SELECT s.song_id, s.title, a.name as artist_name, al.title as album_name,
-               g.name as genre_name, s.duration, s.file_size, s.file_type, s.upload_date
-        FROM Songs s
-        JOIN Artists a ON s.artist_id = a.artist_id
-        LEFT JOIN Albums al ON s.album_id = al.album_id
-        LEFT JOIN Genres g ON s.genre_id = g.genre_id
-        ORDER BY s.upload_date DESC
-        """
-        
-        cursor.execute(query)
-        songs = cursor.fetchall()
+        songs, next_cursor = get_songs_page(after, page_size)
         
         # Format durations to MM:SS
         for song in songs:
@@ -100,18 +93,15 @@ def get_all_songs():
             # Format file size
             song['file_size_formatted'] = format_file_size(song['file_size'])
         
-        return songs
+        return songs, next_cursor
         
     except mysql.connector.Error as e:
         print(f"Error fetching songs: {e}")
-        return []
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
+        return [], None
 
 def delete_song(song_id):
     """Delete a song from the database"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -119,11 +109,18 @@ def delete_song(song_id):
             
         cursor = connection.cursor()
         
+        # Remember where the audio lives so the blob reference can be dropped
+        cursor.execute("SELECT storage_locator FROM Song_Files WHERE song_id = %s", (song_id,))
+        row = cursor.fetchone()
+        storage_locator = row[0] if row else None
+        
         # First delete from related tables to avoid foreign key constraints
         tables = [
+            "Song_Files",
             "Playlist_Songs",
             "User_Favorites",
-            "Listening_History"
+            "Listening_History",
+            "Listening_Daily"
         ]
         
         for table in tables:
@@ -133,6 +130,10 @@ def delete_song(song_id):
         cursor.execute("DELETE FROM Songs WHERE song_id = %s", (song_id,))
         
         connection.commit()
+        
+        if storage_locator:
+            release_blob(storage_locator)
+        invalidate("songs", "playlists", "history")
         return True
         
     except mysql.connector.Error as e:
@@ -144,51 +145,24 @@ def delete_song(song_id):
             connection.close()
 
 def get_artists():
-    """Get list of artists from the database"""
+    """Get list of artists through the shared data service"""
     try:
-        connection = connect_db()
-        if not connection:
-            return []
-            
-        cursor = connection.cursor(dictionary=True)
-        
-        query = "SELECT artist_id, name FROM Artists ORDER BY name"
-        cursor.execute(query)
-        
-        return cursor.fetchall()
-        
-    except mysql.connector.Error as e:
+        return call("get_artists")
+    except Exception as e:
         print(f"Error fetching artists: {e}")
         return []
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 def get_genres():
-    """Get list of genres from the database"""
+    """Get list of genres through the shared data service"""
     try:
-        connection = connect_db()
-        if not connection:
-            return []
-            
-        cursor = connection.cursor(dictionary=True)
-        
-        query = "SELECT genre_id, name FROM Genres ORDER BY name"
-        cursor.execute(query)
-        
-        return cursor.fetchall()
-        
-    except mysql.connector.Error as e:
+        return call("get_genres")
+    except Exception as e:
         print(f"Error fetching genres: {e}")
         return []
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 def add_new_artist(name):
     """Add a new artist to the database"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -198,6 +172,7 @@ def add_new_artist(name):
         
         cursor.execute("INSERT INTO Artists (name) VALUES (%s)", (name,))
         connection.commit()
+        invalidate("lookups")
         
         new_id = cursor.lastrowid
         return new_id
@@ -230,65 +205,20 @@ def format_file_size(size_bytes):
 
 def upload_song(file_path, title, artist_id, genre_id=None):
     """Upload a song to the database"""
+    import mysql.connector
     try:
         if not os.path.exists(file_path):
             messagebox.showerror("Error", f"File not found: {file_path}")
             return None
         
-        # Get file information
-        file_size = os.path.getsize(file_path)
-        file_type = os.path.splitext(file_path)[1][1:].lower()  # Get extension without dot
-        
-        # Get song duration using mutagen
-        try:
-            if file_type == 'mp3':
-                audio = MP3(file_path)
-            elif file_type == 'flac':
-                audio = FLAC(file_path)
-            elif file_type in ['wav', 'wave']:
-                audio = WAVE(file_path)
-            else:
-                # Fallback for other formats
-                audio = mutagen.File(file_path)
-                
-            duration = int(audio.info.length)
-        except Exception as e:
-            print(f"Error getting audio duration: {e}")
-            duration = 0
-        
-        # Read file binary data
-        with open(file_path, 'rb') as file:
-            file_data = file.read()
-        
-        # Insert into database
-        connection = connect_db()
-        if not connection:
-            return None
-            
-        cursor = connection.cursor()
-        
-        query = """
-        INSERT INTO Songs (title, artist_id, genre_id, duration, file_data, file_type, file_size)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        values = (title, artist_id, genre_id, duration, file_data, file_type, file_size)
-        
-        cursor.execute(query, values)
-        connection.commit()
-        
-        # Return the new song ID
-        new_song_id = cursor.lastrowid
+        # One streaming pass: hash + blob storage, duration/tags, then the DB rows
+        new_song_id = upload_song_file(file_path, title, artist_id, genre_id)
         return new_song_id
         
-    except mysql.connector.Error as e:
+    except (mysql.connector.Error, OSError) as e:
         print(f"Error uploading song: {e}")
         messagebox.showerror("Database Error", f"Failed to upload song: {e}")
         return None
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 # ------------------- Navigation Functions -------------------
 def return_to_dashboard():
@@ -303,8 +233,8 @@ def open_admin_login_page():
     """Open the admin login page"""
     try:
         # Remove admin session
-        if os.path.exists("current_admin.txt"):
-            os.remove("current_admin.txt")
+        if os.path.exists(session_path(ADMIN_SESSION_FILE)):
+            os.remove(session_path(ADMIN_SESSION_FILE))
             
         subprocess.Popen(["python", "admin_login.py"])
         root.destroy()
@@ -312,17 +242,39 @@ def open_admin_login_page():
         messagebox.showerror("Error", f"Unable to open admin login: {e}")
 
 # ------------------- UI Functions -------------------
+# Keyset paging state of the song list
+song_pages = {"cursor": None, "loading": False, "page_size": PAGINATION.get("page_size", 100)}
+
 def refresh_song_list():
-    """Refresh the song list display"""
+    """Refresh the song list display from the first page"""
     # Clear the treeview
     for item in songs_tree.get_children():
         songs_tree.delete(item)
     
-    # Get updated songs
-    songs = get_all_songs()
+    song_pages["cursor"] = None
+    load_more_songs(first_page=True)
+
+def load_more_songs(first_page=False):
+    """Fetch the next page of songs in the background"""
+    if not first_page and (song_pages["loading"] or not song_pages["cursor"]):
+        return
+    song_pages["loading"] = True
+    if first_page:
+        show_skeleton_rows()
     
-    # Add songs to treeview
-    for i, song in enumerate(songs, 1):
+    # A refresh supersedes a page that is still loading
+    tasks.submit(get_songs, song_pages["cursor"], song_pages["page_size"], key="songs",
+                 on_done=add_songs_page)
+
+def add_songs_page(page):
+    """Append a fetched page of songs to the treeview"""
+    songs, song_pages["cursor"] = page
+    song_pages["loading"] = False
+    songs_tree.delete(*songs_tree.tag_has("skeleton"))
+    
+    # Add songs to treeview, numbered after the rows already shown
+    start = len(songs_tree.get_children()) + 1
+    for i, song in enumerate(songs, start):
         songs_tree.insert(
             "", "end", 
             values=(
@@ -335,6 +287,28 @@ def refresh_song_list():
                 song["song_id"]
             )
         )
+    
+    # Update stats
+    shown = len(songs_tree.get_children())
+    more = " (scroll for more)" if song_pages["cursor"] else ""
+    stats_label.configure(text=f"Showing {shown} songs{more}")
+
+def show_skeleton_rows(count=10):
+    """Grey placeholder rows until the first page arrives"""
+    for _ in range(count):
+        songs_tree.insert("", "end", values=("░░",) * 7, tags=("skeleton",))
+    stats_label.configure(text="Loading songs...")
+
+def on_songs_scroll(first, last):
+    """Scrollbar callback; fetches the next page near the bottom of the list"""
+    tree_scroll.set(first, last)
+    if song_pages["cursor"] and float(last) >= PAGINATION.get("prefetch_fraction", 0.8):
+        root.after_idle(load_more_songs)
+
+def change_page_size(value):
+    """Reload the list with another page size"""
+    song_pages["page_size"] = int(value)
+    refresh_song_list()
 
 def confirm_delete_song():
     """Confirm and delete selected song"""
@@ -514,178 +488,195 @@ def handle_upload_song():
     upload_btn.pack(pady=20)
 
 # ------------------- Main Application -------------------
-try:
-    # Verify admin privileges
-    admin = get_admin_info()
-    if not admin:
-        exit()
-    
-    # Initialize app
-    ctk.set_appearance_mode("dark")
-    ctk.set_default_color_theme("blue")
-    
-    root = ctk.CTk()
-    root.title("Admin - Manage Songs")
-    root.geometry("1000x600")
-    
-    # Main frame
-    main_frame = ctk.CTkFrame(root)
-    main_frame.pack(fill="both", expand=True, padx=10, pady=10)
-    
-    # Header
-    header_frame = ctk.CTkFrame(main_frame, height=60, fg_color="#1A1A2E")
-    header_frame.pack(fill="x", padx=10, pady=10)
-    
-    # Title
-    ctk.CTkLabel(
-        header_frame, 
-        text="Manage Songs", 
-        font=("Arial", 24, "bold"),
-        text_color="#B146EC"
-    ).pack(side="left", padx=20)
-    
-    # Admin name
-    ctk.CTkLabel(
-        header_frame,
-        text=f"Admin: {admin['first_name']} {admin['last_name']}",
-        font=("Arial", 14)
-    ).pack(side="right", padx=20)
-    
-    # Back button
-    back_btn = ctk.CTkButton(
-        header_frame,
-        text="← Back to Dashboard",
-        command=return_to_dashboard,
-        fg_color="#2563EB",
-        hover_color="#1D4ED8",
-        height=32
-    )
-    back_btn.pack(side="right", padx=20)
-    
-    # Content area
-    content_frame = ctk.CTkFrame(main_frame, fg_color="#131B2E")
-    content_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-    
-    # Action buttons
-    action_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E", height=50)
-    action_frame.pack(fill="x", padx=20, pady=20)
-    
-    # Upload button
-    upload_btn = ctk.CTkButton(
-        action_frame,
-        text="+ Upload New Song",
-        command=handle_upload_song,
-        fg_color="#16A34A",
-        hover_color="#15803D",
-        height=40
-    )
-    upload_btn.pack(side="left", padx=(0, 10))
-    
-    # Delete button
-    delete_btn = ctk.CTkButton(
-        action_frame,
-        text="🗑️ Delete Selected Song",
-        command=confirm_delete_song,
-        fg_color="#DC2626",
-        hover_color="#B91C1C",
-        height=40
-    )
-    delete_btn.pack(side="left")
-    
-    # Refresh button
-    refresh_btn = ctk.CTkButton(
-        action_frame,
-        text="🔄 Refresh List",
-        command=refresh_song_list,
-        fg_color="#B146EC",
-        hover_color="#9333EA",
-        height=40
-    )
-    refresh_btn.pack(side="right")
-    
-    # Songs list with scrollbar
-    songs_frame = ctk.CTkFrame(content_frame, fg_color="#1A1A2E")
-    songs_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
-    
-    # Create Treeview with ttk.Scrollbar
-    tree_frame = ctk.CTkFrame(songs_frame)
-    tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
-    
-    # Create a custom style for the Treeview
-    style = ttk.Style()
-    style.theme_use("default")
-    
-    # Configure colors for dark mode
-    style.configure(
-        "Treeview",
-        background="#1E1E2E",
-        foreground="white",
-        fieldbackground="#1E1E2E",
-        borderwidth=0
-    )
-    style.map(
-        "Treeview", 
-        background=[("selected", "#B146EC")],
-        foreground=[("selected", "white")]
-    )
-    
-    # Add scrollbar
-    tree_scroll = ttk.Scrollbar(tree_frame)
-    tree_scroll.pack(side="right", fill="y")
-    
-    # Create Treeview with columns
-    songs_tree = ttk.Treeview(
-        tree_frame,
-        columns=("id", "title", "artist", "genre", "duration", "size", "song_id"),
-        show="headings",
-        height=20,
-        yscrollcommand=tree_scroll.set
-    )
-    songs_tree.pack(fill="both", expand=True)
-    
-    # Configure scrollbar
-    tree_scroll.config(command=songs_tree.yview)
-    
-    # Format columns
-    songs_tree.heading("id", text="#")
-    songs_tree.heading("title", text="Title")
-    songs_tree.heading("artist", text="Artist")
-    songs_tree.heading("genre", text="Genre")
-    songs_tree.heading("duration", text="Duration")
-    songs_tree.heading("size", text="Size")
-    songs_tree.heading("song_id", text="ID")
-    
-    # Set column widths and alignment
-    songs_tree.column("id", width=50, anchor="center")
-    songs_tree.column("title", width=250, anchor="w")
-    songs_tree.column("artist", width=150, anchor="w")
-    songs_tree.column("genre", width=100, anchor="w")
-    songs_tree.column("duration", width=80, anchor="center")
-    songs_tree.column("size", width=80, anchor="e")
-    songs_tree.column("song_id", width=50, anchor="center")
-    
-    # Statistics footer
-    stats_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E", height=30)
-    stats_frame.pack(fill="x", padx=20, pady=(0, 10))
-    
-    stats_label = ctk.CTkLabel(
-        stats_frame,
-        text="Loading songs...",
-        font=("Arial", 12),
-        text_color="#A0A0A0"
-    )
-    stats_label.pack(side="left")
-    
-    # Load songs after the UI is created
-    root.after(100, lambda: [
-        refresh_song_list(),
-        stats_label.configure(text=f"Total Songs: {len(songs_tree.get_children())}")
-    ])
-    
-    root.mainloop()
-    
-except Exception as e:
-    import traceback
-    print(f"Error: {e}")
-    traceback.print_exc()
-    messagebox.showerror("Error", f"An error occurred: {e}")
\ No newline at end of file
+def main():
+    """Show the song management window"""
+    global root, tasks, tree_scroll, songs_tree, stats_label
+    try:
+        # Verify admin privileges
+        admin = get_admin_info()
+        if not admin:
+            exit()
+
+        # Initialize app
+        ctk.set_appearance_mode("dark")
+        ctk.set_default_color_theme("blue")
+
+        root = ctk.CTk()
+        tasks = get_task_runner(root)  # Background database reads
+        root.title("Admin - Manage Songs")
+        root.geometry("1000x600")
+
+        # Main frame
+        main_frame = ctk.CTkFrame(root)
+        main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Header
+        header_frame = ctk.CTkFrame(main_frame, height=60, fg_color="#1A1A2E")
+        header_frame.pack(fill="x", padx=10, pady=10)
+
+        # Title
+        ctk.CTkLabel(
+            header_frame, 
+            text="Manage Songs", 
+            font=("Arial", 24, "bold"),
+            text_color="#B146EC"
+        ).pack(side="left", padx=20)
+
+        # Admin name
+        ctk.CTkLabel(
+            header_frame,
+            text=f"Admin: {admin['first_name']} {admin['last_name']}",
+            font=("Arial", 14)
+        ).pack(side="right", padx=20)
+
+        # Back button
+        back_btn = ctk.CTkButton(
+            header_frame,
+            text="← Back to Dashboard",
+            command=return_to_dashboard,
+            fg_color="#2563EB",
+            hover_color="#1D4ED8",
+            height=32
+        )
+        back_btn.pack(side="right", padx=20)
+
+        # Content area
+        content_frame = ctk.CTkFrame(main_frame, fg_color="#131B2E")
+        content_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        # Action buttons
+        action_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E", height=50)
+        action_frame.pack(fill="x", padx=20, pady=20)
+
+        # Upload button
+        upload_btn = ctk.CTkButton(
+            action_frame,
+            text="+ Upload New Song",
+            command=handle_upload_song,
+            fg_color="#16A34A",
+            hover_color="#15803D",
+            height=40
+        )
+        upload_btn.pack(side="left", padx=(0, 10))
+
+        # Delete button
+        delete_btn = ctk.CTkButton(
+            action_frame,
+            text="🗑️ Delete Selected Song",
+            command=confirm_delete_song,
+            fg_color="#DC2626",
+            hover_color="#B91C1C",
+            height=40
+        )
+        delete_btn.pack(side="left")
+
+        # Refresh button
+        refresh_btn = ctk.CTkButton(
+            action_frame,
+            text="🔄 Refresh List",
+            command=refresh_song_list,
+            fg_color="#B146EC",
+            hover_color="#9333EA",
+            height=40
+        )
+        refresh_btn.pack(side="right")
+
+        # Page size
+        page_size_menu = ctk.CTkOptionMenu(
+            action_frame,
+            values=["50", "100", "250", "500"],
+            command=change_page_size,
+            width=80,
+            height=40
+        )
+        page_size_menu.set(str(song_pages["page_size"]))
+        page_size_menu.pack(side="right", padx=10)
+        ctk.CTkLabel(action_frame, text="Page size", font=("Arial", 12), text_color="#A0A0A0").pack(side="right")
+
+        # Songs list with scrollbar
+        songs_frame = ctk.CTkFrame(content_frame, fg_color="#1A1A2E")
+        songs_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+
+        # Create Treeview with ttk.Scrollbar
+        tree_frame = ctk.CTkFrame(songs_frame)
+        tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Create a custom style for the Treeview
+        style = ttk.Style()
+        style.theme_use("default")
+
+        # Configure colors for dark mode
+        style.configure(
+            "Treeview",
+            background="#1E1E2E",
+            foreground="white",
+            fieldbackground="#1E1E2E",
+            borderwidth=0
+        )
+        style.map(
+            "Treeview", 
+            background=[("selected", "#B146EC")],
+            foreground=[("selected", "white")]
+        )
+
+        # Add scrollbar
+        tree_scroll = ttk.Scrollbar(tree_frame)
+        tree_scroll.pack(side="right", fill="y")
+
+        # Create Treeview with columns
+        songs_tree = ttk.Treeview(
+            tree_frame,
+            columns=("id", "title", "artist", "genre", "duration", "size", "song_id"),
+            show="headings",
+            height=20,
+            yscrollcommand=on_songs_scroll
+        )
+        songs_tree.pack(fill="both", expand=True)
+
+        # Configure scrollbar
+        tree_scroll.config(command=songs_tree.yview)
+        songs_tree.tag_configure("skeleton", foreground="#555555")
+
+        # Format columns
+        songs_tree.heading("id", text="#")
+        songs_tree.heading("title", text="Title")
+        songs_tree.heading("artist", text="Artist")
+        songs_tree.heading("genre", text="Genre")
+        songs_tree.heading("duration", text="Duration")
+        songs_tree.heading("size", text="Size")
+        songs_tree.heading("song_id", text="ID")
+
+        # Set column widths and alignment
+        songs_tree.column("id", width=50, anchor="center")
+        songs_tree.column("title", width=250, anchor="w")
+        songs_tree.column("artist", width=150, anchor="w")
+        songs_tree.column("genre", width=100, anchor="w")
+        songs_tree.column("duration", width=80, anchor="center")
+        songs_tree.column("size", width=80, anchor="e")
+        songs_tree.column("song_id", width=50, anchor="center")
+
+        # Statistics footer
+        stats_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E", height=30)
+        stats_frame.pack(fill="x", padx=20, pady=(0, 10))
+
+        stats_label = ctk.CTkLabel(
+            stats_frame,
+            text="Loading songs...",
+            font=("Arial", 12),
+            text_color="#A0A0A0"
+        )
+        stats_label.pack(side="left")
+
+        # Load the first page after the UI is created
+        root.after(100, refresh_song_list)
+
+        root.mainloop()
+
+    except Exception as e:
+        import traceback
+        print(f"Error: {e}")
+        traceback.print_exc()
+        messagebox.showerror("Error", f"An error occurred: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,26 @@
 import customtkinter as ctk
 from tkinter import messagebox, simpledialog, ttk
-import mysql.connector
 import subprocess
 import os
 import hashlib
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_pool import get_connection
+from ui_tasks import get_task_runner
+from pagination import get_users_page
+from data_client import invalidate
+from song_stats import remove_user_plays
+from config import PAGINATION, ADMIN_SESSION_FILE, session_path
 
 # ------------------- Database Functions -------------------
 def connect_db():
     """Connect to the MySQL database"""
+    import mysql.connector  # Deferred: only pages that reach the database pay for it
     try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="new_password",
-            database="online_music_system"
-        )
+        connection = get_connection()
         return connection
     except mysql.connector.Error as err:
         messagebox.showerror("Database Connection Error", 
@@ -25,12 +31,12 @@ def get_admin_info():
     """Get the current admin information"""
     try:
         # Read admin ID from file
-        if not os.path.exists("current_admin.txt"):
+        if not os.path.exists(session_path(ADMIN_SESSION_FILE)):
             messagebox.showerror("Error", "Admin session not found!")
             open_admin_login_page()
             return None
             
-        with open("current_admin.txt", "r") as f:
+        with open(session_path(ADMIN_SESSION_FILE), "r") as f:
             admin_id = f.read().strip()
             
         if not admin_id:
@@ -64,41 +70,27 @@ def get_admin_info():
             cursor.close()
             connection.close()
 
-def get_all_users():
-    """Get all users from the database"""
+def get_users(after=None, page_size=None):
+    """Get one page of users, newest registrations first
+
+    Args:
+        after: Cursor returned with the previous page
+        page_size: Users per page
+
+    Returns:
+        (users, next_cursor) - next_cursor is None on the last page
+    """
+    import mysql.connector
     try:
-        connection = connect_db()
-        if not connection:
-            return []
-            
-        cursor = connection.cursor(dictionary=True)
-        
-        query = """
-        SELECT u.user_id, u.first_name, u.last_name, u.email, u.is_admin, u.created_at,
-               COUNT(DISTINCT p.playlist_id) as playlist_count,
-               COUNT(DISTINCT lh.history_id) as listening_count
-        FROM Users u
-        LEFT JOIN Playlists p ON u.user_id = p.user_id
-        LEFT JOIN Listening_History lh ON u.user_id = lh.user_id
-        GROUP BY u.user_id
-        ORDER BY u.created_at DESC
-        """
-        
-        cursor.execute(query)
-        users = cursor.fetchall()
-        
-        return users
+        return get_users_page(after, page_size)
         
     except mysql.connector.Error as e:
         print(f"Error fetching users: {e}")
-        return []
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
+        return [], None
 
 def delete_user(user_id):
     """Delete a user from the database"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -114,11 +106,14 @@ def delete_user(user_id):
             messagebox.showerror("Error", "Cannot delete an admin user.")
             return False
         
-        # The foreign key constraints with ON DELETE CASCADE should
-        # automatically delete related records in other tables
+        # Partitioned history has no foreign keys, so it is deleted explicitly
+        # (and taken off the play counters); ON DELETE CASCADE takes care of
+        # the other tables
+        remove_user_plays(cursor, user_id)
         cursor.execute("DELETE FROM Users WHERE user_id = %s", (user_id,))
         
         connection.commit()
+        invalidate("playlists", "history")
         return True
         
     except mysql.connector.Error as e:
@@ -131,6 +126,7 @@ def delete_user(user_id):
 
 def toggle_admin_status(user_id, current_status):
     """Toggle user's admin status"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -163,6 +159,7 @@ def hash_password(password):
 
 def add_new_user(first_name, last_name, email, password, is_admin=0):
     """Add a new user to the database"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -218,8 +215,8 @@ def open_admin_login_page():
     """Open the admin login page"""
     try:
         # Remove admin session
-        if os.path.exists("current_admin.txt"):
-            os.remove("current_admin.txt")
+        if os.path.exists(session_path(ADMIN_SESSION_FILE)):
+            os.remove(session_path(ADMIN_SESSION_FILE))
             
         subprocess.Popen(["python", "admin_login.py"])
         root.destroy()
@@ -227,17 +224,39 @@ def open_admin_login_page():
         messagebox.showerror("Error", f"Unable to open admin login: {e}")
 
 # ------------------- UI Functions -------------------
+# Keyset paging state of the user list
+user_pages = {"cursor": None, "loading": False, "page_size": PAGINATION.get("page_size", 100)}
+
 def refresh_user_list():
-    """Refresh the user list display"""
+    """Refresh the user list display from the first page"""
     # Clear the treeview
     for item in users_tree.get_children():
         users_tree.delete(item)
     
-    # Get updated users
-    users = get_all_users()
+    user_pages["cursor"] = None
+    load_more_users(first_page=True)
+
+def load_more_users(first_page=False):
+    """Fetch the next page of users in the background"""
+    if not first_page and (user_pages["loading"] or not user_pages["cursor"]):
+        return
+    user_pages["loading"] = True
+    if first_page:
+        show_skeleton_rows()
     
-    # Add users to treeview
-    for i, user in enumerate(users, 1):
+    # A refresh supersedes a page that is still loading
+    tasks.submit(get_users, user_pages["cursor"], user_pages["page_size"], key="users",
+                 on_done=add_users_page)
+
+def add_users_page(page):
+    """Append a fetched page of users to the treeview"""
+    users, user_pages["cursor"] = page
+    user_pages["loading"] = False
+    users_tree.delete(*users_tree.tag_has("skeleton"))
+    
+    # Add users to treeview, numbered after the rows already shown
+    start = len(users_tree.get_children()) + 1
+    for i, user in enumerate(users, start):
         # Format admin status
         admin_status = "Yes" if user["is_admin"] else "No"
         
@@ -259,7 +278,26 @@ def refresh_user_list():
         )
     
     # Update stats
-    stats_label.configure(text=f"Total Users: {len(users_tree.get_children())}")
+    shown = len(users_tree.get_children())
+    more = " (scroll for more)" if user_pages["cursor"] else ""
+    stats_label.configure(text=f"Showing {shown} users{more}")
+
+def show_skeleton_rows(count=10):
+    """Grey placeholder rows until the first page arrives"""
+    for _ in range(count):
+        users_tree.insert("", "end", values=("░░",) * 8, tags=("skeleton",))
+    stats_label.configure(text="Loading users...")
+
+def on_users_scroll(first, last):
+    """Scrollbar callback; fetches the next page near the bottom of the list"""
+    tree_scroll.set(first, last)
+    if user_pages["cursor"] and float(last) >= PAGINATION.get("prefetch_fraction", 0.8):
+        root.after_idle(load_more_users)
+
+def change_page_size(value):
+    """Reload the list with another page size"""
+    user_pages["page_size"] = int(value)
+    refresh_user_list()
 
 def confirm_delete_user():
     """Confirm and delete selected user"""
@@ -446,189 +484,209 @@ def handle_add_user():
     add_btn.pack(pady=20)
 
 # ------------------- Main Application -------------------
-try:
-    # Verify admin privileges
-    admin = get_admin_info()
-    if not admin:
-        exit()
-    
-    # Initialize app
-    ctk.set_appearance_mode("dark")
-    ctk.set_default_color_theme("blue")
-    
-    root = ctk.CTk()
-    root.title("Admin - Manage Users")
-    root.geometry("1000x600")
-    
-    # Main frame
-    main_frame = ctk.CTkFrame(root)
-    main_frame.pack(fill="both", expand=True, padx=10, pady=10)
-    
-    # Header
-    header_frame = ctk.CTkFrame(main_frame, height=60, fg_color="#1A1A2E")
-    header_frame.pack(fill="x", padx=10, pady=10)
-    
-    # Title
-    ctk.CTkLabel(
-        header_frame, 
-        text="Manage Users", 
-        font=("Arial", 24, "bold"),
-        text_color="#B146EC"
-    ).pack(side="left", padx=20)
-    
-    # Admin name
-    ctk.CTkLabel(
-        header_frame,
-        text=f"Admin: {admin['first_name']} {admin['last_name']}",
-        font=("Arial", 14)
-    ).pack(side="right", padx=20)
-    
-    # Back button
-    back_btn = ctk.CTkButton(
-        header_frame,
-        text="← Back to Dashboard",
-        command=return_to_dashboard,
-        fg_color="#2563EB",
-        hover_color="#1D4ED8",
-        height=32
-    )
-    back_btn.pack(side="right", padx=20)
-    
-    # Content area
-    content_frame = ctk.CTkFrame(main_frame, fg_color="#131B2E")
-    content_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-    
-    # Action buttons
-    action_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E", height=50)
-    action_frame.pack(fill="x", padx=20, pady=20)
-    
-    # Add user button
-    add_btn = ctk.CTkButton(
-        action_frame,
-        text="+ Add New User",
-        command=handle_add_user,
-        fg_color="#16A34A",
-        hover_color="#15803D",
-        height=40
-    )
-    add_btn.pack(side="left", padx=(0, 10))
-    
-    # Delete user button
-    delete_btn = ctk.CTkButton(
-        action_frame,
-        text="🗑️ Delete Selected User",
-        command=confirm_delete_user,
-        fg_color="#DC2626",
-        hover_color="#B91C1C",
-        height=40
-    )
-    delete_btn.pack(side="left", padx=(0, 10))
-    
-    # Toggle admin button
-    toggle_admin_btn = ctk.CTkButton(
-        action_frame,
-        text="👑 Toggle Admin Status",
-        command=toggle_selected_admin_status,
-        fg_color="#FACC15",
-        hover_color="#CA8A04",
-        text_color="black",
-        height=40
-    )
-    toggle_admin_btn.pack(side="left")
-    
-    # Refresh button
-    refresh_btn = ctk.CTkButton(
-        action_frame,
-        text="🔄 Refresh List",
-        command=refresh_user_list,
-        fg_color="#B146EC",
-        hover_color="#9333EA",
-        height=40
-    )
-    refresh_btn.pack(side="right")
-    
-    # Users list with scrollbar
-    users_frame = ctk.CTkFrame(content_frame, fg_color="#1A1A2E")
-    users_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
-    
-    # Create Treeview with ttk.Scrollbar
-    tree_frame = ctk.CTkFrame(users_frame)
-    tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
-    
-    # Create a custom style for the Treeview
-    style = ttk.Style()
-    style.theme_use("default")
-    
-    # Configure colors for dark mode
-    style.configure(
-        "Treeview",
-        background="#1E1E2E",
-        foreground="white",
-        fieldbackground="#1E1E2E",
-        borderwidth=0
-    )
-    style.map(
-        "Treeview", 
-        background=[("selected", "#B146EC")],
-        foreground=[("selected", "white")]
-    )
-    
-    # Add scrollbar
-    tree_scroll = ttk.Scrollbar(tree_frame)
-    tree_scroll.pack(side="right", fill="y")
-    
-    # Create Treeview with columns
-    users_tree = ttk.Treeview(
-        tree_frame,
-        columns=("id", "name", "email", "admin", "created", "playlists", "history", "user_id"),
-        show="headings",
-        height=20,
-        yscrollcommand=tree_scroll.set
-    )
-    users_tree.pack(fill="both", expand=True)
-    
-    # Configure scrollbar
-    tree_scroll.config(command=users_tree.yview)
-    
-    # Format columns
-    users_tree.heading("id", text="#")
-    users_tree.heading("name", text="Name")
-    users_tree.heading("email", text="Email")
-    users_tree.heading("admin", text="Admin")
-    users_tree.heading("created", text="Created")
-    users_tree.heading("playlists", text="Playlists")
-    users_tree.heading("history", text="Plays")
-    users_tree.heading("user_id", text="ID")
-    
-    # Set column widths and alignment
-    users_tree.column("id", width=40, anchor="center")
-    users_tree.column("name", width=180, anchor="w")
-    users_tree.column("email", width=200, anchor="w")
-    users_tree.column("admin", width=80, anchor="center")
-    users_tree.column("created", width=100, anchor="center")
-    users_tree.column("playlists", width=80, anchor="center")
-    users_tree.column("history", width=80, anchor="center")
-    users_tree.column("user_id", width=50, anchor="center")
-    
-    # Statistics footer
-    stats_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E", height=30)
-    stats_frame.pack(fill="x", padx=20, pady=(0, 10))
-    
-    stats_label = ctk.CTkLabel(
-        stats_frame,
-        text="Loading users...",
-        font=("Arial", 12),
-        text_color="#A0A0A0"
-    )
-    stats_label.pack(side="left")
-    
-    # Load users after the UI is created
-    root.after(100, refresh_user_list)
-    
-    root.mainloop()
-    
-except Exception as e:
-    import traceback
-    print(f"Error: {e}")
-    traceback.print_exc()
-    messagebox.showerror("Error", f"An error occurred: {e}")
\ No newline at end of file
+def main():
+    """Show the user management window"""
+    global root, tasks, tree_scroll, users_tree, stats_label
+    try:
+        # Verify admin privileges
+        admin = get_admin_info()
+        if not admin:
+            exit()
+
+        # Initialize app
+        ctk.set_appearance_mode("dark")
+        ctk.set_default_color_theme("blue")
+
+        root = ctk.CTk()
+        tasks = get_task_runner(root)  # Background database reads
+        root.title("Admin - Manage Users")
+        root.geometry("1000x600")
+
+        # Main frame
+        main_frame = ctk.CTkFrame(root)
+        main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Header
+        header_frame = ctk.CTkFrame(main_frame, height=60, fg_color="#1A1A2E")
+        header_frame.pack(fill="x", padx=10, pady=10)
+
+        # Title
+        ctk.CTkLabel(
+            header_frame, 
+            text="Manage Users", 
+            font=("Arial", 24, "bold"),
+            text_color="#B146EC"
+        ).pack(side="left", padx=20)
+
+        # Admin name
+        ctk.CTkLabel(
+            header_frame,
+            text=f"Admin: {admin['first_name']} {admin['last_name']}",
+            font=("Arial", 14)
+        ).pack(side="right", padx=20)
+
+        # Back button
+        back_btn = ctk.CTkButton(
+            header_frame,
+            text="← Back to Dashboard",
+            command=return_to_dashboard,
+            fg_color="#2563EB",
+            hover_color="#1D4ED8",
+            height=32
+        )
+        back_btn.pack(side="right", padx=20)
+
+        # Content area
+        content_frame = ctk.CTkFrame(main_frame, fg_color="#131B2E")
+        content_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        # Action buttons
+        action_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E", height=50)
+        action_frame.pack(fill="x", padx=20, pady=20)
+
+        # Add user button
+        add_btn = ctk.CTkButton(
+            action_frame,
+            text="+ Add New User",
+            command=handle_add_user,
+            fg_color="#16A34A",
+            hover_color="#15803D",
+            height=40
+        )
+        add_btn.pack(side="left", padx=(0, 10))
+
+        # Delete user button
+        delete_btn = ctk.CTkButton(
+            action_frame,
+            text="🗑️ Delete Selected User",
+            command=confirm_delete_user,
+            fg_color="#DC2626",
+            hover_color="#B91C1C",
+            height=40
+        )
+        delete_btn.pack(side="left", padx=(0, 10))
+
+        # Toggle admin button
+        toggle_admin_btn = ctk.CTkButton(
+            action_frame,
+            text="👑 Toggle Admin Status",
+            command=toggle_selected_admin_status,
+            fg_color="#FACC15",
+            hover_color="#CA8A04",
+            text_color="black",
+            height=40
+        )
+        toggle_admin_btn.pack(side="left")
+
+        # Refresh button
+        refresh_btn = ctk.CTkButton(
+            action_frame,
+            text="🔄 Refresh List",
+            command=refresh_user_list,
+            fg_color="#B146EC",
+            hover_color="#9333EA",
+            height=40
+        )
+        refresh_btn.pack(side="right")
+
+        # Page size
+        page_size_menu = ctk.CTkOptionMenu(
+            action_frame,
+            values=["50", "100", "250", "500"],
+            command=change_page_size,
+            width=80,
+            height=40
+        )
+        page_size_menu.set(str(user_pages["page_size"]))
+        page_size_menu.pack(side="right", padx=10)
+        ctk.CTkLabel(action_frame, text="Page size", font=("Arial", 12), text_color="#A0A0A0").pack(side="right")
+
+        # Users list with scrollbar
+        users_frame = ctk.CTkFrame(content_frame, fg_color="#1A1A2E")
+        users_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+
+        # Create Treeview with ttk.Scrollbar
+        tree_frame = ctk.CTkFrame(users_frame)
+        tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Create a custom style for the Treeview
+        style = ttk.Style()
+        style.theme_use("default")
+
+        # Configure colors for dark mode
+        style.configure(
+            "Treeview",
+            background="#1E1E2E",
+            foreground="white",
+            fieldbackground="#1E1E2E",
+            borderwidth=0
+        )
+        style.map(
+            "Treeview", 
+            background=[("selected", "#B146EC")],
+            foreground=[("selected", "white")]
+        )
+
+        # Add scrollbar
+        tree_scroll = ttk.Scrollbar(tree_frame)
+        tree_scroll.pack(side="right", fill="y")
+
+        # Create Treeview with columns
+        users_tree = ttk.Treeview(
+            tree_frame,
+            columns=("id", "name", "email", "admin", "created", "playlists", "history", "user_id"),
+            show="headings",
+            height=20,
+            yscrollcommand=on_users_scroll
+        )
+        users_tree.pack(fill="both", expand=True)
+
+        # Configure scrollbar
+        tree_scroll.config(command=users_tree.yview)
+        users_tree.tag_configure("skeleton", foreground="#555555")
+
+        # Format columns
+        users_tree.heading("id", text="#")
+        users_tree.heading("name", text="Name")
+        users_tree.heading("email", text="Email")
+        users_tree.heading("admin", text="Admin")
+        users_tree.heading("created", text="Created")
+        users_tree.heading("playlists", text="Playlists")
+        users_tree.heading("history", text="Plays")
+        users_tree.heading("user_id", text="ID")
+
+        # Set column widths and alignment
+        users_tree.column("id", width=40, anchor="center")
+        users_tree.column("name", width=180, anchor="w")
+        users_tree.column("email", width=200, anchor="w")
+        users_tree.column("admin", width=80, anchor="center")
+        users_tree.column("created", width=100, anchor="center")
+        users_tree.column("playlists", width=80, anchor="center")
+        users_tree.column("history", width=80, anchor="center")
+        users_tree.column("user_id", width=50, anchor="center")
+
+        # Statistics footer
+        stats_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E", height=30)
+        stats_frame.pack(fill="x", padx=20, pady=(0, 10))
+
+        stats_label = ctk.CTkLabel(
+            stats_frame,
+            text="Loading users...",
+            font=("Arial", 12),
+            text_color="#A0A0A0"
+        )
+        stats_label.pack(side="left")
+
+        # Load users after the UI is created
+        root.after(100, refresh_user_list)
+
+        root.mainloop()
+
+    except Exception as e:
+        import traceback
+        print(f"Error: {e}")
+        traceback.print_exc()
+        messagebox.showerror("Error", f"An error occurred: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,21 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox, simpledialog
-import mysql.connector
 import subprocess
 import os
 import io
 import shutil
-from pygame import mixer
-import mutagen
-from mutagen.mp3 import MP3
-from mutagen.id3 import ID3
-from mutagen.flac import FLAC
-from mutagen.wave import WAVE
+import sys
 
-# Initialize mixer for music playback
-mixer.init()
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import USER_SESSION_FILE, session_path
+from db_pool import get_connection
+from play_events import flush_play_events
+from player_client import get_player, follow_player, PlayerError
+from data_client import call
+from song_upload import upload_song_file
+from song_files import iter_song_chunks, save_chunks
 
 # Current song information
 current_song = {
@@ -34,13 +36,9 @@ selected_song = {
 # ------------------- Database Functions -------------------
 def connect_db():
     """Connect to the MySQL database"""
+    import mysql.connector  # Deferred: only pages that reach the database pay for it
     try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="new_password",
-            database="online_music_system"
-        )
+        connection = get_connection()
         return connection
     except mysql.connector.Error as err:
         messagebox.showerror("Database Connection Error", 
@@ -51,12 +49,12 @@ def get_current_user():
     """Get the current logged-in user information"""
     try:
         # Read user ID from file
-        if not os.path.exists("current_user.txt"):
+        if not os.path.exists(session_path(USER_SESSION_FILE)):
             messagebox.showerror("Error", "You are not logged in!")
             open_login_page()
             return None
             
-        with open("current_user.txt", "r") as f:
+        with open(session_path(USER_SESSION_FILE), "r") as f:
             user_id = f.read().strip()
             
         if not user_id:
@@ -86,43 +84,9 @@ def get_current_user():
             connection.close()
 
 def get_popular_songs(limit=8):
-    """Get most popular songs from the database"""
+    """Get most popular songs through the shared data service"""
     try:
-        connection = connect_db()
-        if not connection:
-            return []
-            
-        cursor = connection.cursor(dictionary=True)
-        
-        # Get songs with most plays in listening history
-        query = """
-        SELECT s.song_id, s.title, a.name as artist_name, COUNT(lh.history_id) as play_count, 
-               g.name as genre_name, s.file_size, s.file_type
-        FROM Songs s
-        JOIN Artists a ON s.artist_id = a.artist_id
-        LEFT JOIN Genres g ON s.genre_id = g.genre_id
-        LEFT JOIN Listening_History lh ON s.song_id = lh.song_id
-        GROUP BY s.song_id
-        ORDER BY play_count DESC
-        LIMIT %s
-        """
-        
-        cursor.execute(query, (limit,))
-        songs = cursor.fetchall()
-        
-        # If no songs with play history, get newest songs
-        if not songs:
-            query = """
-            SELECT s.song_id, s.title, a.name as artist_name, s.file_size, s.file_type,
-                   g.name as genre_name, 0 as play_count
-            FROM Songs s
-            JOIN Artists a ON s.artist_id = a.artist_id
-            LEFT JOIN Genres g ON s.genre_id = g.genre_id
-            ORDER BY s.upload_date DESC
-            LIMIT %s
-            """
-            cursor.execute(query, (limit,))
-            songs = cursor.fetchall()
+        songs = call("get_popular_songs", limit)
             
         # Format file sizes to human-readable format
         for song in songs:
@@ -130,43 +94,18 @@ def get_popular_songs(limit=8):
             
         return songs
         
-    except mysql.connector.Error as e:
+    except Exception as e:
         print(f"Error fetching popular songs: {e}")
         return []
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 def get_user_favorite_songs(limit=8):
     """Get the current user's favorite songs"""
     try:
-        # Get current user ID
-        with open("current_user.txt", "r") as f:
-            user_id = f.read().strip()
-            
-        connection = connect_db()
-        if not connection:
+        user_id = get_current_user_id()
+        if not user_id:
             return []
             
-        cursor = connection.cursor(dictionary=True)
-        
-        # Get songs the user has listened to most
-        query = """
-        SELECT s.song_id, s.title, a.name as artist_name, COUNT(lh.history_id) as play_count,
-               g.name as genre_name, s.file_size, s.file_type
-        FROM Listening_History lh
-        JOIN Songs s ON lh.song_id = s.song_id
-        JOIN Artists a ON s.artist_id = a.artist_id
-        LEFT JOIN Genres g ON s.genre_id = g.genre_id
-        WHERE lh.user_id = %s
-        GROUP BY s.song_id
-        ORDER BY play_count DESC
-        LIMIT %s
-        """
-        
-        cursor.execute(query, (user_id, limit))
-        songs = cursor.fetchall()
+        songs = call("get_user_favorite_songs", user_id, limit)
         
         # Format file sizes to human-readable format
         for song in songs:
@@ -177,13 +116,10 @@ def get_user_favorite_songs(limit=8):
     except Exception as e:
         print(f"Error getting user favorite songs: {e}")
         return []
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 def get_song_data(song_id):
-    """Get binary song data from database"""
+    """Get song info and a chunked stream of its audio data"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -192,7 +128,7 @@ def get_song_data(song_id):
         cursor = connection.cursor()
         
         query = """
-        SELECT s.file_data, s.file_type, s.title, a.name as artist_name 
+        SELECT s.file_type, s.title, a.name as artist_name
         FROM Songs s
         JOIN Artists a ON s.artist_id = a.artist_id
         WHERE s.song_id = %s
@@ -202,10 +138,10 @@ def get_song_data(song_id):
         result = cursor.fetchone()
         if result:
             return {
-                'data': result[0], 
-                'type': result[1],
-                'title': result[2],
-                'artist': result[3]
+                'chunks': iter_song_chunks(song_id), 
+                'type': result[0],
+                'title': result[1],
+                'artist': result[2]
             }
         return None
         
@@ -217,137 +153,48 @@ def get_song_data(song_id):
             cursor.close()
             connection.close()
 
-def record_listening_history(song_id):
-    """Record that the current user listened to a song"""
+def get_current_user_id():
+    """ID of the logged-in user, or None"""
     try:
-        # Get current user ID
-        with open("current_user.txt", "r") as f:
-            user_id = f.read().strip()
-            
-        connection = connect_db()
-        if not connection:
-            return
-            
-        cursor = connection.cursor()
-        
-        query = "INSERT INTO Listening_History (user_id, song_id) VALUES (%s, %s)"
-        cursor.execute(query, (user_id, song_id))
-        connection.commit()
-        
-    except Exception as e:
-        print(f"Error recording listening history: {e}")
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
+        with open(session_path(USER_SESSION_FILE), "r") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
 
 def get_artists():
-    """Get list of artists from the database"""
+    """Get list of artists through the shared data service"""
     try:
-        connection = connect_db()
-        if not connection:
-            return []
-            
-        cursor = connection.cursor(dictionary=True)
-        
-        query = "SELECT artist_id, name FROM Artists ORDER BY name"
-        cursor.execute(query)
-        
-        return cursor.fetchall()
-        
-    except mysql.connector.Error as e:
+        return call("get_artists")
+    except Exception as e:
         print(f"Error fetching artists: {e}")
         return []
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 def get_genres():
-    """Get list of genres from the database"""
+    """Get list of genres through the shared data service"""
     try:
-        connection = connect_db()
-        if not connection:
-            return []
-            
-        cursor = connection.cursor(dictionary=True)
-        
-        query = "SELECT genre_id, name FROM Genres ORDER BY name"
-        cursor.execute(query)
-        
-        return cursor.fetchall()
-        
-    except mysql.connector.Error as e:
+        return call("get_genres")
+    except Exception as e:
         print(f"Error fetching genres: {e}")
         return []
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 def upload_song(file_path, title, artist_id, genre_id=None):
     """Upload a song to the database"""
+    import mysql.connector
     try:
         if not os.path.exists(file_path):
             messagebox.showerror("Error", f"File not found: {file_path}")
             return None
         
-        # Get file information
-        file_size = os.path.getsize(file_path)
-        file_type = os.path.splitext(file_path)[1][1:].lower()  # Get extension without dot
-        
-        # Get song duration using mutagen
-        try:
-            if file_type == 'mp3':
-                audio = MP3(file_path)
-            elif file_type == 'flac':
-                audio = FLAC(file_path)
-            elif file_type in ['wav', 'wave']:
-                audio = WAVE(file_path)
-            else:
-                # Fallback for other formats
-                audio = mutagen.File(file_path)
-                
-            duration = int(audio.info.length)
-        except Exception as e:
-            print(f"Error getting audio duration: {e}")
-            duration = 0
-        
-        # Read file binary data
-        with open(file_path, 'rb') as file:
-            file_data = file.read()
-        
-        # Insert into database
-        connection = connect_db()
-        if not connection:
-            return None
-            
-        cursor = connection.cursor()
-        
-        query = """
-        INSERT INTO Songs (title, artist_id, genre_id, duration, file_data, file_type, file_size)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        values = (title, artist_id, genre_id, duration, file_data, file_type, file_size)
-        
-        cursor.execute(query, values)
-        connection.commit()
-        
-        # Return the new song ID
-        new_song_id = cursor.lastrowid
+        # One streaming pass: hash + blob storage, duration/tags, then the DB rows
+        new_song_id = upload_song_file(file_path, title, artist_id, genre_id)
         
         messagebox.showinfo("Success", f"Song '{title}' uploaded successfully!")
         return new_song_id
         
-    except mysql.connector.Error as e:
+    except (mysql.connector.Error, OSError) as e:
         print(f"Error uploading song: {e}")
         messagebox.showerror("Database Error", f"Failed to upload song: {e}")
         return None
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 def format_file_size(size_bytes):
     """Format file size from bytes to human-readable format"""
@@ -369,83 +216,62 @@ def format_file_size(size_bytes):
 
 # ------------------- Music Player Functions -------------------
 def play_song(song_id):
-    """Play a song from its binary data in the database"""
-    global current_song
-    
+    """Play a song in the player service"""
     try:
-        # Get song data from database
-        song_data = get_song_data(song_id)
-        if not song_data:
-            messagebox.showerror("Error", "Could not retrieve song data")
-            return False
-            
-        # Create a temporary file to play the song
-        temp_dir = "temp"
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        temp_file = os.path.join(temp_dir, f"song_{song_id}.{song_data['type']}")
-        
-        # Write binary data to temp file
-        with open(temp_file, 'wb') as f:
-            f.write(song_data['data'])
-            
-        # Load and play the song
-        mixer.music.load(temp_file)
-        mixer.music.play()
-        
-        # Update current song info
-        current_song = {
-            "id": song_id,
-            "title": song_data["title"],
-            "artist": song_data["artist"],
-            "playing": True,
-            "paused": False
-        }
-        
-        # Update UI elements
-        if 'now_playing_label' in globals():
-            now_playing_label.configure(text=f"Now Playing: {current_song['title']} - {current_song['artist']}")
-        
-        if 'play_btn' in globals():
-            play_btn.configure(text="⏸️")
-        
-        # Record in listening history
-        record_listening_history(song_id)
-        
+        # The service downloads the file and records the play; the
+        # controls follow its status events (show_player_status)
+        get_player().play(song_id, user_id=get_current_user_id())
         return True
         
-    except Exception as e:
+    except PlayerError as e:
         print(f"Error playing song: {e}")
         messagebox.showerror("Error", f"Could not play song: {e}")
         return False
 
-def toggle_play_pause():
-    """Toggle between play and pause states"""
+def show_player_status(status):
+    """Show a status event from the player service in the controls"""
     global current_song
     
+    current_song = {
+        "id": status.get("song_id"),
+        "title": status.get("title") or "Loading...",
+        "artist": status.get("artist") or "",
+        "playing": status["state"] in ("playing", "loading"),
+        "paused": status["state"] == "paused"
+    }
+    
+    play_btn.configure(text="⏸️" if current_song["playing"] else "▶️")
+    if current_song["playing"] or current_song["paused"]:
+        now_playing_label.configure(text=f"Now Playing: {current_song['title']} - {current_song['artist']}")
+    elif status.get("error"):
+        now_playing_label.configure(text=status["error"])
+    else:
+        now_playing_label.configure(text="Now Playing: No song playing")
+
+def toggle_play_pause():
+    """Toggle between play and pause states"""
     if current_song["id"] is None:
         # No song loaded - do nothing
         return
-    elif current_song["paused"]:
-        # Resume paused song
-        mixer.music.unpause()
-        current_song["paused"] = False
-        current_song["playing"] = True
-        play_btn.configure(text="⏸️")
-    elif current_song["playing"]:
-        # Pause playing song
-        mixer.music.pause()
-        current_song["paused"] = True
-        current_song["playing"] = False
-        play_btn.configure(text="▶️")
+    else:
+        try:
+            get_player().toggle()
+        except PlayerError as e:
+            messagebox.showerror("Error", f"Player unavailable: {e}")
 
 def play_next_song():
-    """Placeholder for playing next song"""
-    messagebox.showinfo("Info", "Next song feature will be implemented with playlists")
+    """Play the next queued song"""
+    try:
+        get_player().next()
+    except PlayerError as e:
+        messagebox.showinfo("Info", str(e))
 
 def play_previous_song():
-    """Placeholder for playing previous song"""
-    messagebox.showinfo("Info", "Previous song feature will be implemented with playlists")
+    """Play the song before the current one"""
+    try:
+        get_player().previous()
+    except PlayerError as e:
+        messagebox.showinfo("Info", str(e))
 
 # ------------------- Download Functions -------------------
 def download_song(song_id):
@@ -476,9 +302,8 @@ def download_song(song_id):
         if not save_path:  # User cancelled
             return False
         
-        # Write song data to file
-        with open(save_path, 'wb') as f:
-            f.write(song_data['data'])
+        # Stream song data to file
+        save_chunks(song_data['chunks'], save_path)
         
         messagebox.showinfo("Download Complete", f"Song has been downloaded to:\n{save_path}")
         return True
@@ -707,13 +532,15 @@ def open_recommend_page():
 def open_login_page():
     """Logout and open the login page"""
     try:
-        # Stop any playing music
-        if mixer.music.get_busy():
-            mixer.music.stop()
+        # Stop the music and the player service with the session
+        get_player().shutdown()
             
+        # Hand spooled plays to the ingester before the session ends
+        flush_play_events()
+        
         # Remove current user file
-        if os.path.exists("current_user.txt"):
-            os.remove("current_user.txt")
+        if os.path.exists(session_path(USER_SESSION_FILE)):
+            os.remove(session_path(USER_SESSION_FILE))
             
         subprocess.Popen(["python", "login.py"])
         root.destroy()
@@ -908,172 +735,180 @@ def display_popular_songs_tab():
         song_frames.append(song_frame)
 
 # ------------------- Initialize App -------------------
-try:
-    # Get current user info
-    user = get_current_user()
-    if not user:
-        # Redirect to login if not logged in
-        open_login_page()
-        exit()
-
-    # ---------------- Initialize App ----------------
-    ctk.set_appearance_mode("dark")  # Dark mode
-    ctk.set_default_color_theme("blue")  # Default theme
-
-    root = ctk.CTk()
-    root.title("Online Music System - Download Songs")
-    root.geometry("1000x600")  # Adjusted to match the image proportions
-    root.resizable(False, False)
-
-    # ---------------- Main Frame ----------------
-    main_frame = ctk.CTkFrame(root, fg_color="#1E1E2E", corner_radius=15)
-    main_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-    # ---------------- Sidebar Navigation ----------------
-    sidebar = ctk.CTkFrame(main_frame, width=250, height=580, fg_color="#111827", corner_radius=10)
-    sidebar.pack(side="left", fill="y", padx=(10, 0), pady=10)
-
-    # Sidebar Title
-    title_label = ctk.CTkLabel(sidebar, text="Online Music\nSystem", font=("Arial", 20, "bold"), text_color="white")
-    title_label.pack(pady=(25, 30))
-
-    # Sidebar Menu Items with navigation commands
-    home_btn = ctk.CTkButton(sidebar, text="🏠 Home", font=("Arial", 14), 
-                          fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
-                          anchor="w", corner_radius=0, height=40, command=open_home_page)
-    home_btn.pack(fill="x", pady=5, padx=10)
-
-    search_btn = ctk.CTkButton(sidebar, text="🔍 Search", font=("Arial", 14), 
-                            fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
-                            anchor="w", corner_radius=0, height=40, command=open_search_page)
-    search_btn.pack(fill="x", pady=5, padx=10)
-
-    playlist_btn = ctk.CTkButton(sidebar, text="🎵 Playlist", font=("Arial", 14), 
-                              fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
-                              anchor="w", corner_radius=0, height=40, command=open_playlist_page)
-    playlist_btn.pack(fill="x", pady=5, padx=10)
+def main():
+    """Show the download page"""
+    global root, title_label, now_playing_label, play_btn, favorite_songs_frame, subtitle_label
+    global tabs, favorite_tab, popular_tab, song_frames, button_frame
+    try:
+        # Get current user info
+        user = get_current_user()
+        if not user:
+            # Redirect to login if not logged in
+            open_login_page()
+            exit()
 
-    download_btn = ctk.CTkButton(sidebar, text="⬇️ Download", font=("Arial", 14), 
-                              fg_color="#111827", hover_color="#1E293B", text_color="white",
-                              anchor="w", corner_radius=0, height=40)
-    download_btn.pack(fill="x", pady=5, padx=10)
+        # ---------------- Initialize App ----------------
+        ctk.set_appearance_mode("dark")  # Dark mode
+        ctk.set_default_color_theme("blue")  # Default theme
 
-    recommend_btn = ctk.CTkButton(sidebar, text="🎧 Recommend Songs", font=("Arial", 14), 
-                                fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
-                                anchor="w", corner_radius=0, height=40, command=open_recommend_page)
-    recommend_btn.pack(fill="x", pady=5, padx=10)
+        root = ctk.CTk()
+        root.title("Online Music System - Download Songs")
+        root.geometry("1000x600")  # Adjusted to match the image proportions
+        root.resizable(False, False)
 
-    logout_btn = ctk.CTkButton(sidebar, text="🚪 Logout", font=("Arial", 14), 
-                             fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
-                             anchor="w", corner_radius=0, height=40, command=open_login_page)
-    logout_btn.pack(fill="x", pady=5, padx=10)
+        # ---------------- Main Frame ----------------
+        main_frame = ctk.CTkFrame(root, fg_color="#1E1E2E", corner_radius=15)
+        main_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-    # Now playing label
-    now_playing_frame = ctk.CTkFrame(sidebar, fg_color="#111827", height=40)
-    now_playing_frame.pack(side="bottom", fill="x", pady=(0, 10), padx=10)
-    
-    now_playing_label = ctk.CTkLabel(now_playing_frame, 
-                                   text="Now Playing: No song playing", 
-                                   font=("Arial", 12), 
-                                   text_color="#A0A0A0",
-                                   wraplength=220)
-    now_playing_label.pack(pady=5)
-
-    # Music player controls at bottom of sidebar
-    player_frame = ctk.CTkFrame(sidebar, fg_color="#111827", height=50)
-    player_frame.pack(side="bottom", fill="x", pady=10, padx=10)
-
-    # Control buttons with functionality
-    prev_btn = ctk.CTkButton(player_frame, text="⏮️", font=("Arial", 18), 
-                            fg_color="#111827", hover_color="#1E293B", 
-                            width=40, height=40, command=play_previous_song)
-    prev_btn.pack(side="left", padx=10)
-
-    play_btn = ctk.CTkButton(player_frame, text="▶️", font=("Arial", 18), 
-                           fg_color="#111827", hover_color="#1E293B", 
-                           width=40, height=40, command=toggle_play_pause)
-    play_btn.pack(side="left", padx=10)
-
-    next_btn = ctk.CTkButton(player_frame, text="⏭️", font=("Arial", 18), 
-                           fg_color="#111827", hover_color="#1E293B", 
-                           width=40, height=40, command=play_next_song)
-    next_btn.pack(side="left", padx=10)
-
-    # ---------------- Main Content ----------------
-    content_frame = ctk.CTkFrame(main_frame, fg_color="#131B2E", corner_radius=10)
-    content_frame.pack(side="right", fill="both", expand=True, padx=10, pady=10)
-
-    # Header with username
-    header_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E", height=40)
-    header_frame.pack(fill="x", padx=20, pady=(20, 0))
-
-    # Left side: Download Songs
-    download_label = ctk.CTkLabel(header_frame, text="Download Songs", font=("Arial", 24, "bold"), text_color="white")
-    download_label.pack(side="left")
-
-    # Right side: Username - updated with actual user name
-    user_label = ctk.CTkLabel(header_frame, 
-                           text=f"Hello, {user['first_name']} {user['last_name']}!", 
-                           font=("Arial", 14), text_color="#A0A0A0")
-    user_label.pack(side="right")
-
-    # ---------------- Download Your Favorite Songs ----------------
-    favorite_songs_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E")
-    favorite_songs_frame.pack(fill="both", expand=True, padx=20, pady=(40, 0))
-
-    # Section title - centered
-    title_label = ctk.CTkLabel(favorite_songs_frame, text="Download Your Favorite Songs 🎵", 
-                              font=("Arial", 24, "bold"), text_color="#B146EC")
-    title_label.pack(pady=(0, 5))
-
-    # Subtitle - centered
-    subtitle_label = ctk.CTkLabel(favorite_songs_frame, text="Select a song to download or upload your own.", 
-                                 font=("Arial", 14), text_color="#A0A0A0")
-    subtitle_label.pack(pady=(0, 20))
-
-    # Tabview for different song sections
-    tabs = ctk.CTkTabview(favorite_songs_frame, fg_color="#131B2E")
-    tabs.pack(fill="both", expand=True)
-    
-    # Add tabs
-    favorite_tab = tabs.add("Your Favorites")
-    popular_tab = tabs.add("Popular Songs")
-    
-    # Initialize song frames list
-    song_frames = []
-    
-    # Display favorite songs tab
-    display_favorite_songs_tab()
-    
-    # Display popular songs tab
-    display_popular_songs_tab()
+        # ---------------- Sidebar Navigation ----------------
+        sidebar = ctk.CTkFrame(main_frame, width=250, height=580, fg_color="#111827", corner_radius=10)
+        sidebar.pack(side="left", fill="y", padx=(10, 0), pady=10)
 
-    # Button frame at the bottom
-    button_frame = ctk.CTkFrame(favorite_songs_frame, fg_color="#131B2E")
-    button_frame.pack(pady=25)
-
-    # Download button
-    download_button = ctk.CTkButton(button_frame, text="⬇️ Download Selected", font=("Arial", 14, "bold"), 
-                                   fg_color="#B146EC", hover_color="#9333EA", 
-                                   corner_radius=5, height=40, width=210, 
-                                   command=download_selected_song)
-    download_button.pack(side="left", padx=10)
-
-    # Upload button
-    upload_button = ctk.CTkButton(button_frame, text="⬆️ Upload New Song", font=("Arial", 14, "bold"), 
-                                 fg_color="#2563EB", hover_color="#1D4ED8", 
-                                 corner_radius=5, height=40, width=210,
-                                 command=handle_upload_song)
-    upload_button.pack(side="left", padx=10)
-
-    # ---------------- Run Application ----------------
-    root.mainloop()
-    
-except Exception as e:
-    import traceback
-    print(f"Error in download.py: {e}")
-    traceback.print_exc()
-    messagebox.showerror("Error", f"An error occurred: {e}")
-    input("Press Enter to exit...")  # This keeps console open size and type - right side
-        
+        # Sidebar Title
+        title_label = ctk.CTkLabel(sidebar, text="Online Music\nSystem", font=("Arial", 20, "bold"), text_color="white")
+        title_label.pack(pady=(25, 30))
 
+        # Sidebar Menu Items with navigation commands
+        home_btn = ctk.CTkButton(sidebar, text="🏠 Home", font=("Arial", 14), 
+                              fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
+                              anchor="w", corner_radius=0, height=40, command=open_home_page)
+        home_btn.pack(fill="x", pady=5, padx=10)
+
+        search_btn = ctk.CTkButton(sidebar, text="🔍 Search", font=("Arial", 14), 
+                                fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
+                                anchor="w", corner_radius=0, height=40, command=open_search_page)
+        search_btn.pack(fill="x", pady=5, padx=10)
+
+        playlist_btn = ctk.CTkButton(sidebar, text="🎵 Playlist", font=("Arial", 14), 
+                                  fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
+                                  anchor="w", corner_radius=0, height=40, command=open_playlist_page)
+        playlist_btn.pack(fill="x", pady=5, padx=10)
+
+        download_btn = ctk.CTkButton(sidebar, text="⬇️ Download", font=("Arial", 14), 
+                                  fg_color="#111827", hover_color="#1E293B", text_color="white",
+                                  anchor="w", corner_radius=0, height=40)
+        download_btn.pack(fill="x", pady=5, padx=10)
+
+        recommend_btn = ctk.CTkButton(sidebar, text="🎧 Recommend Songs", font=("Arial", 14), 
+                                    fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
+                                    anchor="w", corner_radius=0, height=40, command=open_recommend_page)
+        recommend_btn.pack(fill="x", pady=5, padx=10)
+
+        logout_btn = ctk.CTkButton(sidebar, text="🚪 Logout", font=("Arial", 14), 
+                                 fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
+                                 anchor="w", corner_radius=0, height=40, command=open_login_page)
+        logout_btn.pack(fill="x", pady=5, padx=10)
+
+        # Now playing label
+        now_playing_frame = ctk.CTkFrame(sidebar, fg_color="#111827", height=40)
+        now_playing_frame.pack(side="bottom", fill="x", pady=(0, 10), padx=10)
+
+        now_playing_label = ctk.CTkLabel(now_playing_frame, 
+                                       text="Now Playing: No song playing", 
+                                       font=("Arial", 12), 
+                                       text_color="#A0A0A0",
+                                       wraplength=220)
+        now_playing_label.pack(pady=5)
+
+        # Music player controls at bottom of sidebar
+        player_frame = ctk.CTkFrame(sidebar, fg_color="#111827", height=50)
+        player_frame.pack(side="bottom", fill="x", pady=10, padx=10)
+
+        # Control buttons with functionality
+        prev_btn = ctk.CTkButton(player_frame, text="⏮️", font=("Arial", 18), 
+                                fg_color="#111827", hover_color="#1E293B", 
+                                width=40, height=40, command=play_previous_song)
+        prev_btn.pack(side="left", padx=10)
+
+        play_btn = ctk.CTkButton(player_frame, text="▶️", font=("Arial", 18), 
+                               fg_color="#111827", hover_color="#1E293B", 
+                               width=40, height=40, command=toggle_play_pause)
+        play_btn.pack(side="left", padx=10)
+
+        next_btn = ctk.CTkButton(player_frame, text="⏭️", font=("Arial", 18), 
+                               fg_color="#111827", hover_color="#1E293B", 
+                               width=40, height=40, command=play_next_song)
+        next_btn.pack(side="left", padx=10)
+
+        # ---------------- Main Content ----------------
+        content_frame = ctk.CTkFrame(main_frame, fg_color="#131B2E", corner_radius=10)
+        content_frame.pack(side="right", fill="both", expand=True, padx=10, pady=10)
+
+        # Header with username
+        header_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E", height=40)
+        header_frame.pack(fill="x", padx=20, pady=(20, 0))
+
+        # Left side: Download Songs
+        download_label = ctk.CTkLabel(header_frame, text="Download Songs", font=("Arial", 24, "bold"), text_color="white")
+        download_label.pack(side="left")
+
+        # Right side: Username - updated with actual user name
+        user_label = ctk.CTkLabel(header_frame, 
+                               text=f"Hello, {user['first_name']} {user['last_name']}!", 
+                               font=("Arial", 14), text_color="#A0A0A0")
+        user_label.pack(side="right")
+
+        # ---------------- Download Your Favorite Songs ----------------
+        favorite_songs_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E")
+        favorite_songs_frame.pack(fill="both", expand=True, padx=20, pady=(40, 0))
+
+        # Section title - centered
+        title_label = ctk.CTkLabel(favorite_songs_frame, text="Download Your Favorite Songs 🎵", 
+                                  font=("Arial", 24, "bold"), text_color="#B146EC")
+        title_label.pack(pady=(0, 5))
+
+        # Subtitle - centered
+        subtitle_label = ctk.CTkLabel(favorite_songs_frame, text="Select a song to download or upload your own.", 
+                                     font=("Arial", 14), text_color="#A0A0A0")
+        subtitle_label.pack(pady=(0, 20))
+
+        # Tabview for different song sections
+        tabs = ctk.CTkTabview(favorite_songs_frame, fg_color="#131B2E")
+        tabs.pack(fill="both", expand=True)
+
+        # Add tabs
+        favorite_tab = tabs.add("Your Favorites")
+        popular_tab = tabs.add("Popular Songs")
+
+        # Initialize song frames list
+        song_frames = []
+
+        # Display favorite songs tab
+        display_favorite_songs_tab()
+
+        # Display popular songs tab
+        display_popular_songs_tab()
+
+        # Button frame at the bottom
+        button_frame = ctk.CTkFrame(favorite_songs_frame, fg_color="#131B2E")
+        button_frame.pack(pady=25)
+
+        # Download button
+        download_button = ctk.CTkButton(button_frame, text="⬇️ Download Selected", font=("Arial", 14, "bold"), 
+                                       fg_color="#B146EC", hover_color="#9333EA", 
+                                       corner_radius=5, height=40, width=210, 
+                                       command=download_selected_song)
+        download_button.pack(side="left", padx=10)
+
+        # Upload button
+        upload_button = ctk.CTkButton(button_frame, text="⬆️ Upload New Song", font=("Arial", 14, "bold"), 
+                                     fg_color="#2563EB", hover_color="#1D4ED8", 
+                                     corner_radius=5, height=40, width=210,
+                                     command=handle_upload_song)
+        upload_button.pack(side="left", padx=10)
+
+        # The player service owns the mixer; follow its status events
+        follow_player(root, show_player_status)
+
+        # ---------------- Run Application ----------------
+        root.mainloop()
+
+    except Exception as e:
+        import traceback
+        print(f"Error in download.py: {e}")
+        traceback.print_exc()
+        messagebox.showerror("Error", f"An error occurred: {e}")
+        input("Press Enter to exit...")  # This keeps console open size and type - right side
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-import mysql.connector
 import os
 import subprocess
 import tkinter as tk
@@ -9,11 +8,22 @@ import random
 import time
 import shutil
 import io
-from PIL import Image
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import USER_SESSION_FILE, ADMIN_SESSION_FILE, session_path
+from db_pool import get_connection
+from db_migrations import apply_migrations
+from blob_store import store_bytes, add_blob_ref
+from song_stats import rebuild_song_stats
+from counters import recount_counters
 
 # ------------------- Database Setup Functions -------------------
 def connect_db_server():
     """Connect to MySQL server without specifying a database"""
+    import mysql.connector
     try:
         connection = mysql.connector.connect(
             host="localhost",
@@ -27,13 +37,9 @@ def connect_db_server():
 
 def connect_db():
     """Connect to the specific database"""
+    import mysql.connector  # Deferred: only pages that reach the database pay for it
     try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="new_password",
-            database="online_music_system"
-        )
+        connection = get_connection()
         return connection
     except mysql.connector.Error as err:
         print(f"Error connecting to database: {err}")
@@ -41,6 +47,7 @@ def connect_db():
 
 def create_database():
     """Create the database and tables"""
+    import mysql.connector
     try:
         # First connect to server
         connection = connect_db_server()
@@ -54,127 +61,11 @@ def create_database():
         cursor.execute("CREATE DATABASE IF NOT EXISTS online_music_system")
         cursor.execute("USE online_music_system")
         
-        # Create Users table
-        print("Creating Users table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Users (
-            user_id INT AUTO_INCREMENT PRIMARY KEY,
-            first_name VARCHAR(50) NOT NULL,
-            last_name VARCHAR(50) NOT NULL,
-            email VARCHAR(100) NOT NULL UNIQUE,
-            password VARCHAR(64) NOT NULL,
-            is_admin BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        
-        # Create Artists table
-        print("Creating Artists table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Artists (
-            artist_id INT AUTO_INCREMENT PRIMARY KEY,
-            name VARCHAR(100) NOT NULL,
-            bio TEXT,
-            image_url VARCHAR(255)
-        )
-        """)
-        
-        # Create Albums table
-        print("Creating Albums table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Albums (
-            album_id INT AUTO_INCREMENT PRIMARY KEY,
-            title VARCHAR(100) NOT NULL,
-            artist_id INT,
-            release_year INT,
-            cover_art MEDIUMBLOB,
-            FOREIGN KEY (artist_id) REFERENCES Artists(artist_id) ON DELETE SET NULL
-        )
-        """)
-        
-        # Create Genres table
-        print("Creating Genres table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Genres (
-            genre_id INT AUTO_INCREMENT PRIMARY KEY,
-            name VARCHAR(50) NOT NULL UNIQUE
-        )
-        """)
-        
-        # Create Songs table
-        print("Creating Songs table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Songs (
-            song_id INT AUTO_INCREMENT PRIMARY KEY,
-            title VARCHAR(100) NOT NULL,
-            artist_id INT,
-            album_id INT,
-            genre_id INT,
-            duration INT,
-            file_data LONGBLOB NOT NULL,
-            file_type VARCHAR(10) NOT NULL,
-            file_size INT NOT NULL,
-            upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (artist_id) REFERENCES Artists(artist_id) ON DELETE SET NULL,
-            FOREIGN KEY (album_id) REFERENCES Albums(album_id) ON DELETE SET NULL,
-            FOREIGN KEY (genre_id) REFERENCES Genres(genre_id) ON DELETE SET NULL
-        )
-        """)
-        
-        # Create Playlists table
-        print("Creating Playlists table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Playlists (
-            playlist_id INT AUTO_INCREMENT PRIMARY KEY,
-            user_id INT NOT NULL,
-            name VARCHAR(100) NOT NULL,
-            description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
-        )
-        """)
-        
-        # Create Playlist_Songs junction table
-        print("Creating Playlist_Songs table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Playlist_Songs (
-            playlist_id INT NOT NULL,
-            song_id INT NOT NULL,
-            position INT NOT NULL,
-            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (playlist_id, song_id),
-            FOREIGN KEY (playlist_id) REFERENCES Playlists(playlist_id) ON DELETE CASCADE,
-            FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
-        )
-        """)
-        
-        # Create User_Favorites table
-        print("Creating User_Favorites table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS User_Favorites (
-            user_id INT NOT NULL,
-            song_id INT NOT NULL,
-            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (user_id, song_id),
-            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
-            FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
-        )
-        """)
-        
-        # Create Listening_History table
-        print("Creating Listening_History table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Listening_History (
-            history_id INT AUTO_INCREMENT PRIMARY KEY,
-            user_id INT NOT NULL,
-            song_id INT NOT NULL,
-            played_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
-            FOREIGN KEY (song_id) REFERENCES Songs(song_id) ON DELETE CASCADE
-        )
-        """)
+        # Tables, indexes and later schema changes are versioned migrations
+        # (see db_migrations.py), so this setup path never keeps its own DDL
+        print("Applying schema migrations...")
+        apply_migrations(connection)
         
-        connection.commit()
         cursor.close()
         connection.close()
         
@@ -191,6 +82,7 @@ def hash_password(password):
 
 def add_default_users():
     """Add default users including admin"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -240,6 +132,7 @@ def add_default_users():
 
 def add_default_genres():
     """Add default music genres"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -283,6 +176,7 @@ def add_default_genres():
 
 def add_default_artists():
     """Add default artists"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -335,6 +229,7 @@ def add_default_artists():
 
 def add_default_albums():
     """Add default albums"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -391,6 +286,7 @@ def add_default_albums():
 
 def add_dummy_songs():
     """Add dummy/placeholder songs"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -440,12 +336,17 @@ def add_dummy_songs():
             ("Stay", "Justin Bieber", "Justice", "Pop", 141)
         ]
         
-        # Dummy audio data - just a placeholder WAV file
+        # Dummy audio data - just a placeholder WAV file, stored once and
+        # shared by every dummy song through the blob store
         print("Creating dummy audio data...")
         dummy_audio_data = create_dummy_audio()
-        dummy_file_size = len(dummy_audio_data)
+        dummy_hash, dummy_locator, dummy_file_size = store_bytes(dummy_audio_data)
         dummy_file_type = "wav"
         
+        # store_bytes() took the first reference; each extra song takes one more
+        if len(dummy_songs) > 1:
+            add_blob_ref(dummy_locator, len(dummy_songs) - 1)
+        
         # Insert songs
         print("Adding dummy songs...")
         for title, artist_name, album_title, genre_name, duration in dummy_songs:
@@ -456,10 +357,14 @@ def add_dummy_songs():
             
             cursor.execute(
                 """
-                INSERT INTO Songs (title, artist_id, album_id, genre_id, duration, file_data, file_type, file_size)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                INSERT INTO Songs (title, artist_id, album_id, genre_id, duration, file_type, file_size)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
                 """,
-                (title, artist_id, album_id, genre_id, duration, dummy_audio_data, dummy_file_type, dummy_file_size)
+                (title, artist_id, album_id, genre_id, duration, dummy_file_type, dummy_file_size)
+            )
+            cursor.execute(
+                "INSERT INTO Song_Files (song_id, content_hash, storage_locator) VALUES (%s, %s, %s)",
+                (cursor.lastrowid, dummy_hash, dummy_locator)
             )
         
         connection.commit()
@@ -471,6 +376,11 @@ def add_dummy_songs():
         
     except mysql.connector.Error as err:
         print(f"Error adding dummy songs: {err}")
+        try:
+            connection.rollback()
+            connection.close()
+        except Exception:
+            pass
         return False
 
 def create_dummy_audio():
@@ -519,6 +429,7 @@ def create_dummy_audio():
 
 def add_default_playlists():
     """Add default playlists"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -609,6 +520,7 @@ def add_default_playlists():
 
 def add_sample_listening_history():
     """Add sample listening history for users"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -665,6 +577,10 @@ def add_sample_listening_history():
         
         print(f"Added {new_count} listening history records successfully!")
         
+        # Bring the Song_Stats play counters and dashboard totals in line with the seeded data
+        rebuild_song_stats(connection)
+        recount_counters(connection)
+        
         cursor.close()
         connection.close()
         return True
@@ -826,11 +742,11 @@ def launch_application():
     """Launch the application starting with the login screen"""
     try:
         # Clear any existing user session
-        if os.path.exists("current_user.txt"):
-            os.remove("current_user.txt")
+        if os.path.exists(session_path(USER_SESSION_FILE)):
+            os.remove(session_path(USER_SESSION_FILE))
         
-        if os.path.exists("current_admin.txt"):
-            os.remove("current_admin.txt")
+        if os.path.exists(session_path(ADMIN_SESSION_FILE)):
+            os.remove(session_path(ADMIN_SESSION_FILE))
         
         # Start the login page
         subprocess.Popen(["python", "login.py"])
@@ -842,11 +758,11 @@ def launch_admin_login():
     """Launch the admin login page"""
     try:
         # Clear any existing user session
-        if os.path.exists("current_user.txt"):
-            os.remove("current_user.txt")
+        if os.path.exists(session_path(USER_SESSION_FILE)):
+            os.remove(session_path(USER_SESSION_FILE))
         
-        if os.path.exists("current_admin.txt"):
-            os.remove("current_admin.txt")
+        if os.path.exists(session_path(ADMIN_SESSION_FILE)):
+            os.remove(session_path(ADMIN_SESSION_FILE))
         
         # Start the admin login page
         subprocess.Popen(["python", "admin_login.py"])
@@ -1,13 +1,20 @@
 import customtkinter as ctk
 from tkinter import messagebox, simpledialog
-import mysql.connector
 import subprocess
 import os
-from pygame import mixer
 import io
+import sys
 
-# Initialize mixer for music playback
-mixer.init()
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import USER_SESSION_FILE, session_path
+from db_pool import get_connection
+from play_events import flush_play_events
+from player_client import get_player, follow_player, PlayerError
+from virtual_list import VirtualList, TrackRow
+from ui_tasks import get_task_runner, is_ui_thread
+from data_client import call, invalidate
 
 # Current song information
 current_song = {
@@ -21,29 +28,29 @@ current_song = {
 # ------------------- Database Functions -------------------
 def connect_db():
     """Connect to the MySQL database"""
+    import mysql.connector  # Deferred: only pages that reach the database pay for it
     try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="new_password",
-            database="online_music_system"
-        )
+        connection = get_connection()
         return connection
     except mysql.connector.Error as err:
-        messagebox.showerror("Database Connection Error", 
-                            f"Failed to connect to database: {err}")
+        # Background tasks must not open dialogs
+        if is_ui_thread():
+            messagebox.showerror("Database Connection Error", 
+                                f"Failed to connect to database: {err}")
+        else:
+            print(f"Failed to connect to database: {err}")
         return None
 
 def get_current_user():
     """Get the current logged-in user information"""
     try:
         # Read user ID from file
-        if not os.path.exists("current_user.txt"):
+        if not os.path.exists(session_path(USER_SESSION_FILE)):
             messagebox.showerror("Error", "You are not logged in!")
             open_login_page()
             return None
             
-        with open("current_user.txt", "r") as f:
+        with open(session_path(USER_SESSION_FILE), "r") as f:
             user_id = f.read().strip()
             
         if not user_id:
@@ -74,6 +81,7 @@ def get_current_user():
 
 def get_system_playlists():
     """Get featured/system playlists from the database"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -116,6 +124,7 @@ def get_system_playlists():
 
 def create_default_system_playlists():
     """Create default system playlists if they don't exist"""
+    import mysql.connector
     try:
         connection = connect_db()
         if not connection:
@@ -149,43 +158,20 @@ def create_default_system_playlists():
 def get_user_playlists():
     """Get the current user's playlists"""
     try:
-        # Get current user ID
-        with open("current_user.txt", "r") as f:
-            user_id = f.read().strip()
-            
-        connection = connect_db()
-        if not connection:
+        user_id = get_current_user_id()
+        if not user_id:
             return []
-            
-        cursor = connection.cursor(dictionary=True)
-        
-        query = """
-        SELECT p.playlist_id, p.name, COUNT(ps.song_id) AS song_count
-        FROM Playlists p
-        LEFT JOIN Playlist_Songs ps ON p.playlist_id = ps.playlist_id
-        WHERE p.user_id = %s
-        GROUP BY p.playlist_id
-        ORDER BY p.created_at DESC
-        """
-        
-        cursor.execute(query, (user_id,))
-        playlists = cursor.fetchall()
-        
-        return playlists
-        
+        return call("get_user_playlists", user_id)
     except Exception as e:
         print(f"Error fetching user playlists: {e}")
         return []
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 def create_new_playlist(name, description=""):
     """Create a new playlist for the current user"""
+    import mysql.connector
     try:
         # Get current user ID
-        with open("current_user.txt", "r") as f:
+        with open(session_path(USER_SESSION_FILE), "r") as f:
             user_id = f.read().strip()
             
         connection = connect_db()
@@ -198,6 +184,7 @@ def create_new_playlist(name, description=""):
         cursor.execute(query, (user_id, name, description))
         
         connection.commit()
+        invalidate("playlists")
         
         # Return the new playlist ID
         new_playlist_id = cursor.lastrowid
@@ -214,24 +201,7 @@ def create_new_playlist(name, description=""):
 def get_playlist_songs(playlist_id):
     """Get songs in a playlist"""
     try:
-        connection = connect_db()
-        if not connection:
-            return []
-            
-        cursor = connection.cursor(dictionary=True)
-        
-        query = """
-        SELECT s.song_id, s.title, a.name as artist_name, s.duration,
-               ps.position
-        FROM Playlist_Songs ps
-        JOIN Songs s ON ps.song_id = s.song_id
-        JOIN Artists a ON s.artist_id = a.artist_id
-        WHERE ps.playlist_id = %s
-        ORDER BY ps.position
-        """
-        
-        cursor.execute(query, (playlist_id,))
-        songs = cursor.fetchall()
+        songs = call("get_playlist_songs", playlist_id)
         
         # Format durations to MM:SS
         for song in songs:
@@ -240,156 +210,76 @@ def get_playlist_songs(playlist_id):
         
         return songs
         
-    except mysql.connector.Error as e:
+    except Exception as e:
         print(f"Error fetching playlist songs: {e}")
         return []
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
-def get_song_data(song_id):
-    """Get binary song data from database"""
+def get_current_user_id():
+    """ID of the logged-in user, or None"""
     try:
-        connection = connect_db()
-        if not connection:
-            return None
-            
-        cursor = connection.cursor()
-        
-        query = "SELECT file_data, file_type FROM Songs WHERE song_id = %s"
-        cursor.execute(query, (song_id,))
-        
-        result = cursor.fetchone()
-        if result:
-            return {'data': result[0], 'type': result[1]}
-        return None
-        
-    except mysql.connector.Error as e:
-        print(f"Error getting song data: {e}")
+        with open(session_path(USER_SESSION_FILE), "r") as f:
+            return f.read().strip() or None
+    except OSError:
         return None
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
-
-def record_listening_history(song_id):
-    """Record that the current user listened to a song"""
-    try:
-        # Get current user ID
-        with open("current_user.txt", "r") as f:
-            user_id = f.read().strip()
-            
-        connection = connect_db()
-        if not connection:
-            return
-            
-        cursor = connection.cursor()
-        
-        query = "INSERT INTO Listening_History (user_id, song_id) VALUES (%s, %s)"
-        cursor.execute(query, (user_id, song_id))
-        connection.commit()
-        
-    except Exception as e:
-        print(f"Error recording listening history: {e}")
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 # ------------------- Music Player Functions -------------------
 def play_song(song_id):
-    """Play a song from its binary data in the database"""
-    global current_song
-    
+    """Play a song in the player service"""
     try:
-        # Get song data from database
-        song_data = get_song_data(song_id)
-        if not song_data:
-            messagebox.showerror("Error", "Could not retrieve song data")
-            return False
-            
-        # Get additional song info for display
-        connection = connect_db()
-        if connection:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT s.title, a.name as artist_name FROM Songs s JOIN Artists a ON s.artist_id = a.artist_id WHERE s.song_id = %s",
-                (song_id,)
-            )
-            song_info = cursor.fetchone()
-            cursor.close()
-            connection.close()
-        else:
-            song_info = {"title": "Unknown", "artist_name": "Unknown"}
-            
-        # Create a temporary file to play the song
-        temp_dir = "temp"
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        temp_file = os.path.join(temp_dir, f"song_{song_id}.{song_data['type']}")
-        
-        # Write binary data to temp file
-        with open(temp_file, 'wb') as f:
-            f.write(song_data['data'])
-            
-        # Load and play the song
-        mixer.music.load(temp_file)
-        mixer.music.play()
-        
-        # Update current song info
-        current_song = {
-            "id": song_id,
-            "title": song_info["title"],
-            "artist": song_info["artist_name"],
-            "playing": True,
-            "paused": False
-        }
-        
-        # Update UI elements
-        if 'now_playing_label' in globals():
-            now_playing_label.configure(text=f"Now Playing: {current_song['title']} - {current_song['artist']}")
-        
-        if 'play_btn' in globals():
-            play_btn.configure(text="⏸️")
-        
-        # Record in listening history
-        record_listening_history(song_id)
-        
+        # The service downloads the file and records the play; the
+        # controls follow its status events (show_player_status)
+        get_player().play(song_id, user_id=get_current_user_id())
         return True
         
-    except Exception as e:
+    except PlayerError as e:
         print(f"Error playing song: {e}")
         messagebox.showerror("Error", f"Could not play song: {e}")
         return False
 
-def toggle_play_pause():
-    """Toggle between play and pause states"""
+def show_player_status(status):
+    """Show a status event from the player service in the controls"""
     global current_song
     
+    current_song = {
+        "id": status.get("song_id"),
+        "title": status.get("title") or "Loading...",
+        "artist": status.get("artist") or "",
+        "playing": status["state"] in ("playing", "loading"),
+        "paused": status["state"] == "paused"
+    }
+    
+    play_btn.configure(text="⏸️" if current_song["playing"] else "▶️")
+    if current_song["playing"] or current_song["paused"]:
+        now_playing_label.configure(text=f"Now Playing: {current_song['title']} - {current_song['artist']}")
+    elif status.get("error"):
+        now_playing_label.configure(text=status["error"])
+    else:
+        now_playing_label.configure(text="Now Playing: No song playing")
+
+def toggle_play_pause():
+    """Toggle between play and pause states"""
     if current_song["id"] is None:
         # No song loaded - do nothing
         return
-    elif current_song["paused"]:
-        # Resume paused song
-        mixer.music.unpause()
-        current_song["paused"] = False
-        current_song["playing"] = True
-        play_btn.configure(text="⏸️")
-    elif current_song["playing"]:
-        # Pause playing song
-        mixer.music.pause()
-        current_song["paused"] = True
-        current_song["playing"] = False
-        play_btn.configure(text="▶️")
+    else:
+        try:
+            get_player().toggle()
+        except PlayerError as e:
+            messagebox.showerror("Error", f"Player unavailable: {e}")
 
 def play_next_song():
-    """Placeholder for playing next song"""
-    messagebox.showinfo("Info", "Next song feature will be implemented with playlists")
+    """Play the next queued song"""
+    try:
+        get_player().next()
+    except PlayerError as e:
+        messagebox.showinfo("Info", str(e))
 
 def play_previous_song():
-    """Placeholder for playing previous song"""
-    messagebox.showinfo("Info", "Previous song feature will be implemented with playlists")
+    """Play the song before the current one"""
+    try:
+        get_player().previous()
+    except PlayerError as e:
+        messagebox.showinfo("Info", str(e))
 
 # ------------------- Navigation Functions -------------------
 def open_home_page():
@@ -427,13 +317,15 @@ def open_recommend_page():
 def open_login_page():
     """Logout and open the login page"""
     try:
-        # Stop any playing music
-        if mixer.music.get_busy():
-            mixer.music.stop()
+        # Stop the music and the player service with the session
+        get_player().shutdown()
             
+        # Hand spooled plays to the ingester before the session ends
+        flush_play_events()
+        
         # Remove current user file
-        if os.path.exists("current_user.txt"):
-            os.remove("current_user.txt")
+        if os.path.exists(session_path(USER_SESSION_FILE)):
+            os.remove(session_path(USER_SESSION_FILE))
             
         subprocess.Popen(["python", "login.py"])
         root.destroy()
@@ -465,11 +357,39 @@ def open_playlist_songs(playlist_id, playlist_name):
     songs_frame = ctk.CTkFrame(content_frame, fg_color="#131B2E")
     songs_frame.pack(fill="both", expand=True, padx=20, pady=(20, 10))
     
-    # Get songs in this playlist
-    songs = get_playlist_songs(playlist_id)
+    # Song list header
+    header = ctk.CTkFrame(songs_frame, fg_color="#131B2E", height=30)
+    header.pack(fill="x", pady=(0, 10))
+    
+    ctk.CTkLabel(header, text="#", font=("Arial", 12, "bold"), text_color="#A0A0A0",
+               width=50).pack(side="left", padx=(10, 0))
+    ctk.CTkLabel(header, text="TITLE", font=("Arial", 12, "bold"), text_color="#A0A0A0",
+               width=250).pack(side="left", padx=(10, 0))
+    ctk.CTkLabel(header, text="ARTIST", font=("Arial", 12, "bold"), text_color="#A0A0A0",
+               width=200).pack(side="left", padx=(10, 0))
+    ctk.CTkLabel(header, text="DURATION", font=("Arial", 12, "bold"), text_color="#A0A0A0",
+               width=100).pack(side="left", padx=(10, 0))
+    
+    # Songs list; only the visible rows exist as widgets
+    songs_list = VirtualList(
+        songs_frame,
+        row_factory=lambda parent: TrackRow(parent, lambda song: play_song(song["song_id"])),
+        row_height=40, row_gap=4,
+        fg_color="#131B2E", height=400, corner_radius=0
+    )
+    songs_list.pack(fill="both", expand=True, pady=(0, 10))
+    
+    # Placeholders while the songs load in the background
+    songs_list.show_skeleton()
     
-    if not songs:
+    def show_songs(songs):
+        if songs:
+            songs_list.set_items(songs)
+            return
+        
         # No songs in this playlist
+        header.destroy()
+        songs_list.destroy()
         empty_label = ctk.CTkLabel(songs_frame, text="This playlist is empty.", 
                                  font=("Arial", 16), text_color="#A0A0A0")
         empty_label.pack(pady=30)
@@ -479,54 +399,9 @@ def open_playlist_songs(playlist_id, playlist_name):
                                     font=("Arial", 14, "bold"), fg_color="#B146EC", 
                                     hover_color="#9333EA", command=lambda: open_search_page())
         add_song_btn.pack(pady=10)
-    else:
-        # Song list header
-        header = ctk.CTkFrame(songs_frame, fg_color="#131B2E", height=30)
-        header.pack(fill="x", pady=(0, 10))
-        
-        ctk.CTkLabel(header, text="#", font=("Arial", 12, "bold"), text_color="#A0A0A0",
-                   width=50).pack(side="left", padx=(10, 0))
-        ctk.CTkLabel(header, text="TITLE", font=("Arial", 12, "bold"), text_color="#A0A0A0",
-                   width=250).pack(side="left", padx=(10, 0))
-        ctk.CTkLabel(header, text="ARTIST", font=("Arial", 12, "bold"), text_color="#A0A0A0",
-                   width=200).pack(side="left", padx=(10, 0))
-        ctk.CTkLabel(header, text="DURATION", font=("Arial", 12, "bold"), text_color="#A0A0A0",
-                   width=100).pack(side="left", padx=(10, 0))
-        
-        # Songs list
-        songs_list_frame = ctk.CTkScrollableFrame(songs_frame, fg_color="#131B2E", 
-                                                height=400, corner_radius=0)
-        songs_list_frame.pack(fill="both", expand=True, pady=(0, 10))
-        
-        # Add songs to list
-        for i, song in enumerate(songs, 1):
-            song_row = ctk.CTkFrame(songs_list_frame, fg_color="#1A1A2E", corner_radius=5, height=40)
-            song_row.pack(fill="x", pady=2, padx=5)
-            
-            # Track number
-            ctk.CTkLabel(song_row, text=str(i), font=("Arial", 12), text_color="white",
-                       width=50).pack(side="left", padx=(10, 0))
-            
-            # Song title
-            ctk.CTkLabel(song_row, text=song["title"], font=("Arial", 12), text_color="white",
-                       width=250, anchor="w").pack(side="left", padx=(10, 0))
-            
-            # Artist name
-            ctk.CTkLabel(song_row, text=song["artist_name"], font=("Arial", 12), text_color="#A0A0A0",
-                       width=200, anchor="w").pack(side="left", padx=(10, 0))
-            
-            # Duration
-            ctk.CTkLabel(song_row, text=song["duration_formatted"], font=("Arial", 12), text_color="#A0A0A0",
-                       width=100, anchor="w").pack(side="left", padx=(10, 0))
-            
-            # Play button
-            play_btn = ctk.CTkButton(song_row, text="▶️", font=("Arial", 14), fg_color="#1A1A2E",
-                                   hover_color="#232342", width=30, height=30, 
-                                   command=lambda sid=song["song_id"]: play_song(sid))
-            play_btn.pack(side="right", padx=10)
-            
-            # Make row clickable
-            song_row.bind("<Button-1>", lambda e, sid=song["song_id"]: play_song(sid))
+    
+    # Get songs in this playlist; opening another playlist supersedes this load
+    tasks.submit(get_playlist_songs, playlist_id, key="playlist_songs", on_done=show_songs)
 
 def show_create_playlist_dialog():
     """Show dialog to create a new playlist"""
@@ -548,6 +423,9 @@ def show_create_playlist_dialog():
 
 def refresh_playlists():
     """Refresh the playlists view"""
+    # Drop a playlist's songs that are still loading
+    tasks.cancel("playlist_songs")
+    
     # Clear the content frame
     for widget in content_frame.winfo_children():
         widget.destroy()
@@ -687,110 +565,120 @@ def create_playlists_content():
                            pname=playlist["name"]: open_playlist_songs(pid, pname))
 
 # ------------------- Initialize App -------------------
-try:
-    # Get current user info
-    user = get_current_user()
-    if not user:
-        # Redirect to login if not logged in
-        open_login_page()
-        exit()
-
-    # ---------------- Initialize App ----------------
-    ctk.set_appearance_mode("dark")  # Dark mode
-    ctk.set_default_color_theme("blue")  # Default theme
-
-    root = ctk.CTk()
-    root.title("Online Music System - Playlists")
-    root.geometry("1000x600")  # Adjusted to match the image proportions
-    root.resizable(False, False)
-
-    # ---------------- Main Frame ----------------
-    main_frame = ctk.CTkFrame(root, fg_color="#1E1E2E", corner_radius=15)
-    main_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-    # ---------------- Sidebar Navigation ----------------
-    sidebar = ctk.CTkFrame(main_frame, width=250, height=580, fg_color="#111827", corner_radius=10)
-    sidebar.pack(side="left", fill="y", padx=(10, 0), pady=10)
-
-    # Sidebar Title
-    title_label = ctk.CTkLabel(sidebar, text="Online Music\nSystem", font=("Arial", 20, "bold"), text_color="white")
-    title_label.pack(pady=(25, 30))
-
-    # Sidebar Menu Items with navigation commands
-    home_btn = ctk.CTkButton(sidebar, text="🏠 Home", font=("Arial", 14), 
-                          fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
-                          anchor="w", corner_radius=0, height=40, command=open_home_page)
-    home_btn.pack(fill="x", pady=5, padx=10)
-
-    search_btn = ctk.CTkButton(sidebar, text="🔍 Search", font=("Arial", 14), 
-                            fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
-                            anchor="w", corner_radius=0, height=40, command=open_search_page)
-    search_btn.pack(fill="x", pady=5, padx=10)
-
-    playlist_btn = ctk.CTkButton(sidebar, text="🎵 Playlist", font=("Arial", 14), 
-                              fg_color="#111827", hover_color="#1E293B", text_color="white",
-                              anchor="w", corner_radius=0, height=40)
-    playlist_btn.pack(fill="x", pady=5, padx=10)
-
-    download_btn = ctk.CTkButton(sidebar, text="⬇️ Download", font=("Arial", 14), 
-                              fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
-                              anchor="w", corner_radius=0, height=40, command=open_download_page)
-    download_btn.pack(fill="x", pady=5, padx=10)
+def main():
+    """Show the playlist page"""
+    global user, root, tasks, now_playing_label, play_btn, content_frame
+    try:
+        # Get current user info
+        user = get_current_user()
+        if not user:
+            # Redirect to login if not logged in
+            open_login_page()
+            exit()
 
-    recommend_btn = ctk.CTkButton(sidebar, text="🎧 Recommend Songs", font=("Arial", 14), 
-                                fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
-                                anchor="w", corner_radius=0, height=40, command=open_recommend_page)
-    recommend_btn.pack(fill="x", pady=5, padx=10)
+        # ---------------- Initialize App ----------------
+        ctk.set_appearance_mode("dark")  # Dark mode
+        ctk.set_default_color_theme("blue")  # Default theme
 
-    logout_btn = ctk.CTkButton(sidebar, text="🚪 Logout", font=("Arial", 14), 
-                             fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
-                             anchor="w", corner_radius=0, height=40, command=open_login_page)
-    logout_btn.pack(fill="x", pady=5, padx=10)
+        root = ctk.CTk()
+        tasks = get_task_runner(root)  # Background database reads
+        root.title("Online Music System - Playlists")
+        root.geometry("1000x600")  # Adjusted to match the image proportions
+        root.resizable(False, False)
 
-    # Now playing label
-    now_playing_frame = ctk.CTkFrame(sidebar, fg_color="#111827", height=40)
-    now_playing_frame.pack(side="bottom", fill="x", pady=(0, 10), padx=10)
-    
-    now_playing_label = ctk.CTkLabel(now_playing_frame, 
-                                   text="Now Playing: No song playing", 
-                                   font=("Arial", 12), 
-                                   text_color="#A0A0A0",
-                                   wraplength=220)
-    now_playing_label.pack(pady=5)
-
-    # Music player controls at bottom of sidebar
-    player_frame = ctk.CTkFrame(sidebar, fg_color="#111827", height=50)
-    player_frame.pack(side="bottom", fill="x", pady=10, padx=10)
-
-    # Control buttons with functionality
-    prev_btn = ctk.CTkButton(player_frame, text="⏮️", font=("Arial", 18), 
-                            fg_color="#111827", hover_color="#1E293B", 
-                            width=40, height=40, command=play_previous_song)
-    prev_btn.pack(side="left", padx=10)
-
-    play_btn = ctk.CTkButton(player_frame, text="▶️", font=("Arial", 18), 
-                           fg_color="#111827", hover_color="#1E293B", 
-                           width=40, height=40, command=toggle_play_pause)
-    play_btn.pack(side="left", padx=10)
-
-    next_btn = ctk.CTkButton(player_frame, text="⏭️", font=("Arial", 18), 
-                           fg_color="#111827", hover_color="#1E293B", 
-                           width=40, height=40, command=play_next_song)
-    next_btn.pack(side="left", padx=10)
-
-    # ---------------- Main Content ----------------
-    content_frame = ctk.CTkFrame(main_frame, fg_color="#131B2E", corner_radius=10)
-    content_frame.pack(side="right", fill="both", expand=True, padx=10, pady=10)
-
-    # Create playlists content
-    create_playlists_content()
+        # ---------------- Main Frame ----------------
+        main_frame = ctk.CTkFrame(root, fg_color="#1E1E2E", corner_radius=15)
+        main_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-    # ---------------- Run Application ----------------
-    root.mainloop()
-    
-except Exception as e:
-    import traceback
-    print(f"Error in playlist.py: {e}")
-    traceback.print_exc()
-    messagebox.showerror("Error", f"An error occurred: {e}")
-    input("Press Enter to exit...")  # This keeps console open
\ No newline at end of file
+        # ---------------- Sidebar Navigation ----------------
+        sidebar = ctk.CTkFrame(main_frame, width=250, height=580, fg_color="#111827", corner_radius=10)
+        sidebar.pack(side="left", fill="y", padx=(10, 0), pady=10)
+
+        # Sidebar Title
+        title_label = ctk.CTkLabel(sidebar, text="Online Music\nSystem", font=("Arial", 20, "bold"), text_color="white")
+        title_label.pack(pady=(25, 30))
+
+        # Sidebar Menu Items with navigation commands
+        home_btn = ctk.CTkButton(sidebar, text="🏠 Home", font=("Arial", 14), 
+                              fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
+                              anchor="w", corner_radius=0, height=40, command=open_home_page)
+        home_btn.pack(fill="x", pady=5, padx=10)
+
+        search_btn = ctk.CTkButton(sidebar, text="🔍 Search", font=("Arial", 14), 
+                                fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
+                                anchor="w", corner_radius=0, height=40, command=open_search_page)
+        search_btn.pack(fill="x", pady=5, padx=10)
+
+        playlist_btn = ctk.CTkButton(sidebar, text="🎵 Playlist", font=("Arial", 14), 
+                                  fg_color="#111827", hover_color="#1E293B", text_color="white",
+                                  anchor="w", corner_radius=0, height=40)
+        playlist_btn.pack(fill="x", pady=5, padx=10)
+
+        download_btn = ctk.CTkButton(sidebar, text="⬇️ Download", font=("Arial", 14), 
+                                  fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
+                                  anchor="w", corner_radius=0, height=40, command=open_download_page)
+        download_btn.pack(fill="x", pady=5, padx=10)
+
+        recommend_btn = ctk.CTkButton(sidebar, text="🎧 Recommend Songs", font=("Arial", 14), 
+                                    fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
+                                    anchor="w", corner_radius=0, height=40, command=open_recommend_page)
+        recommend_btn.pack(fill="x", pady=5, padx=10)
+
+        logout_btn = ctk.CTkButton(sidebar, text="🚪 Logout", font=("Arial", 14), 
+                                 fg_color="#111827", hover_color="#1E293B", text_color="#A0A0A0",
+                                 anchor="w", corner_radius=0, height=40, command=open_login_page)
+        logout_btn.pack(fill="x", pady=5, padx=10)
+
+        # Now playing label
+        now_playing_frame = ctk.CTkFrame(sidebar, fg_color="#111827", height=40)
+        now_playing_frame.pack(side="bottom", fill="x", pady=(0, 10), padx=10)
+
+        now_playing_label = ctk.CTkLabel(now_playing_frame, 
+                                       text="Now Playing: No song playing", 
+                                       font=("Arial", 12), 
+                                       text_color="#A0A0A0",
+                                       wraplength=220)
+        now_playing_label.pack(pady=5)
+
+        # Music player controls at bottom of sidebar
+        player_frame = ctk.CTkFrame(sidebar, fg_color="#111827", height=50)
+        player_frame.pack(side="bottom", fill="x", pady=10, padx=10)
+
+        # Control buttons with functionality
+        prev_btn = ctk.CTkButton(player_frame, text="⏮️", font=("Arial", 18), 
+                                fg_color="#111827", hover_color="#1E293B", 
+                                width=40, height=40, command=play_previous_song)
+        prev_btn.pack(side="left", padx=10)
+
+        play_btn = ctk.CTkButton(player_frame, text="▶️", font=("Arial", 18), 
+                               fg_color="#111827", hover_color="#1E293B", 
+                               width=40, height=40, command=toggle_play_pause)
+        play_btn.pack(side="left", padx=10)
+
+        next_btn = ctk.CTkButton(player_frame, text="⏭️", font=("Arial", 18), 
+                               fg_color="#111827", hover_color="#1E293B", 
+                               width=40, height=40, command=play_next_song)
+        next_btn.pack(side="left", padx=10)
+
+        # ---------------- Main Content ----------------
+        content_frame = ctk.CTkFrame(main_frame, fg_color="#131B2E", corner_radius=10)
+        content_frame.pack(side="right", fill="both", expand=True, padx=10, pady=10)
+
+        # Create playlists content
+        create_playlists_content()
+
+        # The player service owns the mixer; follow its status events
+        follow_player(root, show_player_status)
+
+        # ---------------- Run Application ----------------
+        root.mainloop()
+
+    except Exception as e:
+        import traceback
+        print(f"Error in playlist.py: {e}")
+        traceback.print_exc()
+        messagebox.showerror("Error", f"An error occurred: {e}")
+        input("Press Enter to exit...")  # This keeps console open
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,21 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import mysql.connector
 import hashlib
 import subprocess  # To open login.py
 import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_pool import get_connection
 
 # ------------------- Database Connection -------------------
 def connect_db():
     """Connect to the MySQL database"""
+    import mysql.connector  # Deferred: only pages that reach the database pay for it
     try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",  # Replace with your MySQL username
-            password="new_password",  # Replace with your MySQL password
-            database="online_music_system"  # Replace with your database name
-        )
+        connection = get_connection()
         return connection
     except mysql.connector.Error as err:
         messagebox.showerror("Database Connection Error", 
@@ -40,6 +41,7 @@ def validate_password(password):
 # ------------------- Sign Up Function -------------------
 def signup_user():
     """Register a new user in the database"""
+    import mysql.connector
     full_name = fullname_entry.get()
     email = email_entry.get()
     password = password_entry.get()
@@ -198,172 +200,180 @@ def adjust_layout_for_resolution(event=None):
     content_frame.pack_configure(padx=int(40 * width_scale), pady=int(40 * height_scale))
 
 # ----------------- Setup UI -----------------
-try:
-    # Create temp directory for temporary files if it doesn't exist
-    os.makedirs("temp", exist_ok=True)
-    
-    ctk.set_appearance_mode("light")  # Light Mode
-    ctk.set_default_color_theme("blue")
-
-    # Main window
-    root = ctk.CTk()
-    root.title("Online Music System - Sign Up")
-    root.geometry("700x500")  # Default starting size
-    root.minsize(500, 400)    # Minimum functional size
-    
-    # Main Frame with rounded corners
-    main_frame = ctk.CTkFrame(root, corner_radius=20)
-    main_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-    # Left Side - Branding with purple color
-    left_frame = ctk.CTkFrame(main_frame, fg_color="#B146EC", width=350, height=480, corner_radius=20)
-    left_frame.pack(side="left", fill="both")
-
-    # Title on the left side
-    title_label = ctk.CTkLabel(left_frame, text="Online Music\nSystem",
-                              font=("Arial", 36, "bold"), text_color="white")
-    title_label.place(relx=0.5, rely=0.22, anchor="center")
-
-    # Description text below title
-    desc_label = ctk.CTkLabel(left_frame, 
-                             text="Join now to experience unlimited\n*ad-free music*, create custom\nplaylists, and explore new songs.",
-                             font=("Arial", 14), text_color="white", justify="center")
-    desc_label.place(relx=0.5, rely=0.40, anchor="center")
-
-    # Add music bird illustration (same as login page)
-    bird_label = ctk.CTkLabel(left_frame, text="🎵🐦", font=("Arial", 40), text_color="white")
-    bird_label.place(relx=0.5, rely=0.75, anchor="center")
-
-    # Right Side - Signup Form
-    right_frame = ctk.CTkFrame(main_frame, fg_color="white", width=350, height=480, corner_radius=0)
-    right_frame.pack(side="right", fill="both", expand=True)
-
-    # Content container with padding
-    content_frame = ctk.CTkFrame(right_frame, fg_color="white")
-    content_frame.pack(fill="both", expand=True, padx=40, pady=40)
-
-    # Create an Account title
-    right_title_label = ctk.CTkLabel(content_frame, text="Create an Account", 
-                              font=("Arial", 28, "bold"), text_color="#B146EC")
-    right_title_label.pack(anchor="w", pady=(0, 0))
-
-    # Subtitle
-    subtitle_label = ctk.CTkLabel(content_frame, text="Sign up to start your journey into the world of music.",
-                                 font=("Arial", 12), text_color="gray")
-    subtitle_label.pack(anchor="w", pady=(0, 25))
-
-    # Full Name label
-    fullname_label = ctk.CTkLabel(content_frame, text="Full Name", 
-                                 font=("Arial", 14, "bold"), text_color="#333333")
-    fullname_label.pack(anchor="w", pady=(0, 5))
-
-    # Full Name Entry with person icon
-    fullname_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-    fullname_frame.pack(fill="x", pady=(0, 15))
-
-    fullname_entry = ctk.CTkEntry(fullname_frame, font=("Arial", 12), 
-                                 height=45, corner_radius=8,
-                                 border_width=1, border_color="#DDDDDD",
-                                 fg_color="white", text_color="black")
-    fullname_entry.pack(fill="x", side="left", expand=True)
-
-    person_icon = ctk.CTkLabel(fullname_frame, text="👤", font=("Arial", 14), fg_color="transparent")
-    person_icon.pack(side="right", padx=(0, 10))
-
-    # Email Address label
-    email_label = ctk.CTkLabel(content_frame, text="Email Address", 
-                              font=("Arial", 14, "bold"), text_color="#333333")
-    email_label.pack(anchor="w", pady=(0, 5))
-
-    # Email Entry with envelope icon
-    email_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-    email_frame.pack(fill="x", pady=(0, 15))
-
-    email_entry = ctk.CTkEntry(email_frame, font=("Arial", 12), 
-                              height=45, corner_radius=8,
-                              border_width=1, border_color="#DDDDDD",
-                              fg_color="white", text_color="black")
-    email_entry.pack(fill="x", side="left", expand=True)
-
-    email_icon = ctk.CTkLabel(email_frame, text="✉️", font=("Arial", 14), fg_color="transparent")
-    email_icon.pack(side="right", padx=(0, 10))
-
-    # Password label
-    password_label = ctk.CTkLabel(content_frame, text="Password", 
-                                 font=("Arial", 14, "bold"), text_color="#333333")
-    password_label.pack(anchor="w", pady=(0, 5))
-
-    # Password Entry with lock icon
-    password_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-    password_frame.pack(fill="x", pady=(0, 15))
-
-    password_entry = ctk.CTkEntry(password_frame, font=("Arial", 12), 
-                                 height=45, corner_radius=8, 
-                                 border_width=1, border_color="#DDDDDD",
-                                 fg_color="white", text_color="black", 
-                                 show="*")
-    password_entry.pack(fill="x", side="left", expand=True)
-
-    password_icon = ctk.CTkLabel(password_frame, text="🔒", font=("Arial", 14), fg_color="transparent")
-    password_icon.pack(side="right", padx=(0, 10))
-
-    # Confirm Password label
-    confirm_password_label = ctk.CTkLabel(content_frame, text="Confirm Password", 
-                                         font=("Arial", 14, "bold"), text_color="#333333")
-    confirm_password_label.pack(anchor="w", pady=(0, 5))
-
-    # Confirm Password Entry with lock icon
-    confirm_password_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-    confirm_password_frame.pack(fill="x", pady=(0, 15))
-
-    confirm_password_entry = ctk.CTkEntry(confirm_password_frame, font=("Arial", 12), 
-                                         height=45, corner_radius=8, 
-                                         border_width=1, border_color="#DDDDDD",
-                                         fg_color="white", text_color="black", 
-                                         show="*")
-    confirm_password_entry.pack(fill="x", side="left", expand=True)
-
-    confirm_password_icon = ctk.CTkLabel(confirm_password_frame, text="🔒", font=("Arial", 14), fg_color="transparent")
-    confirm_password_icon.pack(side="right", padx=(0, 10))
-
-    # Sign Up button with arrow icon (to match login button)
-    signup_button = ctk.CTkButton(content_frame, text="Sign Up", 
-                                 font=("Arial", 14, "bold"),
-                                 fg_color="#B146EC", hover_color="#9333EA", 
-                                 text_color="white", corner_radius=8, 
-                                 height=45, command=signup_user)
-    signup_button.pack(fill="x", pady=(10, 20))
-
-    # Add an arrow icon to the signup button (matching login)
-    signup_icon_label = ctk.CTkLabel(signup_button, text="→", font=("Arial", 16, "bold"), text_color="white")
-    signup_icon_label.place(relx=0.9, rely=0.5, anchor="e")
-
-    # Already have an account text
-    login_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-    login_frame.pack(pady=0)
-
-    account_label = ctk.CTkLabel(login_frame, text="Already have an account? ", 
-                                font=("Arial", 12), text_color="#333333")
-    account_label.pack(side="left")
-
-    login_label = ctk.CTkLabel(login_frame, text="Login", 
-                              font=("Arial", 12, "bold"), 
-                              text_color="#B146EC", cursor="hand2")
-    login_label.pack(side="left")
-    login_label.bind("<Button-1>", lambda e: open_login_page())
-    
-    # Set up the window resize event binding
-    root.bind("<Configure>", adjust_layout_for_resolution)
-    
-    # Initial layout adjustment after rendering
-    root.update_idletasks()
-    adjust_layout_for_resolution()
+def main():
+    """Show the signup window"""
+    global root, left_frame, title_label, desc_label, bird_label, right_frame, content_frame
+    global right_title_label, subtitle_label, fullname_entry, email_entry, password_entry
+    global confirm_password_entry
+    try:
+        # Create temp directory for temporary files if it doesn't exist
+        os.makedirs("temp", exist_ok=True)
+
+        ctk.set_appearance_mode("light")  # Light Mode
+        ctk.set_default_color_theme("blue")
+
+        # Main window
+        root = ctk.CTk()
+        root.title("Online Music System - Sign Up")
+        root.geometry("700x500")  # Default starting size
+        root.minsize(500, 400)    # Minimum functional size
+
+        # Main Frame with rounded corners
+        main_frame = ctk.CTkFrame(root, corner_radius=20)
+        main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Left Side - Branding with purple color
+        left_frame = ctk.CTkFrame(main_frame, fg_color="#B146EC", width=350, height=480, corner_radius=20)
+        left_frame.pack(side="left", fill="both")
+
+        # Title on the left side
+        title_label = ctk.CTkLabel(left_frame, text="Online Music\nSystem",
+                                  font=("Arial", 36, "bold"), text_color="white")
+        title_label.place(relx=0.5, rely=0.22, anchor="center")
+
+        # Description text below title
+        desc_label = ctk.CTkLabel(left_frame, 
+                                 text="Join now to experience unlimited\n*ad-free music*, create custom\nplaylists, and explore new songs.",
+                                 font=("Arial", 14), text_color="white", justify="center")
+        desc_label.place(relx=0.5, rely=0.40, anchor="center")
+
+        # Add music bird illustration (same as login page)
+        bird_label = ctk.CTkLabel(left_frame, text="🎵🐦", font=("Arial", 40), text_color="white")
+        bird_label.place(relx=0.5, rely=0.75, anchor="center")
+
+        # Right Side - Signup Form
+        right_frame = ctk.CTkFrame(main_frame, fg_color="white", width=350, height=480, corner_radius=0)
+        right_frame.pack(side="right", fill="both", expand=True)
+
+        # Content container with padding
+        content_frame = ctk.CTkFrame(right_frame, fg_color="white")
+        content_frame.pack(fill="both", expand=True, padx=40, pady=40)
+
+        # Create an Account title
+        right_title_label = ctk.CTkLabel(content_frame, text="Create an Account", 
+                                  font=("Arial", 28, "bold"), text_color="#B146EC")
+        right_title_label.pack(anchor="w", pady=(0, 0))
+
+        # Subtitle
+        subtitle_label = ctk.CTkLabel(content_frame, text="Sign up to start your journey into the world of music.",
+                                     font=("Arial", 12), text_color="gray")
+        subtitle_label.pack(anchor="w", pady=(0, 25))
+
+        # Full Name label
+        fullname_label = ctk.CTkLabel(content_frame, text="Full Name", 
+                                     font=("Arial", 14, "bold"), text_color="#333333")
+        fullname_label.pack(anchor="w", pady=(0, 5))
+
+        # Full Name Entry with person icon
+        fullname_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        fullname_frame.pack(fill="x", pady=(0, 15))
+
+        fullname_entry = ctk.CTkEntry(fullname_frame, font=("Arial", 12), 
+                                     height=45, corner_radius=8,
+                                     border_width=1, border_color="#DDDDDD",
+                                     fg_color="white", text_color="black")
+        fullname_entry.pack(fill="x", side="left", expand=True)
+
+        person_icon = ctk.CTkLabel(fullname_frame, text="👤", font=("Arial", 14), fg_color="transparent")
+        person_icon.pack(side="right", padx=(0, 10))
+
+        # Email Address label
+        email_label = ctk.CTkLabel(content_frame, text="Email Address", 
+                                  font=("Arial", 14, "bold"), text_color="#333333")
+        email_label.pack(anchor="w", pady=(0, 5))
+
+        # Email Entry with envelope icon
+        email_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        email_frame.pack(fill="x", pady=(0, 15))
+
+        email_entry = ctk.CTkEntry(email_frame, font=("Arial", 12), 
+                                  height=45, corner_radius=8,
+                                  border_width=1, border_color="#DDDDDD",
+                                  fg_color="white", text_color="black")
+        email_entry.pack(fill="x", side="left", expand=True)
+
+        email_icon = ctk.CTkLabel(email_frame, text="✉️", font=("Arial", 14), fg_color="transparent")
+        email_icon.pack(side="right", padx=(0, 10))
+
+        # Password label
+        password_label = ctk.CTkLabel(content_frame, text="Password", 
+                                     font=("Arial", 14, "bold"), text_color="#333333")
+        password_label.pack(anchor="w", pady=(0, 5))
+
+        # Password Entry with lock icon
+        password_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        password_frame.pack(fill="x", pady=(0, 15))
+
+        password_entry = ctk.CTkEntry(password_frame, font=("Arial", 12), 
+                                     height=45, corner_radius=8, 
+                                     border_width=1, border_color="#DDDDDD",
+                                     fg_color="white", text_color="black", 
+                                     show="*")
+        password_entry.pack(fill="x", side="left", expand=True)
+
+        password_icon = ctk.CTkLabel(password_frame, text="🔒", font=("Arial", 14), fg_color="transparent")
+        password_icon.pack(side="right", padx=(0, 10))
+
+        # Confirm Password label
+        confirm_password_label = ctk.CTkLabel(content_frame, text="Confirm Password", 
+                                             font=("Arial", 14, "bold"), text_color="#333333")
+        confirm_password_label.pack(anchor="w", pady=(0, 5))
+
+        # Confirm Password Entry with lock icon
+        confirm_password_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        confirm_password_frame.pack(fill="x", pady=(0, 15))
+
+        confirm_password_entry = ctk.CTkEntry(confirm_password_frame, font=("Arial", 12), 
+                                             height=45, corner_radius=8, 
+                                             border_width=1, border_color="#DDDDDD",
+                                             fg_color="white", text_color="black", 
+                                             show="*")
+        confirm_password_entry.pack(fill="x", side="left", expand=True)
+
+        confirm_password_icon = ctk.CTkLabel(confirm_password_frame, text="🔒", font=("Arial", 14), fg_color="transparent")
+        confirm_password_icon.pack(side="right", padx=(0, 10))
+
+        # Sign Up button with arrow icon (to match login button)
+        signup_button = ctk.CTkButton(content_frame, text="Sign Up", 
+                                     font=("Arial", 14, "bold"),
+                                     fg_color="#B146EC", hover_color="#9333EA", 
+                                     text_color="white", corner_radius=8, 
+                                     height=45, command=signup_user)
+        signup_button.pack(fill="x", pady=(10, 20))
+
+        # Add an arrow icon to the signup button (matching login)
+        signup_icon_label = ctk.CTkLabel(signup_button, text="→", font=("Arial", 16, "bold"), text_color="white")
+        signup_icon_label.place(relx=0.9, rely=0.5, anchor="e")
+
+        # Already have an account text
+        login_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        login_frame.pack(pady=0)
+
+        account_label = ctk.CTkLabel(login_frame, text="Already have an account? ", 
+                                    font=("Arial", 12), text_color="#333333")
+        account_label.pack(side="left")
+
+        login_label = ctk.CTkLabel(login_frame, text="Login", 
+                                  font=("Arial", 12, "bold"), 
+                                  text_color="#B146EC", cursor="hand2")
+        login_label.pack(side="left")
+        login_label.bind("<Button-1>", lambda e: open_login_page())
+
+        # Set up the window resize event binding
+        root.bind("<Configure>", adjust_layout_for_resolution)
+
+        # Initial layout adjustment after rendering
+        root.update_idletasks()
+        adjust_layout_for_resolution()
+
+        # Run the application
+        root.mainloop()
 
-    # Run the application
-    root.mainloop()
-    
-except Exception as e:
-    import traceback
-    print(f"Error: {e}")
-    traceback.print_exc()
-    input("Press Enter to exit...")  # This keeps the console open
\ No newline at end of file
+    except Exception as e:
+        import traceback
+        print(f"Error: {e}")
+        traceback.print_exc()
+        input("Press Enter to exit...")  # This keeps the console open
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Background data loading for the Tk pages of the Online Music System.
+
+Database calls run on a small worker pool so a slow query never freezes
+the window. Tk is not thread-safe, so workers only compute values; the
+callbacks that update widgets run on the Tk thread, from a root.after()
+poll that is only scheduled while tasks are outstanding:
+
+    tasks = get_task_runner(root)
+    song_list.show_skeleton()
+    tasks.submit(search_songs, query, key="search",
+                 on_done=lambda songs: song_list.set_items(songs))
+
+Submitting with a key supersedes the previous task with that key, e.g.
+an older search that is still running: if it has not started it never
+runs, and if it has, its result is dropped. Task functions must not touch
+widgets or show dialogs; on_error (on the Tk thread) handles failures.
+"""
+
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from config import UI_TASKS
+
+class Task:
+    """Handle for a submitted task"""
+
+    def __init__(self, key=None):
+        self.key = key
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        """Drop the result; the function is skipped if it has not started"""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+class TaskRunner:
+    """Worker pool whose results are delivered on the Tk thread
+
+    Args:
+        root: Tk root whose after() loop delivers results
+        workers: Worker threads (defaults to UI_TASKS["workers"])
+        poll_ms: Result poll interval (defaults to UI_TASKS["poll_ms"])
+    """
+
+    def __init__(self, root, workers=None, poll_ms=None):
+        self.root = root
+        self.poll_ms = poll_ms or UI_TASKS.get("poll_ms", 15)
+        self.executor = ThreadPoolExecutor(max_workers=workers or UI_TASKS.get("workers", 4),
+                                           thread_name_prefix="ui-task")
+        self.finished = queue.SimpleQueue()  # (task, on_done, on_error) per finished future
+        self.latest = {}                     # key -> newest task with that key
+        self.pending = 0
+        self.closed = False
+        self._poll_id = None
+
+    def submit(self, fn, *args, on_done=None, on_error=None, key=None, **kwargs):
+        """Run fn(*args, **kwargs) on a worker
+
+        Args:
+            on_done: Called with the result on the Tk thread
+            on_error: Called with the exception on the Tk thread
+                      (defaults to printing it)
+            key: Cancels the previous task submitted with the same key
+
+        Returns:
+            Task
+        """
+        if self.closed:
+            return None
+        task = Task(key)
+        if key is not None:
+            previous = self.latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self.latest[key] = task
+
+        task.future = self.executor.submit(self._run, task, fn, args, kwargs)
+        # Fires exactly once per future, also when it is cancelled before running
+        task.future.add_done_callback(lambda future: self.finished.put((task, on_done, on_error)))
+        self.pending += 1
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+        return task
+
+    def cancel(self, key):
+        """Cancel the outstanding task with this key, if any"""
+        task = self.latest.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def _run(self, task, fn, args, kwargs):
+        # Worker thread: no Tk calls here
+        if task.cancelled:
+            return None
+        return fn(*args, **kwargs)
+
+    def _poll(self):
+        """Deliver finished results on the Tk thread"""
+        self._poll_id = None
+        if self.closed:
+            return
+        while True:
+            try:
+                task, on_done, on_error = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if task.key is not None and self.latest.get(task.key) is task:
+                del self.latest[task.key]
+            if task.cancelled or task.future.cancelled():
+                continue
+
+            error = task.future.exception()
+            try:
+                if error is None:
+                    if on_done:
+                        on_done(task.future.result())
+                elif on_error:
+                    on_error(error)
+                else:
+                    print(f"Error in background task: {error}")
+                    traceback.print_exception(type(error), error, error.__traceback__)
+            except Exception as e:
+                print(f"Error in task callback: {e}")
+                traceback.print_exc()
+
+        if self.pending:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def shutdown(self):
+        """Cancel queued tasks and stop delivering results"""
+        self.closed = True
+        for task in self.latest.values():
+            task.cancel()
+        self.latest.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+_runners = {}
+_runners_lock = threading.Lock()
+
+def get_task_runner(root):
+    """Shared TaskRunner for a Tk root, shut down when the root is destroyed"""
+    with _runners_lock:
+        runner = _runners.get(root)
+        if runner is None:
+            runner = _runners[root] = TaskRunner(root)
+
+            def on_destroy(event):
+                # <Destroy> on the root also fires for every child widget
+                if event.widget is root:
+                    with _runners_lock:
+                        _runners.pop(root, None)
+                    runner.shutdown()
+            root.bind("<Destroy>", on_destroy, "+")
+        return runner
+
+def is_ui_thread():
+    """True on the Tk (main) thread, where dialogs may be shown"""
+    return threading.current_thread() is threading.main_thread()
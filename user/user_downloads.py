@@ -7,16 +7,16 @@ import sys
 import customtkinter as ctk
 from tkinter import messagebox, filedialog, simpledialog
 import traceback
-import mutagen
-from mutagen.mp3 import MP3
-from mutagen.flac import FLAC
-from mutagen.wave import WAVE
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import UI_THEME, UI_COLOR_THEME, COLORS, TEMP_DIR
+from config import UI_THEME, UI_COLOR_THEME, COLORS
 from utils import get_current_user, connect_db, format_file_size
+from song_upload import upload_song_file
+from song_files import iter_song_chunks, save_chunks
+from player_client import get_player, PlayerError
+from data_client import call
 
 from user_nav import UserNavigation
 
@@ -270,31 +270,7 @@ class UserDownloadPage:
     def get_user_favorite_songs(self, limit=8):
         """Get the current user's favorite songs"""
         try:
-            # Get current user ID
-            user_id = self.user["user_id"]
-                
-            connection = connect_db()
-            if not connection:
-                return []
-                
-            cursor = connection.cursor(dictionary=True)
-            
-            # Get songs the user has listened to most
-            query = """
-            SELECT s.song_id, s.title, a.name as artist_name, COUNT(lh.history_id) as play_count,
-                   g.name as genre_name, s.file_size, s.file_type
-            FROM Listening_History lh
-            JOIN Songs s ON lh.song_id = s.song_id
-            JOIN Artists a ON s.artist_id = a.artist_id
-            LEFT JOIN Genres g ON s.genre_id = g.genre_id
-            WHERE lh.user_id = %s
-            GROUP BY s.song_id
-            ORDER BY play_count DESC
-            LIMIT %s
-            """
-            
-            cursor.execute(query, (user_id, limit))
-            songs = cursor.fetchall()
+            songs = call("get_user_favorite_songs", self.user["user_id"], limit)
             
             # Format file sizes to human-readable format
             for song in songs:
@@ -305,49 +281,11 @@ class UserDownloadPage:
         except Exception as e:
             print(f"Error getting user favorite songs: {e}")
             return []
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
     
     def get_popular_songs(self, limit=8):
-        """Get most popular songs from the database"""
+        """Get most popular songs through the shared data service"""
         try:
-            connection = connect_db()
-            if not connection:
-                return []
-                
-            cursor = connection.cursor(dictionary=True)
-            
-            # Get songs with most plays in listening history
-            query = """
-            SELECT s.song_id, s.title, a.name as artist_name, COUNT(lh.history_id) as play_count, 
-                   g.name as genre_name, s.file_size, s.file_type
-            FROM Songs s
-            JOIN Artists a ON s.artist_id = a.artist_id
-            LEFT JOIN Genres g ON s.genre_id = g.genre_id
-            LEFT JOIN Listening_History lh ON s.song_id = lh.song_id
-            GROUP BY s.song_id
-            ORDER BY play_count DESC
-            LIMIT %s
-            """
-            
-            cursor.execute(query, (limit,))
-            songs = cursor.fetchall()
-            
-            # If no songs with play history, get newest songs
-            if not songs:
-                query = """
-                SELECT s.song_id, s.title, a.name as artist_name, s.file_size, s.file_type,
-                       g.name as genre_name, 0 as play_count
-                FROM Songs s
-                JOIN Artists a ON s.artist_id = a.artist_id
-                LEFT JOIN Genres g ON s.genre_id = g.genre_id
-                ORDER BY s.upload_date DESC
-                LIMIT %s
-                """
-                cursor.execute(query, (limit,))
-                songs = cursor.fetchall()
+            songs = call("get_popular_songs", limit)
                 
             # Format file sizes to human-readable format
             for song in songs:
@@ -358,92 +296,19 @@ class UserDownloadPage:
         except Exception as e:
             print(f"Error fetching popular songs: {e}")
             return []
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
     
     def play_song(self, song_id, title, artist):
-        """Play a song and update player state"""
+        """Play a song in the player service"""
         try:
-            from pygame import mixer
-            
-            # Get song data from database
-            connection = connect_db()
-            if not connection:
-                return False
-                
-            cursor = connection.cursor()
-            
-            # Get file data
-            query = "SELECT file_data, file_type FROM Songs WHERE song_id = %s"
-            cursor.execute(query, (song_id,))
-            
-            result = cursor.fetchone()
-            if not result:
-                messagebox.showerror("Error", "Could not find song data")
-                return False
-            
-            file_data, file_type = result
-            
-            # Create temp directory if doesn't exist
-            os.makedirs(TEMP_DIR, exist_ok=True)
-            
-            # Save file data to temporary file
-            temp_file = os.path.join(TEMP_DIR, f"song_{song_id}.{file_type}")
-            with open(temp_file, 'wb') as f:
-                f.write(file_data)
-            
-            # Play the song
-            mixer.music.load(temp_file)
-            mixer.music.play()
-            
-            # Update player state
-            self.nav.update_playback_state(
-                song_id=song_id,
-                title=title,
-                artist=artist,
-                playing=True,
-                paused=False
-            )
-            
-            # Record in listening history
-            self.record_listening_history(song_id)
-            
+            # The service downloads the file and records the play; the sidebar
+            # follows its status events
+            get_player().play(song_id, title=title, artist=artist, user_id=self.user["user_id"])
             return True
             
-        except Exception as e:
+        except PlayerError as e:
             print(f"Error playing song: {e}")
-            traceback.print_exc()
             messagebox.showerror("Error", f"Could not play song: {e}")
             return False
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    def record_listening_history(self, song_id):
-        """Record that the current user listened to a song"""
-        try:
-            # Get current user ID
-            user_id = self.user["user_id"]
-                
-            connection = connect_db()
-            if not connection:
-                return
-                
-            cursor = connection.cursor()
-            
-            query = "INSERT INTO Listening_History (user_id, song_id) VALUES (%s, %s)"
-            cursor.execute(query, (user_id, song_id))
-            connection.commit()
-            
-        except Exception as e:
-            print(f"Error recording listening history: {e}")
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
     
     def select_song_for_download(self, song_id, title, artist, song_frame):
         """Select a song for download"""
@@ -480,7 +345,7 @@ class UserDownloadPage:
             
             # Get song data and info
             query = """
-            SELECT s.file_data, s.file_type, s.title, a.name 
+            SELECT s.file_type, s.title, a.name
             FROM Songs s
             JOIN Artists a ON s.artist_id = a.artist_id
             WHERE s.song_id = %s
@@ -492,7 +357,7 @@ class UserDownloadPage:
                 messagebox.showerror("Error", "Could not retrieve song data")
                 return False
                 
-            file_data, file_type, title, artist = result
+            file_type, title, artist = result
             
             # Format the filename
             filename = f"{artist} - {title}.{file_type}"
@@ -511,9 +376,8 @@ class UserDownloadPage:
             if not save_path:  # User cancelled
                 return False
             
-            # Write song data to file
-            with open(save_path, 'wb') as f:
-                f.write(file_data)
+            # Stream song data to file
+            save_chunks(iter_song_chunks(song_id), save_path)
             
             messagebox.showinfo("Download Complete", f"Song has been downloaded to:\n{save_path}")
             return True
@@ -712,48 +576,20 @@ class UserDownloadPage:
             self.refresh_song_list()
     
     def get_artists(self):
-        """Get list of artists from the database"""
+        """Get list of artists through the shared data service"""
         try:
-            connection = connect_db()
-            if not connection:
-                return []
-                
-            cursor = connection.cursor(dictionary=True)
-            
-            query = "SELECT artist_id, name FROM Artists ORDER BY name"
-            cursor.execute(query)
-            
-            return cursor.fetchall()
-            
+            return call("get_artists")
         except Exception as e:
             print(f"Error fetching artists: {e}")
             return []
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
     
     def get_genres(self):
-        """Get list of genres from the database"""
+        """Get list of genres through the shared data service"""
         try:
-            connection = connect_db()
-            if not connection:
-                return []
-                
-            cursor = connection.cursor(dictionary=True)
-            
-            query = "SELECT genre_id, name FROM Genres ORDER BY name"
-            cursor.execute(query)
-            
-            return cursor.fetchall()
-            
+            return call("get_genres")
         except Exception as e:
             print(f"Error fetching genres: {e}")
             return []
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
     
     def upload_song(self, file_path, title, artist_id, genre_id=None):
         """Upload a song to the database"""
@@ -762,50 +598,8 @@ class UserDownloadPage:
                 messagebox.showerror("Error", f"File not found: {file_path}")
                 return None
             
-            # Get file information
-            file_size = os.path.getsize(file_path)
-            file_type = os.path.splitext(file_path)[1][1:].lower()  # Get extension without dot
-            
-            # Get song duration using mutagen
-            try:
-                if file_type == 'mp3':
-                    audio = MP3(file_path)
-                elif file_type == 'flac':
-                    audio = FLAC(file_path)
-                elif file_type in ['wav', 'wave']:
-                    audio = WAVE(file_path)
-                else:
-                    # Fallback for other formats
-                    audio = mutagen.File(file_path)
-                    
-                duration = int(audio.info.length)
-            except Exception as e:
-                print(f"Error getting audio duration: {e}")
-                duration = 0
-            
-            # Read file binary data
-            with open(file_path, 'rb') as file:
-                file_data = file.read()
-            
-            # Insert into database
-            connection = connect_db()
-            if not connection:
-                return None
-                
-            cursor = connection.cursor()
-            
-            query = """
-            INSERT INTO Songs (title, artist_id, genre_id, duration, file_data, file_type, file_size)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            values = (title, artist_id, genre_id, duration, file_data, file_type, file_size)
-            
-            cursor.execute(query, values)
-            connection.commit()
-            
-            # Return the new song ID
-            new_song_id = cursor.lastrowid
+            # One streaming pass: hash + blob storage, duration/tags, then the DB rows
+            new_song_id = upload_song_file(file_path, title, artist_id, genre_id)
             
             messagebox.showinfo("Success", f"Song '{title}' uploaded successfully!")
             return new_song_id
@@ -815,10 +609,6 @@ class UserDownloadPage:
             traceback.print_exc()
             messagebox.showerror("Database Error", f"Failed to upload song: {e}")
             return None
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
     
     def refresh_song_list(self):
         """Refresh the song list"""
@@ -11,9 +11,10 @@ import sys
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from pygame import mixer
-from config import COLORS, USER_SESSION_FILE
-from utils import get_current_user
+from config import COLORS, USER_SESSION_FILE, session_path
+from play_events import flush_play_events
+from app_shell import get_app_shell
+from player_client import get_player, follow_player, PlayerError
 
 class UserNavigation:
     """User navigation sidebar with music player controls"""
@@ -34,13 +35,14 @@ class UserNavigation:
             "playing": False,
             "paused": False
         }
-        
-        # Initialize mixer if not already initialized
-        if not mixer.get_init():
-            mixer.init()
+        self.last_error = None
+        self.status_seen = False  # The first event is the state before this page opened
         
         # Create the sidebar
         self.create_sidebar()
+        
+        # The player service owns the mixer; follow its status events
+        follow_player(self.sidebar, self.update_playback_state)
     
     def create_sidebar(self):
         """Create the navigation sidebar"""
@@ -138,22 +140,20 @@ class UserNavigation:
         )
         self.next_btn.pack(side="left", padx=10)
     
-    def update_playback_state(self, song_id=None, title=None, artist=None, playing=False, paused=False):
-        """Update the current playback state and UI controls"""
-        # Update current song info if provided
-        if song_id is not None:
-            self.current_song["id"] = song_id
-        if title is not None:
-            self.current_song["title"] = title
-        if artist is not None:
-            self.current_song["artist"] = artist
+    def update_playback_state(self, status):
+        """Show a status event from the player service in the controls
         
-        # Update playback state
-        self.current_song["playing"] = playing
-        self.current_song["paused"] = paused
+        Args:
+            status: Player status (state, song_id, title, artist, error, ...)
+        """
+        self.current_song["id"] = status.get("song_id")
+        self.current_song["title"] = status.get("title") or "Loading..."
+        self.current_song["artist"] = status.get("artist") or ""
+        self.current_song["playing"] = status["state"] in ("playing", "loading")
+        self.current_song["paused"] = status["state"] == "paused"
         
         # Update UI elements
-        if playing:
+        if self.current_song["playing"]:
             self.play_btn.configure(text="⏸️")
         else:
             self.play_btn.configure(text="▶️")
@@ -163,90 +163,91 @@ class UserNavigation:
             text=f"Now Playing: {self.current_song['title']} - {self.current_song['artist']}" 
             if (self.current_song["playing"] or self.current_song["paused"]) else "No song playing"
         )
+        
+        # Report a new playback error once, from the page that is showing
+        error = status.get("error")
+        if error and error != self.last_error and self.status_seen and self.sidebar.winfo_ismapped():
+            messagebox.showerror("Error", error)
+        self.last_error = error
+        self.status_seen = True
     
     def toggle_play_pause(self):
         """Toggle between play and pause states"""
         if self.current_song["id"] is None:
             # No song loaded - do nothing
             return
-        elif self.current_song["paused"]:
-            # Resume paused song
-            mixer.music.unpause()
-            self.update_playback_state(playing=True, paused=False)
-        elif self.current_song["playing"]:
-            # Pause playing song
-            mixer.music.pause()
-            self.update_playback_state(playing=False, paused=True)
+        try:
+            get_player().toggle()
+        except PlayerError as e:
+            messagebox.showerror("Error", f"Player unavailable: {e}")
     
     def play_previous_song(self):
-        """Placeholder for playing previous song"""
-        messagebox.showinfo("Info", "Previous song feature will be implemented with playlists")
+        """Play the song before the current one"""
+        try:
+            get_player().previous()
+        except PlayerError as e:
+            messagebox.showinfo("Info", str(e))
     
     def play_next_song(self):
-        """Placeholder for playing next song"""
-        messagebox.showinfo("Info", "Next song feature will be implemented with playlists")
+        """Play the next queued song"""
+        try:
+            get_player().next()
+        except PlayerError as e:
+            messagebox.showinfo("Info", str(e))
     
     # ------------------- Navigation Methods -------------------
-    def open_home_page(self):
-        """Navigate to the home page"""
-        if self.active_item == "home":
-            return  # Already on home page
+    def navigate(self, page, script, label):
+        """Switch to a page in the app shell, or start its script when standalone
+        
+        Args:
+            page: Page name (home, search, playlist, download, recommend)
+            script: Page script to start when there is no app shell
+            label: Page name for error messages
+        """
+        if self.active_item == page:
+            return  # Already on this page
         try:
-            subprocess.Popen(["python", "user/user_view.py"])
-            self.master.winfo_toplevel().destroy()
+            shell = get_app_shell(self.master)
+            if shell and shell.has_page(page):
+                shell.show(page)
+            else:
+                subprocess.Popen(["python", script])
+                self.master.winfo_toplevel().destroy()
         except Exception as e:
-            messagebox.showerror("Error", f"Unable to open home page: {e}")
+            messagebox.showerror("Error", f"Unable to open {label}: {e}")
+    
+    def open_home_page(self):
+        """Navigate to the home page"""
+        self.navigate("home", "user/user_view.py", "home page")
     
     def open_search_page(self):
         """Navigate to the search page"""
-        if self.active_item == "search":
-            return  # Already on search page
-        try:
-            subprocess.Popen(["python", "user/user_search.py"])
-            self.master.winfo_toplevel().destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to open search page: {e}")
+        self.navigate("search", "user/user_search.py", "search page")
     
     def open_playlist_page(self):
         """Navigate to the playlist page"""
-        if self.active_item == "playlist":
-            return  # Already on playlist page
-        try:
-            subprocess.Popen(["python", "user/user_playlist.py"])
-            self.master.winfo_toplevel().destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to open playlist page: {e}")
+        self.navigate("playlist", "user/user_playlist.py", "playlist page")
     
     def open_download_page(self):
         """Navigate to the download page"""
-        if self.active_item == "download":
-            return  # Already on download page
-        try:
-            subprocess.Popen(["python", "user/user_downloads.py"])
-            self.master.winfo_toplevel().destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to open download page: {e}")
+        self.navigate("download", "user/user_downloads.py", "download page")
     
     def open_recommend_page(self):
         """Navigate to the recommendations page"""
-        if self.active_item == "recommend":
-            return  # Already on recommend page
-        try:
-            subprocess.Popen(["python", "user/user_recommend.py"])
-            self.master.winfo_toplevel().destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to open recommendations page: {e}")
+        self.navigate("recommend", "user/user_recommend.py", "recommendations page")
     
     def logout(self):
         """Logout and open the login page"""
         try:
-            # Stop any playing music
-            if mixer.music.get_busy():
-                mixer.music.stop()
+            # Stop the music and the player service with the session
+            get_player().shutdown()
+                
+            # Hand spooled plays to the ingester before the session ends
+            flush_play_events()
                 
             # Remove current user file
-            if os.path.exists(USER_SESSION_FILE):
-                os.remove(USER_SESSION_FILE)
+            if os.path.exists(session_path(USER_SESSION_FILE)):
+                os.remove(session_path(USER_SESSION_FILE))
                 
             # Open login page
             subprocess.Popen(["python", "login_signup.py"])
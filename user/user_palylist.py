@@ -11,8 +11,10 @@ import traceback
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import UI_THEME, UI_COLOR_THEME, COLORS, TEMP_DIR
+from config import UI_THEME, UI_COLOR_THEME, COLORS
 from utils import get_current_user, connect_db, format_duration
+from player_client import get_player, PlayerError
+from data_client import call, invalidate
 
 from user_nav import UserNavigation
 
@@ -311,35 +313,10 @@ class UserPlaylistPage:
     def get_user_playlists(self):
         """Get the current user's playlists"""
         try:
-            user_id = self.user["user_id"]
-                
-            connection = connect_db()
-            if not connection:
-                return []
-                
-            cursor = connection.cursor(dictionary=True)
-            
-            query = """
-            SELECT p.playlist_id, p.name, COUNT(ps.song_id) AS song_count
-            FROM Playlists p
-            LEFT JOIN Playlist_Songs ps ON p.playlist_id = ps.playlist_id
-            WHERE p.user_id = %s
-            GROUP BY p.playlist_id
-            ORDER BY p.created_at DESC
-            """
-            
-            cursor.execute(query, (user_id,))
-            playlists = cursor.fetchall()
-            
-            return playlists
-            
+            return call("get_user_playlists", self.user["user_id"])
         except Exception as e:
             print(f"Error fetching user playlists: {e}")
             return []
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
     
     def create_new_playlist(self, name, description=""):
         """Create a new playlist for the current user"""
@@ -356,6 +333,7 @@ class UserPlaylistPage:
             cursor.execute(query, (user_id, name, description))
             
             connection.commit()
+            invalidate("playlists")
             
             # Return the new playlist ID
             new_playlist_id = cursor.lastrowid
@@ -372,24 +350,7 @@ class UserPlaylistPage:
     def get_playlist_songs(self, playlist_id):
         """Get songs in a playlist"""
         try:
-            connection = connect_db()
-            if not connection:
-                return []
-                
-            cursor = connection.cursor(dictionary=True)
-            
-            query = """
-            SELECT s.song_id, s.title, a.name as artist_name, s.duration,
-                   ps.position
-            FROM Playlist_Songs ps
-            JOIN Songs s ON ps.song_id = s.song_id
-            JOIN Artists a ON s.artist_id = a.artist_id
-            WHERE ps.playlist_id = %s
-            ORDER BY ps.position
-            """
-            
-            cursor.execute(query, (playlist_id,))
-            songs = cursor.fetchall()
+            songs = call("get_playlist_songs", playlist_id)
             
             # Format durations to MM:SS
             for song in songs:
@@ -400,10 +361,6 @@ class UserPlaylistPage:
         except Exception as e:
             print(f"Error fetching playlist songs: {e}")
             return []
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
     
     def show_create_playlist_dialog(self):
         """Show dialog to create a new playlist"""
@@ -424,60 +381,16 @@ class UserPlaylistPage:
                 messagebox.showerror("Error", "Failed to create playlist.")
     
     def play_song(self, song_id, title, artist):
-        """Play a song and update player state"""
+        """Play a song in the player service"""
         try:
-            from pygame import mixer
-            
-            # Get song data from database
-            connection = connect_db()
-            if not connection:
-                return False
-                
-            cursor = connection.cursor()
-            
-            # Get file data
-            query = "SELECT file_data, file_type FROM Songs WHERE song_id = %s"
-            cursor.execute(query, (song_id,))
-            
-            result = cursor.fetchone()
-            if not result:
-                messagebox.showerror("Error", "Could not find song data")
-                return False
-            
-            file_data, file_type = result
-            
-            # Create temp directory if doesn't exist
-            os.makedirs(TEMP_DIR, exist_ok=True)
-            
-            # Save file data to temporary file
-            temp_file = os.path.join(TEMP_DIR, f"song_{song_id}.{file_type}")
-            with open(temp_file, 'wb') as f:
-                f.write(file_data)
-            
-            # Play the song
-            mixer.music.load(temp_file)
-            mixer.music.play()
-            
-            # Update player state
-            self.nav.update_playback_state(
-                song_id=song_id,
-                title=title,
-                artist=artist,
-                playing=True,
-                paused=False
-            )
-            
+            # The service downloads the file; the sidebar follows its status events
+            get_player().play(song_id, title=title, artist=artist)
             return True
             
-        except Exception as e:
+        except PlayerError as e:
             print(f"Error playing song: {e}")
-            traceback.print_exc()
             messagebox.showerror("Error", f"Could not play song: {e}")
             return False
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
 
 def main():
     try:
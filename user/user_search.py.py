@@ -11,8 +11,12 @@ import traceback
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import UI_THEME, UI_COLOR_THEME, COLORS, TEMP_DIR
-from utils import get_current_user, connect_db, format_duration
+from config import UI_THEME, UI_COLOR_THEME, COLORS
+from utils import get_current_user, format_duration
+from player_client import get_player, PlayerError
+from virtual_list import VirtualList, SongRow
+from ui_tasks import get_task_runner
+from data_client import call
 
 from user_nav import UserNavigation
 
@@ -26,6 +30,9 @@ class UserSearchPage:
             self.root.destroy()
             return
         
+        # Database reads run in the background (see ui_tasks.py)
+        self.tasks = get_task_runner(root)
+        
         # Initialize UI
         self.initialize_ui()
         
@@ -147,54 +154,34 @@ class UserSearchPage:
         self.songs_title = ctk.CTkLabel(self.songs_section, text="Recent Songs 🎵", 
                                  font=("Arial", 20, "bold"), text_color=COLORS["primary"])
         self.songs_title.pack(anchor="w", pady=(0, 15))
+        
+        # Results list; only the visible rows exist as widgets
+        self.song_list = VirtualList(
+            self.songs_section,
+            row_factory=lambda parent: SongRow(parent, self.play_song_row, fg_color=COLORS["card_bg"],
+                                               play_color=COLORS["success"]),
+            row_height=50, row_gap=10,
+            empty_text="No songs found",
+            fg_color=COLORS["content_bg"]
+        )
+        self.song_list.pack(fill="both", expand=True)
     
     def load_recent_songs(self):
         """Load recent songs as default content"""
-        try:
-            connection = connect_db()
-            if not connection:
-                return
-                
-            cursor = connection.cursor(dictionary=True)
-            
-            query = """
-            SELECT s.song_id, s.title, a.name as artist_name 
-            FROM Songs s
-            JOIN Artists a ON s.artist_id = a.artist_id
-            ORDER BY s.upload_date DESC
-            LIMIT 6
-            """
-            
-            cursor.execute(query)
-            songs = cursor.fetchall()
-            
-            # Display songs
-            self.display_songs(songs, "Recent Songs")
-            
-        except Exception as e:
-            print(f"Error loading recent songs: {e}")
-            traceback.print_exc()
-            
-            # Show error message in UI
-            error_label = ctk.CTkLabel(
-                self.songs_section, 
-                text="Error loading songs. Please try again later.", 
-                font=("Arial", 14),
-                text_color=COLORS["text_secondary"]
-            )
-            error_label.pack(pady=20)
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
+        # Placeholders until the songs arrive; a newer search supersedes this load
+        self.song_list.show_skeleton()
+        self.tasks.submit(
+            self.fetch_recent_songs, key="songs",
+            on_done=lambda songs: self.display_songs(songs, "Recent Songs"),
+            on_error=lambda e: self.show_load_error(e, "Error loading songs. Please try again later.")
+        )
+    
+    def fetch_recent_songs(self):
+        """Most recently uploaded songs (runs on a background worker)"""
+        return call("get_recent_songs", 6)
     
     def perform_search(self, event=None):
-        """Search for songs and update the search results"""
-        # Clear previous search results
-        for widget in self.songs_section.winfo_children():
-            if widget != self.songs_title:  # Keep the section title
-                widget.destroy()
-        
+        """Search for songs in the background and update the search results"""
         # Get search query
         query = self.search_entry.get()
         
@@ -206,93 +193,28 @@ class UserSearchPage:
         # Get search type
         search_type = self.search_type_var.get()
         
-        try:
-            connection = connect_db()
-            if not connection:
-                return
-                
-            cursor = connection.cursor(dictionary=True)
-            
-            search_param = f"%{query}%"
-            
-            # Different queries based on search type
-            if search_type == "song":
-                query_sql = """
-                SELECT s.song_id, s.title, a.name as artist_name, al.title as album_name, 
-                       g.name as genre, s.duration
-                FROM Songs s
-                JOIN Artists a ON s.artist_id = a.artist_id
-                LEFT JOIN Albums al ON s.album_id = al.album_id
-                LEFT JOIN Genres g ON s.genre_id = g.genre_id
-                WHERE s.title LIKE %s
-                ORDER BY s.title
-                """
-                cursor.execute(query_sql, (search_param,))
-            
-            elif search_type == "artist":
-                query_sql = """
-                SELECT s.song_id, s.title, a.name as artist_name, al.title as album_name, 
-                       g.name as genre, s.duration
-                FROM Songs s
-                JOIN Artists a ON s.artist_id = a.artist_id
-                LEFT JOIN Albums al ON s.album_id = al.album_id
-                LEFT JOIN Genres g ON s.genre_id = g.genre_id
-                WHERE a.name LIKE %s
-                ORDER BY s.title
-                """
-                cursor.execute(query_sql, (search_param,))
-                
-            elif search_type == "album":
-                query_sql = """
-                SELECT s.song_id, s.title, a.name as artist_name, al.title as album_name, 
-                       g.name as genre, s.duration
-                FROM Songs s
-                JOIN Artists a ON s.artist_id = a.artist_id
-                LEFT JOIN Albums al ON s.album_id = al.album_id
-                LEFT JOIN Genres g ON s.genre_id = g.genre_id
-                WHERE al.title LIKE %s
-                ORDER BY s.title
-                """
-                cursor.execute(query_sql, (search_param,))
-                
-            else:  # "all" - search everything
-                query_sql = """
-                SELECT s.song_id, s.title, a.name as artist_name, al.title as album_name, 
-                       g.name as genre, s.duration
-                FROM Songs s
-                JOIN Artists a ON s.artist_id = a.artist_id
-                LEFT JOIN Albums al ON s.album_id = al.album_id
-                LEFT JOIN Genres g ON s.genre_id = g.genre_id
-                WHERE s.title LIKE %s OR a.name LIKE %s OR al.title LIKE %s
-                ORDER BY s.title
-                """
-                cursor.execute(query_sql, (search_param, search_param, search_param))
-            
-            songs = cursor.fetchall()
-            
-            # Format durations to MM:SS
-            for song in songs:
-                song['duration_formatted'] = format_duration(song['duration'])
-            
-            # Display results
-            self.display_songs(songs, f"Search Results for '{query}'")
-            
-        except Exception as e:
-            print(f"Error searching songs: {e}")
-            traceback.print_exc()
-            
-            # Show error message in UI
-            error_label = ctk.CTkLabel(
-                self.songs_section, 
-                text="Error performing search. Please try again.", 
-                font=("Arial", 14),
-                text_color=COLORS["text_secondary"]
-            )
-            error_label.pack(pady=20)
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
+        self.song_list.show_skeleton()
+        self.tasks.submit(
+            self.fetch_search_results, query, search_type, key="songs",
+            on_done=lambda songs: self.display_songs(songs, f"Search Results for '{query}'"),
+            on_error=lambda e: self.show_load_error(e, "Error performing search. Please try again.")
+        )
+    
+    def fetch_search_results(self, query, search_type):
+        """Songs matching a search (runs on a background worker)"""
+        songs = call("search_songs", query, search_type)
+        
+        # Format durations to MM:SS
+        for song in songs:
+            song['duration_formatted'] = format_duration(song['duration'])
+        
+        return songs
+    
+    def show_load_error(self, error, text):
+        """Show a failed background load in the results list"""
+        print(f"Error loading songs: {error}")
+        traceback.print_exception(type(error), error, error.__traceback__)
+        self.song_list.set_items([], empty_text=text)
     
     def display_songs(self, songs, section_subtitle=None):
         """Display songs in the search results section"""
@@ -300,118 +222,25 @@ class UserSearchPage:
         if section_subtitle:
             self.songs_title.configure(text=f"🔍 {section_subtitle}")
         
-        if not songs:
-            # No songs found
-            no_songs_label = ctk.CTkLabel(
-                self.songs_section, 
-                text="No songs found", 
-                font=("Arial", 14),
-                text_color=COLORS["text_secondary"]
-            )
-            no_songs_label.pack(pady=20)
-            return
-        
-        # Create song rows
-        for song in songs:
-            # Create a frame for each song row
-            song_frame = ctk.CTkFrame(self.songs_section, fg_color=COLORS["card_bg"], corner_radius=10, height=50)
-            song_frame.pack(fill="x", pady=5)
-            
-            # Format the song display text
-            if "album_name" in song and song["album_name"]:
-                display_text = f"🎵 {song['artist_name']} - {song['title']} ({song['album_name']})"
-            else:
-                display_text = f"🎵 {song['artist_name']} - {song['title']}"
-            
-            # Add duration if available
-            if "duration_formatted" in song:
-                display_text += f" ({song['duration_formatted']})"
-            
-            # Song name and info
-            song_label = ctk.CTkLabel(
-                song_frame, 
-                text=display_text, 
-                font=("Arial", 14), 
-                text_color="white",
-                anchor="w"
-            )
-            song_label.pack(side="left", padx=15, fill="y")
-            
-            # Play button
-            play_icon = ctk.CTkLabel(
-                song_frame, 
-                text="▶️", 
-                font=("Arial", 16), 
-                text_color=COLORS["success"]
-            )
-            play_icon.pack(side="right", padx=15)
-            
-            # Add play song command
-            song_id = song["song_id"]
-            
-            # Make the whole row clickable
-            song_frame.bind("<Button-1>", lambda e, sid=song_id, title=song["title"], artist=song["artist_name"]: 
-                           self.play_song(sid, title, artist))
-            song_label.bind("<Button-1>", lambda e, sid=song_id, title=song["title"], artist=song["artist_name"]: 
-                           self.play_song(sid, title, artist))
-            play_icon.bind("<Button-1>", lambda e, sid=song_id, title=song["title"], artist=song["artist_name"]: 
-                           self.play_song(sid, title, artist))
+        # Recycled rows are rebound to the new songs as they scroll into view
+        self.song_list.set_items(songs, empty_text="No songs found")
+    
+    def play_song_row(self, song):
+        """Play the song shown in a clicked result row"""
+        if song:
+            self.play_song(song["song_id"], song["title"], song["artist_name"])
     
     def play_song(self, song_id, title, artist):
-        """Play a song and update player state"""
+        """Play a song in the player service"""
         try:
-            from pygame import mixer
-            
-            # Get song data from database
-            connection = connect_db()
-            if not connection:
-                return False
-                
-            cursor = connection.cursor()
-            
-            # Get file data
-            query = "SELECT file_data, file_type FROM Songs WHERE song_id = %s"
-            cursor.execute(query, (song_id,))
-            
-            result = cursor.fetchone()
-            if not result:
-                messagebox.showerror("Error", "Could not find song data")
-                return False
-            
-            file_data, file_type = result
-            
-            # Create temp directory if doesn't exist
-            os.makedirs(TEMP_DIR, exist_ok=True)
-            
-            # Save file data to temporary file
-            temp_file = os.path.join(TEMP_DIR, f"song_{song_id}.{file_type}")
-            with open(temp_file, 'wb') as f:
-                f.write(file_data)
-            
-            # Play the song
-            mixer.music.load(temp_file)
-            mixer.music.play()
-            
-            # Update player state
-            self.nav.update_playback_state(
-                song_id=song_id,
-                title=title,
-                artist=artist,
-                playing=True,
-                paused=False
-            )
-            
+            # The service downloads the file; the sidebar follows its status events
+            get_player().play(song_id, title=title, artist=artist)
             return True
             
-        except Exception as e:
+        except PlayerError as e:
             print(f"Error playing song: {e}")
-            traceback.print_exc()
             messagebox.showerror("Error", f"Could not play song: {e}")
             return False
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
 
 def main():
     try:
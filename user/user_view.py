@@ -11,8 +11,10 @@ import traceback
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import UI_THEME, UI_COLOR_THEME, COLORS, TEMP_DIR
-from utils import get_current_user, connect_db, record_listening_history
+from config import UI_THEME, UI_COLOR_THEME, COLORS
+from utils import get_current_user
+from player_client import get_player, PlayerError
+from data_client import call
 
 from user_nav import UserNavigation
 
@@ -116,39 +118,10 @@ class UserHomePage:
         self.songs_frame.pack(fill="x")
     
     def load_featured_songs(self):
-        """Load featured songs from the database"""
+        """Load featured songs through the shared data service"""
         try:
-            connection = connect_db()
-            if not connection:
-                return
-                
-            cursor = connection.cursor(dictionary=True)
-            
-            # Get songs with most plays in listening history
-            query = """
-            SELECT s.song_id, s.title, a.name as artist_name, COUNT(lh.history_id) as play_count 
-            FROM Songs s
-            JOIN Artists a ON s.artist_id = a.artist_id
-            LEFT JOIN Listening_History lh ON s.song_id = lh.song_id
-            GROUP BY s.song_id
-            ORDER BY play_count DESC
-            LIMIT 3
-            """
-            
-            cursor.execute(query)
-            songs = cursor.fetchall()
-            
-            # If no songs with play history, get newest songs
-            if not songs:
-                query = """
-                SELECT s.song_id, s.title, a.name as artist_name 
-                FROM Songs s
-                JOIN Artists a ON s.artist_id = a.artist_id
-                ORDER BY s.upload_date DESC
-                LIMIT 3
-                """
-                cursor.execute(query)
-                songs = cursor.fetchall()
+            # Most played songs, or the newest ones before anything is played
+            songs = call("get_featured_songs", 3)
             
             # Display songs if available
             if songs:
@@ -173,10 +146,6 @@ class UserHomePage:
         except Exception as e:
             print(f"Error loading featured songs: {e}")
             traceback.print_exc()
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
     
     def create_song_card(self, parent, song_id, title, artist):
         """Create a clickable song card"""
@@ -209,77 +178,17 @@ class UserHomePage:
         return song_card
     
     def play_song(self, song_id, title=None, artist=None):
-        """Play a song and update player state"""
+        """Play a song in the player service"""
         try:
-            from pygame import mixer
-            
-            # Get song data from database
-            connection = connect_db()
-            if not connection:
-                return False
-                
-            cursor = connection.cursor()
-            
-            # Get file data
-            query = "SELECT file_data, file_type FROM Songs WHERE song_id = %s"
-            cursor.execute(query, (song_id,))
-            
-            result = cursor.fetchone()
-            if not result:
-                messagebox.showerror("Error", "Could not find song data")
-                return False
-            
-            file_data, file_type = result
-            
-            # Get additional info if not provided
-            if title is None or artist is None:
-                info_query = """
-                SELECT s.title, a.name as artist_name 
-                FROM Songs s 
-                JOIN Artists a ON s.artist_id = a.artist_id 
-                WHERE s.song_id = %s
-                """
-                cursor.execute(info_query, (song_id,))
-                info = cursor.fetchone()
-                if info:
-                    title = info[0]
-                    artist = info[1]
-            
-            # Create temp directory if doesn't exist
-            os.makedirs(TEMP_DIR, exist_ok=True)
-            
-            # Save file data to temporary file
-            temp_file = os.path.join(TEMP_DIR, f"song_{song_id}.{file_type}")
-            with open(temp_file, 'wb') as f:
-                f.write(file_data)
-            
-            # Play the song
-            mixer.music.load(temp_file)
-            mixer.music.play()
-            
-            # Update player state
-            self.nav.update_playback_state(
-                song_id=song_id,
-                title=title,
-                artist=artist,
-                playing=True,
-                paused=False
-            )
-            
-            # Record in listening history
-            record_listening_history(self.user["user_id"], song_id)
-            
+            # The service downloads the file and records the play; the sidebar
+            # follows its status events
+            get_player().play(song_id, title=title, artist=artist, user_id=self.user["user_id"])
             return True
             
-        except Exception as e:
+        except PlayerError as e:
             print(f"Error playing song: {e}")
-            traceback.print_exc()
             messagebox.showerror("Error", f"Could not play song: {e}")
             return False
-        finally:
-            if 'connection' in locals() and connection and connection.is_connected():
-                cursor.close()
-                connection.close()
 
 def main():
     try:
@@ -4,31 +4,35 @@ Utility functions for the Online Music System.
 
 import os
 import hashlib
-import mysql.connector
 import subprocess
 from tkinter import messagebox
-import customtkinter as ctk
-from pygame import mixer
-from config import DB_CONFIG, TEMP_DIR, USER_SESSION_FILE, ADMIN_SESSION_FILE
+from config import DB_CONFIG, TEMP_DIR, USER_SESSION_FILE, ADMIN_SESSION_FILE, session_path
+from db_pool import get_connection
+from play_events import record_play_event
+from ui_tasks import is_ui_thread
 
 # ------------------- Database Functions -------------------
 def connect_db():
-    """Connect to the MySQL database"""
+    """Get a connection to the MySQL database from the shared pool
+
+    Calling close() on the returned connection hands it back to the pool.
+    Safe to call from background tasks, which get no error dialog.
+    """
+    import mysql.connector  # Deferred: only pages that reach the database pay for it
     try:
-        connection = mysql.connector.connect(
-            host=DB_CONFIG["host"],
-            user=DB_CONFIG["user"],
-            password=DB_CONFIG["password"],
-            database=DB_CONFIG["database"]
-        )
+        connection = get_connection()
         return connection
     except mysql.connector.Error as err:
-        messagebox.showerror("Database Connection Error", 
-                            f"Failed to connect to database: {err}")
+        if is_ui_thread():
+            messagebox.showerror("Database Connection Error", 
+                                f"Failed to connect to database: {err}")
+        else:
+            print(f"Failed to connect to database: {err}")
         return None
 
 def connect_db_server():
     """Connect to MySQL server without specifying a database"""
+    import mysql.connector
     try:
         connection = mysql.connector.connect(
             host=DB_CONFIG["host"],
@@ -45,11 +49,11 @@ def get_current_user():
     """Get the current logged-in user information"""
     try:
         # Read user ID from file
-        if not os.path.exists(USER_SESSION_FILE):
+        if not os.path.exists(session_path(USER_SESSION_FILE)):
             messagebox.showerror("Error", "You are not logged in!")
             return None
             
-        with open(USER_SESSION_FILE, "r") as f:
+        with open(session_path(USER_SESSION_FILE), "r") as f:
             user_id = f.read().strip()
             
         if not user_id:
@@ -84,10 +88,10 @@ def get_admin_info():
     """Get the current admin information"""
     try:
         # Read admin ID from file
-        if not os.path.exists(ADMIN_SESSION_FILE):
+        if not os.path.exists(session_path(ADMIN_SESSION_FILE)):
             return None
             
-        with open(ADMIN_SESSION_FILE, "r") as f:
+        with open(session_path(ADMIN_SESSION_FILE), "r") as f:
             admin_id = f.read().strip()
             
         if not admin_id:
@@ -184,6 +188,8 @@ def open_window(script_name, destroy_current=True, current_window=None):
 def init_player():
     """Initialize the music player"""
     try:
+        # pygame and the audio device are only touched when a player is needed
+        from pygame import mixer
         mixer.init()
         return True
     except Exception as e:
@@ -201,31 +207,21 @@ def create_temp_directory():
         return False
 
 def record_listening_history(user_id, song_id):
-    """Record that a user listened to a song"""
+    """Record that a user listened to a song
+
+    The play is appended to the local spool (see play_events) and
+    ingested in a batch off the UI thread.
+    """
     try:
-        connection = connect_db()
-        if not connection:
-            return False
-            
-        cursor = connection.cursor()
-        
-        query = "INSERT INTO Listening_History (user_id, song_id) VALUES (%s, %s)"
-        cursor.execute(query, (user_id, song_id))
-        connection.commit()
-        
-        return True
-        
+        return record_play_event(user_id, song_id)
     except Exception as e:
         print(f"Error recording listening history: {e}")
         return False
-    finally:
-        if 'connection' in locals() and connection and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 # ------------------- UI Helper Functions -------------------
 def create_scrollable_frame(parent, **kwargs):
     """Create a standardized scrollable frame"""
+    import customtkinter as ctk
     return ctk.CTkScrollableFrame(parent, **kwargs)
 
 def create_centered_window(window, width, height):
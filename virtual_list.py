@@ -0,0 +1,330 @@
+"""
+Virtualized list widget for the Online Music System.
+
+VirtualList shows any number of items with a fixed row height, but only
+creates row widgets for the visible viewport plus a few rows of overscan.
+Scrolling moves the rows with place() and rebinds the rows that scroll
+into view to their new items, so a scroll step costs a handful of
+configure() calls however long the list is - 50 results or 50,000.
+
+Rows are widgets made by a row factory and must have a show(item, index)
+method; SongRow and TrackRow cover the song lists. Rows keep their
+bindings for life and read the item they currently show, so recycling a
+row never rebinds events.
+"""
+
+import math
+import time
+import customtkinter as ctk
+
+SCROLL_UNITS = 3  # Rows scrolled per wheel notch
+SKELETON_COLOR = "#24243A"
+
+class VirtualList(ctk.CTkFrame):
+    """Scrollable list that recycles a small pool of row widgets
+
+    Args:
+        master: Parent widget
+        row_factory: Callable (parent) -> row widget with show(item, index);
+                     the row must be created with height=row_height
+        row_height: Height of every row
+        row_gap: Space between rows
+        overscan: Extra rows kept above and below the viewport
+        empty_text: Shown when there are no items
+        on_end_reached: Called once when the last rows come into view, e.g.
+                        to fetch the next page and append_items() it
+        end_threshold: Rows from the end that count as "reached"
+    """
+
+    def __init__(self, master, row_factory, row_height=50, row_gap=5, overscan=2,
+                 empty_text="No items", on_end_reached=None, end_threshold=10, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_factory = row_factory
+        self.row_height = row_height
+        self.row_gap = row_gap
+        self.overscan = overscan
+        self.on_end_reached = on_end_reached
+        self.end_threshold = end_threshold
+
+        self.items = []
+        self.offset = 0          # Scroll position (unscaled pixels)
+        self.rows = []           # Row pool
+        self.visible = {}        # Item index -> row showing it
+        self._render_pending = None
+        self._end_requested = False
+        self.last_render_ms = 0.0
+        self.max_render_ms = 0.0
+        self.loading = False
+        self.skeleton_count = None
+        self.skeletons = []      # Placeholder bars shown while loading
+
+        self.viewport = ctk.CTkFrame(self, fg_color=self.cget("fg_color"), corner_radius=0)
+        self.viewport.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.empty_label = ctk.CTkLabel(self.viewport, text=empty_text, font=("Arial", 14),
+                                      text_color="#A0A0A0")
+
+        self.viewport.bind("<Configure>", lambda e: self.schedule_render())
+        self.bind_scroll(self.viewport)
+
+    # ------------------- Items -------------------
+    def show_skeleton(self, count=None):
+        """Show placeholder rows until the next set_items()
+
+        Args:
+            count: Placeholder rows (defaults to filling the viewport)
+        """
+        self.loading = True
+        self.skeleton_count = count
+        self.schedule_render()
+
+    def set_items(self, items, empty_text=None):
+        """Replace the items and scroll back to the top"""
+        self.loading = False
+        self.items = list(items)
+        self.offset = 0
+        self.visible.clear()
+        self._end_requested = False
+        if empty_text is not None:
+            self.empty_label.configure(text=empty_text)
+        self.schedule_render()
+
+    def append_items(self, items):
+        """Add items at the end, keeping the scroll position"""
+        self.items.extend(items)
+        self._end_requested = False
+        self.schedule_render()
+
+    def refresh(self):
+        """Re-show every visible row, e.g. after items changed in place"""
+        self.visible.clear()
+        self.schedule_render()
+
+    # ------------------- Scrolling -------------------
+    # Positions are in unscaled units, like every CTk geometry argument;
+    # place() applies the widget scaling itself
+    def stride(self):
+        """Distance from the top of one row to the next"""
+        return self.row_height + self.row_gap
+
+    def view_height(self):
+        return self._reverse_widget_scaling(self.viewport.winfo_height())
+
+    def content_height(self):
+        return len(self.items) * self.stride()
+
+    def max_offset(self):
+        return max(0, self.content_height() - self.view_height())
+
+    def scroll_to_offset(self, offset):
+        offset = int(max(0, min(offset, self.max_offset())))
+        if offset != self.offset:
+            self.offset = offset
+            self.schedule_render()
+
+    def scroll_to(self, index):
+        """Scroll so that item index is at the top"""
+        self.scroll_to_offset(index * self.stride())
+
+    def yview(self, *args):
+        """Scrollbar command ("moveto", fraction) or ("scroll", n, units|pages)"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to_offset(float(args[1]) * self.content_height())
+        elif args[0] == "scroll":
+            step = self.view_height() if args[2] == "pages" else self.stride()
+            self.scroll_to_offset(self.offset + int(args[1]) * step)
+
+    def on_mouse_wheel(self, event):
+        if event.num == 4:
+            notches = -1
+        elif event.num == 5:
+            notches = 1
+        else:
+            # Windows reports multiples of 120, macOS small deltas
+            notches = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta
+        self.scroll_to_offset(self.offset + notches * SCROLL_UNITS * self.stride())
+
+    def bind_scroll(self, widget):
+        """Scroll the list with the mouse wheel over widget and its children"""
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            widget.bind(sequence, self.on_mouse_wheel, "+")
+        for child in widget.winfo_children():
+            self.bind_scroll(child)
+
+    # ------------------- Rendering -------------------
+    def schedule_render(self):
+        """Render once when Tk is idle; scroll events in between coalesce"""
+        if self._render_pending is None:
+            self._render_pending = self.after_idle(self.render)
+
+    def render(self):
+        """Place and bind the rows for the current scroll position"""
+        self._render_pending = None
+        start = time.perf_counter()
+
+        view_height = self.view_height()
+        stride = self.stride()
+        count = len(self.items)
+        self.offset = min(self.offset, self.max_offset())
+
+        if self.loading:
+            self.render_skeleton(view_height)
+            return
+        for bar in self.skeletons:
+            bar.place_forget()
+
+        if not count:
+            for row in self.rows:
+                row.place_forget()
+            self.visible.clear()
+            self.empty_label.place(relx=0.5, y=20, anchor="n")
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.empty_label.place_forget()
+
+        # Grow the pool to cover the viewport; it never shrinks
+        needed = int(math.ceil(view_height / stride)) + 1 + 2 * self.overscan
+        while len(self.rows) < needed:
+            row = self.row_factory(self.viewport)
+            self.bind_scroll(row)
+            self.rows.append(row)
+
+        first = max(0, int(self.offset // stride) - self.overscan)
+        last = min(count, int((self.offset + view_height) // stride) + 1 + self.overscan)
+
+        # Rows still showing an item in range keep it; the rest are recycled
+        self.visible = {index: row for index, row in self.visible.items() if first <= index < last}
+        in_use = set(map(id, self.visible.values()))
+        free = [row for row in self.rows if id(row) not in in_use]
+
+        for index in range(first, last):
+            row = self.visible.get(index)
+            if row is None:
+                row = free.pop()
+                row.show(self.items[index], index)
+                self.visible[index] = row
+            row.place(x=0, y=index * stride - self.offset, relwidth=1.0)
+        for row in free:
+            row.place_forget()
+
+        total = self.content_height()
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + view_height) / total))
+
+        if self.on_end_reached and not self._end_requested and last >= count - self.end_threshold:
+            self._end_requested = True
+            self.after_idle(self.on_end_reached)
+
+        self.last_render_ms = (time.perf_counter() - start) * 1000
+        self.max_render_ms = max(self.max_render_ms, self.last_render_ms)
+
+    def render_skeleton(self, view_height):
+        """Hide the rows and place grey placeholder bars instead"""
+        for row in self.rows:
+            row.place_forget()
+        self.visible.clear()
+        self.empty_label.place_forget()
+        self.scrollbar.set(0.0, 1.0)
+
+        count = int(math.ceil(view_height / self.stride()))
+        if self.skeleton_count is not None:
+            count = min(count, self.skeleton_count)
+        while len(self.skeletons) < count:
+            bar = ctk.CTkFrame(self.viewport, fg_color=SKELETON_COLOR, corner_radius=10, height=self.row_height)
+            self.bind_scroll(bar)
+            self.skeletons.append(bar)
+        for index, bar in enumerate(self.skeletons):
+            if index < count:
+                bar.place(x=0, y=index * self.stride(), relwidth=1.0)
+            else:
+                bar.place_forget()
+
+def skeleton_rows(parent, count, height=50, pady=5):
+    """Pack placeholder bars into a plain frame while its rows load
+
+    Returns:
+        The bars, for the caller to destroy once the data arrives
+    """
+    bars = []
+    for _ in range(count):
+        bar = ctk.CTkFrame(parent, fg_color=SKELETON_COLOR, corner_radius=10, height=height)
+        bar.pack(fill="x", pady=pady)
+        bars.append(bar)
+    return bars
+
+# ------------------- Song Rows -------------------
+def song_display_text(song):
+    """"🎵 Artist - Title (Album) (3:45)" for a song row"""
+    if song.get("album_name"):
+        display_text = f"🎵 {song['artist_name']} - {song['title']} ({song['album_name']})"
+    else:
+        display_text = f"🎵 {song['artist_name']} - {song['title']}"
+
+    # Add duration if available
+    if "duration_formatted" in song:
+        display_text += f" ({song['duration_formatted']})"
+    return display_text
+
+class SongRow(ctk.CTkFrame):
+    """Clickable "Artist - Title" row with a play icon (search results)"""
+
+    def __init__(self, master, on_play, height=50, fg_color="#1A1A2E", play_color="#22C55E"):
+        super().__init__(master, fg_color=fg_color, corner_radius=10, height=height)
+        self.pack_propagate(False)
+        self.song = None
+
+        self.song_label = ctk.CTkLabel(self, text="", font=("Arial", 14), text_color="white", anchor="w")
+        self.song_label.pack(side="left", padx=15, fill="y")
+
+        self.play_icon = ctk.CTkLabel(self, text="▶️", font=("Arial", 16), text_color=play_color)
+        self.play_icon.pack(side="right", padx=15)
+
+        # Make the whole row clickable
+        for widget in (self, self.song_label, self.play_icon):
+            widget.bind("<Button-1>", lambda e: on_play(self.song))
+
+    def show(self, song, index):
+        self.song = song
+        self.song_label.configure(text=song_display_text(song))
+
+class TrackRow(ctk.CTkFrame):
+    """Numbered "# Title Artist Duration" row with a play button (playlists)"""
+
+    def __init__(self, master, on_play, height=40, fg_color="#1A1A2E", hover_color="#232342"):
+        super().__init__(master, fg_color=fg_color, corner_radius=5, height=height)
+        self.pack_propagate(False)
+        self.song = None
+
+        self.number_label = ctk.CTkLabel(self, text="", font=("Arial", 12), text_color="white", width=50)
+        self.number_label.pack(side="left", padx=(10, 0))
+
+        self.title_label = ctk.CTkLabel(self, text="", font=("Arial", 12), text_color="white",
+                                      width=250, anchor="w")
+        self.title_label.pack(side="left", padx=(10, 0))
+
+        self.artist_label = ctk.CTkLabel(self, text="", font=("Arial", 12), text_color="#A0A0A0",
+                                       width=200, anchor="w")
+        self.artist_label.pack(side="left", padx=(10, 0))
+
+        self.duration_label = ctk.CTkLabel(self, text="", font=("Arial", 12), text_color="#A0A0A0",
+                                         width=100, anchor="w")
+        self.duration_label.pack(side="left", padx=(10, 0))
+
+        play_btn = ctk.CTkButton(self, text="▶️", font=("Arial", 14), fg_color=fg_color,
+                               hover_color=hover_color, width=30, height=30,
+                               command=lambda: on_play(self.song))
+        play_btn.pack(side="right", padx=10)
+
+        # Make row clickable
+        self.bind("<Button-1>", lambda e: on_play(self.song))
+
+    def show(self, song, index):
+        self.song = song
+        self.number_label.configure(text=str(index + 1))
+        self.title_label.configure(text=song["title"])
+        self.artist_label.configure(text=song["artist_name"])
+        self.duration_label.configure(text=song.get("duration_formatted", ""))